@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name,too-few-public-methods
+"""
+Add an index on the node type and hash of nodes, used to look up nodes for caching
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+# Remove when https://github.com/PyCQA/pylint/issues/1931 is fixed
+# pylint: disable=no-name-in-module,import-error
+from django.db import migrations
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.40'
+DOWN_REVISION = '1.0.39'
+
+# Currently valid hash key
+_HASH_EXTRA_KEY = '_aiida_hash'
+
+
+class Migration(migrations.Migration):
+    """Add an index on the node type and hash of nodes, used to look up nodes for caching"""
+
+    dependencies = [
+        ('db', '0039_reset_hash'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """CREATE INDEX db_dbnode_node_type_hash_idx ON db_dbnode (node_type, (extras ->> '""" + _HASH_EXTRA_KEY +
+            """'));""",
+            reverse_sql="""DROP INDEX IF EXISTS db_dbnode_node_type_hash_idx;"""),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
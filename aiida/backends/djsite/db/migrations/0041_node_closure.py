@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name,too-few-public-methods
+"""
+Add the optional transitive closure table of the provenance graph
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+# Remove when https://github.com/PyCQA/pylint/issues/1931 is fixed
+# pylint: disable=no-name-in-module,import-error
+from django.db import migrations, models
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.41'
+DOWN_REVISION = '1.0.40'
+
+
+class Migration(migrations.Migration):
+    """Add the optional transitive closure table of the provenance graph"""
+
+    dependencies = [
+        ('db', '0040_node_hash_index'),
+    ]
+
+    operations = [
+        # The table is created with SQL, because the foreign keys have to cascade on the database level
+        migrations.RunSQL(
+            """
+            CREATE TABLE db_dbnodeclosure (
+                id serial PRIMARY KEY,
+                ancestor_id integer NOT NULL
+                    REFERENCES db_dbnode (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+                descendant_id integer NOT NULL
+                    REFERENCES db_dbnode (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+                depth integer NOT NULL,
+                CONSTRAINT db_dbnodeclosure_ancestor_id_descendant_id_key UNIQUE (ancestor_id, descendant_id)
+            );
+            CREATE INDEX ix_db_dbnodeclosure_descendant_id ON db_dbnodeclosure (descendant_id);
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS db_dblink_closure_trigger ON db_dblink;
+            DROP FUNCTION IF EXISTS db_dblink_closure_insert();
+            DROP TABLE db_dbnodeclosure;
+            """),
+        migrations.CreateModel(
+            name='DbNodeClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.IntegerField()),
+                ('ancestor',
+                 models.ForeignKey(on_delete=models.deletion.DO_NOTHING, related_name='+', to='db.DbNode')),
+                ('descendant',
+                 models.ForeignKey(on_delete=models.deletion.DO_NOTHING, related_name='+', to='db.DbNode')),
+            ],
+            options={
+                'db_table': 'db_dbnodeclosure',
+                'managed': False,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='dbnodeclosure',
+            unique_together=set([('ancestor', 'descendant')]),
+        ),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
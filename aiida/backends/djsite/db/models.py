@@ -192,6 +192,23 @@ class DbLink(m.Model):
             self.output.pk, )
 
 
+class DbNodeClosure(m.Model):
+    """Transitive closure of the provenance graph over `create` and `input_calc` links.
+
+    The table is optional and is filled and kept up to date by a database trigger once enabled, see
+    :mod:`aiida.manage.database.closure`. It is not managed by Django, because the foreign keys have to cascade on
+    the database level, such that deleting nodes does not need to go through the rows of this table.
+    """
+    ancestor = m.ForeignKey('DbNode', related_name='+', on_delete=m.DO_NOTHING)
+    descendant = m.ForeignKey('DbNode', related_name='+', on_delete=m.DO_NOTHING)
+    depth = m.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'db_dbnodeclosure'
+        unique_together = (('ancestor', 'descendant'),)
+
+
 @python_2_unicode_compatible
 class DbSetting(m.Model):
     """
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name,too-few-public-methods,no-member
+"""Add the optional transitive closure table of the provenance graph
+
+Revision ID: 9a3f0c3b2d51
+Revises: c2b4e9a0d3f1
+Create Date: 2019-08-12 14:37:08.521736
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9a3f0c3b2d51'
+down_revision = 'c2b4e9a0d3f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the closure table."""
+    op.create_table(
+        'db_dbnodeclosure',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['db_dbnode.id'],
+                                ondelete='CASCADE',
+                                initially='DEFERRED',
+                                deferrable=True),
+        sa.ForeignKeyConstraint(['descendant_id'], ['db_dbnode.id'],
+                                ondelete='CASCADE',
+                                initially='DEFERRED',
+                                deferrable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ancestor_id', 'descendant_id', name='db_dbnodeclosure_ancestor_id_descendant_id_key'),
+    )
+    op.create_index('ix_db_dbnodeclosure_descendant_id', 'db_dbnodeclosure', ['descendant_id'], unique=False)
+
+
+def downgrade():
+    """Drop the closure table and the trigger that maintains it, if it was enabled."""
+    op.execute('DROP TRIGGER IF EXISTS db_dblink_closure_trigger ON db_dblink')
+    op.execute('DROP FUNCTION IF EXISTS db_dblink_closure_insert()')
+    op.drop_index('ix_db_dbnodeclosure_descendant_id', table_name='db_dbnodeclosure')
+    op.drop_table('db_dbnodeclosure')
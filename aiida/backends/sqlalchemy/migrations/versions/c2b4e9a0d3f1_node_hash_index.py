@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name,too-few-public-methods,no-member
+"""Add an index on the node type and hash of nodes, used to look up nodes for caching
+
+Revision ID: c2b4e9a0d3f1
+Revises: e797afa09270
+Create Date: 2019-08-06 10:12:41.328501
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from alembic import op
+
+# Remove when https://github.com/PyCQA/pylint/issues/1931 is fixed
+# pylint: disable=no-name-in-module,import-error
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = 'c2b4e9a0d3f1'
+down_revision = 'e797afa09270'
+branch_labels = None
+depends_on = None
+
+# Currently valid hash key
+_HASH_EXTRA_KEY = '_aiida_hash'
+
+
+def upgrade():
+    """Create the index on the node type and hash."""
+    columns = ['node_type', text("(extras ->> '{}')".format(_HASH_EXTRA_KEY))]
+    op.create_index('db_dbnode_node_type_hash_idx', 'db_dbnode', columns)
+
+
+def downgrade():
+    """Drop the index on the node type and hash."""
+    op.drop_index('db_dbnode_node_type_hash_idx', table_name='db_dbnode')
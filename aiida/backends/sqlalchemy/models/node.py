@@ -13,7 +13,8 @@ from __future__ import absolute_import
 
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import relationship, backref
-from sqlalchemy.schema import Column
+from sqlalchemy.schema import Column, Index, UniqueConstraint
+from sqlalchemy.sql import text
 from sqlalchemy.types import Integer, String, DateTime, Text
 # Specific to PGSQL. If needed to be agnostic
 # http://docs.sqlalchemy.org/en/rel_0_9/core/custom_types.html?highlight=guid#backend-agnostic-guid-type
@@ -81,6 +82,11 @@ class DbNode(Base):
         passive_deletes=True
     )
 
+    # Index on the node type and the hash extra, used to look up nodes for caching
+    __table_args__ = (
+        Index('db_dbnode_node_type_hash_idx', 'node_type', text("(extras ->> '_aiida_hash')")),
+    )
+
     def __init__(self, *args, **kwargs):
         super(DbNode, self).__init__(*args, **kwargs)
         # The behavior of an unstored Node instance should be that all its attributes should be initialized in
@@ -189,3 +195,31 @@ class DbLink(Base):
             self.output.get_simple_name(invalid_result="Unknown node"),
             self.output.pk
         )
+
+
+class DbNodeClosure(Base):
+    """Transitive closure of the provenance graph over `create` and `input_calc` links.
+
+    The table is optional and is filled and kept up to date by a database trigger once enabled, see
+    :mod:`aiida.manage.database.closure`.
+    """
+    __tablename__ = "db_dbnodeclosure"
+
+    id = Column(Integer, primary_key=True)
+    ancestor_id = Column(
+        Integer,
+        ForeignKey('db_dbnode.id', ondelete="CASCADE", deferrable=True, initially="DEFERRED"),
+        nullable=False
+    )
+    descendant_id = Column(
+        Integer,
+        ForeignKey('db_dbnode.id', ondelete="CASCADE", deferrable=True, initially="DEFERRED"),
+        nullable=False,
+        index=True
+    )
+    # The number of links between the ancestor and the descendant on the shortest path, minus one
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('ancestor_id', 'descendant_id', name='db_dbnodeclosure_ancestor_id_descendant_id_key'),
+    )
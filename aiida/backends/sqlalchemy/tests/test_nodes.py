@@ -167,3 +167,22 @@ class TestNodeBasicSQLA(AiidaTestCase):
         self.assertEqual(len(res), 1,
                          "There should be a node in the session/DB with the "
                          "UUID {}".format(node_uuid))
+
+    def test_store_many_failure(self):
+        """
+        Test that the models of nodes that could not be stored in bulk are removed from the session of the caller
+        """
+        from sqlalchemy.exc import IntegrityError
+        from aiida.backends.sqlalchemy import get_scoped_session
+
+        session = get_scoped_session()
+        stored = Data().store()
+        node = Data()
+        node.backend_entity.dbmodel.uuid = stored.uuid
+
+        with self.assertRaises(IntegrityError):
+            with session.begin_nested():
+                node.backend.nodes.store_many([node.backend_entity], with_transaction=False)
+
+        self.assertNotIn(node.backend_entity.dbmodel, session)
+        self.assertFalse(node.is_stored)
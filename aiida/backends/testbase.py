@@ -145,6 +145,8 @@ class AiidaTestCase(unittest.TestCase):
 
         cls.__backend_instance.clean_db()
 
+        # Entities that are loaded again after the database is filled anew should not be taken from the identity map
+        get_manager().get_identity_map().clear()
         reset_manager()
 
     @classmethod
@@ -74,18 +74,21 @@ DB_TEST_LIST = {
         'cmdline.params.types.plugin': ['aiida.backends.tests.cmdline.params.types.test_plugin'],
         'cmdline.utils.common': ['aiida.backends.tests.cmdline.utils.test_common'],
         'common.archive': ['aiida.backends.tests.common.test_archive'],
+        'common.datastructures': ['aiida.backends.tests.common.test_datastructures'],
         'common.extendeddicts': ['aiida.backends.tests.common.test_extendeddicts'],
         'common.folders': ['aiida.backends.tests.common.test_folders'],
         'common.hashing': ['aiida.backends.tests.common.test_hashing'],
         'common.lang': ['aiida.backends.tests.common.test_lang'],
         'common.links': ['aiida.backends.tests.common.test_links'],
         'common.logging': ['aiida.backends.tests.common.test_logging'],
+        'common.objectstore': ['aiida.backends.tests.common.test_objectstore'],
         'common.serialize': ['aiida.backends.tests.common.test_serialize'],
         'common.timezone': ['aiida.backends.tests.common.test_timezone'],
         'common.utils': ['aiida.backends.tests.common.test_utils'],
         'dataclasses': ['aiida.backends.tests.test_dataclasses'],
         'dbimporters': ['aiida.backends.tests.test_dbimporters'],
         'engine.daemon.client': ['aiida.backends.tests.engine.daemon.test_client'],
+        'engine.daemon.execmanager': ['aiida.backends.tests.engine.daemon.test_execmanager'],
         'engine.calc_job': ['aiida.backends.tests.engine.test_calc_job'],
         'engine.calcfunctions': ['aiida.backends.tests.engine.test_calcfunctions'],
         'engine.class_loader': ['aiida.backends.tests.engine.test_class_loader'],
@@ -111,6 +114,7 @@ DB_TEST_LIST = {
         'manage.configuration.migrations.': ['aiida.backends.tests.manage.configuration.migrations.test_migrations'],
         'manage.configuration.options.': ['aiida.backends.tests.manage.configuration.test_options'],
         'manage.configuration.profile.': ['aiida.backends.tests.manage.configuration.test_profile'],
+        'manage.database.closure': ['aiida.backends.tests.manage.database.test_closure'],
         'manage.external.postgres': ['aiida.backends.tests.manage.external.test_postgres'],
         'nodes': ['aiida.backends.tests.test_nodes'],
         'orm.authinfos': ['aiida.backends.tests.orm.test_authinfos'],
@@ -135,6 +139,7 @@ DB_TEST_LIST = {
         'orm.node.node': ['aiida.backends.tests.orm.node.test_node'],
         'orm.querybuilder': ['aiida.backends.tests.orm.test_querybuilder'],
         'orm.utils.calcjob': ['aiida.backends.tests.orm.utils.test_calcjob'],
+        'orm.utils.identitymap': ['aiida.backends.tests.orm.utils.test_identitymap'],
         'orm.utils.node': ['aiida.backends.tests.orm.utils.test_node'],
         'orm.utils.loaders': ['aiida.backends.tests.orm.utils.test_loaders'],
         'orm.utils.repository': ['aiida.backends.tests.orm.utils.test_repository'],
@@ -143,6 +148,7 @@ DB_TEST_LIST = {
         'query': ['aiida.backends.tests.test_query'],
         'restapi': ['aiida.backends.tests.test_restapi'],
         'tools.data.orbital': ['aiida.backends.tests.tools.data.orbital.test_orbitals'],
+        'tools.graph.traversal': ['aiida.backends.tests.tools.graph.test_traversal'],
         'tools.importexport.complex': ['aiida.backends.tests.tools.importexport.test_complex'],
         'tools.importexport.prov_redesign': ['aiida.backends.tests.tools.importexport.test_prov_redesign'],
         'tools.importexport.simple': ['aiida.backends.tests.tools.importexport.test_simple'],
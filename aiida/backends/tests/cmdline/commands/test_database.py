@@ -149,3 +149,30 @@ class TestVerdiDatabasaIntegrity(AiidaTestCase):
         result = self.cli_runner.invoke(cmd_database.detect_invalid_nodes, [])
         self.assertNotEqual(result.exit_code, 0)
         self.assertIsNotNone(result.exception)
+
+
+class TestVerdiDatabaseRepository(AiidaTestCase):
+    """Tests for `verdi database repository`."""
+
+    def setUp(self):
+        self.cli_runner = CliRunner()
+
+    def test_pack_and_clean(self):
+        """Test that `verdi database repository pack` and `clean` pack and delete unreferenced objects."""
+        from aiida.common.objectstore import get_object_store
+
+        store = get_object_store()
+        object_hash = store.add_object(b'unreferenced')
+
+        result = self.cli_runner.invoke(cmd_database.repository_pack, [])
+        self.assertClickResultNoException(result)
+        self.assertEqual(store.get_statistics()['loose_objects'], 0)
+        self.assertTrue(store.has_object(object_hash))
+
+        result = self.cli_runner.invoke(cmd_database.repository_clean, ['--min-age', '-1'])
+        self.assertClickResultNoException(result)
+        self.assertFalse(store.has_object(object_hash))
+
+        result = self.cli_runner.invoke(cmd_database.repository_status, [])
+        self.assertClickResultNoException(result)
+        self.assertIn('packed_objects', result.output)
@@ -43,6 +43,18 @@ class TestVerdiRehash(AiidaTestCase):
         self.assertClickResultNoException(result)
         self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
 
+    def test_rehash_chunks(self):
+        """Rehashing in chunks smaller than the number of nodes should rehash all nodes and store their hashes."""
+        expected_node_count = 5
+        self.node_int.clear_hash()
+        self.assertIsNone(self.node_int.get_extra('_aiida_hash'))
+
+        options = ['--chunk-size', '2']
+        result = self.cli_runner.invoke(cmd_rehash.rehash, options)
+        self.assertClickResultNoException(result)
+        self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
+        self.assertEqual(self.node_int.get_extra('_aiida_hash'), self.node_int.get_hash())
+
     def test_rehash_bool(self):
         """Limiting the queryset by defining an entry point, in this case bool, should limit nodes to 2."""
         expected_node_count = 2
@@ -11,6 +11,7 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import click
 from click.testing import CliRunner
 
 from aiida import get_version
@@ -41,3 +42,37 @@ class TestVerdi(AiidaTestCase):
         CONFIG.dictionary[CONFIG.KEY_PROFILES] = {}
         result = self.cli_runner.invoke(cmd_verdi.verdi, [])
         self.assertIsNone(result.exception, result.output)
+
+    def test_verdi_lazy_commands(self):
+        """Verify that the lazily imported sub commands of `verdi` are listed and registered under the right name."""
+        ctx = click.Context(cmd_verdi.verdi)
+        self.assertEqual(set(cmd_verdi.verdi.list_commands(ctx)), set(cmd_verdi.VERDI_COMMANDS))
+
+        for name in cmd_verdi.VERDI_COMMANDS:
+            command = cmd_verdi.verdi.get_command(ctx, name)
+            self.assertIsInstance(command, click.Command)
+            self.assertEqual(command.name, name)
+
+    def test_verdi_lazy_commands_completion(self):
+        """Verify that listing the sub commands for shell completion does not import them, unless they are invoked."""
+        from aiida.cmdline.utils.lazy import LazyGroup
+
+        group = LazyGroup(lazy_commands={'missing': 'aiida.cmdline.commands.cmd_nonexistent'})
+
+        ctx = click.Context(group, resilient_parsing=True)
+        command = group.get_command(ctx, 'missing')
+        self.assertIsInstance(command, click.Command)
+        self.assertEqual(command.name, 'missing')
+        self.assertNotIn('missing', group.commands)
+
+        ctx = group.make_context('group', ['missing'], resilient_parsing=True)
+        with self.assertRaises(ImportError):
+            group.get_command(ctx, 'missing')
+
+    def test_devel_import_time(self):
+        """Verify that importing `verdi` does not import modules that should only be imported when they are needed."""
+        from aiida.cmdline.commands import cmd_devel
+
+        result = self.cli_runner.invoke(cmd_devel.devel_import_time, [])
+        self.assertIsNone(result.exception, result.output)
+        self.assertIn('none of the modules', result.output)
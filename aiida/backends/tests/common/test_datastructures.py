@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the common data structures."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import unittest
+
+from aiida.common.datastructures import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Tests for the `LRUCache` class."""
+
+    def test_get_set(self):
+        """Test setting and getting entries."""
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+
+        self.assertIn('a', cache)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', 2), 2)
+
+    def test_eviction(self):
+        """Test that the least recently used entry is discarded once the maximum size is exceeded."""
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        # Using `a` makes `b` the least recently used entry
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_pop_clear(self):
+        """Test removing entries."""
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertIsNone(cache.pop('a'))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_sizeof(self):
+        """Test that the total size of the entries is bounded if a `sizeof` function is given."""
+        cache = LRUCache(maxsize=10, sizeof=len)
+        cache.set('a', 'x' * 4)
+        cache.set('b', 'x' * 4)
+        self.assertEqual(cache.size, 8)
+
+        cache.set('c', 'x' * 4)
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.size, 8)
+
+        # A value that is larger than the maximum size is not kept
+        cache.set('d', 'x' * 11)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+        cache.set('a', 'x' * 2)
+        self.assertEqual(cache.pop('a'), 'xx')
+        self.assertEqual(cache.size, 0)
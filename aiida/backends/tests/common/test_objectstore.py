@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the content addressed object store."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from aiida.common.exceptions import NotExistent
+from aiida.common.folders import Folder
+from aiida.common.hashing import make_hash
+from aiida.common.objectstore import ObjectStore, ObjectTree
+
+
+class TestObjectStore(unittest.TestCase):
+    """Tests for the `ObjectStore` class."""
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.store = ObjectStore(os.path.join(self.tempdir, 'container'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_add_object(self):
+        """Objects are identified by the hash of their content and identical content is stored once."""
+        self.assertFalse(self.store.exists())
+
+        object_hash = self.store.add_object(b'content')
+        self.assertEqual(self.store.add_object(b'content'), object_hash)
+        self.assertEqual(self.store.get_hash(io.BytesIO(b'content')), object_hash)
+        self.assertTrue(self.store.has_object(object_hash))
+        self.assertEqual(self.store.get_object_content(object_hash), b'content')
+        self.assertEqual(self.store.get_statistics()['loose_objects'], 1)
+
+        with self.assertRaises(NotExistent):
+            self.store.open_object(self.store.get_hash(io.BytesIO(b'other')))
+
+    def test_pack_loose_objects(self):
+        """Packed objects can be read as before, also partially, and new pack files are started above the size."""
+        hashes = [self.store.add_object(u'object {}'.format(index).encode('utf8') * 100) for index in range(5)]
+
+        self.assertEqual(self.store.pack_loose_objects(pack_size=1000), 5)
+        self.assertEqual(self.store.pack_loose_objects(), 0)
+
+        statistics = self.store.get_statistics()
+        self.assertEqual(statistics['loose_objects'], 0)
+        self.assertEqual(statistics['packed_objects'], 5)
+        self.assertEqual(statistics['packs'], 3)
+
+        for index, object_hash in enumerate(hashes):
+            content = u'object {}'.format(index).encode('utf8') * 100
+            self.assertEqual(self.store.get_object_content(object_hash), content)
+
+            with self.store.open_object(object_hash) as handle:
+                handle.seek(10)
+                self.assertEqual(handle.read(5), content[10:15])
+
+    def test_delete_unreferenced_objects(self):
+        """Only objects that are not referenced by a manifest are deleted, and repacking reclaims their space."""
+        referenced = self.store.add_object(b'referenced')
+        unreferenced = self.store.add_object(b'unreferenced')
+        self.store.set_manifest('uuid', {'file.txt': referenced, 'empty': None})
+        self.store.pack_loose_objects()
+
+        self.assertEqual(self.store.delete_unreferenced_objects(min_age=3600), 0)
+        self.assertEqual(self.store.delete_unreferenced_objects(min_age=-1), 1)
+        self.assertFalse(self.store.has_object(unreferenced))
+
+        self.assertEqual(self.store.repack(), len(b'unreferenced'))
+        self.assertEqual(self.store.get_object_content(referenced), b'referenced')
+
+        self.store.delete_manifest('uuid')
+        self.assertIsNone(self.store.get_manifest('uuid'))
+        self.assertEqual(self.store.delete_unreferenced_objects(min_age=-1), 1)
+        self.assertEqual(self.store.get_statistics()['packed_objects'], 0)
+
+        # A pack that no longer contains any object is removed altogether
+        self.assertEqual(self.store.repack(), len(b'referenced'))
+        self.assertEqual(self.store.get_statistics()['packs'], 0)
+
+    def test_add_objects_from_directory(self):
+        """The manifest of a directory maps its files onto their objects and includes its empty directories."""
+        folder = Folder(os.path.join(self.tempdir, 'folder'))
+        folder.get_subfolder('empty', create=True)
+        folder.get_subfolder('sub', create=True).create_file_from_filelike(io.BytesIO(b'b'), 'b.txt', mode='wb')
+        folder.create_file_from_filelike(io.BytesIO(b'a'), 'a.txt', mode='wb')
+
+        manifest = self.store.add_objects_from_directory(folder.abspath)
+        self.assertEqual(sorted(manifest.keys()), ['a.txt', 'empty', os.path.join('sub', 'b.txt')])
+        self.assertIsNone(manifest['empty'])
+        self.assertEqual(self.store.get_object_content(manifest['a.txt']), b'a')
+
+        self.store.set_manifest('uuid', manifest)
+        self.assertEqual(self.store.get_manifest('uuid'), manifest)
+
+        # The hash of the tree does not depend on whether it is computed from the folder or the manifest
+        self.assertEqual(make_hash(ObjectTree(manifest)), make_hash(ObjectTree.from_folder(folder)))
+        self.assertEqual(ObjectTree(manifest).tree['empty'], {})
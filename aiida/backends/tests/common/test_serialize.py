@@ -123,3 +123,38 @@ class TestSerialize(AiidaTestCase):
         deserialized = serialize.deserialize(serialized)
 
         self.assertEqual(attribute_dict, deserialized)
+
+    def test_serialize_json_round_trip(self):
+        """Test the JSON serialization of a data structure with nodes, groups, computers and tuples."""
+        from aiida.common.extendeddicts import AttributeDict
+
+        node = orm.Data().store()
+        group = orm.Group(label='test_serialize_json_round_trip').store()
+
+        data = {
+            'node': node,
+            'group': group,
+            'computer': self.computer,
+            'tuple': (1, 'a', [2.5, None]),
+            'attribute_dict': AttributeDict({'value': True}),
+        }
+
+        deserialized = serialize.deserialize_json(serialize.serialize_json(data))
+
+        self.assertEqual(deserialized['node'].uuid, node.uuid)
+        self.assertEqual(deserialized['group'].uuid, group.uuid)
+        self.assertEqual(deserialized['computer'].uuid, self.computer.uuid)  # pylint: disable=no-member
+        self.assertEqual(deserialized['tuple'], (1, 'a', [2.5, None]))
+        self.assertIsInstance(deserialized['attribute_dict'], AttributeDict)
+        self.assertEqual(deserialized['attribute_dict'], data['attribute_dict'])
+
+    def test_serialize_json_unsupported(self):
+        """Test that the JSON serialization raises `TypeError` for data structures it cannot represent."""
+        with self.assertRaises(TypeError):
+            serialize.serialize_json({('Si',): 1})
+
+        with self.assertRaises(TypeError):
+            serialize.serialize_json({'set': set([1, 2])})
+
+        with self.assertRaises(ValueError):
+            serialize.serialize_json(orm.Data())
@@ -159,6 +159,16 @@ class UniqueTest(unittest.TestCase):
             self.assertEqual(backup_utils.ask_question(question, int, True), None)
 
 
+class IterSortedBatchesTest(unittest.TestCase):
+    """Tests for the iter_sorted_batches function."""
+
+    def test_iter_sorted_batches(self):
+        """Test that the values are sorted and split in batches of at most the given size."""
+        self.assertEqual(list(utils.iter_sorted_batches({5, 3, 1, 4, 2}, 2)), [[1, 2], [3, 4], [5]])
+        self.assertEqual(list(utils.iter_sorted_batches([2, 1], 2)), [[1, 2]])
+        self.assertEqual(list(utils.iter_sorted_batches([], 2)), [])
+
+
 class PrettifierTest(unittest.TestCase):
     """
     Tests for the Prettifier class methods.
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the bulk upload and retrieval of files in `aiida.engine.daemon.execmanager`."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+
+import mock
+
+from aiida import orm
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.folders import SandboxFolder
+from aiida.common.utils import get_new_uuid
+from aiida.engine.daemon import execmanager
+from aiida.transports.plugins.local import LocalTransport
+
+
+class TestUploadAsArchive(AiidaTestCase):
+    """Tests for `_upload_as_archive` with the local transport."""
+
+    def setUp(self):
+        super(TestUploadAsArchive, self).setUp()
+        self.workdir = tempfile.mkdtemp()
+        self.sourcedir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+        shutil.rmtree(self.sourcedir)
+        super(TestUploadAsArchive, self).tearDown()
+
+    def write_source(self, name, content):
+        """Write a file with the given content in the source directory and return its absolute path."""
+        path = os.path.join(self.sourcedir, name)
+        with io.open(path, 'w', encoding='utf8') as handle:
+            handle.write(content)
+        return path
+
+    def test_upload_as_archive(self):
+        """Test that the code files, raw input folder and local copy list end up in the working directory."""
+        code = orm.Code(
+            local_executable='run.sh', files=[self.write_source('run.sh', u'#!/bin/bash'),
+                                              self.write_source('aux.txt', u'aux')])
+        os.mkdir(os.path.join(self.sourcedir, 'lib'))
+        self.write_source(os.path.join('lib', 'module.py'), u'module')
+        code.put_object_from_tree(os.path.join(self.sourcedir, 'lib'), 'lib')
+        code.store()
+        single = orm.SinglefileData(file=self.write_source('single.txt', u'single')).store()
+        node = orm.CalculationNode().store()
+
+        with SandboxFolder() as folder:
+            folder.create_file_from_filelike(io.BytesIO(b'input'), 'input.txt')
+            folder.get_subfolder('sub', create=True).create_file_from_filelike(io.BytesIO(b'nested'), 'nested.txt')
+
+            with LocalTransport() as transport:
+                transport.chdir(self.workdir)
+                uploaded = execmanager._upload_as_archive(  # pylint: disable=protected-access
+                    node, transport, [code], folder, [(single.uuid, 'single.txt', 'copied.txt')],
+                    execmanager.execlogger)
+
+        self.assertTrue(uploaded)
+        self.assertEqual(
+            sorted(os.listdir(self.workdir)), ['aux.txt', 'copied.txt', 'input.txt', 'lib', 'run.sh', 'sub'])
+
+        for name, content in [('input.txt', 'input'), (os.path.join('sub', 'nested.txt'), 'nested'),
+                              ('copied.txt', 'single'), ('aux.txt', 'aux'), ('run.sh', '#!/bin/bash'),
+                              (os.path.join('lib', 'module.py'), 'module')]:
+            with io.open(os.path.join(self.workdir, name), encoding='utf8') as handle:
+                self.assertEqual(handle.read(), content)
+
+        self.assertTrue(os.stat(os.path.join(self.workdir, 'run.sh')).st_mode & stat.S_IXUSR)
+        self.assertFalse(os.stat(os.path.join(self.workdir, 'aux.txt')).st_mode & stat.S_IXUSR)
+
+    def test_upload_as_archive_failure(self):
+        """Test that a failure to unpack the archive is reported and removes it, and that it has no duplicates."""
+        code = orm.Code(local_executable='run.sh', files=[self.write_source('run.sh', u'#!/bin/bash')]).store()
+        node = orm.CalculationNode().store()
+        archive_path = os.path.join(self.sourcedir, 'archive.tar.gz')
+
+        with SandboxFolder() as folder:
+            folder.create_file_from_filelike(io.BytesIO(b'input'), 'input.txt')
+
+            with LocalTransport() as transport:
+                transport.chdir(self.workdir)
+                put = transport.put
+
+                def put_and_keep(localpath, remotepath, *args, **kwargs):
+                    shutil.copyfile(localpath, archive_path)
+                    return put(localpath, remotepath, *args, **kwargs)
+
+                with mock.patch.object(transport, 'put', side_effect=put_and_keep), \
+                        mock.patch.object(transport, 'exec_command_wait', return_value=(2, '', 'tar: error')):
+                    uploaded = execmanager._upload_as_archive(  # pylint: disable=protected-access
+                        node, transport, [code], folder, [], execmanager.execlogger)
+
+        self.assertFalse(uploaded)
+        self.assertEqual(os.listdir(self.workdir), [])
+
+        with tarfile.open(archive_path, mode='r:gz') as archive:
+            self.assertEqual(sorted(archive.getnames()), ['input.txt', 'run.sh'])
+
+    def test_upload_as_archive_missing_node(self):
+        """Test that the files are uploaded individually if a node of the local copy list cannot be packed."""
+        node = orm.CalculationNode().store()
+        missing_uuid = get_new_uuid()
+
+        with SandboxFolder() as folder:
+            folder.create_file_from_filelike(io.BytesIO(b'input'), 'input.txt')
+
+            with LocalTransport() as transport:
+                transport.chdir(self.workdir)
+                with mock.patch.object(transport, 'put') as put:
+                    uploaded = execmanager._upload_as_archive(  # pylint: disable=protected-access
+                        node, transport, [], folder, [(missing_uuid, 'file.txt', 'file.txt')],
+                        execmanager.execlogger)
+
+        self.assertFalse(uploaded)
+        self.assertFalse(put.called)
+
+
+class TestRetrieveAsArchive(AiidaTestCase):
+    """Tests for `_retrieve_as_archive` with the local transport."""
+
+    def setUp(self):
+        super(TestRetrieveAsArchive, self).setUp()
+        self.workdir = tempfile.mkdtemp()
+        self.localdir = tempfile.mkdtemp()
+        self.node = orm.CalculationNode().store()
+
+        os.makedirs(os.path.join(self.workdir, 'folder', 'sub'))
+        for name in ['file.txt', os.path.join('folder', 'nested.txt'), os.path.join('folder', 'sub', 'deep.txt')]:
+            with io.open(os.path.join(self.workdir, name), 'w', encoding='utf8') as handle:
+                handle.write(os.path.basename(name))
+
+        os.symlink('file.txt', os.path.join(self.workdir, 'link.txt'))
+        os.symlink('nested.txt', os.path.join(self.workdir, 'folder', 'link.txt'))
+        os.symlink('nonexistent.txt', os.path.join(self.workdir, 'folder', 'dangling.txt'))
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+        shutil.rmtree(self.localdir)
+        super(TestRetrieveAsArchive, self).tearDown()
+
+    def read_local(self, name):
+        """Return the content of the retrieved file with the given name."""
+        with io.open(os.path.join(self.localdir, name), encoding='utf8') as handle:
+            return handle.read()
+
+    def test_retrieve_as_archive(self):
+        """Test that files and folders are retrieved, following symbolic links, and missing items are returned."""
+        pairs = [('file.txt', 'file.txt'), ('folder', 'folder'), ('link.txt', 'copied.txt'),
+                 ('missing.txt', 'missing.txt'), ('-dash.txt', 'dash.txt')]
+
+        with LocalTransport() as transport:
+            transport.chdir(self.workdir)
+            remaining = execmanager._retrieve_as_archive(  # pylint: disable=protected-access
+                self.node, transport, self.localdir, pairs)
+
+        self.assertEqual(sorted(remaining), [('-dash.txt', 'dash.txt'), ('missing.txt', 'missing.txt')])
+        self.assertNotIn(execmanager.REMOTE_RETRIEVE_ARCHIVE_NAME, os.listdir(self.workdir))
+
+        self.assertEqual(self.read_local('file.txt'), 'file.txt')
+        self.assertEqual(self.read_local('copied.txt'), 'file.txt')
+        self.assertEqual(self.read_local(os.path.join('folder', 'nested.txt')), 'nested.txt')
+        self.assertEqual(self.read_local(os.path.join('folder', 'link.txt')), 'nested.txt')
+        self.assertEqual(self.read_local(os.path.join('folder', 'sub', 'deep.txt')), 'deep.txt')
+        self.assertFalse(os.path.islink(os.path.join(self.localdir, 'copied.txt')))
+        self.assertFalse(os.path.lexists(os.path.join(self.localdir, 'folder', 'dangling.txt')))
+
+    def test_retrieve_as_archive_failure(self):
+        """Test that all items are returned to be retrieved individually if the archive cannot be created."""
+        pairs = [('file.txt', 'file.txt'), ('folder', 'folder')]
+
+        with LocalTransport() as transport:
+            transport.chdir(self.workdir)
+            with mock.patch.object(transport, 'exec_command_wait', return_value=(127, '', 'tar: not found')):
+                remaining = execmanager._retrieve_as_archive(  # pylint: disable=protected-access
+                    self.node, transport, self.localdir, pairs)
+
+        self.assertEqual(remaining, pairs)
+        self.assertEqual(os.listdir(self.localdir), [])
@@ -18,6 +18,7 @@ from tornado import gen
 from aiida.backends.testbase import AiidaTestCase
 from aiida.backends.tests.utils import processes as test_processes
 from aiida.engine import processes, run
+from aiida.manage.external.pgnotify import ProcessTerminationNotifier
 from aiida.manage.manager import get_manager
 
 
@@ -49,3 +50,41 @@ class TestWf(AiidaTestCase):
         calc_node = runner.run_until_complete(gen.with_timeout(self.TIMEOUT, future))
 
         self.assertEqual(process.node.pk, calc_node.pk)
+
+    def test_calculation_future_notifications(self):
+        runner = get_manager().get_runner()
+        process = test_processes.DummyProcess()
+        notifier = ProcessTerminationNotifier(runner.loop)
+
+        try:
+            # No polling and no communicator
+            future = processes.futures.CalculationFuture(pk=process.pid, loop=runner.loop, notifier=notifier)
+
+            runner.run(process)
+            notifier.notify(process.pid)
+            calc_node = runner.run_until_complete(gen.with_timeout(self.TIMEOUT, future))
+        finally:
+            notifier.close()
+
+        self.assertEqual(process.node.pk, calc_node.pk)
+
+    def test_calculation_future_notifications_reconnect(self):
+        """Test that the notifier listens again when sending a notification over a connection that has dropped."""
+        runner = get_manager().get_runner()
+        process = test_processes.DummyProcess()
+        notifier = ProcessTerminationNotifier(runner.loop)
+
+        try:
+            future = processes.futures.CalculationFuture(pk=process.pid, loop=runner.loop, notifier=notifier)
+
+            # Simulate the listening connection dropping while the process is running
+            notifier._connection.close()  # pylint: disable=protected-access
+
+            runner.run(process)
+            notifier.notify(process.pid)
+            calc_node = runner.run_until_complete(gen.with_timeout(self.TIMEOUT, future))
+            self.assertTrue(notifier._listening)  # pylint: disable=protected-access
+        finally:
+            notifier.close()
+
+        self.assertEqual(process.node.pk, calc_node.pk)
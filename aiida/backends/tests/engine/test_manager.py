@@ -12,13 +12,16 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import os
+import shutil
+import tempfile
 import time
 
 import tornado
 
 from aiida.orm import AuthInfo, User
 from aiida.backends.testbase import AiidaTestCase
-from aiida.engine.processes.calcjobs.manager import JobManager, JobsList
+from aiida.engine.processes.calcjobs.manager import JobManager, JobsList, SharedJobsCache
 from aiida.engine.transports import TransportQueue
 
 
@@ -79,3 +82,82 @@ class TestJobsList(AiidaTestCase):
         last_updated = time.time()
         jobs_list = JobsList(self.auth_info, self.transport_queue, last_updated=last_updated)
         self.assertEqual(jobs_list.last_updated, last_updated)
+
+    def test_update_interval(self):
+        """Test that the update interval backs off when the requested jobs do not change state."""
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        job_info = JobInfo()
+        job_info.job_id = '1'
+        job_info.job_state = JobState.RUNNING
+
+        jobs_list = JobsList(self.auth_info, self.transport_queue)
+        with jobs_list.request_job_info_update('1'):
+            self.assertEqual(jobs_list.update_interval_factor, 1)
+
+            # The job was not known before, so this counts as a change
+            jobs_list._update_interval({}, {'1': job_info})  # pylint: disable=protected-access
+            self.assertEqual(jobs_list.update_interval_factor, 1)
+
+            for factor in [2, 4, JobsList.MAXIMUM_UPDATE_INTERVAL_FACTOR]:
+                jobs_list._update_interval({'1': job_info}, {'1': job_info})  # pylint: disable=protected-access
+                self.assertEqual(jobs_list.update_interval_factor, factor)
+
+            # The job disappearing from the scheduler is a change and should reset the interval
+            jobs_list._update_interval({'1': job_info}, {})  # pylint: disable=protected-access
+            self.assertEqual(jobs_list.update_interval_factor, 1)
+
+
+class TestSharedJobsCache(AiidaTestCase):
+    """Test the `aiida.engine.processes.calcjobs.manager.SharedJobsCache` class."""
+
+    def setUp(self):
+        super(TestSharedJobsCache, self).setUp()
+        self.dirpath = tempfile.mkdtemp()
+        self.cache = SharedJobsCache(os.path.join(self.dirpath, 'jobs', 'authinfo.json'))
+
+    def tearDown(self):
+        super(TestSharedJobsCache, self).tearDown()
+        shutil.rmtree(self.dirpath)
+
+    def test_get_set(self):
+        """Test that a response that is set can be retrieved only if recent enough and containing all jobs."""
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        job_info = JobInfo()
+        job_info.job_id = '1'
+        job_info.job_state = JobState.RUNNING
+
+        self.assertIsNone(self.cache.get(['1'], max_age=10))
+        self.assertEqual(self.cache.get_active_job_ids(), [])
+
+        timestamp = time.time()
+        self.cache.set(timestamp, ['1', '2'], {'1': job_info})
+
+        cached_timestamp, jobs = self.cache.get(['1', '2'], max_age=10)
+        self.assertEqual(cached_timestamp, timestamp)
+        self.assertEqual(list(jobs.keys()), ['1'])
+        self.assertEqual(jobs['1'].job_state, JobState.RUNNING)
+        self.assertEqual(self.cache.get_active_job_ids(), ['1'])
+
+        # A job that was not queried is not covered by the cached response
+        self.assertIsNone(self.cache.get(['3'], max_age=10))
+
+        # A response that is too old should not be returned
+        self.cache.set(timestamp - 20, ['1', '2'], {'1': job_info})
+        self.assertIsNone(self.cache.get(['1'], max_age=10))
+
+        # A response of all the jobs of the user covers any job
+        self.cache.set(timestamp, None, {'1': job_info})
+        self.assertIsNotNone(self.cache.get(['3'], max_age=10))
+
+    def test_get_requested_after(self):
+        """Test that a response obtained before the jobs were requested is not returned.
+
+        Otherwise a job submitted after the response was obtained would be missing from it and seem to have finished.
+        """
+        timestamp = time.time()
+        self.cache.set(timestamp, None, {})
+
+        self.assertIsNotNone(self.cache.get(['1'], max_age=10, requested_after=timestamp - 1))
+        self.assertIsNone(self.cache.get(['1'], max_age=10, requested_after=timestamp + 1))
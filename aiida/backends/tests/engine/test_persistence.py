@@ -16,7 +16,7 @@ import plumpy
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.backends.tests.utils.processes import DummyProcess
-from aiida.engine.persistence import AiiDAPersister
+from aiida.engine.persistence import AiiDAPersister, CHECKPOINT_CODECS, encode_checkpoint, decode_checkpoint
 from aiida.engine import Process, run
 
 
@@ -65,3 +65,25 @@ class TestAiiDAPersister(AiidaTestCase):
 
         self.persister.delete_checkpoint(process.pid)
         self.assertEquals(process.node.checkpoint, None)
+
+    def test_save_load_checkpoint_codecs(self):
+        """Test that checkpoints written with any codec can be loaded, regardless of the codec of the persister."""
+        for codec in CHECKPOINT_CODECS:
+            process = DummyProcess()
+            bundle_saved = AiiDAPersister(codec=codec).save_checkpoint(process)
+            bundle_loaded = self.persister.load_checkpoint(process.node.pk)
+
+            self.assertDictEqual(bundle_saved, bundle_loaded)
+
+    def test_encode_checkpoint_fallback(self):
+        """Test that a bundle that cannot be represented in JSON falls back to the YAML codec."""
+        bundle = {('tuple', 'key'): 'value'}
+
+        for codec in CHECKPOINT_CODECS:
+            checkpoint = encode_checkpoint(bundle, codec)
+            self.assertEqual(decode_checkpoint(checkpoint), bundle)
+
+    def test_invalid_codec(self):
+        """Test that an invalid codec raises."""
+        with self.assertRaises(ValueError):
+            AiiDAPersister(codec='invalid')
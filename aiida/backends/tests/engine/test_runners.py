@@ -11,10 +11,11 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import mock
 import plumpy
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.engine import Process
+from aiida.engine import Process, runners
 from aiida.manage.manager import get_manager
 from aiida.orm import WorkflowNode
 
@@ -58,6 +59,30 @@ class TestWorkchain(AiidaTestCase):
 
         self.assertTrue(future.result())
 
+    def test_call_on_calculation_finish_notifications(self):
+        """Test that the termination of a process that is not notified is still noticed by polling."""
+        loop = self.runner.loop
+        runner = runners.Runner(loop=loop, process_notifications=True)
+        # The process runs in a runner without notifications, so its termination is never notified
+        proc = Proc(runner=self.runner)
+        future = plumpy.Future()
+
+        def calc_done(pk):
+            self.assertEqual(pk, proc.node.pk)
+            loop.stop()
+            future.set_result(True)
+
+        try:
+            with mock.patch.object(runners, 'NOTIFICATION_POLL_INTERVAL', 0):
+                runner.call_on_calculation_finish(proc.node.pk, calc_done)
+
+            self.runner.loop.add_callback(proc.step_until_terminated)
+            self._run_loop_for(5.)
+        finally:
+            runner.notifier.close()
+
+        self.assertTrue(future.result())
+
     def _run_loop_for(self, seconds):
         loop = self.runner.loop
         loop.call_later(seconds, the_hans_klok_comeback, self.runner.loop)
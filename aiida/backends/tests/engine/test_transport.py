@@ -143,3 +143,48 @@ class TestTransportQueue(AiidaTestCase):
 
         finally:
             transport_class._DEFAULT_SAFE_OPEN_INTERVAL = original_interval
+
+    def test_idle_timeout(self):
+        """Verify that with an idle timeout the transport is kept open and reused by subsequent requests."""
+        from tornado.gen import sleep
+
+        queue = TransportQueue(idle_timeout=0.2)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans1 = yield request
+
+            self.assertTrue(trans1.is_open)
+
+            with queue.request_transport(self.authinfo) as request:
+                trans2 = yield request
+                self.assertIs(trans1, trans2)
+
+            yield sleep(0.4)
+            self.assertFalse(trans2.is_open)
+
+        loop.run_sync(lambda: test())
+
+    def test_idle_timeout_closed_transport(self):
+        """Verify that a kept alive transport that got closed in the meantime is not reused."""
+        queue = TransportQueue(idle_timeout=10)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans1 = yield request
+
+            trans1.close()
+
+            with queue.request_transport(self.authinfo) as request:
+                trans2 = yield request
+                self.assertIsNot(trans1, trans2)
+                self.assertTrue(trans2.is_open)
+
+            queue.close()
+            self.assertFalse(trans2.is_open)
+
+        loop.run_sync(lambda: test())
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the transitive closure table of the provenance graph."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from aiida import orm
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.exceptions import InvalidOperation
+from aiida.common.links import LinkType
+from aiida.manage.database import closure
+
+
+class TestClosureTable(AiidaTestCase):
+    """Tests for the transitive closure table of the provenance graph."""
+
+    def setUp(self):
+        super(TestClosureTable, self).setUp()
+        self.session = orm.QueryBuilder()._impl.get_session()  # pylint: disable=protected-access
+
+    def tearDown(self):
+        closure.disable_closure_table()
+        super(TestClosureTable, self).tearDown()
+
+    def get_closure(self):
+        """Return the rows of the closure table as a set of tuples of ancestor, descendant and depth."""
+        from sqlalchemy.sql import text
+        return set(self.session.execute(text('SELECT ancestor_id, descendant_id, depth FROM db_dbnodeclosure')))
+
+    @staticmethod
+    def create_calculation(inputs, outputs=1):
+        """Create a calculation with the given inputs and return it with the given number of created outputs."""
+        calculation = orm.CalculationNode()
+        for index, node in enumerate(inputs):
+            calculation.add_incoming(node, link_type=LinkType.INPUT_CALC, link_label='input_{}'.format(index))
+        calculation.store()
+
+        created = []
+        for index in range(outputs):
+            data = orm.Data()
+            data.add_incoming(calculation, link_type=LinkType.CREATE, link_label='output_{}'.format(index))
+            created.append(data.store())
+
+        return calculation, created
+
+    @staticmethod
+    def get_descendants(node, **kwargs):
+        """Return the pks of the descendants of the given node queried with the `QueryBuilder`."""
+        builder = orm.QueryBuilder().append(orm.Node, filters={'id': node.pk}, tag='origin')
+        builder.append(orm.Node, with_ancestors='origin', project='id', **kwargs)
+        return sorted(pk for pk, in builder.all())
+
+    @staticmethod
+    def get_ancestors(node, **kwargs):
+        """Return the pks of the ancestors of the given node queried with the `QueryBuilder`."""
+        builder = orm.QueryBuilder().append(orm.Node, filters={'id': node.pk}, tag='origin')
+        builder.append(orm.Node, with_descendants='origin', project='id', **kwargs)
+        return sorted(pk for pk, in builder.all())
+
+    def test_enable_disable(self):
+        """Test that the table is filled when enabled, maintained when links are added and emptied when disabled."""
+        data = orm.Data().store()
+        calc_a, (data_a,) = self.create_calculation([data])
+
+        self.assertFalse(closure.is_closure_table_enabled())
+        self.assertEqual(self.get_closure(), set())
+
+        with self.assertRaises(InvalidOperation):
+            closure.rebuild_closure_table()
+
+        self.assertEqual(closure.enable_closure_table(), 3)
+        self.assertTrue(closure.is_closure_table_enabled())
+        self.assertEqual(self.get_closure(), {(data.pk, calc_a.pk, 0), (data.pk, data_a.pk, 1),
+                                              (calc_a.pk, data_a.pk, 0)})
+
+        # Links that are added while enabled are added to the closure, with the depth of the shortest path
+        calc_b, (data_b,) = self.create_calculation([data_a, data])
+        expected = {
+            (data.pk, calc_a.pk, 0), (data.pk, data_a.pk, 1), (calc_a.pk, data_a.pk, 0),
+            (data.pk, calc_b.pk, 0), (data.pk, data_b.pk, 1), (calc_a.pk, calc_b.pk, 1), (calc_a.pk, data_b.pk, 2),
+            (data_a.pk, calc_b.pk, 0), (data_a.pk, data_b.pk, 1), (calc_b.pk, data_b.pk, 0)
+        }
+        self.assertEqual(self.get_closure(), expected)
+
+        # Links of other types are not part of the closure
+        workflow = orm.WorkflowNode()
+        workflow.add_incoming(data_b, link_type=LinkType.INPUT_WORK, link_label='input')
+        workflow.store()
+        self.assertEqual(self.get_closure(), expected)
+
+        self.assertEqual(closure.rebuild_closure_table(), len(expected))
+        self.assertEqual(self.get_closure(), expected)
+
+        closure.disable_closure_table()
+        self.assertFalse(closure.is_closure_table_enabled())
+        self.assertEqual(self.get_closure(), set())
+
+    def test_querybuilder(self):
+        """Test that the `QueryBuilder` gives the same results with and without the closure table."""
+        data = orm.Data().store()
+        _, (data_a, data_b) = self.create_calculation([data], outputs=2)
+        _, (data_c,) = self.create_calculation([data_a, data_b])
+        _, (data_d,) = self.create_calculation([data_c, data])
+
+        queries = [
+            (self.get_descendants, data, {}),
+            (self.get_descendants, data, {'max_depth': 2}),
+            (self.get_descendants, data_a, {}),
+            (self.get_ancestors, data_d, {}),
+            (self.get_ancestors, data_d, {'max_depth': 3}),
+            (self.get_ancestors, data_c, {'link_types': LinkType.CREATE}),
+        ]
+
+        expected = [function(node, **kwargs) for function, node, kwargs in queries]
+
+        closure.enable_closure_table()
+
+        for (function, node, kwargs), result in zip(queries, expected):
+            self.assertEqual(function(node, **kwargs), result)
+
+        # Nodes that are reachable through multiple paths are only returned once
+        self.assertEqual(self.get_descendants(data).count(data_d.pk), 1)
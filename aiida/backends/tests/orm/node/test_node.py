@@ -13,12 +13,14 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import io
 import os
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.common import exceptions, LinkType
-from aiida.orm import Data, Node, User, CalculationNode, WorkflowNode, load_node
-from aiida.orm.utils.links import LinkTriple
+from aiida.common.utils import get_new_uuid
+from aiida.orm import Data, Dict, Node, User, CalculationNode, WorkflowNode, load_node, store_many
+from aiida.orm.utils.links import LinkTriple, get_links
 
 
 class TestNode(AiidaTestCase):
@@ -47,6 +49,55 @@ class TestNode(AiidaTestCase):
         with self.assertRaises(exceptions.ModificationNotAllowed):
             node.user = self.user
 
+    def test_get_same_node(self):
+        """Test looking up a stored node with the same hash, also after its hash changed."""
+        content = {'uuid': get_new_uuid()}
+        stored = Dict(dict=content).store()
+
+        self.assertEqual(Dict(dict=content)._get_same_node().pk, stored.pk)  # pylint: disable=protected-access
+        self.assertEqual([node.pk for node in stored.get_all_same_nodes()], [stored.pk])
+
+        # The previous lookup should not be returned once the hash of the stored node changed
+        stored.clear_hash()
+        self.assertIsNone(Dict(dict=content)._get_same_node())  # pylint: disable=protected-access
+
+        stored.rehash()
+        self.assertEqual(Dict(dict=content)._get_same_node().pk, stored.pk)  # pylint: disable=protected-access
+
+    def test_store_many(self):
+        """Test storing many nodes and their incoming links at once."""
+        calculation = CalculationNode().store()
+        stored = Data().store()
+        nodes = [Dict(dict={'index': index}) for index in range(5)]
+        nodes[0].add_incoming(calculation, LinkType.CREATE, 'result')
+        nodes[1].put_object_from_filelike(io.StringIO(u'content'), 'file.txt')
+
+        self.assertEqual(store_many(nodes + [stored]), nodes + [stored])
+
+        for index, node in enumerate(nodes):
+            self.assertTrue(node.is_stored)
+            loaded = load_node(node.pk)
+            self.assertEqual(loaded.get_dict(), {'index': index})
+            self.assertEqual(loaded.get_hash(), node.get_hash())
+            self.assertEqual(loaded.get_extra('_aiida_hash'), node.get_hash())
+
+        self.assertEqual(len(set(node.pk for node in nodes)), len(nodes))
+        self.assertEqual(load_node(nodes[0].pk).get_incoming().one().node.pk, calculation.pk)
+        self.assertEqual(load_node(nodes[1].pk).get_object_content('file.txt'), 'content')
+
+    def test_store_many_invalid(self):
+        """Test that `store_many` only accepts data nodes whose sources are stored and leaves the nodes unstored."""
+        with self.assertRaises(TypeError):
+            store_many([Data(), CalculationNode()])
+
+        node = Data()
+        node.add_incoming(CalculationNode(), LinkType.CREATE, 'result')
+
+        with self.assertRaises(exceptions.ModificationNotAllowed):
+            store_many([Data(), node])
+
+        self.assertFalse(node.is_stored)
+
 
 class TestNodeAttributesExtras(AiidaTestCase):
     """Test for node attributes and extras."""
@@ -209,6 +260,28 @@ class TestNodeAttributesExtras(AiidaTestCase):
         self.node.set_attribute_many(attributes)
         self.assertEqual(set(self.node.attributes_keys()), set(attributes))
 
+    def test_attributes_loaded_per_key(self):
+        """Test that the attributes of a loaded node are selected per key and match the complete attributes."""
+        from aiida.orm import QueryBuilder
+
+        attributes = {'small': 1, 'null': None, 'large': list(range(10000)), 'nested': {'a': [1, 2]}}
+        self.node.set_attribute_many(attributes)
+        self.node.store()
+
+        builder = QueryBuilder().append(Data, filters={'id': self.node.pk}, project='*')
+        for loaded in [load_node(self.node.pk), builder.one()[0]]:
+            self.assertEqual(loaded.get_attribute('small'), 1)
+            self.assertIsNone(loaded.get_attribute('null'))
+            self.assertEqual(loaded.get_attribute_many(['nested', 'small']), [{'a': [1, 2]}, 1])
+            self.assertEqual(set(loaded.attributes_keys()), set(attributes))
+            self.assertEqual(loaded.attributes, attributes)
+
+            with self.assertRaises(AttributeError):
+                loaded.get_attribute('not_existing')
+
+            with self.assertRaises(AttributeError):
+                loaded.get_attribute_many(['small', 'not_existing'])
+
     def test_extras(self):
         """Test the `Node.extras` property."""
         original_extra = {'nested': {'a': 1}}
@@ -565,6 +638,71 @@ class TestNodeLinks(AiidaTestCase):
         incoming_uuids = sorted([neighbor.node.uuid for neighbor in incoming_nodes])
         self.assertEqual(incoming_uuids, sorted([source_one.uuid, source_two.uuid]))
 
+    def test_get_links(self):
+        """Test that `get_links` returns the same links for many nodes as `get_incoming` and `get_outgoing`."""
+        data = Data().store()
+        calculations = []
+        for index in range(3):
+            calculation = CalculationNode()
+            calculation.add_incoming(data, LinkType.INPUT_CALC, 'input')
+            calculation.store()
+            output = Data()
+            output.add_incoming(calculation, LinkType.CREATE, 'output_{}'.format(index))
+            output.store()
+            calculations.append(calculation)
+
+        unstored = CalculationNode()
+        unstored.add_incoming(data, LinkType.INPUT_CALC, 'input')
+        nodes = calculations + [unstored]
+
+        links = get_links(nodes, 'incoming')
+        self.assertEqual(list(links), nodes)
+        for node in nodes:
+            self.assertEqual(links[node].all_link_labels(), ['input'])
+            self.assertEqual(links[node].one().node.uuid, data.uuid)
+
+        # Neighbors that are shared by multiple nodes are loaded only once
+        self.assertEqual(len(set(id(links[node].one().node) for node in calculations)), 1)
+
+        links = get_links(nodes, 'outgoing', link_type=LinkType.CREATE, link_label_filter='output_%')
+        for node in calculations:
+            self.assertEqual(links[node].all_link_labels(), node.get_outgoing().all_link_labels())
+        self.assertEqual(links[unstored].all(), [])
+
+        self.assertEqual(len(get_links(nodes, 'outgoing', link_type=LinkType.RETURN)[calculations[0]].all()), 0)
+        self.assertEqual(len(get_links(nodes, 'outgoing', node_class=CalculationNode)[calculations[0]].all()), 0)
+
+        with self.assertRaises(ValueError):
+            get_links(nodes, 'sideways')
+
+    def test_get_links_cache(self):
+        """Test that `get_links` can cache the links on the nodes, and that the cache is cleared when adding links."""
+        data = Data().store()
+        calculation = CalculationNode()
+        calculation.add_incoming(data, LinkType.INPUT_CALC, 'input')
+        calculation.store()
+
+        links = get_links([calculation], 'outgoing', link_type=LinkType.CREATE, cache=True)
+        self.assertEqual(links[calculation].all(), [])
+
+        # Links added in any other way than through the cached instance are not seen
+        output = Data()
+        output.add_incoming(load_node(calculation.pk), LinkType.CREATE, 'output')
+        output.store()
+        self.assertEqual(calculation.get_outgoing().all(), [])
+
+        # The cache of the source instance is cleared when a link is stored through it
+        output = Data()
+        output.add_incoming(calculation, LinkType.CREATE, 'other')
+        output.store()
+        self.assertEqual(sorted(calculation.get_outgoing().all_link_labels()), ['other', 'output'])
+
+        get_links([calculation, data], 'incoming', cache=True)
+        self.assertEqual(calculation.get_incoming(link_type=LinkType.INPUT_CALC).all_link_labels(), ['input'])
+        self.assertEqual(calculation.get_incoming(node_class=CalculationNode).all(), [])
+        self.assertEqual(calculation.get_incoming(link_label_filter='in%').all_link_labels(), ['input'])
+        self.assertEqual(data.get_incoming().all(), [])
+
     def test_node_indegree_unique_pair(self):
         """Test that the validation of links with indegree `unique_pair` works correctly
 
@@ -254,6 +254,45 @@ class TestBackendLog(AiidaTestCase):
         self.assertEqual(logs[0].message, message)
         self.assertEqual(logs[1].message, message2)
 
+    def test_buffered_db_log_handler(self):
+        """Verify that the buffered db log handler writes the records in bulk when flushed and when closed."""
+        from aiida.orm.logs import OrderSpecifier, ASCENDING
+        from aiida.orm.utils.log import BufferedDBLogHandler, create_logger_adapter, flush_db_log_handlers
+
+        node = orm.CalculationNode().store()
+        logger = logging.getLogger('aiida.test_buffered_db_log_handler')
+        logger.propagate = False
+
+        # A long flush interval, such that the records are only written when the buffer is full or flushed explicitly
+        handler = BufferedDBLogHandler(buffer_size=10, flush_interval=3600)
+        logger.addHandler(handler)
+
+        try:
+            adapter = create_logger_adapter(logger, node)
+            adapter.error('first message')
+            self.assertEqual(len(Log.objects.get_logs_for(node)), 0)
+
+            flush_db_log_handlers(logger)
+            self.assertEqual(len(Log.objects.get_logs_for(node)), 1)
+
+            for index in range(3):
+                adapter.error('message %d', index)
+
+            # Records of unstored nodes are not stored, as with the unbuffered handler
+            orm.CalculationNode().logger.error('unstored')
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        logs = Log.objects.get_logs_for(node, order_by=[OrderSpecifier('time', ASCENDING)])
+        self.assertEqual([log.message for log in logs], ['first message', 'message 0', 'message 1', 'message 2'])
+        self.assertEqual(len(Log.objects.all()), 4)
+
+        # After closing, records are written immediately
+        handler.handle(logging.makeLogRecord({'name': 'test', 'levelname': 'ERROR', 'msg': 'closed', 'backend':
+                                              node.backend, 'dbnode_id': node.pk}))
+        self.assertEqual(len(Log.objects.get_logs_for(node)), 5)
+
     def test_log_querybuilder(self):
         """ Test querying for logs by joining on nodes in the QueryBuilder """
         from aiida.orm import QueryBuilder
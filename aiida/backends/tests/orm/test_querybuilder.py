@@ -12,6 +12,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import mock
 import six
 
 from aiida import orm
@@ -34,3 +35,103 @@ class TestQueryBuilder(AiidaTestCase):
         self.assertEqual(len(result), 2)
         self.assertIsInstance(result[0], six.string_types)
         self.assertIsInstance(result[1], orm.Data)
+
+    def test_query_cache(self):
+        """Test that queries with the same structure are taken from the cache and bound with their own values."""
+        from aiida.orm.utils.querycache import get_query_cache
+
+        nodes = [orm.Int(value) for value in range(4)]
+        for index, node in enumerate(nodes):
+            node.set_extra('index', index)
+            node.label = 'node_{}'.format(index)
+            node.store()
+
+        def get_builder(pk, label):
+            builder = orm.QueryBuilder()
+            builder.append(orm.Int, filters={'id': {'>=': pk}, 'label': {'like': label}}, project=['id', 'label'])
+            builder.order_by({orm.Int: {'id': 'asc'}})
+            return builder
+
+        cache = get_query_cache()
+        cache.clear()
+
+        builder = get_builder(nodes[1].pk, 'node_%')
+        self.assertEqual(builder.all(), [[node.pk, node.label] for node in nodes[1:]])
+        self.assertEqual(cache.info().misses, 1)
+
+        builder = get_builder(nodes[2].pk, 'node_3')
+        self.assertEqual(builder.all(), [[nodes[3].pk, nodes[3].label]])
+        self.assertEqual(builder.count(), 1)
+        self.assertEqual(builder.first(), [nodes[3].pk, nodes[3].label])
+        self.assertEqual(get_builder(nodes[3].pk, 'none').first(), None)
+        self.assertEqual(get_builder(nodes[0].pk, 'node_%').count(), len(nodes))
+        self.assertEqual(cache.info().misses, 1)
+        self.assertEqual(cache.info().hits, 5)
+
+        # Filters on attributes and extras with a list of values
+        for values in [[1, 2], [0, 3]]:
+            builder = orm.QueryBuilder()
+            builder.append(orm.Int, filters={'extras.index': {'in': values}, 'id': {'in': [n.pk for n in nodes]}})
+            self.assertEqual(sorted(node.pk for node, in builder.all()), sorted(nodes[value].pk for value in values))
+            builder = orm.QueryBuilder()
+            builder.append(orm.Int, filters={'attributes.value': {'>': values[0]}}, project='attributes.value')
+            self.assertTrue(all(value > values[0] for value, in builder.all()))
+        self.assertEqual(cache.info().misses, 3)
+
+        # A query that was modified after it was built should not be taken from the cache
+        builder = get_builder(nodes[0].pk, 'node_%')
+        builder.distinct()
+        self.assertEqual(len(builder.all()), len(nodes))
+
+        # With an unsupported version of SQLAlchemy, queries are not cached but still return the right results
+        with mock.patch('aiida.orm.utils.querycache.is_sqlalchemy_supported', return_value=False):
+            info = cache.info()
+            self.assertEqual(get_builder(nodes[2].pk, 'node_%').count(), 2)
+            self.assertEqual(cache.info(), info)
+
+    def test_queryhelp_key(self):
+        """Test the structure and parameter values that are extracted from a queryhelp."""
+        from aiida.orm.utils.querycache import get_queryhelp_key, substitute_parameters
+
+        filters = {'node': {'id': {'in': [1, 2]}, 'attributes.x': {'of_type': 'number'}, 'or': [{'label': 'a'}]}}
+        structure, values = get_queryhelp_key([], filters, {}, [], None, None)
+        self.assertEqual(values, [1, 2, 'a'])
+
+        other_filters = {'node': {'id': {'in': [3, 4]}, 'attributes.x': {'of_type': 'number'}, 'or': [{'label': 'b'}]}}
+        self.assertEqual(get_queryhelp_key([], other_filters, {}, [], None, None)[0], structure)
+
+        for different in [{'node': {'id': {'in': [3]}}}, {'node': {'id': {'in': [3.0, 4.0]}}}, {'node': {'id': True}}]:
+            self.assertNotEqual(get_queryhelp_key([], different, {}, [], None, None)[0], structure)
+
+        substituted = substitute_parameters(filters, [3, 4, 'b'])
+        self.assertEqual(substituted, other_filters)
+
+    def test_to_arrays(self):
+        """Test that projected columns are returned as NumPy arrays in batches."""
+        import numpy
+        from aiida.common.exceptions import InputValidationError
+
+        nodes = [orm.Float(value + 0.5).store() for value in range(5)]
+        pks = [node.pk for node in nodes]
+
+        builder = orm.QueryBuilder()
+        builder.append(orm.Float, filters={'id': {'in': pks}}, project=['id', 'attributes.value'], tag='float')
+        builder.order_by({'float': {'id': 'asc'}})
+
+        batches = list(builder.iter_columns(batch_size=2))
+        self.assertEqual([len(batch['float']['id']) for batch in batches], [2, 2, 1])
+
+        arrays = builder.to_arrays(batch_size=2)
+        self.assertTrue(numpy.issubdtype(arrays['float']['id'].dtype, numpy.integer))
+        self.assertEqual(arrays['float']['id'].tolist(), pks)
+        self.assertEqual(arrays['float']['attributes.value'].tolist(), [node.value for node in nodes])
+
+        builder = orm.QueryBuilder()
+        filters = {'id': {'in': pks}, 'attributes.value': {'>': 10}}
+        builder.append(orm.Float, filters=filters, project=['id'], tag='float')
+        self.assertEqual(builder.to_arrays()['float']['id'].tolist(), [])
+
+        builder = orm.QueryBuilder()
+        builder.append(orm.Float, filters={'id': {'in': pks}}, project=['*'])
+        with self.assertRaises(InputValidationError):
+            builder.to_arrays()
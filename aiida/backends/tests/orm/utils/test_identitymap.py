@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the identity map of stored entities that can no longer change."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import mock
+
+from aiida import orm
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.exceptions import NotExistent
+from aiida.manage.database.delete.nodes import delete_nodes
+from aiida.manage.manager import get_manager
+from aiida.orm.utils.identitymap import IdentityMap
+
+
+class TestIdentityMap(AiidaTestCase):
+    """Tests for the `IdentityMap` and its use by the entity loaders."""
+
+    def setUp(self):
+        super(TestIdentityMap, self).setUp()
+        self.identity_map = get_manager().get_identity_map()
+        self.identity_map.clear()
+
+    def test_is_cacheable(self):
+        """Only stored codes, computers and sealed process nodes are cacheable."""
+        code = orm.Code(remote_computer_exec=(self.computer, '/bin/true'))
+        self.assertFalse(IdentityMap.is_cacheable(code))
+        code.store()
+        self.assertTrue(IdentityMap.is_cacheable(code))
+
+        self.assertTrue(IdentityMap.is_cacheable(self.computer))
+        self.assertFalse(IdentityMap.is_cacheable(orm.Data().store()))
+
+        process = orm.CalculationNode().store()
+        self.assertFalse(IdentityMap.is_cacheable(process))
+        process.seal()
+        self.assertTrue(IdentityMap.is_cacheable(process))
+
+    def test_load_node(self):
+        """Loading a sealed node by pk or UUID returns the same instance, other nodes are loaded each time."""
+        process = orm.CalculationNode().store()
+        process.seal()
+        data = orm.Data().store()
+
+        loaded = orm.load_node(process.pk)
+        self.assertIs(orm.load_node(process.pk), loaded)
+        self.assertIs(orm.load_node(process.uuid), loaded)
+        self.assertIs(orm.load_node(process.uuid.upper()), loaded)
+
+        info = self.identity_map.info()
+        self.assertEqual(info.currsize, 1)
+        self.assertEqual(info.hits, 3)
+
+        # Partial UUIDs always go to the database
+        self.assertIsNot(orm.load_node(process.uuid[:16]), loaded)
+
+        # The instance is only returned if it matches the requested classes
+        with self.assertRaises(NotExistent):
+            orm.load_node(process.pk, sub_classes=(orm.WorkflowNode,))
+
+        self.assertIsNot(orm.load_node(data.pk), orm.load_node(data.pk))
+        self.assertEqual(self.identity_map.info().currsize, 1)
+
+    def test_load_code_and_computer(self):
+        """Codes and computers are loaded only once."""
+        code = orm.Code(remote_computer_exec=(self.computer, '/bin/true')).store()
+
+        self.assertIs(orm.load_code(code.pk), orm.load_code(code.uuid))
+        self.assertIs(orm.load_computer(self.computer.pk), orm.load_computer(self.computer.uuid))
+
+        # Node and computer pks do not collide
+        self.assertIsInstance(orm.load_node(code.pk), orm.Code)
+        self.assertIsInstance(orm.load_computer(self.computer.pk), orm.Computer)
+
+    def test_size_limit(self):
+        """The least recently used entities are discarded, and a size of zero disables the map."""
+        identity_map = IdentityMap(maxsize=2)
+        nodes = []
+
+        for _ in range(3):
+            node = orm.CalculationNode().store()
+            node.seal()
+            nodes.append(node)
+            self.assertTrue(identity_map.add(node))
+
+        self.assertIsNone(identity_map.get(orm.Node, nodes[0].pk))
+        self.assertIsNone(identity_map.get(orm.Node, nodes[0].uuid))
+        self.assertIs(identity_map.get(orm.Node, nodes[2].uuid), nodes[2])
+        self.assertEqual(identity_map.info().currsize, 2)
+
+        disabled = IdentityMap(maxsize=0)
+        self.assertFalse(disabled.add(nodes[0]))
+        self.assertIsNone(disabled.get(orm.Node, nodes[0].pk))
+
+    def test_invalidate(self):
+        """Deleted entities are removed from the map, such that they can no longer be loaded."""
+        process = orm.CalculationNode().store()
+        process.seal()
+        pk = process.pk
+        uuid = process.uuid
+
+        orm.load_node(pk)
+        self.assertIsNotNone(self.identity_map.get(orm.Node, pk))
+
+        delete_nodes([pk], force=True)
+        self.assertIsNone(self.identity_map.get(orm.Node, uuid))
+
+        with self.assertRaises(NotExistent):
+            orm.load_node(pk)
+
+        self.identity_map.add(process)
+        self.identity_map.invalidate(orm.ProcessNode, pk)
+        self.assertIsNone(self.identity_map.get(orm.Node, pk))
+        self.assertIsNone(self.identity_map._uuids.get((orm.Node, uuid)))  # pylint: disable=protected-access
+
+    def test_deleted_elsewhere(self):
+        """Entities that are deleted without invalidating the map, for example by another process, are not returned."""
+        process = orm.CalculationNode().store()
+        process.seal()
+        pk = process.pk
+        uuid = process.uuid
+
+        orm.load_node(uuid)
+
+        with mock.patch.object(IdentityMap, 'invalidate'):
+            delete_nodes([pk], force=True)
+
+        with self.assertRaises(NotExistent):
+            orm.load_node(uuid)
+
+        with self.assertRaises(NotExistent):
+            orm.load_node(pk)
+
+        self.assertEqual(self.identity_map.info().currsize, 0)
@@ -17,8 +17,13 @@ import os
 import shutil
 import tempfile
 
+import mock
+
 from aiida.backends.testbase import AiidaTestCase
-from aiida.orm import Node
+from aiida.common.exceptions import ModificationNotAllowed
+from aiida.common.objectstore import get_object_store
+from aiida.orm import CalcJobNode, Data, Node, load_node
+from aiida.orm.utils.repository import File, FileType
 
 
 class TestRepository(AiidaTestCase):
@@ -114,3 +119,56 @@ class TestRepository(AiidaTestCase):
         key = os.path.join(basepath, 'subdir', 'a.txt')
         content = self.get_file_content(os.path.join('subdir', 'a.txt'))
         self.assertEqual(node.get_object_content(key), content)
+
+    @mock.patch('aiida.orm.utils.repository.get_repository_backend', return_value='objectstore')
+    def test_objectstore(self, _):
+        """Content of nodes stored with the object store backend is read from the store through the manifest."""
+        node = Data()
+        node.put_object_from_tree(self.tempdir)
+        node.put_object_from_tree(self.tempdir, 'empty', contents_only=False)
+        node.delete_object(os.path.join('empty', os.path.basename(self.tempdir)))
+        hash_unstored = node.get_hash()
+        node.store()
+
+        manifest = get_object_store().get_manifest(node.uuid)
+        self.assertIn(os.path.join('path', 'subdir', 'a.txt'), manifest)
+        self.assertIsNone(manifest[os.path.join('path', 'empty')])
+
+        loaded = load_node(node.pk)
+        key = os.path.join('subdir', 'a.txt')
+        self.assertEqual(loaded.get_object_content(key), self.get_file_content(key))
+        self.assertEqual(loaded.get_object_content(key, mode='rb'), self.get_file_content(key).encode('utf8'))
+        self.assertEqual(loaded.list_object_names(), ['c.txt', 'empty', 'subdir'])
+        self.assertEqual(loaded.list_objects('empty'), [])
+        self.assertEqual(loaded.get_object('subdir'), File('subdir', FileType.DIRECTORY))
+        self.assertEqual(loaded.get_object(key), File('a.txt', FileType.FILE))
+        self.assertEqual(loaded.get_hash(), hash_unstored)
+
+        with self.assertRaises(IOError):
+            loaded.list_objects('non_existent')
+
+        with self.assertRaises(ModificationNotAllowed):
+            loaded.open('c.txt', mode='w')
+
+        # Content is copied to disk for callers that require a path
+        folder = loaded._repository._get_base_folder()  # pylint: disable=protected-access
+        self.assertEqual(sorted(folder.get_content_list()), ['c.txt', 'empty', 'subdir'])
+
+        # Stored nodes can still be modified when forced
+        loaded.delete_object('subdir', force=True)
+        self.assertEqual(load_node(node.pk).list_object_names(), ['c.txt', 'empty'])
+
+    @mock.patch('aiida.orm.utils.repository.get_repository_backend', return_value='objectstore')
+    def test_objectstore_base_path(self, _):
+        """Content written under the base path of a stored calculation job is kept in its manifest."""
+        node = CalcJobNode(computer=self.computer)
+        node.set_option('resources', {'num_machines': 1, 'num_mpiprocs_per_machine': 1})
+        node.store()
+        node.put_object_from_tree(self.tempdir, force=True)
+
+        key = os.path.join('subdir', 'b.txt')
+        self.assertEqual(load_node(node.pk).get_object_content(key), self.get_file_content(key))
+        self.assertIn(os.path.join('raw_input', key), get_object_store().get_manifest(node.uuid))
+
+        folder = node._raw_input_folder  # pylint: disable=protected-access
+        self.assertEqual(sorted(os.listdir(folder.abspath)), ['c.txt', 'subdir'])
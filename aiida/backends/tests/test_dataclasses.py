@@ -2685,6 +2685,126 @@ class TestArrayData(AiidaTestCase):
             if name == 'third':
                 self.assertAlmostEquals(abs(third - array).max(), 0.)
 
+    def test_partial_reads(self):
+        """
+        Check the memory-mapped and partial reads of arrays, before and after storing, and the shared array cache
+        """
+        import numpy
+        from aiida.manage.manager import get_manager
+
+        n = ArrayData()
+        first = numpy.random.rand(5, 3, 4)
+        n.set_array('first', first)
+
+        for node in [n, n.store()]:
+            mapped = node.get_array('first', mmap=True)
+            self.assertIsInstance(mapped, numpy.memmap)
+            self.assertAlmostEquals(abs(first - mapped).max(), 0.)
+            self.assertAlmostEquals(abs(first[2] - node.get_array_slice('first', 2)).max(), 0.)
+            self.assertAlmostEquals(abs(first[1:3, 0] - node.get_array_slice('first', (slice(1, 3), 0))).max(), 0.)
+            self.assertNotIsInstance(node.get_array_slice('first', 2), numpy.memmap)
+
+            with self.assertRaises(KeyError):
+                node.get_array_slice('nonexistent_array', 0)
+
+        # Memory-mapped reads do not populate the cache, full reads do and are shared by all instances of the node
+        cache = get_manager().get_array_cache()
+        self.assertNotIn((n.uuid, 'first'), cache)
+        array = n.get_array('first')
+        self.assertIn((n.uuid, 'first'), cache)
+        self.assertIs(load_node(n.pk).get_array('first'), array)
+
+        # The cached array is shared, so it cannot be modified in place
+        self.assertFalse(array.flags.writeable)
+        with self.assertRaises(ValueError):
+            array[0] = 0.
+
+        n.clear_internal_cache()
+        self.assertNotIn((n.uuid, 'first'), cache)
+
+    def test_chunked(self):
+        """
+        Check the chunked and compressed storage of arrays, appending to them and reading parts of them
+        """
+        import numpy
+
+        for compressed in [False, True]:
+            n = ArrayData()
+            first = numpy.random.rand(10, 3)
+            n.set_array('first', first, chunk_size=4, compressed=compressed)
+            self.assertEqual(len(n.list_object_names()), 3)
+
+            # Complete the last chunk and add one more
+            more = numpy.random.rand(5, 3)
+            n.append_array('first', more)
+            first = numpy.concatenate([first, more])
+            self.assertEqual(len(n.list_object_names()), 4)
+            self.assertEqual(n.get_shape('first'), (15, 3))
+
+            with self.assertRaises(ValueError):
+                n.append_array('first', numpy.random.rand(2, 2))
+
+            n.store()
+            n2 = load_node(n.pk)
+
+            self.assertEqual(n2.get_arraynames(), ['first'])
+            self.assertAlmostEquals(abs(first - n2.get_array('first')).max(), 0.)
+            self.assertAlmostEquals(abs(first[13] - n2.get_array_slice('first', 13)).max(), 0.)
+            self.assertAlmostEquals(abs(first[-1, 2] - n2.get_array_slice('first', (-1, 2))), 0.)
+            self.assertAlmostEquals(abs(first[2:14:3, 1] - n2.get_array_slice('first', (slice(2, 14, 3), 1))).max(), 0.)
+            self.assertAlmostEquals(abs(first[[9, 0]] - n2.get_array_slice('first', [9, 0])).max(), 0.)
+
+            # Read from the chunks instead of the cached array, with advanced indices along several axes
+            n2.clear_internal_cache()
+            mask = first[:, 0] > 0.5
+            for index in [([0, 5], [1, 2]), (mask, 1), (slice(2, 14, 3), [0, 2])]:
+                self.assertTrue(numpy.array_equal(first[index], n2.get_array_slice('first', index)))
+            self.assertAlmostEquals(abs(first[12:] - n2.get_array_chunk('first', 3, mmap=True)).max(), 0.)
+            self.assertEqual(isinstance(n2.get_array_chunk('first', 0, mmap=True), numpy.memmap), not compressed)
+
+            with self.assertRaises(IndexError):
+                n2.get_array_slice('first', 15)
+            with self.assertRaises(IndexError):
+                n2.get_array_chunk('first', 4)
+            with self.assertRaises(ValueError):
+                n2.get_array('first', mmap=True)
+            with self.assertRaises(ModificationNotAllowed):
+                n2.append_array('first', more)
+
+        # Only chunked arrays can be appended to, and overwriting a chunked array removes its chunks
+        n = ArrayData()
+        n.set_array('second', numpy.arange(10), chunk_size=3)
+        n.set_array('second', numpy.arange(4))
+        self.assertEqual(n.list_object_names(), ['second.npy'])
+
+        with self.assertRaises(ValueError):
+            n.append_array('second', numpy.arange(4))
+        with self.assertRaises(ValueError):
+            n.get_array_chunk('second', 0)
+        with self.assertRaises(ValueError):
+            n.set_array('third', numpy.array(1.), chunk_size=1)
+
+        n.set_array('third', numpy.zeros((0, 2)), compressed=True)
+        n.append_array('third', numpy.ones((3, 2), dtype=int))
+        self.assertAlmostEquals(abs(numpy.ones((3, 2)) - n.get_array('third')).max(), 0.)
+
+        n.delete_array('third')
+        self.assertEqual(n.get_arraynames(), ['second'])
+        self.assertEqual(n.list_object_names(), ['second.npy'])
+
+        # Empty arrays are stored as a single empty chunk
+        n.set_array('empty', numpy.empty((0, 3)), chunk_size=2)
+        n.set_array('empty_compressed', numpy.empty((0, 3)), compressed=True)
+        n.set_array('deleted', numpy.empty((0, 3)), chunk_size=2)
+        n.delete_array('deleted')
+        n.store()
+
+        n2 = load_node(n.pk)
+        n2.clear_internal_cache()
+        self.assertEqual(sorted(n2.get_arraynames()), ['empty', 'empty_compressed', 'second'])
+        for name in ['empty', 'empty_compressed']:
+            self.assertEqual(n2.get_array(name).shape, (0, 3))
+
 
 class TestTrajectoryData(AiidaTestCase):
     """
@@ -2871,6 +2991,42 @@ class TestTrajectoryData(AiidaTestCase):
             # Step 66 does not exist
             n.get_index_from_stepid(66)
 
+    def test_append_steps(self):
+        """
+        Check appending steps to a chunked trajectory.
+        """
+        import numpy
+
+        symbols = ['H', 'O']
+        positions = numpy.random.rand(5, 2, 3)
+        times = numpy.arange(5) * 0.01
+
+        n = TrajectoryData()
+        n.set_trajectory(symbols=symbols, positions=positions, times=times, chunk_size=2, compressed=True)
+
+        more_positions = numpy.random.rand(3, 2, 3)
+        more_times = numpy.arange(5, 8) * 0.01
+
+        # The times are required, because the trajectory has them, and the velocities are not
+        with self.assertRaises(ValueError):
+            n.append_steps(positions=more_positions)
+        with self.assertRaises(ValueError):
+            n.append_steps(positions=more_positions, times=more_times, velocities=more_positions)
+
+        n.append_steps(positions=more_positions, times=more_times)
+        n.store()
+
+        self.assertEqual(n.numsteps, 8)
+        self.assertEqual(list(n.get_stepids()), list(range(8)))
+        self.assertAlmostEqual(abs(numpy.concatenate([positions, more_positions]) - n.get_positions()).sum(), 0.)
+        self.assertAlmostEqual(abs(numpy.concatenate([times, more_times]) - n.get_times()).sum(), 0.)
+
+        data = n.get_step_data(6)
+        self.assertEqual(data[0], 6)
+        self.assertAlmostEqual(data[1], more_times[1])
+        self.assertIsNone(data[2])
+        self.assertAlmostEqual(abs(data[4] - more_positions[1]).sum(), 0.)
+
     def test_conversion_to_structure(self):
         """
         Check the methods to export a given time step to a StructureData node.
@@ -19,6 +19,7 @@ import io
 import tempfile
 import unittest
 
+import mock
 import six
 from six.moves import range
 
@@ -1873,3 +1874,64 @@ class TestNodeDeletion(AiidaTestCase):
             delete_nodes([called.pk], verbosity=2, force=True, follow_returns=True)
 
         self._check_existence(uuids_check_existence, uuids_check_deleted)
+
+    def test_deletion_in_chunks(self):
+        """
+        Check that nodes are deleted in chunks together with their comments, logs and group memberships
+        """
+        from aiida.common import timezone
+
+        data = orm.Data().store()
+        calc = orm.CalculationNode()
+        calc.add_incoming(data, link_type=LinkType.INPUT_CALC, link_label='input')
+        calc.store()
+        outputs = []
+        for index in range(3):
+            output = orm.Data()
+            output.add_incoming(calc, link_type=LinkType.CREATE, link_label='output{}'.format(index))
+            outputs.append(output.store())
+
+        group = orm.Group(label='deletion_in_chunks').store()
+        group.add_nodes([data] + outputs)
+        orm.Comment(outputs[0], orm.User.objects.get_default(), 'I will perish').store()
+        orm.Log(timezone.now(), 'loggername', 'WARNING', calc.pk, 'I will perish too').store()
+
+        uuids_check_existence = (data.uuid,)
+        uuids_check_deleted = [node.uuid for node in [calc] + outputs]
+
+        with Capturing():
+            delete_nodes([calc.pk], verbosity=2, force=True, chunk_size=1)
+
+        self._check_existence(uuids_check_existence, uuids_check_deleted)
+        self.assertEqual([node.uuid for node in group.nodes], [data.uuid])
+        self.assertEqual(orm.QueryBuilder().append(orm.Comment, filters={'content': 'I will perish'}).count(), 0)
+        self.assertEqual(orm.QueryBuilder().append(orm.Log, filters={'message': 'I will perish too'}).count(), 0)
+
+    def test_deletion_resumed(self):
+        """
+        Check that an interrupted deletion can be resumed by deleting the same nodes again
+        """
+        from aiida.orm.utils.identitymap import IdentityMap
+
+        data = orm.Data().store()
+        calc = orm.CalculationNode()
+        calc.add_incoming(data, link_type=LinkType.INPUT_CALC, link_label='input')
+        calc.store()
+        outputs = []
+        for index in range(3):
+            output = orm.Data()
+            output.add_incoming(calc, link_type=LinkType.CREATE, link_label='output{}'.format(index))
+            outputs.append(output.store())
+
+        # Interrupt the deletion right after the transaction of the first chunk has been committed
+        with Capturing(), mock.patch.object(IdentityMap, 'invalidate', side_effect=RuntimeError('interrupted')):
+            with self.assertRaises(RuntimeError):
+                delete_nodes([calc.pk], verbosity=2, force=True, chunk_size=1)
+
+        # The nodes furthest away from the given node are deleted first
+        self._check_existence([data.uuid, calc.uuid, outputs[0].uuid, outputs[1].uuid], [outputs[2].uuid])
+
+        with Capturing():
+            delete_nodes([calc.pk], verbosity=2, force=True, chunk_size=1)
+
+        self._check_existence([data.uuid], [node.uuid for node in [calc] + outputs])
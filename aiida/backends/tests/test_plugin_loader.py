@@ -102,3 +102,19 @@ class TestExistingPlugins(AiidaTestCase):
             cls = factories.DbImporterFactory(entry_point.name)
             self.assertTrue(issubclass(cls, DbImporter),
                 'DbImporter plugin class {} is not subclass of {}'.format(cls, DbImporter))
+
+    def test_entry_point_cache(self):
+        """Test that the entry points of a group are cached and that the cache can be cleared."""
+        from aiida.plugins.entry_point import clear_entry_point_cache, get_entry_point_manager
+
+        entry_points = get_entry_points('aiida.calculations')
+        manager = get_entry_point_manager()
+        expected = [entry_point.name for entry_point in manager.iter_entry_points('aiida.calculations')]
+        self.assertEqual([entry_point.name for entry_point in entry_points], expected)
+
+        # Modifying the returned list should not affect the cache
+        entry_points.pop()
+        self.assertEqual([entry_point.name for entry_point in get_entry_points('aiida.calculations')], expected)
+
+        clear_entry_point_cache()
+        self.assertEqual([entry_point.name for entry_point in get_entry_points('aiida.calculations')], expected)
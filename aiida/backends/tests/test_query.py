@@ -987,20 +987,20 @@ class QueryBuilderPath(AiidaTestCase):
             }).count(), 0)
 
         n6.add_incoming(n5, link_type=LinkType.CREATE, link_label='link1')
-        # Yet, now 2 links from 1 to 8
+        # Yet, now 2 paths from 1 to 8, but the walk is deduplicated, so n8 is only returned once
         self.assertEqual(
             orm.QueryBuilder().append(orm.Node, filters={
                 'id': n1.pk
             }, tag='anc').append(orm.Node, with_ancestors='anc', filters={
                 'id': n8.pk
-            }).count(), 2)
+            }).count(), 1)
 
         self.assertEqual(
             orm.QueryBuilder().append(orm.Node, filters={
                 'id': n8.pk
             }, tag='desc').append(orm.Node, with_descendants='desc', filters={
                 'id': n1.pk
-            }).count(), 2)
+            }).count(), 1)
 
         self.assertEqual(
             orm.QueryBuilder().append(orm.Node, filters={
@@ -1016,7 +1016,7 @@ class QueryBuilderPath(AiidaTestCase):
                         '<': 6
                     }
                 },
-            ).count(), 2)
+            ).count(), 1)
         self.assertEqual(
             orm.QueryBuilder().append(orm.Node, filters={
                 'id': n8.pk
@@ -1029,7 +1029,7 @@ class QueryBuilderPath(AiidaTestCase):
                 edge_filters={
                     'depth': 5
                 },
-            ).count(), 2)
+            ).count(), 1)
         self.assertEqual(
             orm.QueryBuilder().append(orm.Node, filters={
                 'id': n8.pk
@@ -1122,6 +1122,61 @@ class QueryBuilderPath(AiidaTestCase):
         # self.assertTrue(set(next(zip(*qb.all()))), set([5]))
 
 
+    def test_query_path_traversal_options(self):
+        """Test the options that bound the recursive traversal of `with_ancestors` and `with_descendants`."""
+        from aiida.common.exceptions import InputValidationError
+
+        d1 = orm.Data().store()
+        c1 = orm.CalculationNode()
+        c1.add_incoming(d1, link_type=LinkType.INPUT_CALC, link_label='input')
+        c1.store()
+        d2 = orm.Data()
+        d2.add_incoming(c1, link_type=LinkType.CREATE, link_label='output')
+        d2.store()
+        c2 = orm.CalculationNode()
+        c2.add_incoming(d2, link_type=LinkType.INPUT_CALC, link_label='input')
+        c2.store()
+        d3 = orm.Data()
+        d3.add_incoming(c2, link_type=LinkType.CREATE, link_label='output')
+        d3.store()
+
+        def get_descendants(**kwargs):
+            builder = orm.QueryBuilder().append(orm.Node, filters={'id': d1.pk}, tag='anc')
+            builder.append(orm.Node, with_ancestors='anc', project='id', **kwargs)
+            return {pk for pk, in builder.all()}
+
+        def get_ancestors(**kwargs):
+            builder = orm.QueryBuilder().append(orm.Node, filters={'id': d3.pk}, tag='desc')
+            builder.append(orm.Node, with_descendants='desc', project='id', **kwargs)
+            return {pk for pk, in builder.all()}
+
+        self.assertEqual(get_descendants(), {c1.pk, d2.pk, c2.pk, d3.pk})
+        self.assertEqual(get_descendants(max_depth=1), {c1.pk})
+        self.assertEqual(get_descendants(max_depth=3), {c1.pk, d2.pk, c2.pk})
+        self.assertEqual(get_ancestors(max_depth=2), {c2.pk, d2.pk})
+        self.assertEqual(get_descendants(link_types=LinkType.INPUT_CALC), {c1.pk})
+        self.assertEqual(get_ancestors(link_types=[LinkType.CREATE.value]), {c2.pk})
+        self.assertEqual(get_descendants(link_types=[LinkType.CALL_CALC]), set())
+
+        # The walk does not continue beyond nodes that do not pass the traversal filters
+        self.assertEqual(get_descendants(traversal_filters={'node_type': {'like': 'process.%'}}), {c1.pk})
+        self.assertEqual(get_descendants(traversal_filters={'id': {'!==': d2.pk}}), {c1.pk})
+
+        # The depth of the walk is still available on the edge when the walk is bounded
+        builder = orm.QueryBuilder().append(orm.Node, filters={'id': d1.pk}, tag='anc')
+        builder.append(orm.Node, with_ancestors='anc', max_depth=2, project='id', edge_project='depth')
+        self.assertEqual(set(builder.all()), {(c1.pk, 0), (d2.pk, 1)})
+
+        # The options are only allowed for the recursive joins and have to be valid
+        builder = orm.QueryBuilder().append(orm.Node, tag='node')
+        with self.assertRaises(InputValidationError):
+            builder.append(orm.Node, with_incoming='node', max_depth=1)
+        with self.assertRaises(InputValidationError):
+            builder.append(orm.Node, with_ancestors='node', max_depth=0)
+        with self.assertRaises(InputValidationError):
+            builder.append(orm.Node, with_ancestors='node', link_types=['invalid'])
+
+
 class TestConsistency(AiidaTestCase):
 
     def test_create_node_and_query(self):
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the traversal of the provenance graph."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from aiida import orm
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.links import LinkType
+from aiida.tools.graph import traverse, LinkRule, TraversedLink, FORWARD, BACKWARD
+
+
+class TestTraverse(AiidaTestCase):
+    """Tests for the traversal of the provenance graph."""
+
+    def setUp(self):
+        super(TestTraverse, self).setUp()
+        self.reset_database()
+
+    def create_provenance(self):
+        """Create a work chain that calls a calculation, which uses data created by another calculation.
+
+        data_in -> calc_a -> data_mid -> calc_b -> data_out, where work calls calc_b and returns data_out.
+        """
+        # pylint: disable=attribute-defined-outside-init
+        self.data_in = orm.Data().store()
+
+        self.calc_a = orm.CalculationNode()
+        self.calc_a.add_incoming(self.data_in, link_type=LinkType.INPUT_CALC, link_label='input')
+        self.calc_a.store()
+
+        self.data_mid = orm.Data()
+        self.data_mid.add_incoming(self.calc_a, link_type=LinkType.CREATE, link_label='output')
+        self.data_mid.store()
+
+        self.work = orm.WorkflowNode()
+        self.work.add_incoming(self.data_mid, link_type=LinkType.INPUT_WORK, link_label='input')
+        self.work.store()
+
+        self.calc_b = orm.CalculationNode()
+        self.calc_b.add_incoming(self.data_mid, link_type=LinkType.INPUT_CALC, link_label='input')
+        self.calc_b.add_incoming(self.work, link_type=LinkType.CALL_CALC, link_label='call')
+        self.calc_b.store()
+
+        self.data_out = orm.Data()
+        self.data_out.add_incoming(self.calc_b, link_type=LinkType.CREATE, link_label='output')
+        self.data_out.store()
+        self.data_out.add_incoming(self.work, link_type=LinkType.RETURN, link_label='output')
+
+    def test_forward(self):
+        """Test following links forward, with the default data provenance rules."""
+        self.create_provenance()
+        rules = [LinkRule([LinkType.CREATE, LinkType.INPUT_CALC], FORWARD)]
+
+        result = traverse([self.data_in.pk], rules)
+        expected = {self.data_in.pk, self.calc_a.pk, self.data_mid.pk, self.calc_b.pk, self.data_out.pk}
+        self.assertEqual(result.pks, expected)
+        self.assertEqual(result.frontier, set())
+        self.assertIsNone(result.links)
+
+        result = traverse([self.calc_b.pk], rules)
+        self.assertEqual(result.pks, {self.calc_b.pk, self.data_out.pk})
+
+        result = traverse([self.data_in.pk], [LinkRule(['create', 'input_calc', 'input_work'], FORWARD)])
+        self.assertEqual(result.pks, expected | {self.work.pk})
+
+    def test_backward(self):
+        """Test following links backward, and in both directions at once."""
+        self.create_provenance()
+
+        result = traverse([self.data_out.pk], [LinkRule(LinkType.CREATE, BACKWARD)])
+        self.assertEqual(result.pks, {self.data_out.pk, self.calc_b.pk})
+
+        result = traverse([self.data_out.pk], [LinkRule([LinkType.RETURN, LinkType.INPUT_WORK], BACKWARD)])
+        self.assertEqual(result.pks, {self.data_out.pk, self.work.pk, self.data_mid.pk})
+
+        rules = [LinkRule(LinkType.CALL_CALC, FORWARD), LinkRule(LinkType.RETURN, BACKWARD)]
+        result = traverse([self.data_out.pk], rules)
+        self.assertEqual(result.pks, {self.data_out.pk, self.work.pk, self.calc_b.pk})
+
+    def test_max_iterations(self):
+        """Test that the number of iterations can be bounded and that the statistics of each iteration are returned."""
+        self.create_provenance()
+        rules = [LinkRule([LinkType.CREATE, LinkType.INPUT_CALC], FORWARD)]
+        stats = []
+
+        result = traverse([self.data_in.pk], rules, max_iterations=2, stats_callback=stats.append)
+        self.assertEqual(result.pks, {self.data_in.pk, self.calc_a.pk, self.data_mid.pk})
+        self.assertEqual(result.frontier, {self.data_mid.pk})
+        self.assertEqual(result.stats, stats)
+        self.assertEqual([(entry.iteration, entry.frontier, entry.discovered, entry.visited) for entry in stats],
+                         [(1, 1, 1, 2), (2, 1, 1, 3)])
+
+        result = traverse([self.data_in.pk], rules, max_iterations=0)
+        self.assertEqual(result.pks, {self.data_in.pk})
+        self.assertEqual(result.frontier, {self.data_in.pk})
+        self.assertEqual(result.stats, [])
+
+        with self.assertRaises(ValueError):
+            traverse([self.data_in.pk], rules, max_iterations=-1)
+
+    def test_batch_size(self):
+        """Test that the frontier is queried in batches of the given size."""
+        self.create_provenance()
+        rules = [LinkRule([LinkType.INPUT_CALC, LinkType.INPUT_WORK], FORWARD)]
+
+        result = traverse([self.data_in.pk, self.data_mid.pk], rules, batch_size=1)
+        self.assertEqual(result.pks, {self.data_in.pk, self.data_mid.pk, self.calc_a.pk, self.calc_b.pk, self.work.pk})
+        self.assertEqual(result.stats[0].queries, 2)
+
+    def test_return_links(self):
+        """Test that the links are returned, including those between nodes that were already visited."""
+        self.create_provenance()
+        rules = [LinkRule([LinkType.CREATE, LinkType.RETURN, LinkType.CALL_CALC], FORWARD)]
+
+        result = traverse([self.work.pk], rules, return_links=True)
+        self.assertEqual(result.pks, {self.work.pk, self.calc_b.pk, self.data_out.pk})
+        self.assertEqual(
+            set(result.links), {
+                TraversedLink(self.work.pk, self.calc_b.pk, LinkType.CALL_CALC.value, 'call'),
+                TraversedLink(self.work.pk, self.data_out.pk, LinkType.RETURN.value, 'output'),
+                TraversedLink(self.calc_b.pk, self.data_out.pk, LinkType.CREATE.value, 'output'),
+            })
+        self.assertEqual([entry.links for entry in result.stats], [2, 1])
+
+    def test_invalid_rules(self):
+        """Test that invalid rules raise."""
+        with self.assertRaises(ValueError):
+            traverse([1], [LinkRule(LinkType.CREATE, 'sideways')])
+
+        with self.assertRaises(ValueError):
+            traverse([1], [LinkRule('invalid', FORWARD)])
@@ -184,3 +184,106 @@ class TestSimple(AiidaTestCase):
         folder = SandboxFolder()
         with self.assertRaises(exceptions.LicensingException):
             export_tree([struct], folder=folder, silent=True, forbidden_licenses=crashing_filter)
+
+    @with_temp_dir
+    def test_export_streaming(self, temp_dir):
+        """Test that a streaming export in small batches writes the same data as a regular export."""
+        from aiida.common.folders import SandboxFolder
+        from aiida.common.links import LinkType
+        from aiida.tools.importexport.dbexport import export_tree
+
+        struct = orm.StructureData()
+        struct.store()
+
+        calc = orm.CalcJobNode()
+        calc.computer = self.computer
+        calc.set_option('resources', {'num_machines': 1, 'num_mpiprocs_per_machine': 1})
+        calc.add_incoming(struct, link_type=LinkType.INPUT_CALC, link_label='structure')
+        calc.store()
+
+        outputs = [orm.Int(value) for value in range(3)]
+        for index, output in enumerate(outputs):
+            output.add_incoming(calc, link_type=LinkType.CREATE, link_label='output_{}'.format(index))
+            output.set_extra('index', index)
+            output.store()
+
+        group = orm.Group(label='streaming').store()
+        group.add_nodes([struct] + outputs)
+
+        contents = []
+        for kwargs in [{}, {'streaming': True, 'batch_size': 1, 'threads': 2}]:
+            folder = SandboxFolder()
+            export_tree([group], folder=folder, silent=True, **kwargs)
+            with io.open(folder.get_abs_path('data.json'), 'r', encoding='utf8') as fhandle:
+                data = json.load(fhandle)
+            data['links_uuid'] = sorted(data['links_uuid'], key=lambda link: (link['input'], link['output']))
+            data['groups_uuid'] = {key: sorted(value) for key, value in data['groups_uuid'].items()}
+            contents.append((data, sorted(os.listdir(folder.get_abs_path('nodes')))))
+
+        self.assertEqual(contents[0], contents[1])
+
+        filename = os.path.join(temp_dir, 'export.tar.gz')
+        uuids = [node.uuid for node in [struct, calc] + outputs]
+        export([group], outfile=filename, silent=True, streaming=True, batch_size=2)
+
+        self.clean_db()
+        self.create_user()
+        import_data(filename, silent=True)
+
+        for uuid in uuids:
+            orm.load_node(uuid)
+        self.assertEqual(len(orm.load_node(calc.uuid).get_outgoing().all()), len(outputs))
+        self.assertEqual(orm.load_node(outputs[2].uuid).get_extra('index'), 2)
+
+    @with_temp_dir
+    def test_import_streaming(self, temp_dir):
+        """Test that a streaming import in small batches imports the same entities as a regular import."""
+        from aiida.common.links import LinkType
+        from aiida.tools.importexport import export_zip
+
+        struct = orm.StructureData()
+        struct.store()
+
+        calc = orm.CalcJobNode()
+        calc.computer = self.computer
+        calc.set_option('resources', {'num_machines': 1, 'num_mpiprocs_per_machine': 1})
+        calc.add_incoming(struct, link_type=LinkType.INPUT_CALC, link_label='structure')
+        calc.store()
+
+        outputs = [orm.Int(value) for value in range(3)]
+        for index, output in enumerate(outputs):
+            output.add_incoming(calc, link_type=LinkType.CREATE, link_label='output_{}'.format(index))
+            output.set_extra('index', index)
+            output.store()
+
+        group = orm.Group(label='streaming').store()
+        group.add_nodes([struct] + outputs)
+
+        uuids = [node.uuid for node in [struct, calc] + outputs]
+        struct_files = sorted(struct.list_object_names())
+
+        filenames = [os.path.join(temp_dir, 'export.tar.gz'), os.path.join(temp_dir, 'export.zip')]
+        export([group], outfile=filenames[0], silent=True)
+        export_zip([group], outfile=filenames[1], silent=True)
+
+        for filename in filenames:
+            self.clean_db()
+            self.create_user()
+            import_data(filename, silent=True, streaming=True, batch_size=2)
+
+            for uuid in uuids:
+                orm.load_node(uuid)
+            self.assertEqual(len(orm.load_node(calc.uuid).get_outgoing().all()), len(outputs))
+            self.assertEqual(orm.load_node(outputs[2].uuid).get_extra('index'), 2)
+            self.assertEqual(sorted(orm.load_node(struct.uuid).list_object_names()), struct_files)
+            self.assertEqual(orm.load_node(calc.uuid).computer.uuid, self.computer.uuid)
+
+            imported_group = orm.load_group(label='streaming')
+            self.assertEqual(sorted(node.uuid for node in imported_group.nodes),
+                             sorted(node.uuid for node in [struct] + outputs))
+
+            # Importing again only finds existing entries
+            result = import_data(filename, silent=True, streaming=True, batch_size=2)
+            self.assertEqual(result['Node']['new'], [])
+            self.assertEqual(len(result['Node']['existing']), len(uuids))
+            self.assertEqual(len(orm.load_node(calc.uuid).get_outgoing().all()), len(outputs))
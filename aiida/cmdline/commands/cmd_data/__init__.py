@@ -16,6 +16,13 @@ from aiida.cmdline.commands.cmd_verdi import verdi
 from aiida.cmdline.utils.pluginable import Pluginable
 
 
-@verdi.group('data', entry_point_group='aiida.cmdline.data', cls=Pluginable)
+# The modules that define the sub commands of `verdi data`, which are only imported when the command is invoked
+VERDI_DATA_COMMANDS = {
+    name: 'aiida.cmdline.commands.cmd_data.cmd_{}'.format(name)
+    for name in ['array', 'bands', 'cif', 'dict', 'remote', 'structure', 'trajectory', 'upf']
+}
+
+
+@verdi.group('data', entry_point_group='aiida.cmdline.data', cls=Pluginable, lazy_commands=VERDI_DATA_COMMANDS)
 def verdi_data():
     """Inspect, create and manage data nodes."""
@@ -163,3 +163,119 @@ def detect_invalid_nodes():
         echo.echo_success('no integrity violations detected')
     else:
         echo.echo_critical('one or more integrity violations detected')
+
+
+@verdi_database.group('closure')
+def verdi_database_closure():
+    """Manage the closure table of the provenance graph.
+
+    The transitive closure table is optional. When enabled, the table is kept up to date automatically and is used
+    by the QueryBuilder to look up the ancestors and descendants of nodes directly, instead of walking the provenance
+    graph for every query.
+    """
+
+
+@verdi_database_closure.command('status')
+@decorators.with_dbenv()
+def closure_status():
+    """Show whether the closure table is enabled."""
+    from aiida.manage.database.closure import is_closure_table_enabled
+
+    if is_closure_table_enabled():
+        echo.echo_info('the closure table is enabled')
+    else:
+        echo.echo_info('the closure table is disabled')
+
+
+@verdi_database_closure.command('enable')
+@decorators.with_dbenv()
+def closure_enable():
+    """Enable the closure table and fill it with the current provenance graph.
+
+    Links cannot be stored by other processes while the table is being filled, which can take a while for large
+    databases, so it is best to stop the daemon first.
+    """
+    from aiida.manage.database.closure import enable_closure_table
+
+    count = enable_closure_table()
+    echo.echo_success('enabled the closure table with {} entries'.format(count))
+
+
+@verdi_database_closure.command('rebuild')
+@decorators.with_dbenv()
+def closure_rebuild():
+    """Recompute the closure table from scratch.
+
+    This is only necessary if links have been removed from the database other than by deleting nodes.
+    """
+    from aiida.common.exceptions import InvalidOperation
+    from aiida.manage.database.closure import rebuild_closure_table
+
+    try:
+        count = rebuild_closure_table()
+    except InvalidOperation:
+        echo.echo_critical('the closure table is not enabled, use `verdi database closure enable` instead')
+    else:
+        echo.echo_success('rebuilt the closure table with {} entries'.format(count))
+
+
+@verdi_database_closure.command('disable')
+@decorators.with_dbenv()
+def closure_disable():
+    """Disable the closure table and empty it."""
+    from aiida.manage.database.closure import disable_closure_table
+
+    disable_closure_table()
+    echo.echo_success('disabled the closure table')
+
+
+@verdi_database.group('repository')
+def verdi_database_repository():
+    """Maintain the object store of the file repository.
+
+    These commands only apply to profiles whose `repository.backend` option is set to `objectstore`. Packing and
+    cleaning can safely be run while the daemon is running.
+    """
+
+
+@verdi_database_repository.command('status')
+@decorators.with_dbenv()
+def repository_status():
+    """Show the number of loose and packed objects in the object store."""
+    from tabulate import tabulate
+    from aiida.common.objectstore import get_object_store
+
+    statistics = get_object_store().get_statistics()
+    echo.echo(tabulate(sorted(statistics.items()), headers=['Statistic', 'Value']))
+
+
+@verdi_database_repository.command('pack')
+@click.option(
+    '--pack-size',
+    type=click.INT,
+    default=None,
+    help='Size in bytes above which a pack file is no longer appended to and a new one is started.')
+@decorators.with_dbenv()
+def repository_pack(pack_size):
+    """Move all loose objects into pack files."""
+    from aiida.common.objectstore import get_object_store, DEFAULT_PACK_SIZE
+
+    count = get_object_store().pack_loose_objects(pack_size=pack_size or DEFAULT_PACK_SIZE)
+    echo.echo_success('packed {} objects'.format(count))
+
+
+@verdi_database_repository.command('clean')
+@click.option(
+    '--min-age',
+    type=click.INT,
+    default=None,
+    help='Minimum time in seconds since an unreferenced object was added, for it to be deleted.')
+@decorators.with_dbenv()
+def repository_clean(min_age):
+    """Delete the objects that are not referenced by any node and reclaim their space in the pack files."""
+    from aiida.common.objectstore import get_object_store, DEFAULT_MIN_AGE
+
+    store = get_object_store()
+    count = store.delete_unreferenced_objects(min_age=DEFAULT_MIN_AGE if min_age is None else min_age)
+    reclaimed = store.repack()
+    echo.echo_success('deleted {} unreferenced objects and reclaimed {} bytes'.format(count, reclaimed))
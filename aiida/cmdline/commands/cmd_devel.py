@@ -160,6 +160,86 @@ def devel_tests(paths, verbose):  # pylint: disable=too-many-locals,too-many-sta
         sys.exit(len(test_failures) + len(test_errors))
 
 
+# Modules that are slow to import and should only be imported by the commands that need them, not by `verdi` itself
+LAZY_IMPORT_MODULES = ('aiida.orm', 'aiida.engine', 'plumpy', 'kiwipy', 'pkg_resources', 'sqlalchemy', 'django',
+                       'numpy')
+
+IMPORT_TIME_SCRIPT = """
+import json
+import sys
+import time
+
+modules = set(sys.modules)
+start = time.time()
+for module in sys.argv[1:]:
+    __import__(module)
+print(json.dumps({'time': time.time() - start, 'modules': sorted(set(sys.modules) - modules)}))
+"""
+
+
+@verdi_devel.command('import-time')
+@click.argument('modules', nargs=-1, required=False)
+@click.option(
+    '-n', '--number', type=click.INT, default=15, show_default=True, help='Number of the slowest imports to show.')
+def devel_import_time(modules, number):
+    """Report the time it takes to import `verdi`.
+
+    Imports the given MODULES, by default the module of `verdi`, in a new interpreter and reports the total time, the
+    slowest imports if supported by the interpreter, and the imported modules that should only be imported by the
+    commands that need them. The command fails if any of the latter are imported, such that it can be used to guard
+    against regressions of the start up time of `verdi`.
+    """
+    import subprocess
+    import sys
+    import tabulate
+
+    from aiida.common import json
+
+    modules = modules or ('aiida.cmdline.commands.cmd_verdi',)
+    command = [sys.executable]
+
+    # The `-X importtime` option reports the time spent on each import, but is only available as of python 3.7
+    if sys.version_info >= (3, 7):
+        command.extend(['-X', 'importtime'])
+
+    process = subprocess.Popen(
+        command + ['-c', IMPORT_TIME_SCRIPT] + list(modules), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate()
+
+    if process.returncode:
+        echo.echo_critical('failed to import {}:\n{}'.format(', '.join(modules), stderr.decode('utf-8')))
+
+    result = json.loads(stdout.decode('utf-8').strip().splitlines()[-1])
+    imported = set(result['modules'])
+
+    timings = []
+    for line in stderr.decode('utf-8').splitlines():
+        try:
+            _, self_time, cumulative_time, name = [part.strip() for part in line.replace(':', '|', 1).split('|')]
+            timing = (name, int(cumulative_time) / 1000., int(self_time) / 1000.)
+        except ValueError:
+            # Skip the header and anything else that is not a timing
+            continue
+
+        # Skip the modules that are imported by the interpreter itself
+        if name in imported:
+            timings.append(timing)
+
+    if timings:
+        timings = sorted(timings, key=lambda timing: timing[1], reverse=True)[:number]
+        echo.echo(tabulate.tabulate(timings, headers=['Module', 'Cumulative [ms]', 'Self [ms]'], floatfmt='.1f'))
+        echo.echo('')
+
+    echo.echo_info('imported {} modules in {:.3f} s'.format(len(imported), result['time']))
+
+    lazy_modules = [module for module in LAZY_IMPORT_MODULES if module in imported]
+
+    if lazy_modules:
+        echo.echo_critical('modules that should be imported lazily were imported: {}'.format(', '.join(lazy_modules)))
+
+    echo.echo_success('none of the modules that should be imported lazily were imported')
+
+
 @verdi_devel.command('play')
 def devel_play():
     """Open a browser and play the Aida triumphal march by Giuseppe Verdi."""
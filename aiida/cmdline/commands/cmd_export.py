@@ -99,9 +99,26 @@ def inspect(archive, version, data, meta_data):
     default=True,
     show_default=True,
     help='Include or exclude comments for node(s) in export. (Will also export extra users who commented).')
+@click.option(
+    '--streaming/--no-streaming',
+    default=False,
+    show_default=True,
+    help='Write the database entries while they are queried in batches, to limit the memory usage of large exports.')
+@click.option(
+    '--batch-size',
+    type=click.INT,
+    default=1000,
+    show_default=True,
+    help='The number of nodes that are visited, queried or written at a time.')
+@click.option(
+    '--threads',
+    type=click.INT,
+    default=1,
+    show_default=True,
+    help='The number of threads used to copy the repository folders of the nodes, ignored for zip archives.')
 @decorators.with_dbenv()
 def create(output_file, codes, computers, groups, nodes, archive_format, force, input_forward, create_reversed,
-           return_reversed, call_reversed, include_comments, include_logs):
+           return_reversed, call_reversed, include_comments, include_logs, streaming, batch_size, threads):
     """
     Export various entities, such as Codes, Computers, Groups and Nodes, to an archive file for backup or
     sharing purposes.
@@ -129,6 +146,9 @@ def create(output_file, codes, computers, groups, nodes, archive_format, force,
         'call_reversed': call_reversed,
         'include_comments': include_comments,
         'include_logs': include_logs,
+        'streaming': streaming,
+        'batch_size': batch_size,
+        'threads': threads,
         'overwrite': force
     }
 
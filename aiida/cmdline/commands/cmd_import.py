@@ -179,11 +179,22 @@ def _migrate_archive(ctx, temp_folder, file_to_import, archive, non_interactive,
     default=True,
     show_default=True,
     help="Force migration of export file archives, if needed.")
+@click.option(
+    '--streaming/--no-streaming',
+    default=False,
+    show_default=True,
+    help='Read the archive in batches without extracting it, to limit the memory and disk usage of large imports.')
+@click.option(
+    '--batch-size',
+    type=click.INT,
+    default=1000,
+    show_default=True,
+    help='The number of entries that are imported at a time when streaming.')
 @options.NON_INTERACTIVE()
 @decorators.with_dbenv()
 @click.pass_context
 def cmd_import(ctx, archives, webpages, group, extras_mode_existing, extras_mode_new, comment_mode, migration,
-               non_interactive):
+               streaming, batch_size, non_interactive):
     """Import one or multiple exported AiiDA archives
 
     The ARCHIVES can be specified by their relative or absolute file path, or their HTTP URL.
@@ -231,6 +242,8 @@ def cmd_import(ctx, archives, webpages, group, extras_mode_existing, extras_mode
         "extras_mode_existing": ExtrasImportCode[extras_mode_existing].value,
         "extras_mode_new": extras_mode_new,
         "comment_mode": comment_mode,
+        "streaming": streaming,
+        "batch_size": batch_size,
         "non_interactive": non_interactive
     }
 
@@ -15,8 +15,6 @@ from __future__ import absolute_import
 
 import click
 
-from kiwipy import communications
-
 from aiida.cmdline.commands.cmd_verdi import verdi
 from aiida.cmdline.params import arguments, options
 from aiida.cmdline.utils import decorators, echo
@@ -170,6 +168,8 @@ def process_status(processes):
 def process_kill(processes, timeout, wait):
     """Kill running processes."""
 
+    from kiwipy import communications
+
     controller = get_manager().get_process_controller()
 
     futures = {}
@@ -201,6 +201,8 @@ def process_kill(processes, timeout, wait):
 def process_pause(processes, timeout, wait):
     """Pause running processes."""
 
+    from kiwipy import communications
+
     controller = get_manager().get_process_controller()
 
     futures = {}
@@ -232,6 +234,8 @@ def process_pause(processes, timeout, wait):
 def process_play(processes, timeout, wait):
     """Play paused processes."""
 
+    from kiwipy import communications
+
     controller = get_manager().get_process_controller()
 
     futures = {}
@@ -28,32 +28,46 @@ from aiida.cmdline.utils import decorators, echo
     type=PluginParamType(group=('aiida.calculations', 'aiida.data', 'aiida.workflows'), load=True),
     default=None,
     help='Only include nodes that are class or sub class of the class identified by this entry point.')
+@click.option(
+    '-p',
+    '--processes',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Number of worker processes to compute the hashes with.')
+@click.option(
+    '-c',
+    '--chunk-size',
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help='Number of nodes that are loaded, hashed and updated at a time.')
 @decorators.with_dbenv()
-def rehash(nodes, entry_point):
+def rehash(nodes, entry_point, processes, chunk_size):
     """Recompute the hash for nodes in the database
 
     The set of nodes that will be rehashed can be filtered by their identifier and/or based on their class.
     """
     from aiida.orm import Data, ProcessNode, QueryBuilder
+    from aiida.tools.hashing import rehash_nodes
 
     # If no explicit entry point is defined, rehash all nodes, which are either Data nodes or ProcessNodes
     if entry_point is None:
         entry_point = (Data, ProcessNode)
 
     if nodes:
-        to_hash = [(node,) for node in nodes if isinstance(node, entry_point)]
-        num_nodes = len(to_hash)
+        pks = [node.pk for node in nodes if isinstance(node, entry_point)]
+        num_nodes = len(pks)
     else:
+        pks = None
         builder = QueryBuilder()
         builder.append(entry_point, tag='node')
-        to_hash = builder.all()
         num_nodes = builder.count()
 
-    if not to_hash:
+    if not num_nodes:
         echo.echo_critical('no matching nodes found')
 
-    with click.progressbar(to_hash, label="Rehashing Nodes:") as iter_hash:
-        for node, in iter_hash:
-            node.rehash()
+    with click.progressbar(length=num_nodes, label="Rehashing Nodes:") as progress:
+        num_nodes = rehash_nodes(entry_point, pks, processes, chunk_size, progress_callback=progress.update)
 
     echo.echo_success('{} nodes re-hashed.'.format(num_nodes))
@@ -15,11 +15,23 @@ from __future__ import absolute_import
 import click
 
 from aiida.cmdline.params import options
+from aiida.cmdline.utils.lazy import LazyGroup
 from aiida.common.extendeddicts import AttributeDict
 from aiida.common import exceptions
 
+# The modules that define the sub commands of `verdi`, which are only imported when the command is invoked
+VERDI_COMMANDS = {
+    name: 'aiida.cmdline.commands.cmd_{}'.format(name) for name in [
+        'calcjob', 'code', 'comment', 'completioncommand', 'computer', 'config', 'daemon', 'data', 'database', 'devel',
+        'export', 'graph', 'group', 'import', 'node', 'plugin', 'process', 'profile', 'rehash', 'restapi', 'run',
+        'setup', 'shell', 'status', 'user'
+    ]
+}
+# The `verdi quicksetup` command is defined in the same module as `verdi setup`
+VERDI_COMMANDS['quicksetup'] = VERDI_COMMANDS['setup']
 
-@click.group(context_settings={'help_option_names': ['-h', '--help']})
+
+@click.group(cls=LazyGroup, lazy_commands=VERDI_COMMANDS, context_settings={'help_option_names': ['-h', '--help']})
 @options.PROFILE()
 @click.version_option(None, '-v', '--version', message="AiiDA version %(version)s")
 @click.pass_context
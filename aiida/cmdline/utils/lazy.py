@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Click command group that imports the modules of its sub commands lazily."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import importlib
+
+import click
+
+
+class LazyGroup(click.Group):
+    """A click command group whose sub commands are only imported when they are needed.
+
+    The group is constructed with a mapping of command names onto the modules that define them, where each module
+    registers its command on the group when it is imported, for example through the `@verdi.group('code')` decorator.
+    Listing the commands does not import any of the modules. Shell completion also retrieves every listed command, to
+    check whether it is hidden and to get its short help, so while parsing resiliently, as is done for completion, a
+    placeholder command without help is returned for the commands that are listed but not invoked.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize with a mapping of command names onto the modules that define them."""
+        self._lazy_commands = kwargs.pop('lazy_commands', {})
+        super(LazyGroup, self).__init__(*args, **kwargs)
+
+    def list_commands(self, ctx):
+        """Return the names of the sub commands, including those that have not been imported yet."""
+        return sorted(set(super(LazyGroup, self).list_commands(ctx)) | set(self._lazy_commands))
+
+    def get_command(self, ctx, name):
+        """Import the module of the sub command, if that has not been done yet, and return the command."""
+        if name not in self.commands and name in self._lazy_commands:
+            if ctx is not None and ctx.resilient_parsing and name not in ctx.protected_args + ctx.args:
+                return click.Command(name)
+
+            importlib.import_module(self._lazy_commands[name])
+
+        return super(LazyGroup, self).get_command(ctx, name)
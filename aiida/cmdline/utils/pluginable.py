@@ -11,13 +11,13 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
-import click
 
+from aiida.cmdline.utils.lazy import LazyGroup
 from aiida.common import exceptions
 from aiida.plugins.entry_point import load_entry_point, get_entry_point_names
 
 
-class Pluginable(click.Group):
+class Pluginable(LazyGroup):
     """A click command group that finds and loads plugin commands lazily."""
 
     def __init__(self, *args, **kwargs):
@@ -12,6 +12,9 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import collections
+import threading
+
 from enum import Enum, IntEnum
 
 from .extendeddicts import DefaultFieldsAttributeDict
@@ -206,3 +209,100 @@ class LazyStore(object):
         :return: the object that was popped
         """
         return self._store.pop(key)
+
+
+class LRUCache(object):
+    """
+    A mapping with a maximum size, that discards the least recently used entries once the maximum size is exceeded
+    """
+
+    def __init__(self, maxsize=128, sizeof=None):
+        """
+        :param maxsize: the maximum number of entries to keep, or the maximum total size if `sizeof` is given
+        :param sizeof: optional function that returns the size of a value, such as its number of bytes
+        """
+        self._maxsize = maxsize
+        self._sizeof = sizeof
+        self._size = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @property
+    def maxsize(self):
+        """Return the maximum number of entries that are kept, or their maximum total size if `sizeof` is given."""
+        return self._maxsize
+
+    @property
+    def size(self):
+        """Return the number of entries, or their total size if `sizeof` is given."""
+        return self._size if self._sizeof is not None else len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Get the value of the given key and mark it as most recently used
+
+        :param key: the key of the entry
+        :param default: the value to return if the key is not present
+        :return: the value or the default
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Set the value of the given key, discarding the least recently used entry if the maximum size is exceeded
+
+        :param key: the key of the entry
+        :param value: the value
+        """
+        with self._lock:
+            self._discard(key)
+            self._data[key] = value
+
+            if self._sizeof is not None:
+                self._size += self._sizeof(value)
+
+            while self.size > self._maxsize:
+                self._discard(next(iter(self._data)))
+
+    def pop(self, key, default=None):
+        """
+        Remove the entry of the given key
+
+        :param key: the key of the entry
+        :param default: the value to return if the key is not present
+        :return: the value of the removed entry or the default
+        """
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._discard(key)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def _discard(self, key):
+        """Remove the entry of the given key, if present, without acquiring the lock, and return its value."""
+        if key not in self._data:
+            return None
+
+        value = self._data.pop(key)
+
+        if self._sizeof is not None:
+            self._size -= self._sizeof(value)
+
+        return value
@@ -43,6 +43,7 @@ except ImportError:  # Python2
 from aiida.common.constants import AIIDA_FLOAT_PRECISION
 
 from .folders import Folder
+from .objectstore import ObjectTree
 
 # The prefix of the hashed using pbkdf2_sha256 algorithm in Django
 HASHING_PREFIX_DJANGO = "pbkdf2_sha256"
@@ -59,6 +60,9 @@ HASHING_KEY = "HashingKey"
 # The key that is used to store the hash in the node extras
 _HASH_EXTRA_KEY = '_aiida_hash'
 
+# The number of bytes that are read at a time when hashing the content of files
+FILE_HASH_CHUNK_SIZE = 2**20
+
 pwd_context = CryptContext(  # pylint: disable=invalid-name
     # The list of hashes that we support
     schemes=["argon2", "pbkdf2_sha256", "des_crypt"],
@@ -161,6 +165,19 @@ def _single_digest(obj_type, obj_bytes=b''):
     return blake2b(obj_bytes, person=obj_type.encode('ascii'), node_depth=0, **BLAKE2B_OPTIONS).digest()
 
 
+def _single_digest_filelike(obj_type, handle, chunk_size=FILE_HASH_CHUNK_SIZE):
+    """Return the same digest as `_single_digest` for the content of a binary filelike, reading it in chunks.
+
+    :param obj_type: the type string of the object
+    :param handle: the binary filelike object
+    :param chunk_size: the number of bytes to read at a time
+    """
+    digest = blake2b(person=obj_type.encode('ascii'), node_depth=0, **BLAKE2B_OPTIONS)
+    for chunk in iter(lambda: handle.read(chunk_size), b''):
+        digest.update(chunk)
+    return digest.digest()
+
+
 _END_DIGEST = _single_digest(')')
 
 
@@ -305,7 +322,7 @@ def _(folder, **kwargs):
             if isfile:
                 yield _single_digest('fname', name.encode('utf-8'))
                 with subfolder.open(name, mode='rb') as fhandle:
-                    yield _single_digest('fcontent', fhandle.read())
+                    yield _single_digest_filelike('fcontent', fhandle)
             else:
                 yield _single_digest('dir(', name.encode('utf-8'))
                 for digest in folder_digests(subfolder.get_subfolder(name)):
@@ -315,6 +332,33 @@ def _(folder, **kwargs):
     return [_single_digest('folder')] + [d for d in folder_digests(folder)]
 
 
+@_make_hash.register(ObjectTree)
+def _(object_tree, **kwargs):
+    """
+    Hash the content of an ObjectTree, using the hashes of its objects instead of reading their content.
+    :param ignored_folder_content: list of filenames to be ignored for the hashing
+    """
+
+    ignored_folder_content = kwargs.get('ignored_folder_content', [])
+
+    def tree_digests(tree):
+        """traverses the given tree and yields digests for the contained objects"""
+        for name, value in sorted(tree.items(), key=itemgetter(0)):
+            if name in ignored_folder_content:
+                continue
+
+            if isinstance(value, dict):
+                yield _single_digest('dir(', name.encode('utf-8'))
+                for digest in tree_digests(value):
+                    yield digest
+                yield _END_DIGEST
+            else:
+                yield _single_digest('fname', name.encode('utf-8'))
+                yield _single_digest('fobject', ObjectTree.get_digest(value))
+
+    return [_single_digest('folder')] + [d for d in tree_digests(object_tree.tree)]
+
+
 def float_to_text(value, sig):
     """
     Convert float to text string for computing hash.
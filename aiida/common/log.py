@@ -195,6 +195,15 @@ def configure_logging(with_orm=False, daemon=False, daemon_log_file=None):
             'level': get_config_option('logging.db_loglevel'),
             'class': 'aiida.orm.utils.log.DBLogHandler',
         }
+
+        # Buffer the records and write them in bulk, if a buffer size is configured
+        buffer_size = get_config_option('logging.db_log_buffer_size')
+        if buffer_size > 0:
+            config['handlers'][handler_dblogger].update({
+                'class': 'aiida.orm.utils.log.BufferedDBLogHandler',
+                'buffer_size': buffer_size,
+                'flush_interval': get_config_option('logging.db_log_flush_interval'),
+            })
         config['loggers']['aiida']['handlers'].append(handler_dblogger)
 
     dictConfig(config)
@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""A content addressed store of file objects, that deduplicates identical content and packs objects in few files.
+
+Objects are identified by the SHA-256 hash of their content. A new object is first written as a `loose` object, a
+single file in a directory sharded by its hash, which can be done concurrently by any number of processes without
+locking. Loose objects can then be moved into `pack` files, which are append-only files that each contain many objects
+and whose index, the pack and the byte range of each object, is kept in an SQLite database. This keeps the number of
+files on disk low, and since pack files only ever grow, they can be backed up incrementally.
+
+The same database stores the manifests, which map the relative paths in the repository of a node onto the hashes of
+their objects, such that nodes reference their content without having a directory of their own.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import binascii
+import errno
+import hashlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+import six
+
+from aiida.common import exceptions
+
+__all__ = ('ObjectStore', 'ObjectTree', 'get_object_store')
+
+# The number of bytes that are read at a time when streaming the content of an object
+CHUNK_SIZE = 2**16
+
+# The size above which a pack file is no longer appended to
+DEFAULT_PACK_SIZE = 2**32
+
+# The minimum age in seconds of unreferenced objects to be deleted, such that objects that were just added for a node
+# that has not yet stored its manifest are not deleted
+DEFAULT_MIN_AGE = 3600
+
+_SQL_CREATE_TABLES = (
+    'CREATE TABLE IF NOT EXISTS packed '
+    '(hash TEXT PRIMARY KEY, pack INTEGER NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL, '
+    'mtime REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS packed_pack ON packed (pack)',
+    'CREATE TABLE IF NOT EXISTS manifests (uuid TEXT PRIMARY KEY, manifest TEXT NOT NULL)',
+)
+
+_OBJECT_STORES = {}
+_OBJECT_STORES_LOCK = threading.Lock()
+
+
+def get_object_store():
+    """Return the object store of the repository of the current profile.
+
+    :return: the object store
+    :rtype: :class:`aiida.common.objectstore.ObjectStore`
+    """
+    from aiida.common.utils import get_repository_folder
+
+    basepath = get_repository_folder('container')
+
+    with _OBJECT_STORES_LOCK:
+        if basepath not in _OBJECT_STORES:
+            _OBJECT_STORES[basepath] = ObjectStore(basepath)
+
+        return _OBJECT_STORES[basepath]
+
+
+class ObjectStore(object):  # pylint: disable=useless-object-inheritance
+    """A content addressed store of loose and packed objects, with an index of the packed objects and node manifests.
+
+    An instance can be shared by threads, each of which gets its own connection to the database.
+    """
+
+    def __init__(self, basepath):
+        """Construct a store in the given directory, which is created when the first object is added.
+
+        :param basepath: absolute path of the directory of the store
+        """
+        self._basepath = basepath
+        self._local = threading.local()
+        self._pack_lock = threading.Lock()
+
+    @property
+    def basepath(self):
+        """Return the absolute path of the directory of the store."""
+        return self._basepath
+
+    def exists(self):
+        """Return whether the store has been created on disk.
+
+        :return: boolean, True if the database of the store exists
+        """
+        return os.path.isfile(self._get_database_path())
+
+    @staticmethod
+    def get_hash(handle):
+        """Return the hash of the content of the binary filelike, reading it in chunks.
+
+        :param handle: a binary filelike object
+        :return: the hexadecimal SHA-256 hash of the content
+        """
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def add_object_from_filelike(self, handle):
+        """Add an object with the content of the binary filelike, unless an object with the same content exists.
+
+        The content is streamed to a temporary file while it is hashed, which is then moved in place as a loose object.
+
+        :param handle: a binary filelike object
+        :return: the hash of the object
+        """
+        self._create()
+        digest = hashlib.sha256()
+
+        with tempfile.NamedTemporaryFile(dir=self._get_path('tmp'), delete=False) as temporary:
+            try:
+                for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    temporary.write(chunk)
+            except Exception:
+                temporary.close()
+                os.remove(temporary.name)
+                raise
+
+        object_hash = digest.hexdigest()
+
+        if self._touch_object(object_hash):
+            os.remove(temporary.name)
+        else:
+            path = self._get_loose_path(object_hash)
+            _makedirs(os.path.dirname(path))
+            os.rename(temporary.name, path)
+
+        return object_hash
+
+    def add_object(self, content):
+        """Add an object with the given content, unless an object with the same content exists.
+
+        :param content: the content as bytes
+        :return: the hash of the object
+        """
+        return self.add_object_from_filelike(io.BytesIO(content))
+
+    def add_objects_from_directory(self, path):
+        """Add an object for each file in the given directory and return the manifest of the directory.
+
+        :param path: absolute path of the directory
+        :return: dictionary of relative paths onto object hashes, where empty directories map onto None
+        """
+        manifest = {}
+
+        for relpath, abspath in _walk_directory(path):
+            if abspath is None:
+                manifest[relpath] = None
+            else:
+                with io.open(abspath, 'rb') as handle:
+                    manifest[relpath] = self.add_object_from_filelike(handle)
+
+        return manifest
+
+    def has_object(self, object_hash):
+        """Return whether the store contains the object with the given hash.
+
+        :param object_hash: the hash of the object
+        :return: boolean, True if the object exists
+        """
+        return os.path.isfile(self._get_loose_path(object_hash)) or self._get_packed(object_hash) is not None
+
+    def open_object(self, object_hash):
+        """Return a binary filelike object with which the content of the object can be streamed.
+
+        :param object_hash: the hash of the object
+        :return: a binary filelike object, which should be closed by the caller
+        :raises aiida.common.exceptions.NotExistent: if the object does not exist
+        """
+        packed = self._get_packed(object_hash)
+
+        if packed is None:
+            try:
+                return io.open(self._get_loose_path(object_hash), 'rb')
+            except (IOError, OSError) as exception:
+                if exception.errno != errno.ENOENT:
+                    raise
+
+            # The object may have been packed in the meantime
+            packed = self._get_packed(object_hash)
+
+            if packed is None:
+                raise exceptions.NotExistent('object {} does not exist'.format(object_hash))
+
+        pack, offset, length = packed
+        return io.BufferedReader(_PackedObjectReader(self._get_pack_path(pack), offset, length), CHUNK_SIZE)
+
+    def get_object_content(self, object_hash):
+        """Return the content of the object with the given hash.
+
+        :param object_hash: the hash of the object
+        :return: the content as bytes
+        :raises aiida.common.exceptions.NotExistent: if the object does not exist
+        """
+        with self.open_object(object_hash) as handle:
+            return handle.read()
+
+    def get_manifest(self, uuid):
+        """Return the manifest of the node with the given uuid.
+
+        :param uuid: the uuid of the node
+        :return: dictionary of relative paths onto object hashes, where empty directories map onto None, or None if
+            the node has no manifest
+        """
+        if not self.exists():
+            return None
+
+        row = self._get_connection().execute('SELECT manifest FROM manifests WHERE uuid = ?', (uuid,)).fetchone()
+
+        return None if row is None else json.loads(row[0])
+
+    def set_manifest(self, uuid, manifest):
+        """Set the manifest of the node with the given uuid, replacing any existing manifest.
+
+        :param uuid: the uuid of the node
+        :param manifest: dictionary of relative paths onto object hashes, where empty directories map onto None
+        """
+        self._create()
+        self._get_connection().execute('INSERT OR REPLACE INTO manifests (uuid, manifest) VALUES (?, ?)',
+                                       (uuid, json.dumps(manifest, sort_keys=True)))
+
+    def delete_manifest(self, uuid):
+        """Delete the manifest of the node with the given uuid, if it exists.
+
+        The objects that it references are not deleted, see :meth:`delete_unreferenced_objects`.
+
+        :param uuid: the uuid of the node
+        """
+        if self.exists():
+            self._get_connection().execute('DELETE FROM manifests WHERE uuid = ?', (uuid,))
+
+    def pack_loose_objects(self, pack_size=DEFAULT_PACK_SIZE):
+        """Move all loose objects into pack files.
+
+        Objects are appended to the last pack file until it exceeds the given size, after which a new pack is started.
+        The loose objects are only removed once the pack files have been synced to disk and the index is committed.
+
+        :param pack_size: the size in bytes above which a pack file is no longer appended to
+        :return: the number of objects that were packed
+        """
+        if not self.exists():
+            return 0
+
+        connection = self._get_connection()
+        packed = []
+        loose_paths = []
+
+        with self._pack_lock:
+            # The immediate transaction also prevents other processes from packing at the same time
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                pack = max(self._get_pack_ids() or [0])
+                handle = io.open(self._get_pack_path(pack), 'ab')
+                try:
+                    for object_hash, path in self._iter_loose_objects():
+                        loose_paths.append(path)
+
+                        if self._get_packed(object_hash, connection) is not None:
+                            continue
+
+                        if handle.tell() >= pack_size:
+                            _close_synced(handle)
+                            pack += 1
+                            handle = io.open(self._get_pack_path(pack), 'ab')
+
+                        offset = handle.tell()
+                        with io.open(path, 'rb') as loose:
+                            shutil.copyfileobj(loose, handle, CHUNK_SIZE)
+                        packed.append((object_hash, pack, offset, handle.tell() - offset, time.time()))
+                finally:
+                    _close_synced(handle)
+
+                connection.executemany('INSERT INTO packed (hash, pack, offset, length, mtime) VALUES (?, ?, ?, ?, ?)',
+                                       packed)
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+        for path in loose_paths:
+            _remove_file(path)
+
+        return len(packed)
+
+    def delete_unreferenced_objects(self, min_age=DEFAULT_MIN_AGE):
+        """Delete all objects that are not referenced by any manifest and have not been added for the given time.
+
+        Loose objects are removed from disk, packed objects are only removed from the index and the space they take in
+        their pack file is reclaimed by :meth:`repack`.
+
+        :param min_age: the minimum time in seconds since an object was last added, for it to be deleted
+        :return: the number of objects that were deleted
+        """
+        if not self.exists():
+            return 0
+
+        connection = self._get_connection()
+        threshold = time.time() - min_age
+        deleted = 0
+
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            referenced = set()
+            for manifest, in connection.execute('SELECT manifest FROM manifests'):
+                referenced.update(object_hash for object_hash in json.loads(manifest).values() if object_hash)
+
+            rows = connection.execute('SELECT hash, mtime FROM packed')
+            unreferenced = [(object_hash,) for object_hash, mtime in rows
+                            if object_hash not in referenced and mtime < threshold]
+            connection.executemany('DELETE FROM packed WHERE hash = ?', unreferenced)
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+        deleted += len(unreferenced)
+
+        for object_hash, path in self._iter_loose_objects():
+            if object_hash not in referenced and os.path.getmtime(path) < threshold:
+                _remove_file(path)
+                deleted += 1
+
+        return deleted
+
+    def repack(self):
+        """Rewrite the pack files that contain space of deleted objects, such that this space is reclaimed.
+
+        Each pack is checked and rewritten within an immediate transaction, which prevents other processes from packing
+        or repacking at the same time, such that no object is appended to a pack while it is being checked or removed.
+
+        :return: the number of bytes that were reclaimed
+        """
+        if not self.exists():
+            return 0
+
+        connection = self._get_connection()
+        reclaimed = 0
+
+        with self._pack_lock:
+            for pack in sorted(self._get_pack_ids()):
+                source_path = self._get_pack_path(pack)
+                rewritten = False
+
+                connection.execute('BEGIN IMMEDIATE')
+                try:
+                    size = os.path.getsize(source_path)
+                    rows = connection.execute('SELECT hash, offset, length FROM packed WHERE pack = ? ORDER BY offset',
+                                              (pack,)).fetchall()
+                    length_total = sum(length for _, _, length in rows)
+
+                    if not rows:
+                        # Nothing references the pack, so it can be removed before the lock is released
+                        _remove_file(source_path)
+                    elif length_total < size:
+                        target = max(self._get_pack_ids()) + 1
+                        updated = []
+                        with io.open(source_path, 'rb') as source, io.open(self._get_pack_path(target), 'ab') as handle:
+                            for object_hash, offset, length in rows:
+                                source.seek(offset)
+                                updated.append((target, handle.tell(), object_hash))
+                                _copy_range(source, handle, length)
+                            handle.flush()
+                            os.fsync(handle.fileno())
+                        connection.executemany('UPDATE packed SET pack = ?, offset = ? WHERE hash = ?', updated)
+                        rewritten = True
+
+                    connection.execute('COMMIT')
+                except Exception:
+                    connection.execute('ROLLBACK')
+                    raise
+
+                reclaimed += size - length_total
+
+                # The source is no longer the last pack, so no other process appends to it once the lock is released
+                if rewritten:
+                    _remove_file(source_path)
+
+        return reclaimed
+
+    def get_statistics(self):
+        """Return statistics of the content of the store.
+
+        :return: dictionary with the number of loose and packed objects, the number of packs, their total size in bytes
+            and the number of manifests
+        """
+        statistics = {'loose_objects': 0, 'packed_objects': 0, 'packs': 0, 'packs_size': 0, 'manifests': 0}
+
+        if not self.exists():
+            return statistics
+
+        connection = self._get_connection()
+        pack_ids = self._get_pack_ids()
+
+        statistics['loose_objects'] = sum(1 for _ in self._iter_loose_objects())
+        statistics['packed_objects'] = connection.execute('SELECT COUNT(*) FROM packed').fetchone()[0]
+        statistics['packs'] = len(pack_ids)
+        statistics['packs_size'] = sum(os.path.getsize(self._get_pack_path(pack)) for pack in pack_ids)
+        statistics['manifests'] = connection.execute('SELECT COUNT(*) FROM manifests').fetchone()[0]
+
+        return statistics
+
+    def _create(self):
+        """Create the directories and the database of the store, if they do not yet exist."""
+        if getattr(self._local, 'created', False):
+            return
+
+        for name in ('loose', 'packs', 'tmp'):
+            _makedirs(self._get_path(name))
+
+        connection = self._get_connection()
+        for statement in _SQL_CREATE_TABLES:
+            connection.execute(statement)
+
+        self._local.created = True
+
+    def _get_connection(self):
+        """Return the connection to the database of this thread, which is reopened after the process is forked.
+
+        The connection is in autocommit mode, such that every statement outside of an explicit transaction is committed
+        immediately.
+
+        :return: a `sqlite3.Connection`
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            _makedirs(self._basepath)
+            self._local.connection = sqlite3.connect(self._get_database_path(), timeout=60, isolation_level=None)
+            self._local.pid = os.getpid()
+            self._local.created = False
+
+        return self._local.connection
+
+    def _get_packed(self, object_hash, connection=None):
+        """Return the pack, offset and length of the packed object with the given hash.
+
+        :param object_hash: the hash of the object
+        :param connection: optional connection to use
+        :return: tuple of the pack, offset and length, or None if the object is not packed
+        """
+        if connection is None:
+            if not self.exists():
+                return None
+            connection = self._get_connection()
+
+        return connection.execute('SELECT pack, offset, length FROM packed WHERE hash = ?', (object_hash,)).fetchone()
+
+    def _touch_object(self, object_hash):
+        """Mark the object with the given hash as added now, such that it is not deleted as an unreferenced object.
+
+        :param object_hash: the hash of the object
+        :return: boolean, True if the object exists
+        """
+        try:
+            os.utime(self._get_loose_path(object_hash), None)
+            return True
+        except (IOError, OSError) as exception:
+            if exception.errno != errno.ENOENT:
+                raise
+
+        connection = self._get_connection()
+        cursor = connection.execute('UPDATE packed SET mtime = ? WHERE hash = ?', (time.time(), object_hash))
+
+        return cursor.rowcount > 0
+
+    def _iter_loose_objects(self):
+        """Yield the hash and the path of every loose object.
+
+        :return: generator of tuples of the hash and the absolute path of each loose object
+        """
+        loose_path = self._get_path('loose')
+
+        if not os.path.isdir(loose_path):
+            return
+
+        for prefix in sorted(os.listdir(loose_path)):
+            directory = os.path.join(loose_path, prefix)
+            for suffix in sorted(os.listdir(directory)):
+                yield prefix + suffix, os.path.join(directory, suffix)
+
+    def _get_pack_ids(self):
+        """Return the ids of the existing pack files.
+
+        :return: list of integers
+        """
+        packs_path = self._get_path('packs')
+
+        if not os.path.isdir(packs_path):
+            return []
+
+        return [int(name) for name in os.listdir(packs_path) if name.isdigit()]
+
+    def _get_path(self, *args):
+        return os.path.join(self._basepath, *args)
+
+    def _get_database_path(self):
+        return self._get_path('index.sqlite')
+
+    def _get_loose_path(self, object_hash):
+        return self._get_path('loose', object_hash[:2], object_hash[2:])
+
+    def _get_pack_path(self, pack):
+        return self._get_path('packs', six.text_type(pack))
+
+
+class ObjectTree(object):  # pylint: disable=useless-object-inheritance
+    """The content of a directory tree as the hashes of its objects, which is hashed by `make_hash` without reading it.
+
+    The hash is different from that of a `Folder` with the same content, but the same for a tree that is built from a
+    manifest of an object store and from a folder on disk.
+    """
+
+    def __init__(self, manifest):
+        """Construct the tree from a manifest.
+
+        :param manifest: dictionary of relative paths onto object hashes, where empty directories map onto None
+        """
+        self._tree = {}
+
+        for path, object_hash in manifest.items():
+            parts = [part for part in path.split(os.sep) if part]
+            directory = self._tree
+
+            for part in parts[:-1]:
+                directory = directory.setdefault(part, {})
+
+            if object_hash is None:
+                directory.setdefault(parts[-1], {})
+            else:
+                directory[parts[-1]] = object_hash
+
+    @classmethod
+    def from_folder(cls, folder):
+        """Construct the tree from the content of a folder on disk, by computing the hash of each of its files.
+
+        :param folder: a :class:`aiida.common.folders.Folder`
+        :return: the tree
+        """
+        return cls(get_manifest_from_directory(folder.abspath))
+
+    @property
+    def tree(self):
+        """Return the tree as nested dictionaries, where the values of files are the hashes of their content."""
+        return self._tree
+
+    @staticmethod
+    def get_digest(object_hash):
+        """Return the binary digest of the given object hash."""
+        return binascii.unhexlify(object_hash)
+
+
+def get_manifest_from_directory(path):
+    """Return the manifest of the content of a directory, by computing the hash of each of its files.
+
+    :param path: absolute path of the directory
+    :return: dictionary of relative paths onto object hashes, where empty directories map onto None
+    """
+    manifest = {}
+
+    for relpath, abspath in _walk_directory(path):
+        if abspath is None:
+            manifest[relpath] = None
+        else:
+            with io.open(abspath, 'rb') as handle:
+                manifest[relpath] = ObjectStore.get_hash(handle)
+
+    return manifest
+
+
+def _walk_directory(path):
+    """Yield the relative and absolute path of every file in a directory, and the relative path of empty directories.
+
+    :param path: absolute path of the directory
+    :return: generator of tuples of the relative path and the absolute path, which is None for empty directories
+    """
+    if not os.path.isdir(path):
+        return
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        relpath = os.path.relpath(dirpath, path)
+
+        if not dirnames and not filenames and relpath != os.curdir:
+            yield relpath, None
+
+        for filename in filenames:
+            yield os.path.normpath(os.path.join(relpath, filename)), os.path.join(dirpath, filename)
+
+
+class _PackedObjectReader(io.RawIOBase):
+    """A raw binary stream of a byte range of a pack file."""
+
+    def __init__(self, path, offset, length):
+        super(_PackedObjectReader, self).__init__()
+        self._handle = io.open(path, 'rb')
+        self._offset = offset
+        self._length = length
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._length + offset
+        else:
+            raise ValueError('invalid whence {}'.format(whence))
+
+        self._position = min(max(position, 0), self._length)
+        return self._position
+
+    def readinto(self, buffer):  # pylint: disable=redefined-builtin
+        size = min(len(buffer), self._length - self._position)
+
+        if size <= 0:
+            return 0
+
+        self._handle.seek(self._offset + self._position)
+        data = self._handle.read(size)
+        buffer[:len(data)] = data
+        self._position += len(data)
+
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._handle.close()
+        super(_PackedObjectReader, self).close()
+
+
+def _makedirs(path):
+    """Create a directory and its parents, if it does not yet exist."""
+    try:
+        os.makedirs(path)
+    except OSError as exception:
+        if exception.errno != errno.EEXIST:
+            raise
+
+
+def _remove_file(path):
+    """Remove a file, if it still exists."""
+    try:
+        os.remove(path)
+    except OSError as exception:
+        if exception.errno != errno.ENOENT:
+            raise
+
+
+def _close_synced(handle):
+    """Flush a file handle, sync it to disk and close it."""
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+
+
+def _copy_range(source, target, length):
+    """Copy the given number of bytes from the current position of the source to the target handle."""
+    while length > 0:
+        chunk = source.read(min(CHUNK_SIZE, length))
+        if not chunk:
+            raise IOError('unexpected end of pack file')
+        target.write(chunk)
+        length -= len(chunk)
@@ -57,6 +57,8 @@ def get_repository_folder(subfolder=None):
             retval = os.path.abspath(os.path.join(repository_path, 'sandbox'))
         elif subfolder == "repository":
             retval = os.path.abspath(os.path.join(repository_path, 'repository'))
+        elif subfolder == "container":
+            retval = os.path.abspath(os.path.join(repository_path, 'container'))
         else:
             raise ValueError("Invalid 'subfolder' passed to get_repository_folder: {}".format(subfolder))
         _repository_folder_cache[subfolder] = retval
@@ -243,6 +245,20 @@ def grouper(n, iterable):  # pylint: disable=invalid-name
         yield chunk
 
 
+def iter_sorted_batches(values, batch_size):
+    """
+    Yield the given values in sorted lists of at most `batch_size` values.
+
+    This is used to split large sets of ids over several queries, such that the `IN` clause of each query stays small.
+
+    :param values: iterable of values that can be sorted, for example ids
+    :param batch_size: the maximum number of values per batch
+    """
+    values = sorted(values)
+    for start in range(0, len(values), batch_size):
+        yield values[start:start + batch_size]
+
+
 class ArrayCounter(object):  # pylint: disable=useless-object-inheritance
     """
     A counter & a method that increments it and returns its value.
@@ -31,6 +31,8 @@ from aiida.plugins import DataFactory
 from aiida.schedulers.datastructures import JobState
 
 REMOTE_WORK_DIRECTORY_LOST_FOUND = 'lost+found'
+REMOTE_UPLOAD_ARCHIVE_NAME = '.aiida_upload.tar.gz'
+REMOTE_RETRIEVE_ARCHIVE_NAME = '.aiida_retrieve.tar.gz'
 
 execlogger = AIIDA_LOGGER.getChild('execmanager')
 
@@ -45,7 +47,7 @@ def upload_calculation(node, transport, calc_info, script_filename, dry_run=Fals
     :return: tuple of ``calc_info`` and ``script_filename``
     """
     from logging import LoggerAdapter
-    from tempfile import NamedTemporaryFile
+    from aiida.manage.configuration import get_config
     from aiida.orm import load_node, Code, RemoteData
 
     # If the calculation already has a `remote_folder`, simply return. The upload was apparently already completed
@@ -138,45 +140,19 @@ def upload_calculation(node, transport, calc_info, script_filename, dry_run=Fals
         workdir = transport.getcwd()
         node.set_remote_workdir(workdir)
 
-    # I first create the code files, so that the code can put
-    # default files to be overwritten by the plugin itself.
-    # Still, beware! The code file itself could be overwritten...
-    # But I checked for this earlier.
-    for code in input_codes:
-        if code.is_local():
-            # Note: this will possibly overwrite files
-            for f in code.get_folder_list():
-                transport.put(code.get_abs_path(f), f)
-            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
-
-    # In a dry_run, the working directory is the raw input folder, which will already contain these resources
-    if not dry_run:
-        for filename in folder.get_content_list():
-            logger.debug("[submission of calculation {}] copying file/folder {}...".format(node.pk, filename))
-            transport.put(folder.get_abs_path(filename), filename)
-
     # local_copy_list is a list of tuples, each with (uuid, dest_rel_path)
     # NOTE: validation of these lists are done inside calculation.presubmit()
     local_copy_list = calc_info.local_copy_list or []
     remote_copy_list = calc_info.remote_copy_list or []
     remote_symlink_list = calc_info.remote_symlink_list or []
 
-    for uuid, filename, target in local_copy_list:
-        logger.debug("[submission of calculation {}] copying local file/folder to {}".format(node.pk, target))
+    uploaded_as_archive = False
 
-        try:
-            data_node = load_node(uuid=uuid)
-        except exceptions.NotExistent:
-            logger.warning('failed to load Node<{}> specified in the `local_copy_list`'.format(uuid))
+    if not dry_run and get_config().get_option('transport.bulk_upload'):
+        uploaded_as_archive = _upload_as_archive(node, transport, input_codes, folder, local_copy_list, logger)
 
-        # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
-        # combination with the new `Transport.put_object_from_filelike`
-        # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
-        with NamedTemporaryFile(mode='wb+') as handle:
-            handle.write(data_node.get_object_content(filename, mode='rb'))
-            handle.flush()
-            handle.seek(0)
-            transport.put(handle.name, target)
+    if not uploaded_as_archive:
+        _upload_individually(node, transport, input_codes, folder, local_copy_list, logger, dry_run)
 
     if dry_run:
         if remote_copy_list:
@@ -235,6 +211,145 @@ def upload_calculation(node, transport, calc_info, script_filename, dry_run=Fals
     return calc_info, script_filename
 
 
+def _upload_individually(node, transport, codes, folder, local_copy_list, logger, dry_run=False):
+    """Upload the code files, the raw input folder and the local copy list to the remote one file at a time.
+
+    :param node: the `CalcJobNode`
+    :param transport: an already opened transport whose current directory is the remote working directory
+    :param codes: list of the `Code` instances used by the calculation
+    :param folder: the raw input folder of the calculation
+    :param local_copy_list: the `local_copy_list` of the calc info
+    :param logger: the logger adapter to use
+    :param dry_run: if True, the raw input folder is not copied as it already is the working directory
+    """
+    from tempfile import NamedTemporaryFile
+    from aiida.orm import load_node
+
+    # I first create the code files, so that the code can put
+    # default files to be overwritten by the plugin itself.
+    # Still, beware! The code file itself could be overwritten...
+    # But I checked for this earlier.
+    for code in codes:
+        if code.is_local():
+            # Note: this will possibly overwrite files
+            for f in code.get_folder_list():
+                transport.put(code.get_abs_path(f), f)
+            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
+
+    # In a dry_run, the working directory is the raw input folder, which will already contain these resources
+    if not dry_run:
+        for filename in folder.get_content_list():
+            logger.debug("[submission of calculation {}] copying file/folder {}...".format(node.pk, filename))
+            transport.put(folder.get_abs_path(filename), filename)
+
+    for uuid, filename, target in local_copy_list:
+        logger.debug("[submission of calculation {}] copying local file/folder to {}".format(node.pk, target))
+
+        try:
+            data_node = load_node(uuid=uuid)
+        except exceptions.NotExistent:
+            logger.warning('failed to load Node<{}> specified in the `local_copy_list`'.format(uuid))
+
+        # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
+        # combination with the new `Transport.put_object_from_filelike`
+        # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
+        with NamedTemporaryFile(mode='wb+') as handle:
+            handle.write(data_node.get_object_content(filename, mode='rb'))
+            handle.flush()
+            handle.seek(0)
+            transport.put(handle.name, target)
+
+
+def _upload_as_archive(node, transport, codes, folder, local_copy_list, logger):
+    """Upload the code files, the raw input folder and the local copy list to the remote in a single archive.
+
+    All files are packed in a compressed tar archive, in the same order in which they would be copied individually,
+    such that later entries overwrite earlier ones upon extraction. The archive is copied with a single `put` call
+    and is then unpacked and removed in the remote working directory with a single command.
+
+    :param node: the `CalcJobNode`
+    :param transport: an already opened transport whose current directory is the remote working directory
+    :param codes: list of the `Code` instances used by the calculation
+    :param folder: the raw input folder of the calculation
+    :param local_copy_list: the `local_copy_list` of the calc info
+    :param logger: the logger adapter to use
+    :return: True if the archive was successfully unpacked on the remote, False otherwise, in which case the files
+        should be uploaded individually instead
+    """
+    from tempfile import NamedTemporaryFile
+    from aiida.common.escaping import escape_for_bash
+
+    with NamedTemporaryFile(suffix='.tar.gz') as handle:
+
+        try:
+            _pack_upload_archive(handle, codes, folder, local_copy_list)
+        except Exception as exception:  # pylint: disable=broad-except
+            # Any problem with the files is reported by the individual upload, which is the reference behaviour
+            logger.warning('[submission of calculation {}] failed to pack the upload archive, falling back to copying '
+                           'files individually: {}'.format(node.pk, exception))
+            return False
+
+        logger.debug("[submission of calculation {}] copying all files in a single archive".format(node.pk))
+        transport.put(handle.name, REMOTE_UPLOAD_ARCHIVE_NAME)
+
+    archive_name = escape_for_bash(REMOTE_UPLOAD_ARCHIVE_NAME)
+    retval, _, stderr = transport.exec_command_wait('tar -xzpf {0} && rm -f {0}'.format(archive_name))
+
+    if retval != 0:
+        logger.warning('[submission of calculation {}] failed to unpack the upload archive on the remote, falling '
+                       'back to copying files individually: {}'.format(node.pk, stderr))
+        try:
+            transport.remove(REMOTE_UPLOAD_ARCHIVE_NAME)
+        except (IOError, OSError):
+            pass
+        return False
+
+    return True
+
+
+def _pack_upload_archive(handle, codes, folder, local_copy_list):
+    """Write the code files, the raw input folder and the local copy list to a compressed tar archive.
+
+    :param handle: the binary file handle to write the archive to, which is flushed afterwards
+    :param codes: list of the `Code` instances used by the calculation
+    :param folder: the raw input folder of the calculation
+    :param local_copy_list: the `local_copy_list` of the calc info
+    """
+    import io
+    import tarfile
+    import time
+    from aiida.orm import load_node
+
+    with tarfile.open(fileobj=handle, mode='w:gz') as archive:
+
+        for code in codes:
+            if code.is_local():
+                code_folder = code._repository._get_base_folder()  # pylint: disable=protected-access
+                executable = code.get_local_executable()
+
+                def set_executable(tarinfo, executable=executable):
+                    if tarinfo.name == executable:
+                        tarinfo.mode = 0o755  # rwxr-xr-x
+                    return tarinfo
+
+                # Directories are added recursively, just as they are copied by `put`
+                for filename in code.list_object_names():
+                    archive.add(code_folder.get_abs_path(filename), arcname=filename, filter=set_executable)
+
+        for filename in folder.get_content_list():
+            archive.add(folder.get_abs_path(filename), arcname=filename)
+
+        for uuid, filename, target in local_copy_list:
+            content = load_node(uuid=uuid).get_object_content(filename, mode='rb')
+            tarinfo = tarfile.TarInfo(name=target)
+            tarinfo.size = len(content)
+            tarinfo.mode = 0o644
+            tarinfo.mtime = time.time()
+            archive.addfile(tarinfo, io.BytesIO(content))
+
+    handle.flush()
+
+
 def submit_calculation(calculation, transport, calc_info, script_filename):
     """
     Submit a calculation
@@ -465,10 +580,18 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
     treated as the work directory of the folder and the depth integer determines
     upto what level of the original remotepath nesting the files will be copied.
 
+    If the `transport.bulk_retrieve` configuration option is enabled, all resolved remote items are first packed in a
+    single archive on the remote, which is retrieved with a single `get` call and unpacked locally. Any item that
+    cannot be found in that archive is then retrieved individually.
+
     :param transport: the Transport instance
     :param folder: an absolute path to a folder to copy files in
     :param retrieve_list: the list of files to retrieve
     """
+    from aiida.manage.configuration import get_config
+
+    remote_local_pairs = []
+
     for item in retrieve_list:
         if isinstance(item, list):
             tmp_rname, tmp_lname, depth = item
@@ -481,7 +604,7 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
                     local_names.append(os.path.sep.join([tmp_lname] + to_append))
             else:
                 remote_names = [tmp_rname]
-                to_append = remote_names.split(os.path.sep)[-depth:] if depth > 0 else []
+                to_append = tmp_rname.split(os.path.sep)[-depth:] if depth > 0 else []
                 local_names = [os.path.sep.join([tmp_lname] + to_append)]
             if depth > 1:  # create directories in the folder, if needed
                 for this_local_file in local_names:
@@ -498,7 +621,121 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
                 remote_names = [item]
                 local_names = [os.path.split(item)[1]]
 
-        for rem, loc in zip(remote_names, local_names):
-            transport.logger.debug(
-                "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem))
-            transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+        remote_local_pairs.extend(zip(remote_names, local_names))
+
+    if len(remote_local_pairs) > 1 and get_config().get_option('transport.bulk_retrieve'):
+        remote_local_pairs = _retrieve_as_archive(calculation, transport, folder, remote_local_pairs)
+
+    for rem, loc in remote_local_pairs:
+        transport.logger.debug(
+            "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem))
+        transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+
+
+def _retrieve_as_archive(calculation, transport, folder, remote_local_pairs):
+    """
+    Retrieve remote items by packing them in a single archive on the remote that is retrieved and unpacked locally.
+
+    The remote names are passed to `tar` through its standard input, such that a single command suffices
+    regardless of the number of items. Only options that are understood by both GNU and BSD `tar` are used. Items that
+    cannot be read are skipped by `tar`, which then still writes the archive but exits with a non-zero status, so the
+    status is not relied upon: names that cannot be passed safely, or that are not found in the retrieved archive, are
+    returned such that the caller can retrieve them individually. If the archive cannot be created, retrieved or read
+    at all, all items are returned.
+
+    Symbolic links are followed when packing, just like `Transport.get` does by default, such that a retrieved link is
+    replaced by a copy of its target. Dangling links are therefore not retrieved.
+
+    :param calculation: the `CalcJobNode`
+    :param transport: the Transport instance, whose current directory is the remote working directory
+    :param folder: an absolute path to a folder to copy files in
+    :param remote_local_pairs: list of tuples of remote name and the local name relative to `folder`
+    :return: list of tuples of remote and local name that were not retrieved through the archive
+    """
+    import tarfile
+    from aiida.common.escaping import escape_for_bash
+
+    archivable = []
+    remaining = []
+
+    for rem, loc in remote_local_pairs:
+        if rem.startswith('-') or '\n' in rem:
+            remaining.append((rem, loc))
+        else:
+            archivable.append((rem, loc))
+
+    archive_name = escape_for_bash(REMOTE_RETRIEVE_ARCHIVE_NAME)
+    command = 'tar -czhf {} -T -'.format(archive_name)
+    stdin = '\n'.join([rem for rem, _ in archivable]) + '\n'
+
+    transport.logger.debug("[retrieval of calc {}] Packing {} remote items in a single archive".format(
+        calculation.pk, len(archivable)))
+    retval, _, stderr = transport.exec_command_wait(command, stdin=stdin)
+
+    if retval != 0:
+        transport.logger.debug("[retrieval of calc {}] not all items could be packed in the retrieve archive, they "
+                               "will be retrieved individually: {}".format(calculation.pk, stderr))
+
+    with SandboxFolder() as sandbox:
+        archive_path = sandbox.get_abs_path(REMOTE_RETRIEVE_ARCHIVE_NAME)
+        extracted = sandbox.get_subfolder('extracted', create=True)
+
+        try:
+            try:
+                transport.get(REMOTE_RETRIEVE_ARCHIVE_NAME, archive_path)
+            finally:
+                transport.remove(REMOTE_RETRIEVE_ARCHIVE_NAME)
+
+            with tarfile.open(archive_path, mode='r:gz') as archive:
+                # Only extract regular files, directories and hard links that end up within the extraction folder
+                members = [
+                    member for member in archive.getmembers()
+                    if (member.isfile() or member.isdir() or member.islnk()) and _is_relative_path(member.name) and
+                    (not member.islnk() or _is_relative_path(member.linkname))
+                ]
+                archive.extractall(extracted.abspath, members=members)
+        except (IOError, OSError, EOFError, tarfile.TarError) as exception:
+            transport.logger.warning("[retrieval of calc {}] failed to retrieve the archive from the remote, falling "
+                                     "back to retrieving items individually: {} {}".format(
+                                         calculation.pk, stderr, exception))
+            return remote_local_pairs
+
+        for rem, loc in archivable:
+            # Leading separators of absolute paths are stripped by `tar` when creating the archive
+            source = os.path.join(extracted.abspath, os.path.normpath(rem).lstrip(os.sep))
+            if os.path.exists(source):
+                _copy_retrieved_item(source, os.path.join(folder, loc))
+            else:
+                remaining.append((rem, loc))
+
+    return remaining
+
+
+def _is_relative_path(name):
+    """
+    Return whether the name of an archive member is a relative path that does not point outside of the archive.
+
+    :param name: the name of the member
+    """
+    name = os.path.normpath(name)
+    return not os.path.isabs(name) and name != os.pardir and not name.startswith(os.pardir + os.sep)
+
+
+def _copy_retrieved_item(source, destination):
+    """
+    Copy a file or folder that was extracted from a retrieve archive to its final destination.
+
+    This mirrors the behavior of `Transport.get`, meaning that a folder copied to an existing folder is nested inside
+    it.
+
+    :param source: absolute path of the extracted file or folder
+    :param destination: absolute path of the destination
+    """
+    import shutil
+
+    if os.path.isdir(source):
+        if os.path.isdir(destination):
+            destination = os.path.join(destination, os.path.basename(source))
+        shutil.copytree(source, destination)
+    else:
+        shutil.copyfile(source, destination)
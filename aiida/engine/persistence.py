@@ -12,18 +12,29 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import base64
 import logging
 import traceback
+import zlib
 
 import plumpy
 
 from aiida.orm.utils import serialize
 
-__all__ = ('AiiDAPersister', 'ObjectLoader', 'get_object_loader')
+__all__ = ('AiiDAPersister', 'ObjectLoader', 'get_object_loader', 'encode_checkpoint', 'decode_checkpoint')
 
 LOGGER = logging.getLogger(__name__)
 OBJECT_LOADER = None
 
+CHECKPOINT_CODEC_YAML = 'yaml'
+CHECKPOINT_CODEC_JSON = 'json'
+CHECKPOINT_CODEC_JSON_ZLIB = 'json-zlib'
+CHECKPOINT_CODECS = (CHECKPOINT_CODEC_YAML, CHECKPOINT_CODEC_JSON, CHECKPOINT_CODEC_JSON_ZLIB)
+
+# Checkpoints written with the YAML codec have no prefix, which keeps checkpoints of older versions readable
+CHECKPOINT_PREFIX_JSON = 'aiida-json:'
+CHECKPOINT_PREFIX_JSON_ZLIB = 'aiida-json-zlib:'
+
 ObjectLoader = plumpy.DefaultObjectLoader
 
 
@@ -40,12 +51,81 @@ def get_object_loader():
     return OBJECT_LOADER
 
 
+def encode_checkpoint(bundle, codec=CHECKPOINT_CODEC_YAML):
+    """
+    Encode a process checkpoint bundle into a string that can be stored in the attributes of the process node
+
+    With the JSON codecs, bundles containing types that cannot be represented in JSON are encoded with the YAML codec.
+
+    :param bundle: the checkpoint bundle
+    :param codec: the codec to use, one of `CHECKPOINT_CODECS`
+    :return: the encoded checkpoint
+    :raises ValueError: if the codec is not supported
+    """
+    if codec not in CHECKPOINT_CODECS:
+        raise ValueError('unsupported checkpoint codec `{}`, choose from {}'.format(codec, CHECKPOINT_CODECS))
+
+    if codec == CHECKPOINT_CODEC_YAML:
+        return serialize.serialize(bundle)
+
+    try:
+        serialized = serialize.serialize_json(bundle)
+    except TypeError:
+        LOGGER.debug('checkpoint cannot be encoded as JSON, falling back to YAML')
+        return serialize.serialize(bundle)
+
+    if codec == CHECKPOINT_CODEC_JSON_ZLIB:
+        compressed = base64.b64encode(zlib.compress(serialized.encode('utf-8')))
+        return CHECKPOINT_PREFIX_JSON_ZLIB + compressed.decode('ascii')
+
+    return CHECKPOINT_PREFIX_JSON + serialized
+
+
+def decode_checkpoint(checkpoint):
+    """
+    Decode a process checkpoint bundle from the string returned by `encode_checkpoint`
+
+    The codec is determined from the checkpoint itself, so checkpoints written with any codec can be decoded.
+
+    :param checkpoint: the encoded checkpoint
+    :return: the checkpoint bundle
+    """
+    if checkpoint.startswith(CHECKPOINT_PREFIX_JSON_ZLIB):
+        compressed = checkpoint[len(CHECKPOINT_PREFIX_JSON_ZLIB):].encode('ascii')
+        return serialize.deserialize_json(zlib.decompress(base64.b64decode(compressed)).decode('utf-8'))
+
+    if checkpoint.startswith(CHECKPOINT_PREFIX_JSON):
+        return serialize.deserialize_json(checkpoint[len(CHECKPOINT_PREFIX_JSON):])
+
+    return serialize.deserialize(checkpoint)
+
+
 class AiiDAPersister(plumpy.Persister):
     """
     This node is responsible to taking saved process instance states and
     persisting them to the database.
+
+    The checkpoints are encoded with the codec passed to the constructor, but checkpoints encoded with any of the
+    supported codecs, including those written by older versions that always used YAML, can be loaded.
     """
 
+    def __init__(self, codec=CHECKPOINT_CODEC_YAML):
+        """
+        Construct a new persister
+
+        :param codec: the codec to encode checkpoints with, one of `CHECKPOINT_CODECS`
+        """
+        if codec not in CHECKPOINT_CODECS:
+            raise ValueError('unsupported checkpoint codec `{}`, choose from {}'.format(codec, CHECKPOINT_CODECS))
+
+        super(AiiDAPersister, self).__init__()
+        self._codec = codec
+
+    @property
+    def codec(self):
+        """Return the codec used to encode checkpoints."""
+        return self._codec
+
     def save_checkpoint(self, process, tag=None):
         """
         Persist a Process instance
@@ -67,7 +147,10 @@ class AiiDAPersister(plumpy.Persister):
                 process, traceback.format_exc()))
 
         try:
-            process.node.set_checkpoint(serialize.serialize(bundle))
+            checkpoint = encode_checkpoint(bundle, self._codec)
+            # Avoid rewriting the attribute if nothing changed since the last checkpoint
+            if checkpoint != process.node.checkpoint:
+                process.node.set_checkpoint(checkpoint)
         except Exception:
             raise plumpy.PersistenceError("Failed to store a checkpoint for '{}': {}".format(
                 process, traceback.format_exc()))
@@ -102,7 +185,7 @@ class AiiDAPersister(plumpy.Persister):
             raise plumpy.PersistenceError('Calculation<{}> does not have a saved checkpoint'.format(calculation.pk))
 
         try:
-            bundle = serialize.deserialize(checkpoint)
+            bundle = decode_checkpoint(checkpoint)
         except Exception:
             raise plumpy.PersistenceError("Failed to load the checkpoint for process<{}>: {}".format(
                 pid, traceback.format_exc()))
@@ -13,16 +13,19 @@ from __future__ import print_function
 from __future__ import absolute_import
 
 import contextlib
+import io
+import os
+import tempfile
 import time
 
 from six import iteritems, itervalues
 from tornado import concurrent, gen
 
 from aiida import schedulers
-from aiida.common import exceptions, lang
+from aiida.common import exceptions, json, lang
 from aiida.common.log import AIIDA_LOGGER
 
-__all__ = ('JobsList', 'JobManager')
+__all__ = ('JobsList', 'JobManager', 'SharedJobsCache')
 
 
 class JobsList(object):  # pylint: disable=useless-object-inheritance
@@ -40,9 +43,23 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
     launched with that particular authinfo. If multiple authinfo instances with the same computer, have active jobs
     these limitations are not respected between them, since there is no communication between ``JobsList`` instances.
     See the :py:class:`~aiida.engine.processes.calcjobs.manager.JobManager` for example usage.
+
+    To share the polling of the scheduler between the ``JobsList`` instances of different runners, for example the
+    workers of the daemon, a :py:class:`~aiida.engine.processes.calcjobs.manager.SharedJobsCache` can be passed. The
+    jobs list will then first look for a sufficiently recent scheduler response in that cache that contains all the
+    jobs it is interested in, before polling the scheduler itself. Only responses that were obtained after the update
+    of each of the jobs was requested are used, because a job that was submitted after the response was obtained is
+    missing from it, which would otherwise be interpreted as the job having finished.
+
+    The interval between updates is adapted to how often the jobs actually change state: each time an update shows
+    no change for any of the requested jobs, the interval is doubled, up to ``MAXIMUM_UPDATE_INTERVAL_FACTOR`` times
+    the minimum interval. As soon as a change is observed, or a job is requested that has not been seen before, the
+    interval is reset to the minimum.
     """
 
-    def __init__(self, authinfo, transport_queue, last_updated=None):
+    MAXIMUM_UPDATE_INTERVAL_FACTOR = 4
+
+    def __init__(self, authinfo, transport_queue, last_updated=None, shared_cache=None):
         """Construct an instance for the given authinfo and transport queue.
 
         :param authinfo: The authinfo used to check the jobs list
@@ -51,6 +68,8 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
         :type: :class:`aiida.engine.transports.TransportQueue`
         :param last_updated: initialize the last updated timestamp
         :type: float
+        :param shared_cache: optional cache of scheduler responses shared with other jobs lists of the same authinfo
+        :type: :class:`aiida.engine.processes.calcjobs.manager.SharedJobsCache`
         """
         lang.type_check(last_updated, float, allow_none=True)
 
@@ -58,11 +77,14 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
         self._transport_queue = transport_queue
         self._loop = transport_queue.loop()
         self._logger = AIIDA_LOGGER.getChild('calcjobs')
+        self._shared_cache = shared_cache
 
         self._jobs_cache = {}
         self._job_update_requests = {}  # Mapping: {job_id: Future}
+        self._job_update_request_times = {}  # Mapping: {job_id: time at which the update was first requested}
         self._last_updated = last_updated
         self._update_handle = None
+        self._update_interval_factor = 1
 
     @property
     def logger(self):
@@ -89,6 +111,15 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
         """
         return self._last_updated
 
+    @property
+    def update_interval_factor(self):
+        """Return the current factor with which the minimum update interval is multiplied.
+
+        :return: the update interval factor
+        :rtype: int
+        """
+        return self._update_interval_factor
+
     @gen.coroutine
     def _get_jobs_from_scheduler(self):
         """Get the current jobs list from the scheduler.
@@ -96,17 +127,39 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
         :return: a mapping of job ids to :py:class:`~aiida.schedulers.datastructures.JobInfo` instances
         :rtype: dict
         """
+        scheduler = self._authinfo.computer.get_scheduler()
+        requested_job_ids = self._get_jobs_with_scheduler()
+        can_query_by_user = scheduler.get_feature('can_query_by_user')
+
+        if self._shared_cache is not None:
+            # Only a response obtained after the update of every requested job was requested is guaranteed to include
+            # all those jobs that are still with the scheduler
+            request_times = list(itervalues(self._job_update_request_times))
+            cached = self._shared_cache.get(
+                requested_job_ids,
+                max_age=self.get_minimum_update_interval(),
+                requested_after=max(request_times) if request_times else None)
+            if cached is not None:
+                self._last_updated, jobs_cache = cached
+                self.logger.info('AuthInfo<{}>: retrieved status of active jobs from shared cache'.format(
+                    self._authinfo.pk))
+                raise gen.Return(jobs_cache)
+
         with self._transport_queue.request_transport(self._authinfo) as request:
             transport = yield request
 
-            scheduler = self._authinfo.computer.get_scheduler()
             scheduler.set_transport(transport)
 
             kwargs = {'as_dict': True}
-            if scheduler.get_feature('can_query_by_user'):
+            if can_query_by_user:
                 kwargs['user'] = "$USER"
+                queried_job_ids = None
             else:
-                kwargs['jobs'] = self._get_jobs_with_scheduler()
+                queried_job_ids = requested_job_ids
+                if self._shared_cache is not None:
+                    # Also query the jobs of other runners that are still active so the response can be shared
+                    queried_job_ids = sorted(set(queried_job_ids).union(self._shared_cache.get_active_job_ids()))
+                kwargs['jobs'] = queried_job_ids
 
             scheduler_response = scheduler.get_jobs(**kwargs)
 
@@ -115,18 +168,28 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
             jobs_cache = {}
             self.logger.info('AuthInfo<{}>: successfully retrieved status of active jobs'.format(self._authinfo.pk))
 
+            # Get the detailed job information of the jobs that are done in a single request if the scheduler supports
+            # it. Unless the response is shared, this is only needed for the jobs that have actually been requested.
+            done_job_ids = [
+                job_id for job_id, job_info in iteritems(scheduler_response)
+                if job_info.job_state == schedulers.JobState.DONE and
+                (self._shared_cache is not None or job_id in requested_job_ids)
+            ]
+
+            try:
+                detailed_job_infos = scheduler.get_detailed_jobinfos(done_job_ids)
+            except exceptions.FeatureNotAvailable:
+                detailed_job_infos = {
+                    job_id: 'This scheduler does not implement get_detailed_jobinfo' for job_id in done_job_ids
+                }
+
             for job_id, job_info in iteritems(scheduler_response):
-                # If the job is done then get detailed job information
-                detailed_job_info = None
-                if job_info.job_state == schedulers.JobState.DONE:
-                    try:
-                        detailed_job_info = scheduler.get_detailed_jobinfo(job_id)
-                    except exceptions.FeatureNotAvailable:
-                        detailed_job_info = 'This scheduler does not implement get_detailed_jobinfo'
-
-                job_info.detailedJobinfo = detailed_job_info
+                job_info.detailedJobinfo = detailed_job_infos.get(job_id, None)
                 jobs_cache[job_id] = job_info
 
+            if self._shared_cache is not None:
+                self._shared_cache.set(self._last_updated, queried_job_ids, jobs_cache)
+
             raise gen.Return(jobs_cache)
 
     @gen.coroutine
@@ -141,7 +204,9 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
                 return
 
             # Update our cache of the job states
-            self._jobs_cache = yield self._get_jobs_from_scheduler()
+            jobs_cache = yield self._get_jobs_from_scheduler()
+            self._update_interval(self._jobs_cache, jobs_cache)
+            self._jobs_cache = jobs_cache
         except Exception as exception:
             # Set the exception on all the update futures
             for future in itervalues(self._job_update_requests):
@@ -154,6 +219,7 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
                     future.set_result(self._jobs_cache.get(job_id, None))
         finally:
             self._job_update_requests = {}
+            self._job_update_request_times = {}
 
     @contextlib.contextmanager
     def request_job_info_update(self, job_id):
@@ -166,8 +232,13 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
         """
         # Get or create the future
         request = self._job_update_requests.setdefault(job_id, concurrent.Future())
+        self._job_update_request_times.setdefault(job_id, time.time())
         assert not request.done(), 'Expected pending job info future, found in done state.'
 
+        if job_id not in self._jobs_cache:
+            # A job that we have not seen before, so make sure its first update is not delayed
+            self._update_interval_factor = 1
+
         try:
             self._ensure_updating()
             yield request
@@ -211,11 +282,25 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
 
         return old.job_state != new.job_state or old.job_substate != new.job_substate
 
+    def _update_interval(self, old_jobs_cache, new_jobs_cache):
+        """Adapt the update interval factor based on whether any of the requested jobs changed state.
+
+        :param old_jobs_cache: the jobs cache of the previous update
+        :param new_jobs_cache: the jobs cache of the current update
+        """
+        for job_id in self._job_update_requests:
+            if job_id not in old_jobs_cache or self._has_job_state_changed(
+                    old_jobs_cache.get(job_id, None), new_jobs_cache.get(job_id, None)):
+                self._update_interval_factor = 1
+                return
+
+        self._update_interval_factor = min(self._update_interval_factor * 2, self.MAXIMUM_UPDATE_INTERVAL_FACTOR)
+
     def _get_next_update_delay(self):
         """Calculate when we are next allowed to poll the scheduler.
 
         This delay is calculated as the minimum polling interval defined by the authentication info for this instance,
-        minus time elapsed since the last update.
+        multiplied by the current update interval factor, minus time elapsed since the last update.
 
         :return: delay (in seconds) after which the scheduler may be polled again
         :rtype: float
@@ -225,10 +310,10 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
             return 0.
 
         # Make sure to actually 'get' the minimum interval here, in case the user changed since last time
-        minimum_interval = self.get_minimum_update_interval()
+        interval = self.get_minimum_update_interval() * self._update_interval_factor
         elapsed = time.time() - self.last_updated
 
-        delay = max(minimum_interval - elapsed, 0.)
+        delay = max(interval - elapsed, 0.)
 
         return delay
 
@@ -244,6 +329,107 @@ class JobsList(object):  # pylint: disable=useless-object-inheritance
         return [str(job_id) for job_id, _ in self._job_update_requests.items()]
 
 
+class SharedJobsCache(object):  # pylint: disable=useless-object-inheritance
+    """File based cache of the scheduler response for the jobs of an ``AuthInfo`` that can be shared between runners.
+
+    The cache records the time of the scheduler response, the job ids that were queried, or `None` if all jobs of the
+    user were queried, and the job infos of the response. The file is replaced atomically, such that different
+    processes can read and write it concurrently without locking.
+    """
+
+    def __init__(self, filepath):
+        """Construct a new instance.
+
+        :param filepath: absolute path of the cache file
+        """
+        self._filepath = filepath
+
+    @property
+    def filepath(self):
+        """Return the absolute path of the cache file."""
+        return self._filepath
+
+    def _load(self):
+        """Load the content of the cache file.
+
+        :return: the content of the cache or None if it does not exist or cannot be read
+        """
+        try:
+            with io.open(self._filepath, 'r', encoding='utf8') as handle:
+                return json.load(handle)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def get(self, job_ids, max_age, requested_after=None):
+        """Return the cached scheduler response if it is recent enough and contains all given job ids.
+
+        :param job_ids: list of job ids that the response should contain
+        :param max_age: the maximum age in seconds of the response
+        :param requested_after: optional timestamp before which the response should not have been obtained, typically
+            the time at which the update of the jobs was requested. A job that was submitted after the response was
+            obtained would be missing from it, as if it had already finished.
+        :return: tuple of the timestamp of the response and a mapping of job ids to `JobInfo` instances, or None
+        """
+        from aiida.schedulers.datastructures import JobInfo
+
+        content = self._load()
+
+        if content is None or time.time() - content['timestamp'] > max_age:
+            return None
+
+        if requested_after is not None and content['timestamp'] < requested_after:
+            return None
+
+        if content['job_ids'] is not None and not set(job_ids).issubset(content['job_ids']):
+            return None
+
+        jobs = {}
+        for job_id, serialized in iteritems(content['jobs']):
+            job_info = JobInfo()
+            job_info.load_from_serialized(serialized)
+            jobs[job_id] = job_info
+
+        return content['timestamp'], jobs
+
+    def get_active_job_ids(self):
+        """Return the ids of the jobs that were still with the scheduler according to the cached response.
+
+        :return: list of job ids
+        """
+        content = self._load()
+
+        if content is None:
+            return []
+
+        return list(content['jobs'].keys())
+
+    def set(self, timestamp, job_ids, jobs):
+        """Replace the cached scheduler response.
+
+        :param timestamp: the timestamp of the response
+        :param job_ids: the list of job ids that were queried, or None if all the jobs of the user were queried
+        :param jobs: a mapping of job ids to `JobInfo` instances
+        """
+        content = {
+            'timestamp': timestamp,
+            'job_ids': job_ids,
+            'jobs': {job_id: job_info.serialize() for job_id, job_info in iteritems(jobs)},
+        }
+
+        dirpath = os.path.dirname(self._filepath)
+
+        try:
+            if not os.path.isdir(dirpath):
+                os.makedirs(dirpath)
+
+            filedescriptor, temppath = tempfile.mkstemp(dir=dirpath)
+            with io.open(filedescriptor, 'wb') as handle:
+                json.dump(content, handle)
+            os.rename(temppath, self._filepath)
+        except (IOError, OSError) as exception:
+            AIIDA_LOGGER.getChild('calcjobs').warning('failed to write the shared jobs cache: {}'.format(exception))
+
+
 class JobManager(object):
     """A manager for :py:class:`~aiida.engine.processes.calcjobs.calcjob.CalcJob` submitted to ``Computer`` instances.
 
@@ -256,13 +442,22 @@ class JobManager(object):
     As long as a :py:class:`~aiida.engine.runners.Runner` will create a single ``JobManager`` instance and use that for
     its lifetime, the guarantees made by the ``JobsList`` about respecting the minimum polling interval of the scheduler
     will be maintained. Note, however, that since each ``Runner`` will create its own job manager, these guarantees
-    only hold per runner.
+    only hold per runner, unless a directory for shared jobs caches is specified. In that case, each jobs list will
+    share the responses of the scheduler, through a cache file for its authinfo in that directory, with the job lists
+    of all other runners that use the same directory.
     """
 
     # pylint: disable=useless-object-inheritance
 
-    def __init__(self, transport_queue):
+    def __init__(self, transport_queue, shared_cache_directory=None):
+        """Construct a new instance.
+
+        :param transport_queue: A transport queue
+        :type: :class:`aiida.engine.transports.TransportQueue`
+        :param shared_cache_directory: optional absolute path of the directory for the shared jobs caches
+        """
         self._transport_queue = transport_queue
+        self._shared_cache_directory = shared_cache_directory
         self._job_lists = {}
 
     def get_jobs_list(self, authinfo):
@@ -272,7 +467,11 @@ class JobManager(object):
         :return: a `JobsList` instance
         """
         if authinfo.id not in self._job_lists:
-            self._job_lists[authinfo.id] = JobsList(authinfo, self._transport_queue)
+            shared_cache = None
+            if self._shared_cache_directory is not None:
+                filepath = os.path.join(self._shared_cache_directory, 'authinfo-{}.json'.format(authinfo.id))
+                shared_cache = SharedJobsCache(filepath)
+            self._job_lists[authinfo.id] = JobsList(authinfo, self._transport_queue, shared_cache=shared_cache)
 
         return self._job_lists[authinfo.id]
 
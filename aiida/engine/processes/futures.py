@@ -26,27 +26,40 @@ class CalculationFuture(plumpy.Future):
     listening for broadcast events if possible
     """
     _filtered = None
+    _notifier = None
 
-    def __init__(self, pk, loop=None, poll_interval=None, communicator=None):
+    def __init__(self, pk, loop=None, poll_interval=None, communicator=None, notifier=None):
         """
         Get a future for a calculation node being finished.  If a None poll_interval is
         supplied polling will not be used.  If a communicator is supplied it will be used
-        to listen for broadcast messages.
+        to listen for broadcast messages.  If a notifier is supplied it will be used to
+        listen for termination notifications sent through the database.
 
         :param pk: The calculation pk
         :param loop: An event loop
         :param poll_interval: The polling interval.  Can be None in which case no polling.
         :param communicator: A communicator.   Can be None in which case no broadcast listens.
+        :param notifier: A process termination notifier.  Can be None in which case no notification listens.
+        :type notifier: :class:`aiida.manage.external.pgnotify.ProcessTerminationNotifier`
         """
         from aiida.orm import load_node
         from .process import ProcessState
 
         super(CalculationFuture, self).__init__()
-        assert not (poll_interval is None and communicator is None), 'Must poll or have a communicator to use'
+        assert not (poll_interval is None and communicator is None and notifier is None), \
+            'Must poll or have a communicator or notifier to use'
 
         calc_node = load_node(pk=pk)
+        self._pk = pk
+        self._calc_node = calc_node
+
+        # Register for notifications before checking the state, so that a termination in between is not missed
+        if notifier is not None and not calc_node.is_terminated:
+            self._notifier = notifier
+            self._notifier.add_callback(pk, self._on_notification)
 
         if calc_node.is_terminated:
+            self.cleanup()
             self.set_result(calc_node)
         else:
             self._communicator = communicator
@@ -64,12 +77,22 @@ class CalculationFuture(plumpy.Future):
                 loop.add_callback(self._poll_calculation, calc_node, poll_interval)
 
     def cleanup(self):
-        """Clean up the future by removing broadcast subscribers from the communicator if it still exists."""
-        if self._communicator is not None:
+        """Clean up the future by removing broadcast subscribers and notification callbacks if they still exist."""
+        if getattr(self, '_communicator', None) is not None:
             self._communicator.remove_broadcast_subscriber(self._filtered)
             self._filtered = None
             self._communicator = None
 
+        if self._notifier is not None:
+            self._notifier.remove_callback(self._pk, self._on_notification)
+            self._notifier = None
+
+    def _on_notification(self, _pk):
+        """Callback for the notification that the calculation has terminated."""
+        self._notifier = None
+        if not self.done():
+            self.set_result(self._calc_node)
+
     @tornado.gen.coroutine
     def _poll_calculation(self, calc_node, poll_interval):
         """Poll whether the calculation node has reached a terminal state."""
@@ -33,6 +33,7 @@ from aiida.common.extendeddicts import AttributeDict
 from aiida.common.lang import classproperty, override, protected
 from aiida.common.links import LinkType
 from aiida.common.log import LOG_LEVEL_REPORT
+from aiida.orm.utils.log import flush_db_log_handlers
 
 from .exit_code import ExitCode
 from .builder import ProcessBuilder
@@ -346,11 +347,24 @@ class Process(plumpy.Process):
             except BaseException:
                 self.logger.exception('Failed to delete checkpoint')
 
+        # Write the buffered log records of the process before it is sealed and its termination is announced
+        try:
+            flush_db_log_handlers()
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception('Failed to write the buffered log records')
+
         try:
             self.node.seal()
         except exceptions.ModificationNotAllowed:
             pass
 
+        notifier = self.runner.notifier
+        if notifier is not None:
+            try:
+                notifier.notify(self.node.pk)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception('Failed to notify the termination of the process')
+
     @override
     def on_except(self, exc_info):
         """
@@ -32,6 +32,10 @@ __all__ = ('Runner',)
 
 LOGGER = logging.getLogger(__name__)
 
+# The interval in seconds at which processes are still polled while their termination is awaited through notifications,
+# since processes that terminate in a runner without notifications, or while the connection is down, are not notified
+NOTIFICATION_POLL_INTERVAL = 60
+
 ResultAndNode = collections.namedtuple('ResultAndNode', ['result', 'node'])
 ResultAndPk = collections.namedtuple('ResultAndPk', ['result', 'pk'])
 
@@ -44,7 +48,15 @@ class Runner(object):  # pylint: disable=useless-object-inheritance
     _controller = None
     _closed = False
 
-    def __init__(self, poll_interval=0, loop=None, communicator=None, rmq_submit=False, persister=None):
+    def __init__(self,
+                 poll_interval=0,
+                 loop=None,
+                 communicator=None,
+                 rmq_submit=False,
+                 persister=None,
+                 transport_idle_timeout=0,
+                 jobs_cache_directory=None,
+                 process_notifications=False):
         """
         Construct a new runner
 
@@ -56,6 +68,10 @@ class Runner(object):  # pylint: disable=useless-object-inheritance
         :param rmq_submit: if True, processes will be submitted to RabbitMQ, otherwise they will be scheduled here
         :param persister: the persister to use to persist processes
         :type persister: :class:`plumpy.Persister`
+        :param transport_idle_timeout: seconds that an unused open transport is kept alive to be reused
+        :param jobs_cache_directory: optional directory through which scheduler job states are shared with other runners
+        :param process_notifications: if True, the termination of processes is notified and awaited through the
+            database with `LISTEN` and `NOTIFY`, while the state of the process nodes is polled at a coarse interval
         """
         assert not (rmq_submit and persister is None), \
             'Must supply a persister if you want to submit using communicator'
@@ -63,9 +79,14 @@ class Runner(object):  # pylint: disable=useless-object-inheritance
         self._loop = loop if loop is not None else tornado.ioloop.IOLoop()
         self._poll_interval = poll_interval
         self._rmq_submit = rmq_submit
-        self._transport = transports.TransportQueue(self._loop)
-        self._job_manager = manager.JobManager(self._transport)
+        self._transport = transports.TransportQueue(self._loop, idle_timeout=transport_idle_timeout)
+        self._job_manager = manager.JobManager(self._transport, shared_cache_directory=jobs_cache_directory)
         self._persister = persister
+        self._notifier = None
+
+        if process_notifications:
+            from aiida.manage.external.pgnotify import ProcessTerminationNotifier
+            self._notifier = ProcessTerminationNotifier(self._loop)
 
         if communicator is not None:
             self._communicator = communicator
@@ -108,6 +129,16 @@ class Runner(object):  # pylint: disable=useless-object-inheritance
         """
         return self._communicator
 
+    @property
+    def notifier(self):
+        """
+        Get the process termination notifier used by this runner
+
+        :return: the notifier or None if process notifications are disabled
+        :rtype: :class:`aiida.manage.external.pgnotify.ProcessTerminationNotifier`
+        """
+        return self._notifier
+
     @property
     def job_manager(self):
         return self._job_manager
@@ -142,8 +173,11 @@ class Runner(object):  # pylint: disable=useless-object-inheritance
             return self._loop.run_sync(lambda: future)
 
     def close(self):
-        """Close the runner by stopping the loop."""
+        """Close the runner by stopping the loop and closing any transports and connections that are kept alive."""
         assert not self._closed
+        self._transport.close()
+        if self._notifier is not None:
+            self._notifier.close()
         self.stop()
         self._closed = True
 
@@ -263,8 +297,22 @@ class Runner(object):  # pylint: disable=useless-object-inheritance
         :param pk: the pk of the calculation
         :param callback: the function to be called upon calculation termination
         """
-        calculation = load_node(pk=pk)
-        self._poll_calculation(calculation, callback)
+        if self._notifier is None:
+            self._poll_calculation(load_node(pk=pk), callback, self._poll_interval)
+            return
+
+        called = []
+
+        def on_terminated(terminated_pk):
+            """Call the callback for the first of the notification and the poll that reports the termination."""
+            if not called:
+                called.append(terminated_pk)
+                self._notifier.remove_callback(terminated_pk, on_terminated)
+                callback(terminated_pk)
+
+        # The callback is registered first, such that a termination right before it, is not missed
+        self._notifier.add_callback(pk, on_terminated)
+        self._poll_calculation(load_node(pk=pk), on_terminated, self._get_notification_poll_interval())
 
     def get_calculation_future(self, pk):
         """
@@ -273,10 +321,21 @@ class Runner(object):  # pylint: disable=useless-object-inheritance
 
         :return: A future representing the completion of the calculation node
         """
+        if self._notifier is not None:
+            return futures.CalculationFuture(
+                pk, self._loop, self._get_notification_poll_interval(), self._communicator, notifier=self._notifier)
+
         return futures.CalculationFuture(pk, self._loop, self._poll_interval, self._communicator)
 
-    def _poll_calculation(self, calc_node, callback):
+    def _get_notification_poll_interval(self):
+        """Return the interval at which processes are polled while their termination is awaited through notifications.
+
+        :return: the interval in seconds
+        """
+        return max(self._poll_interval, NOTIFICATION_POLL_INTERVAL)
+
+    def _poll_calculation(self, calc_node, callback, poll_interval):
         if calc_node.is_terminated:
             self._loop.add_callback(callback, calc_node.pk)
         else:
-            self._loop.call_later(self._poll_interval, self._poll_calculation, calc_node, callback)
+            self._loop.call_later(poll_interval, self._poll_calculation, calc_node, callback, poll_interval)
@@ -28,6 +28,7 @@ class TransportRequest(object):
         super(TransportRequest, self).__init__()
         self.future = concurrent.Future()
         self.count = 0
+        self.close_callback_handle = None
 
 
 class TransportQueue(object):  # pylint: disable=useless-object-inheritance
@@ -40,21 +41,85 @@ class TransportQueue(object):  # pylint: disable=useless-object-inheritance
     it will open the transport and give it to all the clients that asked for it
     up to that point.  This way opening of transports (a costly operation) can
     be minimised.
+
+    If an idle timeout is set, a transport is not closed as soon as the last
+    client releases it, but is kept open for that many seconds.  Any request
+    for the same authinfo coming in within that time will reuse the open
+    transport, provided it is still open, instead of opening a new one.
     """
     AuthInfoEntry = namedtuple('AuthInfoEntry', ['authinfo', 'transport', 'callbacks', 'callback_handle'])
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, idle_timeout=0):
         """
         :param loop: The event loop to use, will use `tornado.ioloop.IOLoop.current()` if not supplied
         :type loop: :class:`tornado.ioloop.IOLoop`
+        :param idle_timeout: number of seconds an open transport without users is kept alive for reuse, if zero
+            the transport is closed as soon as it is no longer used
         """
         self._loop = loop if loop is not None else ioloop.IOLoop.current()
+        self._idle_timeout = idle_timeout
         self._transport_requests = {}
 
     def loop(self):
         """ Get the loop being used by this transport queue """
         return self._loop
 
+    @property
+    def idle_timeout(self):
+        """ Return the number of seconds that an unused open transport is kept alive """
+        return self._idle_timeout
+
+    def close(self):
+        """ Close all transports that are currently kept alive without users """
+        for authinfo_id, transport_request in list(self._transport_requests.items()):
+            if transport_request.count == 0 and transport_request.close_callback_handle is not None:
+                self._loop.remove_timeout(transport_request.close_callback_handle)
+                self._close_transport_request(authinfo_id, transport_request)
+
+    def _close_transport_request(self, authinfo_id, transport_request):
+        """
+        Close the transport of a request and remove the request from the queue
+
+        :param authinfo_id: the id of the authinfo of the request
+        :param transport_request: the transport request
+        """
+        transport_request.close_callback_handle = None
+
+        if self._transport_requests.get(authinfo_id, None) is transport_request:
+            self._transport_requests.pop(authinfo_id)
+
+        transport = transport_request.future.result()
+        if transport.is_open:
+            _LOGGER.debug('Transport request closing transport for authinfo<%d>', authinfo_id)
+            transport.close()
+
+    def _get_kept_alive_request(self, authinfo):
+        """
+        Return the request for the given authinfo if its transport is being kept alive and is still healthy
+
+        A kept alive transport whose connection has been closed in the meantime is discarded, so that a new one
+        will be opened for the next request.
+
+        :param authinfo: the authinfo
+        :return: the transport request or None
+        """
+        transport_request = self._transport_requests.get(authinfo.id, None)
+
+        if transport_request is None or transport_request.close_callback_handle is None:
+            return transport_request
+
+        # The transport is kept alive, cancel its scheduled close as there is a new user
+        self._loop.remove_timeout(transport_request.close_callback_handle)
+        transport_request.close_callback_handle = None
+
+        if transport_request.future.result().is_open:
+            _LOGGER.debug('Transport request reusing open transport for %s', authinfo)
+            return transport_request
+
+        _LOGGER.debug('Transport request discarding closed transport for %s', authinfo)
+        self._close_transport_request(authinfo.id, transport_request)
+        return None
+
     @contextlib.contextmanager
     def request_transport(self, authinfo):
         """
@@ -72,7 +137,7 @@ class TransportQueue(object):  # pylint: disable=useless-object-inheritance
         :return: A future that can be yielded to give the transport
         """
         open_callback_handle = None
-        transport_request = self._transport_requests.get(authinfo.id, None)
+        transport_request = self._get_kept_alive_request(authinfo)
 
         if transport_request is None:
             # There is no existing request for this transport (i.e. on this authinfo)
@@ -115,10 +180,17 @@ class TransportQueue(object):  # pylint: disable=useless-object-inheritance
             assert transport_request.count >= 0, "Transport request count dropped below 0!"
             # Check if there are no longer any users that want the transport
             if transport_request.count == 0:
-                if transport_request.future.done():
-                    _LOGGER.debug('Transport request closing transport for %s', authinfo)
-                    transport_request.future.result().close()
-                elif open_callback_handle is not None:
-                    self._loop.remove_timeout(open_callback_handle)
-
-                self._transport_requests.pop(authinfo.id, None)
+                if transport_request.future.done() and self._idle_timeout > 0 and \
+                        transport_request.future.exception() is None:
+                    # Keep the transport open for a while such that subsequent requests can reuse it
+                    _LOGGER.debug('Transport request keeping transport alive for %s', authinfo)
+                    transport_request.close_callback_handle = self._loop.call_later(
+                        self._idle_timeout, self._close_transport_request, authinfo.id, transport_request)
+                else:
+                    if transport_request.future.done():
+                        _LOGGER.debug('Transport request closing transport for %s', authinfo)
+                        transport_request.future.result().close()
+                    elif open_callback_handle is not None:
+                        self._loop.remove_timeout(open_callback_handle)
+
+                    self._transport_requests.pop(authinfo.id, None)
@@ -94,6 +94,56 @@ CONFIG_OPTIONS = {
         'description': 'The polling interval in seconds to be used by process runners',
         'global_only': False,
     },
+    'runner.poll.shared': {
+        'key': 'runner_poll_shared',
+        'valid_type': 'bool',
+        'valid_values': None,
+        'default': False,
+        'description': 'Share the scheduler job states polled by a runner with all other runners of the profile',
+        'global_only': False,
+    },
+    'runner.process_notifications': {
+        'key': 'runner_process_notifications',
+        'valid_type': 'bool',
+        'valid_values': None,
+        'default': False,
+        'description': 'Await the termination of processes through database notifications and only poll as a fallback',
+        'global_only': False,
+    },
+    'runner.checkpoint_codec': {
+        'key': 'runner_checkpoint_codec',
+        'valid_type': 'string',
+        'valid_values': ['yaml', 'json', 'json-zlib'],
+        'default': 'yaml',
+        'description': 'The codec used to encode process checkpoints, where `json` and `json-zlib` are faster but '
+                       'cannot be read by older versions',
+        'global_only': False,
+    },
+    'transport.idle_timeout': {
+        'key': 'transport_idle_timeout',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 0,
+        'description': 'The time in seconds an open transport without users is kept alive to be reused by new '
+                       'requests, where 0 closes it immediately',
+        'global_only': False,
+    },
+    'transport.bulk_upload': {
+        'key': 'transport_bulk_upload',
+        'valid_type': 'bool',
+        'valid_values': None,
+        'default': False,
+        'description': 'Upload the input files of calculation jobs as a single archive that is unpacked on the remote',
+        'global_only': False,
+    },
+    'transport.bulk_retrieve': {
+        'key': 'transport_bulk_retrieve',
+        'valid_type': 'bool',
+        'valid_values': None,
+        'default': False,
+        'description': 'Retrieve the output files of calculation jobs as a single archive created on the remote',
+        'global_only': False,
+    },
     'daemon.timeout': {
         'key': 'daemon_timeout',
         'valid_type': 'int',
@@ -102,6 +152,39 @@ CONFIG_OPTIONS = {
         'description': 'The timeout in seconds for calls to the circus client',
         'global_only': False,
     },
+    'querybuilder.cache_size': {
+        'key': 'querybuilder_cache_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 256,
+        'description': 'The number of compiled query shapes kept in memory by the QueryBuilder, 0 disables the cache',
+        'global_only': False,
+    },
+    'repository.backend': {
+        'key': 'repository_backend',
+        'valid_type': 'string',
+        'valid_values': ['folder', 'objectstore'],
+        'default': 'folder',
+        'description': 'Where the repository content of new nodes is stored: a folder per node or a deduplicating '
+                       'content addressed object store',
+        'global_only': False,
+    },
+    'orm.identity_map_size': {
+        'key': 'orm_identity_map_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 1024,
+        'description': 'The number of codes, computers and sealed processes kept in memory once loaded, 0 disables it',
+        'global_only': False,
+    },
+    'orm.array_cache_size': {
+        'key': 'orm_array_cache_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 512,
+        'description': 'The total size in megabytes of the arrays of stored ArrayData nodes kept in memory once loaded',
+        'global_only': False,
+    },
     'verdi.shell.auto_import': {
         'key': 'verdi_shell_auto_import',
         'valid_type': 'string',
@@ -126,6 +209,24 @@ CONFIG_OPTIONS = {
         'description': 'Minimum level to log to the DbLog table',
         'global_only': False,
     },
+    'logging.db_log_buffer_size': {
+        'key': 'logging_db_log_buffer_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 0,
+        'description': 'The number of log records that are buffered and written to the DbLog table in bulk by a '
+                       'background thread, 0 writes every record immediately',
+        'global_only': False,
+    },
+    'logging.db_log_flush_interval': {
+        'key': 'logging_db_log_flush_interval',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 1,
+        'description': 'The maximum time in seconds that a buffered log record waits before it is written to the '
+                       'DbLog table',
+        'global_only': False,
+    },
     'logging.tornado_loglevel': {
         'key': 'logging_tornado_log_level',
         'valid_type': 'string',
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Optional transitive closure table of the provenance graph, to look up ancestors and descendants of nodes directly.
+
+The table `db_dbnodeclosure` contains a row for every pair of nodes that are connected through a path of `create` and
+`input_calc` links, together with the depth of the shortest such path. By default the table is empty and unused. Once
+enabled, a trigger on the link table keeps it up to date whenever a link is stored, regardless of whether it is added
+through `Node.add_incoming`, when storing a node or by an import, and the `QueryBuilder` uses it for the joins with
+`with_ancestors` and `with_descendants`, as long as they do not require the path or the depth of the walk.
+
+Rows are removed automatically when either of their nodes is deleted. Since deleting a node always deletes all its
+descendants along these links as well, no row can become stale, unless links are removed from the database directly,
+in which case the table should be rebuilt with :func:`rebuild_closure_table`.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+from aiida.common.links import LinkType
+
+__all__ = ('CLOSURE_LINK_TYPES', 'is_closure_table_enabled', 'enable_closure_table', 'disable_closure_table',
+           'rebuild_closure_table')
+
+# The values of the link types that are included in the closure, which are the link types followed by default by the
+# recursive joins of the `QueryBuilder`
+CLOSURE_LINK_TYPES = (LinkType.CREATE.value, LinkType.INPUT_CALC.value)
+
+_TRIGGER_NAME = 'db_dblink_closure_trigger'
+_FUNCTION_NAME = 'db_dblink_closure_insert'
+_LINK_TYPES_SQL = ', '.join("'{}'".format(link_type) for link_type in CLOSURE_LINK_TYPES)
+
+# Insert the pairs of all ancestors of the source and all descendants of the target of a new link, where the source and
+# the target are their own ancestor and descendant, respectively, at distance zero. Existing pairs keep the smallest
+# depth, which is the number of links on the shortest path minus one, just as the depth of the recursive joins.
+_SQL_CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION {function}() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.type IN ({link_types}) AND NEW.input_id <> NEW.output_id THEN
+        INSERT INTO db_dbnodeclosure (ancestor_id, descendant_id, depth)
+        SELECT ancestors.node_id, descendants.node_id, MIN(ancestors.distance + descendants.distance)
+        FROM (
+            SELECT NEW.input_id AS node_id, 0 AS distance
+            UNION ALL
+            SELECT ancestor_id, depth + 1 FROM db_dbnodeclosure WHERE descendant_id = NEW.input_id
+        ) AS ancestors CROSS JOIN (
+            SELECT NEW.output_id AS node_id, 0 AS distance
+            UNION ALL
+            SELECT descendant_id, depth + 1 FROM db_dbnodeclosure WHERE ancestor_id = NEW.output_id
+        ) AS descendants
+        WHERE ancestors.node_id <> descendants.node_id
+        GROUP BY ancestors.node_id, descendants.node_id
+        ON CONFLICT (ancestor_id, descendant_id) DO UPDATE SET depth = LEAST(db_dbnodeclosure.depth, EXCLUDED.depth);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""".format(function=_FUNCTION_NAME, link_types=_LINK_TYPES_SQL)
+
+_SQL_CREATE_TRIGGER = """
+CREATE TRIGGER {trigger} AFTER INSERT ON db_dblink FOR EACH ROW EXECUTE PROCEDURE {function}();
+""".format(trigger=_TRIGGER_NAME, function=_FUNCTION_NAME)
+
+_SQL_DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS {trigger} ON db_dblink;
+""".format(trigger=_TRIGGER_NAME)
+
+_SQL_DROP_FUNCTION = """
+DROP FUNCTION IF EXISTS {function}();
+""".format(function=_FUNCTION_NAME)
+
+_SQL_IS_ENABLED = """
+SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = '{trigger}' AND tgrelid = 'db_dblink'::regclass);
+""".format(trigger=_TRIGGER_NAME)
+
+_SQL_INSERT_LINKS = """
+INSERT INTO db_dbnodeclosure (ancestor_id, descendant_id, depth)
+SELECT DISTINCT input_id, output_id, 0 FROM db_dblink WHERE type IN ({link_types}) AND input_id <> output_id;
+""".format(link_types=_LINK_TYPES_SQL)
+
+# Extend the rows that were inserted in the previous step, identified by the range of their ids, by one link. Since the
+# table is filled breadth first, pairs that already exist have a shorter path and are left alone.
+_SQL_INSERT_STEP = """
+INSERT INTO db_dbnodeclosure (ancestor_id, descendant_id, depth)
+SELECT DISTINCT closure.ancestor_id, link.output_id, closure.depth + 1
+FROM db_dbnodeclosure AS closure JOIN db_dblink AS link ON link.input_id = closure.descendant_id
+WHERE closure.id > :first_id AND closure.id <= :last_id
+    AND link.type IN ({link_types}) AND link.output_id <> closure.ancestor_id
+ON CONFLICT (ancestor_id, descendant_id) DO NOTHING;
+""".format(link_types=_LINK_TYPES_SQL)
+
+_SQL_MAX_ID = """
+SELECT COALESCE(MAX(id), 0) FROM db_dbnodeclosure;
+"""
+
+
+def _get_session():
+    """Return the SQLAlchemy session that is used by the `QueryBuilder` of the current backend."""
+    from aiida.manage.manager import get_manager
+    return get_manager().get_backend().query().get_session()
+
+
+def is_closure_table_enabled(session=None):
+    """Return whether the closure table is enabled, i.e. whether the trigger that maintains it is installed.
+
+    :param session: optional SQLAlchemy session to use, by default that of the `QueryBuilder` of the current backend
+    :return: boolean, True if the closure table is enabled
+    """
+    from sqlalchemy.sql import text
+
+    if session is None:
+        session = _get_session()
+
+    return session.execute(text(_SQL_IS_ENABLED)).scalar()
+
+
+def enable_closure_table():
+    """Install the trigger that maintains the closure table and fill the table with the current provenance graph.
+
+    This is done in a single transaction, during which links cannot be stored by other processes, such that the table
+    is guaranteed to be complete once enabled. If the table was already enabled, it is rebuilt. The trigger relies on
+    `INSERT ... ON CONFLICT`, which requires PostgreSQL 9.5 or higher.
+
+    :return: the number of rows in the closure table
+    """
+    from sqlalchemy.sql import text
+
+    session = _get_session()
+
+    try:
+        session.execute(text(_SQL_CREATE_FUNCTION))
+        session.execute(text(_SQL_DROP_TRIGGER))
+        session.execute(text(_SQL_CREATE_TRIGGER))
+        count = _fill_closure_table(session)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return count
+
+
+def disable_closure_table():
+    """Remove the trigger that maintains the closure table and empty the table."""
+    from sqlalchemy.sql import text
+
+    session = _get_session()
+
+    try:
+        session.execute(text(_SQL_DROP_TRIGGER))
+        session.execute(text(_SQL_DROP_FUNCTION))
+        session.execute(text('TRUNCATE db_dbnodeclosure RESTART IDENTITY;'))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+def rebuild_closure_table():
+    """Recompute the closure table from scratch.
+
+    :return: the number of rows in the closure table
+    :raises aiida.common.exceptions.InvalidOperation: if the closure table is not enabled
+    """
+    from aiida.common.exceptions import InvalidOperation
+
+    session = _get_session()
+
+    if not is_closure_table_enabled(session):
+        raise InvalidOperation('the closure table is not enabled')
+
+    try:
+        count = _fill_closure_table(session)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return count
+
+
+def _fill_closure_table(session):
+    """Fill the closure table breadth first, one link at a time, without committing.
+
+    :param session: the SQLAlchemy session to use
+    :return: the number of rows in the closure table
+    """
+    from sqlalchemy.sql import text
+
+    # Prevent other processes from storing links until the transaction is committed
+    session.execute(text('LOCK TABLE db_dblink IN SHARE ROW EXCLUSIVE MODE;'))
+    session.execute(text('TRUNCATE db_dbnodeclosure RESTART IDENTITY;'))
+    session.execute(text(_SQL_INSERT_LINKS))
+
+    first_id = 0
+    last_id = session.execute(text(_SQL_MAX_ID)).scalar()
+
+    while last_id > first_id:
+        session.execute(text(_SQL_INSERT_STEP), {'first_id': first_id, 'last_id': last_id})
+        first_id, last_id = last_id, session.execute(text(_SQL_MAX_ID)).scalar()
+
+    return session.execute(text('SELECT COUNT(*) FROM db_dbnodeclosure;')).scalar()
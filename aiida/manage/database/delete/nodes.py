@@ -7,17 +7,92 @@
 # For further information on the license, see the LICENSE.txt file        #
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
-"""Function to delete nodes from the database."""
+"""Function to delete nodes from the database.
+
+The set of nodes to delete is computed in a temporary table on the database server, such that the pks of the nodes never
+have to be held in memory at once. The nodes are then deleted in chunks, each in their own transaction, together with
+their links, group memberships, comments and logs, while the repository folders of the deleted nodes are erased in the
+background. The nodes that are furthest away from the given nodes are deleted first, such that an interrupted deletion
+can be resumed by deleting the same nodes again.
+"""
 from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
 
+from multiprocessing.pool import ThreadPool
+
 from six.moves import zip
 
 import click
 
 from aiida.cmdline.utils import echo
 
+# The default number of nodes that are deleted in a single transaction
+DEFAULT_CHUNK_SIZE = 1000
+
+_TABLE = 'delete_nodes_pks'
+
+_SQL_CREATE_TABLE = """
+CREATE TEMPORARY TABLE {table} (id integer PRIMARY KEY, generation integer NOT NULL);
+""".format(table=_TABLE)
+
+_SQL_CREATE_INDEX = """
+CREATE INDEX ON {table} (generation, id);
+""".format(table=_TABLE)
+
+_SQL_DROP_TABLE = """
+DROP TABLE IF EXISTS {table};
+""".format(table=_TABLE)
+
+_SQL_INSERT_EXISTING = """
+INSERT INTO {table} (id, generation) SELECT id, 0 FROM db_dbnode WHERE id IN :pks;
+""".format(table=_TABLE)
+
+# Add the nodes that are linked to from the nodes that were added in the previous generation and were not yet visited
+_SQL_INSERT_GENERATION = """
+INSERT INTO {table} (id, generation)
+SELECT DISTINCT link.output_id, :generation
+FROM db_dblink AS link JOIN {table} AS node ON node.id = link.input_id
+WHERE node.generation = :previous AND link.type IN :link_types
+    AND NOT EXISTS (SELECT 1 FROM {table} AS visited WHERE visited.id = link.output_id);
+""".format(table=_TABLE)
+
+_SQL_COUNT = """
+SELECT COUNT(*) FROM {table};
+""".format(table=_TABLE)
+
+_SQL_SELECT_NODES = """
+SELECT node.uuid, node.id, node.node_type, node.label
+FROM {table} JOIN db_dbnode AS node ON node.id = {table}.id ORDER BY node.id;
+""".format(table=_TABLE)
+
+# The links of the given types from nodes that are not deleted to nodes that are, with the pk of the source, the type
+# string of the target and the label of the link
+_SQL_SELECT_LOSING = """
+SELECT link.input_id, node.node_type, link.label
+FROM db_dblink AS link JOIN {table} ON {table}.id = link.output_id JOIN db_dbnode AS node ON node.id = link.output_id
+WHERE link.type IN :link_types AND NOT EXISTS (SELECT 1 FROM {table} AS deleted WHERE deleted.id = link.input_id);
+""".format(table=_TABLE)
+
+# The chunks are selected from the last generation to the first, such that every node that remains after an interrupted
+# deletion can still be reached from the given nodes, which are deleted last
+_SQL_SELECT_CHUNK = """
+SELECT {table}.generation, node.id, node.uuid
+FROM {table} JOIN db_dbnode AS node ON node.id = {table}.id
+WHERE ({table}.generation, {table}.id) < (:last_generation, :last_id)
+ORDER BY {table}.generation DESC, {table}.id DESC LIMIT :chunk_size;
+""".format(table=_TABLE)
+
+# Rows of the closure table of the provenance graph are deleted through the cascade of their foreign keys
+_SQL_DELETE_CHUNK = (
+    'DELETE FROM db_dblink WHERE input_id IN :pks;',
+    'DELETE FROM db_dblink WHERE output_id IN :pks;',
+    'DELETE FROM db_dbgroup_dbnodes WHERE dbnode_id IN :pks;',
+    'DELETE FROM db_dbcomment WHERE dbnode_id IN :pks;',
+    'DELETE FROM db_dblog WHERE dbnode_id IN :pks;',
+    'DELETE FROM db_dbnode WHERE id IN :pks;',
+)
+
 
 def delete_nodes(pks,
                  follow_calls=False,
@@ -25,12 +100,20 @@ def delete_nodes(pks,
                  dry_run=False,
                  force=False,
                  disable_checks=False,
-                 verbosity=0):
+                 verbosity=0,
+                 chunk_size=DEFAULT_CHUNK_SIZE,
+                 threads=1):
     """
     Delete nodes by a list of pks
 
     :note: The script will also delete all children calculations generated from the specified nodes.
 
+    :note: The nodes are deleted in chunks of `chunk_size` nodes, each in their own transaction, so the deletion as a
+        whole is not atomic. If it is interrupted, the nodes of the chunks that were committed remain deleted while the
+        others remain in the database, for example a calculation without some of its outputs. Since the nodes that are
+        furthest away from the given nodes are deleted first, the given nodes are deleted last and calling this function
+        again with the same arguments deletes the remaining nodes.
+
     :param pks: a list of the PKs of the nodes to delete
     :param bool follow_calls: Follow calls
     :param bool follow_returns:
@@ -43,35 +126,18 @@ def delete_nodes(pks,
         If checks are disabled, also logging is disabled.
     :param bool force: Do not ask for confirmation to delete nodes.
     :param int verbosity:
-        The verbosity levels, 0 prints nothing, 1 prints just sums and total, 2 prints individual nodes.
+        The verbosity levels, 0 prints nothing, 1 prints just sums, total and progress, 2 prints individual nodes.
+    :param int chunk_size: the number of nodes that are deleted in a single transaction
+    :param int threads: the number of threads that erase the repository folders of the deleted nodes in the background
+    :raises aiida.common.exceptions.InvalidOperation: if the session of the backend has changes that are not flushed
     """
     # pylint: disable=too-many-arguments,too-many-branches,too-many-locals,too-many-statements
-    from aiida.backends.utils import delete_nodes_and_connections
-    from aiida.common import exceptions
+    from aiida.common.exceptions import InvalidOperation
     from aiida.common.links import LinkType
-    from aiida.orm import User, Node, ProcessNode, Data, QueryBuilder, load_node
+    from aiida.orm import User, load_node
 
     user_email = User.objects.get_default().email
 
-    starting_pks = []
-    for pk in pks:
-        try:
-            load_node(pk)
-        except exceptions.NotExistent:
-            echo.echo_warning('warning: node with pk<{}> does not exist, skipping'.format(pk))
-        else:
-            starting_pks.append(pk)
-
-    if not starting_pks:
-        # I prefer checking explicitly, an empty set might be problematic for the queries done below.
-        if verbosity:
-            echo.echo("Nothing to delete")
-        return
-
-    # The following code is just for the querying of downwards provenance.
-    # Ideally, there should be a module to interface with, but this is the solution for now.
-    # By only dealing with ids, and keeping track of what has been already
-    # visited in the query, there's good performance and no infinite loops.
     link_types_to_follow = [LinkType.CREATE.value, LinkType.INPUT_CALC.value, LinkType.INPUT_WORK.value]
     if follow_calls:
         link_types_to_follow.append(LinkType.CALL_CALC.value)
@@ -79,116 +145,98 @@ def delete_nodes(pks,
     if follow_returns:
         link_types_to_follow.append(LinkType.RETURN.value)
 
-    edge_filters = {'type': {'in': link_types_to_follow}}
-
-    # Operational set always includes the recently (in the last iteration added) nodes.
-    operational_set = set().union(set(starting_pks))  # Union to copy the set!
-    pks_set_to_delete = set().union(set(starting_pks))
-    while operational_set:
-        # new_pks_set are the the pks of all nodes that are connected to the operational node set
-        # with the links specified.
-        new_pks_set = set(i for i, in QueryBuilder().append(Node, filters={
-            'id': {
-                'in': operational_set
-            }
-        }).append(Node, project='id', edge_filters=edge_filters).iterall())
-        # The operational set is only those pks that haven't been yet put into the pks_set_to_delete.
-        operational_set = new_pks_set.difference(pks_set_to_delete)
-
-        # I add these pks in the pks_set_to_delete with a union
-        pks_set_to_delete = pks_set_to_delete.union(new_pks_set)
-
-    if verbosity > 0:
-        echo.echo("I {} delete {} node{}".format('would' if dry_run else 'will', len(pks_set_to_delete),
-                                                 's' if len(pks_set_to_delete) > 1 else ''))
-        if verbosity > 1:
-            builder = QueryBuilder().append(
-                Node, filters={'id': {
-                    'in': pks_set_to_delete
-                }}, project=('uuid', 'id', 'node_type', 'label'))
-            echo.echo("The nodes I {} delete:".format('would' if dry_run else 'will'))
-            for uuid, pk, type_string, label in builder.iterall():
-                try:
-                    short_type_string = type_string.split('.')[-2]
-                except IndexError:
-                    short_type_string = type_string
-                echo.echo("   {} {} {} {}".format(uuid, pk, short_type_string, label))
-
-    # Here I am checking whether I am deleting
-    # A data instance without also deleting the creator, which brakes relationship between a calculation and its data
-    # A calculation instance that was called, without also deleting the caller.
+    session = _get_session()
 
-    if not disable_checks:
-        link_types_to_follow = [LinkType.CALL_CALC.value, LinkType.CALL_WORK.value]
-        called_qb = QueryBuilder()
-        called_qb.append(ProcessNode, filters={'id': {'!in': pks_set_to_delete}}, project='id')
-        called_qb.append(
-            ProcessNode,
-            project='node_type',
-            edge_project='label',
-            filters={'id': {
-                'in': pks_set_to_delete
-            }},
-            edge_filters={'type': {
-                'in': link_types_to_follow
-            }})
-        caller_to_called2delete = called_qb.all()
-
-        if verbosity > 0 and caller_to_called2delete:
-            calculation_pks_losing_called = set(next(zip(*caller_to_called2delete)))
-            echo.echo("\n{} calculation{} {} lose at least one called instance".format(
-                len(calculation_pks_losing_called), 's' if len(calculation_pks_losing_called) > 1 else '',
-                'would' if dry_run else 'will'))
-            if verbosity > 1:
-                echo.echo(
-                    "These are the calculations that {} lose a called instance:".format('would' if dry_run else 'will'))
-                for calc_losing_called_pk in calculation_pks_losing_called:
-                    echo.echo('  ', load_node(calc_losing_called_pk))
-
-        created_qb = QueryBuilder()
-        created_qb.append(ProcessNode, filters={'id': {'!in': pks_set_to_delete}}, project='id')
-        created_qb.append(
-            Data,
-            project='node_type',
-            edge_project='label',
-            filters={'id': {
-                'in': pks_set_to_delete
-            }},
-            edge_filters={'type': {
-                '==': LinkType.CREATE.value
-            }})
-
-        creator_to_created2delete = created_qb.all()
-        if verbosity > 0 and creator_to_created2delete:
-            calculation_pks_losing_created = set(next(zip(*creator_to_created2delete)))
-            echo.echo("\n{} calculation{} {} lose at least one created data-instance".format(
-                len(calculation_pks_losing_created), 's' if len(calculation_pks_losing_created) > 1 else '',
-                'would' if dry_run else 'will'))
+    # The deletion runs on a dedicated connection, because the temporary table has to survive the transaction of each
+    # chunk, which would wait forever for rows that are changed in the transaction of the session
+    if session.new or session.dirty or session.deleted:
+        raise InvalidOperation('the session has pending changes, commit or roll them back before deleting nodes')
+
+    connection = session.get_bind().connect()
+
+    try:
+        starting_pks = _create_node_set(connection, pks)
+
+        if not starting_pks:
+            # I prefer checking explicitly, an empty set might be problematic for the queries done below.
+            if verbosity:
+                echo.echo("Nothing to delete")
+            return
+
+        # By only dealing with ids, and keeping track of what has been already visited in the temporary table, there's
+        # good performance and no infinite loops.
+        number_of_generations = _expand_node_set(connection, link_types_to_follow)
+
+        number_of_nodes = connection.execute(_text(_SQL_COUNT)).scalar()
+
+        if verbosity > 0:
+            echo.echo("I {} delete {} node{}".format('would' if dry_run else 'will', number_of_nodes,
+                                                     's' if number_of_nodes > 1 else ''))
             if verbosity > 1:
-                echo.echo("These are the calculations that {} lose a created data-instance:".format(
+                echo.echo("The nodes I {} delete:".format('would' if dry_run else 'will'))
+                for uuid, pk, type_string, label in connection.execute(_text(_SQL_SELECT_NODES)):
+                    try:
+                        short_type_string = type_string.split('.')[-2]
+                    except IndexError:
+                        short_type_string = type_string
+                    echo.echo("   {} {} {} {}".format(uuid, pk, short_type_string, label))
+
+        # Here I am checking whether I am deleting
+        # A data instance without also deleting the creator, which brakes relationship between a calculation and its
+        # data. A calculation instance that was called, without also deleting the caller.
+
+        if not disable_checks:
+            link_types = [LinkType.CALL_CALC.value, LinkType.CALL_WORK.value]
+            caller_to_called2delete = connection.execute(
+                _text(_SQL_SELECT_LOSING, 'link_types'), link_types=link_types).fetchall()
+
+            if verbosity > 0 and caller_to_called2delete:
+                calculation_pks_losing_called = set(next(zip(*caller_to_called2delete)))
+                echo.echo("\n{} calculation{} {} lose at least one called instance".format(
+                    len(calculation_pks_losing_called), 's' if len(calculation_pks_losing_called) > 1 else '',
                     'would' if dry_run else 'will'))
-                for calc_losing_created_pk in calculation_pks_losing_created:
-                    echo.echo('  ', load_node(calc_losing_created_pk))
+                if verbosity > 1:
+                    echo.echo("These are the calculations that {} lose a called instance:".format(
+                        'would' if dry_run else 'will'))
+                    for calc_losing_called_pk in calculation_pks_losing_called:
+                        echo.echo('  ', load_node(calc_losing_called_pk))
 
-    if dry_run:
-        if verbosity > 0:
-            echo.echo("\nThis was a dry run, exiting without deleting anything")
-        return
-
-    # Asking for user confirmation here
-    if force:
-        pass
-    else:
-        echo.echo_warning("YOU ARE ABOUT TO DELETE {} NODES! THIS CANNOT BE UNDONE!".format(len(pks_set_to_delete)))
-        if not click.confirm("Shall I continue?"):
-            echo.echo("Exiting without deleting")
+            link_types = [LinkType.CREATE.value]
+            creator_to_created2delete = connection.execute(
+                _text(_SQL_SELECT_LOSING, 'link_types'), link_types=link_types).fetchall()
+
+            if verbosity > 0 and creator_to_created2delete:
+                calculation_pks_losing_created = set(next(zip(*creator_to_created2delete)))
+                echo.echo("\n{} calculation{} {} lose at least one created data-instance".format(
+                    len(calculation_pks_losing_created), 's' if len(calculation_pks_losing_created) > 1 else '',
+                    'would' if dry_run else 'will'))
+                if verbosity > 1:
+                    echo.echo("These are the calculations that {} lose a created data-instance:".format(
+                        'would' if dry_run else 'will'))
+                    for calc_losing_created_pk in calculation_pks_losing_created:
+                        echo.echo('  ', load_node(calc_losing_created_pk))
+
+        if dry_run:
+            if verbosity > 0:
+                echo.echo("\nThis was a dry run, exiting without deleting anything")
             return
 
-    # Recover the list of folders to delete before actually deleting the nodes. I will delete the folders only later,
-    # so that if there is a problem during the deletion of the nodes in the DB, I don't delete the folders
-    repositories = [load_node(pk)._repository for pk in pks_set_to_delete]  # pylint: disable=protected-access
+        # Asking for user confirmation here
+        if force:
+            pass
+        else:
+            echo.echo_warning("YOU ARE ABOUT TO DELETE {} NODES! THIS CANNOT BE UNDONE!".format(number_of_nodes))
+            if not click.confirm("Shall I continue?"):
+                echo.echo("Exiting without deleting")
+                return
+
+        _delete_node_set(connection, number_of_nodes, number_of_generations, chunk_size, threads, verbosity)
+    finally:
+        connection.execute(_text(_SQL_DROP_TABLE))
+        connection.close()
 
-    delete_nodes_and_connections(pks_set_to_delete)
+    # Objects of the session may still refer to the deleted rows, so make sure they are reloaded when accessed again
+    session.expire_all()
 
     if not disable_checks:
         # I pass now to the log the information for calculations losing created data or called instances
@@ -206,7 +254,134 @@ def delete_nodes(pks,
                                 "created with the label {} "
                                 "by this calculation".format(user_email, data_type_string, link_label))
 
-    # If we are here, we managed to delete the entries from the DB.
-    # I can now delete the folders
-    for repository in repositories:
-        repository.erase(force=True)
+
+def _get_session():
+    """Return the SQLAlchemy session that is used by the `QueryBuilder` of the current backend."""
+    from aiida.manage.manager import get_manager
+    return get_manager().get_backend().query().get_session()
+
+
+def _text(sql, *expanding):
+    """Return the textual SQL statement, where the given parameters are expanded from lists for `IN` clauses.
+
+    :param sql: the SQL statement
+    :param expanding: the names of the parameters to expand
+    :return: the `sqlalchemy.sql.expression.TextClause`
+    """
+    from sqlalchemy.sql import bindparam, text
+    return text(sql).bindparams(*[bindparam(name, expanding=True) for name in expanding])
+
+
+def _create_node_set(connection, pks):
+    """Create the temporary table with the nodes to delete and add the existing nodes with the given pks to it.
+
+    :param connection: the dedicated SQLAlchemy connection
+    :param pks: the pks of the nodes to delete
+    :return: the set of pks of the nodes that exist
+    """
+    from aiida.common.utils import iter_sorted_batches
+
+    with connection.begin():
+        # The table of a previous deletion that failed may still exist if the connection was reused
+        connection.execute(_text(_SQL_DROP_TABLE))
+        connection.execute(_text(_SQL_CREATE_TABLE))
+        connection.execute(_text(_SQL_CREATE_INDEX))
+        for batch in iter_sorted_batches(set(pks), DEFAULT_CHUNK_SIZE):
+            connection.execute(_text(_SQL_INSERT_EXISTING, 'pks'), pks=batch)
+
+    existing = set(pk for pk, in connection.execute(_text('SELECT id FROM {};'.format(_TABLE))))
+
+    for pk in sorted(set(pks)):
+        if pk not in existing:
+            echo.echo_warning('warning: node with pk<{}> does not exist, skipping'.format(pk))
+
+    return existing
+
+
+def _expand_node_set(connection, link_types):
+    """Add all nodes to the temporary table that can be reached by following the given link types forward.
+
+    Each generation of nodes is added with a single statement, until no new nodes are found.
+
+    :param connection: the dedicated SQLAlchemy connection
+    :param link_types: the values of the link types to follow
+    :return: the number of generations in the temporary table, including the generation of the given nodes
+    """
+    generation = 1
+
+    while True:
+        with connection.begin():
+            result = connection.execute(
+                _text(_SQL_INSERT_GENERATION, 'link_types'),
+                generation=generation,
+                previous=generation - 1,
+                link_types=link_types)
+
+        if not result.rowcount:
+            return generation
+
+        generation += 1
+
+
+def _delete_node_set(connection, number_of_nodes, number_of_generations, chunk_size, threads, verbosity):
+    """Delete the nodes in the temporary table in chunks, each in their own transaction, from the last generation.
+
+    Once the transaction of a chunk has been committed, the repository folders of its nodes are erased in the
+    background, such that a folder is never erased if its node could not be deleted.
+
+    :param connection: the dedicated SQLAlchemy connection
+    :param number_of_nodes: the total number of nodes to delete, to report the progress
+    :param number_of_generations: the number of generations of nodes in the temporary table
+    :param chunk_size: the number of nodes that are deleted in a single transaction
+    :param threads: the number of threads that erase the repository folders
+    :param verbosity: if larger than 0, the progress is printed after each chunk
+    """
+    # pylint: disable=too-many-arguments
+    from aiida.manage.manager import get_manager
+    from aiida.orm import Node
+
+    identity_map = get_manager().get_identity_map()
+    pool = ThreadPool(threads)
+    results = []
+    last_generation = number_of_generations
+    last_id = 0
+    deleted = 0
+
+    try:
+        while True:
+            chunk = connection.execute(
+                _text(_SQL_SELECT_CHUNK), last_generation=last_generation, last_id=last_id,
+                chunk_size=chunk_size).fetchall()
+
+            if not chunk:
+                break
+
+            pks = [pk for _, pk, _ in chunk]
+
+            with connection.begin():
+                for statement in _SQL_DELETE_CHUNK:
+                    connection.execute(_text(statement, 'pks'), pks=pks)
+
+            identity_map.invalidate(Node, pks)
+            results.append(pool.map_async(_erase_repository, [uuid for _, _, uuid in chunk]))
+            last_generation, last_id, _ = chunk[-1]
+            deleted += len(pks)
+
+            if verbosity > 0:
+                echo.echo("Deleted {}/{} nodes".format(deleted, number_of_nodes))
+    finally:
+        pool.close()
+        pool.join()
+
+    # Raise any exception that occurred while erasing the repository folders
+    for result in results:
+        result.get()
+
+
+def _erase_repository(uuid):
+    """Erase the repository folder of the node with the given uuid.
+
+    :param uuid: the uuid of the node
+    """
+    from aiida.orm.utils.repository import Repository
+    Repository(uuid, is_stored=True).erase(force=True)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Components to notify the termination of processes through PostgreSQL `LISTEN` and `NOTIFY`."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import collections
+import logging
+
+from tornado import ioloop
+
+__all__ = ('ProcessTerminationNotifier',)
+
+LOGGER = logging.getLogger(__name__)
+
+_CHANNEL = 'aiida_process_terminated'
+
+
+def get_connection_parameters(profile):
+    """Return the parameters to connect to the database of the given profile with `psycopg2.connect`.
+
+    :param profile: the profile
+    :type profile: :class:`aiida.manage.configuration.profile.Profile`
+    :return: dictionary of connection parameters
+    """
+    parameters = {
+        'database': profile.database_name,
+        'user': profile.database_username,
+        'password': profile.database_password,
+        'host': profile.database_hostname,
+        'port': profile.database_port,
+    }
+
+    return {key: value for key, value in parameters.items() if value}
+
+
+class ProcessTerminationNotifier(object):  # pylint: disable=useless-object-inheritance
+    """Send and receive notifications of terminated processes through the database, without a message broker.
+
+    A notification is sent with `NOTIFY` on a dedicated channel with the pk of the process node as payload. Instances
+    that have callbacks registered `LISTEN` on that channel and call the callbacks of the pk in the payload on the
+    event loop. Notifications are sent and received over a single dedicated autocommit connection per instance, which
+    is only opened when it is first needed.
+    """
+
+    def __init__(self, loop, connection_parameters=None):
+        """Construct a new notifier.
+
+        :param loop: the event loop on which to listen for notifications and to call the callbacks
+        :type loop: :class:`tornado.ioloop.IOLoop`
+        :param connection_parameters: optional parameters for `psycopg2.connect`, if not specified the parameters of
+            the database of the currently loaded profile are used
+        """
+        self._loop = loop
+        self._connection_parameters = connection_parameters
+        self._connection = None
+        self._listening = False
+        self._listening_fd = None
+        self._callbacks = collections.defaultdict(list)
+
+    def _get_connection(self):
+        """Return the connection of this notifier, opening it if necessary.
+
+        If the connection was used to listen and has dropped, the notifier reconnects and listens again, such that the
+        registered callbacks are not silently lost.
+
+        :return: the psycopg2 connection
+        """
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        if self._listening and self._connection.closed:
+            self._reconnect()
+            return self._connection
+
+        if self._connection is None or self._connection.closed:
+            parameters = self._connection_parameters
+
+            if parameters is None:
+                from aiida.manage.manager import get_manager
+                parameters = get_connection_parameters(get_manager().get_profile())
+
+            self._disconnect()
+            self._connection = psycopg2.connect(**parameters)
+            self._connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+
+        return self._connection
+
+    def notify(self, pk):
+        """Send the notification that the process with the given pk has terminated.
+
+        If the connection turns out to have dropped, the notification is sent again over a new connection.
+
+        :param pk: the pk of the process node
+        """
+        import psycopg2
+
+        try:
+            self._send_notification(pk)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            LOGGER.warning('failed to send process termination notification, reconnecting')
+            if self._listening:
+                self._reconnect()
+            else:
+                self._disconnect()
+            self._send_notification(pk)
+
+    def _send_notification(self, pk):
+        """Send the notification for the given pk over the connection of this notifier.
+
+        :param pk: the pk of the process node
+        """
+        with self._get_connection().cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', (_CHANNEL, str(pk)))
+
+    def add_callback(self, pk, callback):
+        """Register a callback to be called with the pk as sole argument once the process has terminated.
+
+        Note that a process that already terminated will not send a notification anymore, so the caller should check
+        whether the process has terminated, after registering the callback.
+
+        :param pk: the pk of the process node
+        :param callback: the callback
+        """
+        self._listen()
+        self._callbacks[pk].append(callback)
+
+    def remove_callback(self, pk, callback):
+        """Remove a callback that was registered for the given pk, if it is still registered.
+
+        :param pk: the pk of the process node
+        :param callback: the callback
+        """
+        try:
+            self._callbacks[pk].remove(callback)
+        except ValueError:
+            pass
+
+        if not self._callbacks[pk]:
+            self._callbacks.pop(pk)
+
+    def close(self):
+        """Stop listening, close the connection and discard all registered callbacks."""
+        self._disconnect()
+        self._callbacks.clear()
+
+    def _disconnect(self):
+        """Stop listening and close the connection."""
+        if self._listening:
+            self._loop.remove_handler(self._listening_fd)
+
+        if self._connection is not None and not self._connection.closed:
+            self._connection.close()
+
+        self._connection = None
+        self._listening = False
+        self._listening_fd = None
+
+    def _reconnect(self):
+        """Reopen the connection and listen again, after which the processes of all registered callbacks are checked.
+
+        Any notification sent while the connection was down is lost, so the callbacks of processes that terminated in
+        the meantime are called directly.
+        """
+        from aiida.orm import load_node
+
+        self._disconnect()
+        self._listen()
+
+        for pk in list(self._callbacks):
+            if load_node(pk).is_terminated:
+                self._fire_callbacks(pk)
+
+    def _fire_callbacks(self, pk):
+        """Schedule the callbacks registered for the given pk on the event loop and remove them.
+
+        :param pk: the pk of the process node
+        """
+        for callback in self._callbacks.pop(pk, []):
+            self._loop.add_callback(callback, pk)
+
+    def _listen(self):
+        """Start listening for notifications on the event loop, if not already doing so."""
+        if self._listening:
+            return
+
+        connection = self._get_connection()
+
+        with connection.cursor() as cursor:
+            cursor.execute('LISTEN {}'.format(_CHANNEL))
+
+        self._listening_fd = connection.fileno()
+        self._loop.add_handler(self._listening_fd, self._on_readable, ioloop.IOLoop.READ)
+        self._listening = True
+
+    def _on_readable(self, _fd, _events):
+        """Process the notifications that have been received on the connection."""
+        try:
+            self._connection.poll()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('failed to poll the connection for process termination notifications, reconnecting')
+            try:
+                self._reconnect()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('failed to reconnect to listen for process termination notifications')
+            return
+
+        while self._connection.notifies:
+            notification = self._connection.notifies.pop(0)
+
+            try:
+                pk = int(notification.payload)
+            except ValueError:
+                LOGGER.warning('received invalid process termination notification: %s', notification.payload)
+                continue
+
+            self._fire_callbacks(pk)
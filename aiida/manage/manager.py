@@ -64,6 +64,8 @@ class Manager(object):  # pylint: disable=useless-object-inheritance
 
         unload_backend()
         self._backend = None
+        self._identity_map = None
+        self._array_cache = None
 
     def _load_backend(self, schema_check=True):
         """Load the backend for the currently configured profile and return it.
@@ -125,6 +127,37 @@ class Manager(object):  # pylint: disable=useless-object-inheritance
 
         return self._backend
 
+    def get_identity_map(self):
+        """
+        Get the identity map of stored entities that can no longer change, which is discarded with the backend
+
+        :return: the identity map
+        :rtype: :class:`aiida.orm.utils.identitymap.IdentityMap`
+        """
+        from aiida.orm.utils.identitymap import IdentityMap
+        from .configuration import get_config_option
+
+        if self._identity_map is None:
+            self._identity_map = IdentityMap(maxsize=get_config_option('orm.identity_map_size'))
+
+        return self._identity_map
+
+    def get_array_cache(self):
+        """
+        Get the cache of the arrays of stored `ArrayData` nodes, which is bounded by the total size of the arrays
+
+        :return: the array cache, keyed by the node UUID and the array name
+        :rtype: :class:`aiida.common.datastructures.LRUCache`
+        """
+        from aiida.common.datastructures import LRUCache
+        from .configuration import get_config_option
+
+        if self._array_cache is None:
+            maxsize = get_config_option('orm.array_cache_size') * 1024**2
+            self._array_cache = LRUCache(maxsize=maxsize, sizeof=lambda array: array.nbytes)
+
+        return self._array_cache
+
     def get_persister(self):
         """
         Get the persister
@@ -133,9 +166,11 @@ class Manager(object):  # pylint: disable=useless-object-inheritance
         :rtype: :class:`plumpy.Persister`
         """
         from aiida.engine import persistence
+        from .configuration import get_config
 
         if self._persister is None:
-            self._persister = persistence.AiiDAPersister()
+            codec = get_config().get_option('runner.checkpoint_codec')
+            self._persister = persistence.AiiDAPersister(codec=codec)
 
         return self._persister
 
@@ -270,7 +305,16 @@ class Manager(object):  # pylint: disable=useless-object-inheritance
         profile = self.get_profile()
         poll_interval = 0.0 if profile.is_test_profile else config.get_option('runner.poll.interval')
 
-        settings = {'rmq_submit': False, 'poll_interval': poll_interval}
+        settings = {
+            'rmq_submit': False,
+            'poll_interval': poll_interval,
+            'transport_idle_timeout': config.get_option('transport.idle_timeout'),
+            'process_notifications': config.get_option('runner.process_notifications'),
+        }
+
+        if config.get_option('runner.poll.shared'):
+            settings['jobs_cache_directory'] = profile.filepaths['daemon']['jobs']
+
         settings.update(kwargs)
 
         if 'communicator' not in settings:
@@ -322,6 +366,8 @@ class Manager(object):  # pylint: disable=useless-object-inheritance
 
         self._backend = None
         self._config = None
+        self._identity_map = None
+        self._array_cache = None
         self._profile = None
         self._communicator = None
         self._daemon_client = None
@@ -334,6 +380,8 @@ class Manager(object):  # pylint: disable=useless-object-inheritance
         self._backend = None  # type: aiida.orm.implementation.Backend
         self._config = None  # type: aiida.manage.configuration.config.Config
         self._daemon_client = None  # type: aiida.daemon.client.DaemonClient
+        self._identity_map = None  # type: aiida.orm.utils.identitymap.IdentityMap
+        self._array_cache = None  # type: aiida.common.datastructures.LRUCache
         self._profile = None  # type: aiida.manage.configuration.profile.Profile
         self._communicator = None  # type: kiwipy.rmq.RmqThreadCommunicator
         self._process_controller = None  # type: plumpy.RemoteProcessThreadController
@@ -59,6 +59,7 @@ class Computer(entities.Entity):
 
         def delete(self, id):  # pylint: disable=redefined-builtin,invalid-name
             """Delete the computer with the given id"""
+            get_manager().get_identity_map().invalidate(Computer, id)
             return self._backend.computers.delete(id)
 
     def __init__(self, name, hostname, description='', transport_type='', scheduler_type='', workdir=None,
@@ -156,19 +156,30 @@ def _(dbmodel, backend):
     get_backend_entity for DummyModel DbNode.
     DummyModel instances are created when QueryBuilder queries the Django backend.
     """
-    djnode_instance = djmodels.DbNode(
-        id=dbmodel.id,
-        node_type=dbmodel.node_type,
-        process_type=dbmodel.process_type,
-        uuid=dbmodel.uuid,
-        ctime=dbmodel.ctime,
-        mtime=dbmodel.mtime,
-        label=dbmodel.label,
-        description=dbmodel.description,
-        dbcomputer_id=dbmodel.dbcomputer_id,
-        user_id=dbmodel.user_id,
-        attributes=dbmodel.attributes,
-        extras=dbmodel.extras)
+    from sqlalchemy import inspect
+
+    # Columns that were deferred by the query, such as the attributes, are deferred on the Django instance as well
+    unloaded = inspect(dbmodel).unloaded
+
+    if unloaded:
+        fields = djmodels.DbNode._meta.concrete_fields  # pylint: disable=protected-access
+        field_names = [field.attname for field in fields if field.attname not in unloaded]
+        values = [getattr(dbmodel, field_name) for field_name in field_names]
+        djnode_instance = djmodels.DbNode.from_db('default', field_names, values)
+    else:
+        djnode_instance = djmodels.DbNode(
+            id=dbmodel.id,
+            node_type=dbmodel.node_type,
+            process_type=dbmodel.process_type,
+            uuid=dbmodel.uuid,
+            ctime=dbmodel.ctime,
+            mtime=dbmodel.mtime,
+            label=dbmodel.label,
+            description=dbmodel.description,
+            dbcomputer_id=dbmodel.dbcomputer_id,
+            user_id=dbmodel.user_id,
+            attributes=dbmodel.attributes,
+            extras=dbmodel.extras)
 
     from . import nodes
     return nodes.DjangoNode.from_dbmodel(djnode_instance, backend)
@@ -153,3 +153,22 @@ class DjangoLogCollection(BackendLogCollection):
 
         # Return list of deleted entities' (former) PKs for checking
         return entities_to_delete
+
+    def create_many(self, entries):
+        """
+        Create and store many Log entries at once, with a single bulk insert
+
+        :param entries: list of dictionaries with the `time`, `loggername`, `levelname`, `dbnode_id`, `message` and
+            `metadata` of each Log entry
+        :type entries: list
+        """
+        if not entries:
+            return
+
+        dblogs = []
+        for entry in entries:
+            entry = dict(entry)
+            entry['metadata'] = entry.get('metadata', None) or {}
+            dblogs.append(models.DbLog(**entry))
+
+        models.DbLog.objects.bulk_create(dblogs)
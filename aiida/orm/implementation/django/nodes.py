@@ -28,6 +28,18 @@ from . import utils as dj_utils
 from .computers import DjangoComputer
 from .users import DjangoUser
 
+# Select only the attributes with the given keys of a stored node, such that the rest is never sent by the database
+_SQL_SELECT_ATTRIBUTES = """
+SELECT (
+    SELECT jsonb_object_agg(entry.key, entry.value) FROM jsonb_each(node.attributes) AS entry
+    WHERE entry.key = ANY(%(keys)s)
+) FROM db_dbnode AS node WHERE node.id = %(id)s
+"""
+
+_SQL_SELECT_ATTRIBUTE_KEYS = """
+SELECT jsonb_object_keys(node.attributes) FROM db_dbnode AS node WHERE node.id = %(id)s
+"""
+
 
 class DjangoNode(entities.DjangoModelEntity[models.DbNode], BackendNode):
     """Django Node backend entity"""
@@ -177,7 +189,7 @@ class DjangoNode(entities.DjangoModelEntity[models.DbNode], BackendNode):
         :raises AttributeError: if the attribute does not exist and no default is specified
         """
         try:
-            return self._dbmodel.attributes[key]
+            return self._get_attributes((key,))[key]
         except KeyError as exception:
             raise AttributeError('attribute `{}` does not exist'.format(exception))
 
@@ -196,11 +208,29 @@ class DjangoNode(entities.DjangoModelEntity[models.DbNode], BackendNode):
         :return: a list of attribute values
         :raises AttributeError: if at least one attribute does not exist
         """
+        attributes = self._get_attributes(keys)
+
         try:
-            return [self.get_attribute(key) for key in keys]
+            return [attributes[key] for key in keys]
         except KeyError as exception:
             raise AttributeError('attribute `{}` does not exist'.format(exception))
 
+    def _get_attributes(self, keys):
+        """Return a dictionary that contains at least the attributes with the given keys that exist.
+
+        If the attributes would be refreshed from the database upon access, only the requested attributes are selected,
+        such that the complete attributes dictionary is neither transferred nor deserialized.
+
+        :param keys: a list of attribute names
+        :return: a dictionary of attributes
+        """
+        if not self._dbmodel.is_refreshed_on_access('attributes'):
+            return self._dbmodel.attributes
+
+        rows = self.backend.execute_prepared_statement(_SQL_SELECT_ATTRIBUTES, {'keys': list(keys), 'id': self.id})
+
+        return (rows[0][0] if rows else None) or {}
+
     def set_attribute(self, key, value):
         """Set an attribute to the given value.
 
@@ -289,7 +319,12 @@ class DjangoNode(entities.DjangoModelEntity[models.DbNode], BackendNode):
 
         :return: an iterator with attribute keys
         """
-        for key in self._dbmodel.attributes:
+        if not self._dbmodel.is_refreshed_on_access('attributes'):
+            for key in self._dbmodel.attributes:
+                yield key
+            return
+
+        for key, in self.backend.execute_prepared_statement(_SQL_SELECT_ATTRIBUTE_KEYS, {'id': self.id}):
             yield key
 
     @property
@@ -533,3 +568,85 @@ class DjangoNodeCollection(BackendNodeCollection):
             models.DbNode.objects.filter(pk=pk).delete()  # pylint: disable=no-member
         except ObjectDoesNotExist:
             raise exceptions.NotExistent("Node with pk '{}' not found".format(pk))
+
+    def store_many(self, nodes, links=None, with_transaction=True, clean=True):
+        """Store many nodes and their incoming links in the database at once.
+
+        The nodes are inserted in bulk, after which the links of all nodes are inserted in bulk. The source nodes of
+        the links have to be stored already.
+
+        :param nodes: list of unstored `BackendNode` instances
+        :param links: optional list with for each node the list of link triples to add to it
+        :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+        :param clean: boolean, if True, will clean the attributes and extras before attempting to store
+        """
+        from aiida.common.lang import EmptyContextManager
+
+        dbmodels = [node.dbmodel for node in nodes]
+
+        if not dbmodels:
+            return
+
+        if clean:
+            for node in nodes:
+                node.clean_values()
+
+        try:
+            with transaction.atomic() if with_transaction else EmptyContextManager():
+                # On PostgreSQL the primary keys of the created rows are returned and set on the model instances
+                models.DbNode.objects.bulk_create(dbmodels)
+
+                dblinks = []
+                for node, link_triples in zip(nodes, links or []):
+                    for source, link_type, link_label in link_triples:
+                        dblinks.append(
+                            models.DbLink(
+                                input_id=source.id, output_id=node.id, label=link_label, type=link_type.value))
+
+                if dblinks:
+                    models.DbLink.objects.bulk_create(dblinks)
+        except Exception:
+            # The models should not be considered stored, which is determined by the presence of their primary key
+            for dbmodel in dbmodels:
+                dbmodel.pk = None
+            raise
+
+    def bulk_set_extra(self, key, values):
+        """Set an extra of many stored nodes at once, without loading the nodes.
+
+        :param key: name of the extra
+        :param values: dictionary mapping the pk of each node onto the value of the extra to set
+        """
+        from django.db import connection
+        from aiida.common import json
+
+        if not values:
+            return
+
+        query = ('UPDATE db_dbnode SET extras = '
+                 "jsonb_set(coalesce(extras, '{}'::jsonb), ARRAY[%s], %s::jsonb) WHERE id = %s")
+        parameters = [(key, json.dumps(clean_value(value)), pk) for pk, value in values.items()]
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.executemany(query, parameters)
+
+    def get_pks_by_hash(self, node_type, node_hash):
+        """Return the pks of the nodes of the given node type with the given hash.
+
+        The query uses the dedicated index on the node type and the hash extra, which is why it should be preferred
+        over filtering on the hash extra with the `QueryBuilder`.
+
+        :param node_type: the exact node type string of the nodes
+        :param node_hash: the hash of the nodes
+        :return: list of pks of the matching nodes, ordered by pk
+        """
+        from django.db import connection
+        from aiida.common.hashing import _HASH_EXTRA_KEY
+
+        query = ("SELECT id FROM db_dbnode WHERE node_type = %s AND (extras ->> '{}') = %s "
+                 'ORDER BY id'.format(_HASH_EXTRA_KEY))
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, (node_type, node_hash))
+            return [row[0] for row in cursor.fetchall()]
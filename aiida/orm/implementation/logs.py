@@ -130,3 +130,13 @@ class BackendLogCollection(backends.BackendCollection[BackendLog]):
         :raises TypeError: if ``filters`` is not a `dict`
         :raises `~aiida.common.exceptions.ValidationError`: if ``filters`` is empty
         """
+
+    @abc.abstractmethod
+    def create_many(self, entries):
+        """
+        Create and store many Log entries at once, with a single bulk insert
+
+        :param entries: list of dictionaries with the `time`, `loggername`, `levelname`, `dbnode_id`, `message` and
+            `metadata` of each Log entry
+        :type entries: list
+        """
@@ -406,3 +406,36 @@ class BackendNodeCollection(backends.BackendCollection[BackendNode]):
 
         :param pk: id of the node to delete
         """
+
+    @abc.abstractmethod
+    def store_many(self, nodes, links=None, with_transaction=True, clean=True):
+        """Store many nodes and their incoming links in the database at once.
+
+        The nodes are inserted in bulk, after which the links of all nodes are inserted in bulk. The source nodes of
+        the links have to be stored already.
+
+        :param nodes: list of unstored `BackendNode` instances
+        :param links: optional list with for each node the list of link triples to add to it
+        :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+        :param clean: boolean, if True, will clean the attributes and extras before attempting to store
+        """
+
+    @abc.abstractmethod
+    def bulk_set_extra(self, key, values):
+        """Set an extra of many stored nodes at once, without loading the nodes.
+
+        :param key: name of the extra
+        :param values: dictionary mapping the pk of each node onto the value of the extra to set
+        """
+
+    @abc.abstractmethod
+    def get_pks_by_hash(self, node_type, node_hash):
+        """Return the pks of the nodes of the given node type with the given hash.
+
+        The query uses the dedicated index on the node type and the hash extra, which is why it should be preferred
+        over filtering on the hash extra with the `QueryBuilder`.
+
+        :param node_type: the exact node type string of the nodes
+        :param node_hash: the hash of the nodes
+        :return: list of pks of the matching nodes, ordered by pk
+        """
@@ -54,6 +54,12 @@ class BackendQueryBuilder(object):
         A property, decorated with @property. Returns the implementation for the DbLink
         """
 
+    @abc.abstractmethod
+    def NodeClosure(self):
+        """
+        A property, decorated with @property. Returns the implementation for the DbNodeClosure
+        """
+
     @abc.abstractmethod
     def Computer(self):
         """
@@ -267,6 +273,38 @@ class BackendQueryBuilder(object):
         :returns: An iterator over all the results of a list of dictionaries.
         """
 
+    def iter_rows(self, query, batch_size):
+        """
+        Execute the query and yield its rows in batches, without converting the values to AiiDA entities.
+
+        The rows are fetched from a server side cursor, such that only one batch is kept in memory at a time.
+
+        :param query: the query, either a :class:`sqlalchemy.orm.Query` or a cached query
+            :class:`aiida.orm.utils.querycache.CachedQuery`
+        :param int batch_size: the number of rows per batch
+        :returns: a generator of lists of rows, where each row is a sequence of the values as returned by the database
+        """
+        from aiida.orm.utils.querycache import CachedQuery
+
+        try:
+            if isinstance(query, CachedQuery):
+                result = query.execute(stream_results=True)
+            else:
+                connection = self.get_session().connection().execution_options(stream_results=True)
+                result = connection.execute(query.with_labels().statement)
+
+            try:
+                while True:
+                    rows = result.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                result.close()
+        except Exception:
+            self.get_session().rollback()
+            raise
+
     @abc.abstractmethod
     def get_column_names(self, alias):
         """
@@ -162,3 +162,23 @@ class SqlaLogCollection(BackendLogCollection):
 
         # Return list of deleted entities' (former) PKs for checking
         return entities_to_delete
+
+    def create_many(self, entries):
+        """
+        Create and store many Log entries at once, with a single bulk insert
+
+        :param entries: list of dictionaries with the `time`, `loggername`, `levelname`, `dbnode_id`, `message` and
+            `metadata` of each Log entry
+        :type entries: list
+        """
+        if not entries:
+            return
+
+        session = get_scoped_session()
+
+        try:
+            session.bulk_save_objects([models.DbLog(**entry) for entry in entries])
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
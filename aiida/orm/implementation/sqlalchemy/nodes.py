@@ -14,6 +14,7 @@ from __future__ import absolute_import
 
 # pylint: disable=no-name-in-module,import-error
 from datetime import datetime
+from sqlalchemy import text
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -29,6 +30,18 @@ from . import utils as sqla_utils
 from .computers import SqlaComputer
 from .users import SqlaUser
 
+# Select only the attributes with the given keys of a stored node, such that the rest is never sent by the database
+_SQL_SELECT_ATTRIBUTES = """
+SELECT (
+    SELECT jsonb_object_agg(entry.key, entry.value) FROM jsonb_each(node.attributes) AS entry
+    WHERE entry.key = ANY(:keys)
+) FROM db_dbnode AS node WHERE node.id = :id
+"""
+
+_SQL_SELECT_ATTRIBUTE_KEYS = """
+SELECT jsonb_object_keys(node.attributes) FROM db_dbnode AS node WHERE node.id = :id
+"""
+
 
 class SqlaNode(entities.SqlaModelEntity[models.DbNode], BackendNode):
     """SQLA Node backend entity"""
@@ -179,7 +192,7 @@ class SqlaNode(entities.SqlaModelEntity[models.DbNode], BackendNode):
         :raises AttributeError: if the attribute does not exist and no default is specified
         """
         try:
-            return self._dbmodel.attributes[key]
+            return self._get_attributes((key,))[key]
         except KeyError as exception:
             raise AttributeError('attribute `{}` does not exist'.format(exception))
 
@@ -198,11 +211,30 @@ class SqlaNode(entities.SqlaModelEntity[models.DbNode], BackendNode):
         :return: a list of attribute values
         :raises AttributeError: if at least one attribute does not exist
         """
+        attributes = self._get_attributes(keys)
+
         try:
-            return [self.get_attribute(key) for key in keys]
+            return [attributes[key] for key in keys]
         except KeyError as exception:
             raise AttributeError('attribute `{}` does not exist'.format(exception))
 
+    def _get_attributes(self, keys):
+        """Return a dictionary that contains at least the attributes with the given keys that exist.
+
+        If the attributes would be refreshed from the database upon access, only the requested attributes are selected,
+        such that the complete attributes dictionary is neither transferred nor deserialized.
+
+        :param keys: a list of attribute names
+        :return: a dictionary of attributes
+        """
+        if not self._dbmodel.is_refreshed_on_access('attributes'):
+            return self._dbmodel.attributes
+
+        session = get_scoped_session()
+        attributes = session.execute(text(_SQL_SELECT_ATTRIBUTES), {'keys': list(keys), 'id': self.id}).scalar()
+
+        return attributes or {}
+
     def set_attribute(self, key, value):
         """Set an attribute to the given value.
 
@@ -294,7 +326,13 @@ class SqlaNode(entities.SqlaModelEntity[models.DbNode], BackendNode):
 
         :return: an iterator with attribute keys
         """
-        for key in self._dbmodel.attributes.keys():
+        if not self._dbmodel.is_refreshed_on_access('attributes'):
+            for key in self._dbmodel.attributes.keys():
+                yield key
+            return
+
+        session = get_scoped_session()
+        for key, in session.execute(text(_SQL_SELECT_ATTRIBUTE_KEYS), {'id': self.id}):
             yield key
 
     @property
@@ -551,3 +589,103 @@ class SqlaNodeCollection(BackendNodeCollection):
             session.commit()
         except NoResultFound:
             raise exceptions.NotExistent("Node with pk '{}' not found".format(pk))
+
+    def store_many(self, nodes, links=None, with_transaction=True, clean=True):
+        """Store many nodes and their incoming links in the database at once.
+
+        The nodes are inserted in bulk, after which the links of all nodes are inserted in bulk. The source nodes of
+        the links have to be stored already.
+
+        :param nodes: list of unstored `BackendNode` instances
+        :param links: optional list with for each node the list of link triples to add to it
+        :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+        :param clean: boolean, if True, will clean the attributes and extras before attempting to store
+        """
+        session = get_scoped_session()
+        dbmodels = [node.dbmodel for node in nodes]
+
+        if not dbmodels:
+            return
+
+        if clean:
+            for node in nodes:
+                node.clean_values()
+
+        try:
+            # Reserve the primary keys of all nodes with a single query. With the primary keys known beforehand, the
+            # session will insert the nodes with a single `executemany` instead of one `INSERT RETURNING` per node
+            query = text("SELECT nextval('db_dbnode_id_seq') FROM generate_series(1, :count)")
+            pks = [row[0] for row in session.execute(query, {'count': len(dbmodels)})]
+
+            for dbmodel, pk in zip(dbmodels, pks):
+                dbmodel.id = pk
+
+            session.add_all(dbmodels)
+            session.flush()
+
+            rows = []
+            for node, link_triples in zip(nodes, links or []):
+                for source, link_type, link_label in link_triples:
+                    rows.append({
+                        'input_id': source.id,
+                        'output_id': node.id,
+                        'label': link_label,
+                        'type': link_type.value
+                    })
+
+            if rows:
+                session.execute(models.DbLink.__table__.insert(), rows)  # pylint: disable=no-member
+
+            if with_transaction:
+                session.commit()
+        except SQLAlchemyError:
+            if with_transaction:
+                session.rollback()
+            # The models should not be considered stored, which is determined by the presence of their primary key, and
+            # should no longer be in the session, which otherwise still contains them if the caller owns the transaction
+            for dbmodel in dbmodels:
+                if dbmodel in session:
+                    session.expunge(dbmodel)
+                dbmodel.id = None
+            raise
+
+    def bulk_set_extra(self, key, values):
+        """Set an extra of many stored nodes at once, without loading the nodes.
+
+        :param key: name of the extra
+        :param values: dictionary mapping the pk of each node onto the value of the extra to set
+        """
+        from aiida.common import json
+
+        if not values:
+            return
+
+        session = get_scoped_session()
+        query = text('UPDATE db_dbnode SET extras = '
+                     "jsonb_set(coalesce(extras, '{}'::jsonb), ARRAY[:key], CAST(:value AS jsonb)) WHERE id = :pk")
+        parameters = [{'pk': pk, 'key': key, 'value': json.dumps(clean_value(value))} for pk, value in values.items()]
+
+        try:
+            session.execute(query, parameters)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+
+    def get_pks_by_hash(self, node_type, node_hash):
+        """Return the pks of the nodes of the given node type with the given hash.
+
+        The query uses the dedicated index on the node type and the hash extra, which is why it should be preferred
+        over filtering on the hash extra with the `QueryBuilder`.
+
+        :param node_type: the exact node type string of the nodes
+        :param node_hash: the hash of the nodes
+        :return: list of pks of the matching nodes, ordered by pk
+        """
+        from aiida.common.hashing import _HASH_EXTRA_KEY
+
+        session = get_scoped_session()
+        query = text("SELECT id FROM db_dbnode WHERE node_type = :node_type AND (extras ->> '{}') = :node_hash "
+                     'ORDER BY id'.format(_HASH_EXTRA_KEY))
+
+        return [row[0] for row in session.execute(query, {'node_type': node_type, 'node_hash': node_hash})]
@@ -95,6 +95,11 @@ class SqlaQueryBuilder(BackendQueryBuilder):
         import aiida.backends.sqlalchemy.models.node
         return aiida.backends.sqlalchemy.models.node.DbLink
 
+    @property
+    def NodeClosure(self):
+        import aiida.backends.sqlalchemy.models.node
+        return aiida.backends.sqlalchemy.models.node.DbNodeClosure
+
     @property
     def Computer(self):
         import aiida.backends.sqlalchemy.models.computer
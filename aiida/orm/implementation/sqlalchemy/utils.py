@@ -64,7 +64,7 @@ class ModelWrapper(object):
         if item == '_model':
             raise AttributeError()
 
-        if self.is_saved() and self._is_mutable_model_field(item) and not self._in_transaction():
+        if self.is_refreshed_on_access(item):
             self._ensure_model_uptodate(fields=(item,))
 
         return getattr(self._model, item)
@@ -82,6 +82,14 @@ class ModelWrapper(object):
             fields = set((key,) + self._auto_flush)
             self._flush(fields=fields)
 
+    def is_refreshed_on_access(self, field):
+        """Return whether the value of the given field is refreshed from the database whenever it is accessed.
+
+        :param field: the name of the model field
+        :return: boolean, True if the field is refreshed from the database upon access, False otherwise
+        """
+        return self.is_saved() and self._is_mutable_model_field(field) and not self._in_transaction()
+
     def is_saved(self):
         """Retun whether the wrapped model instance is saved in the database.
 
@@ -48,11 +48,29 @@ class Log(entities.Entity):
             :return: An object implementing the log entry interface
             :rtype: :class:`aiida.orm.logs.Log`
             """
+            fields = Log.Collection.get_fields_from_record(record)
+
+            # Do not store if dbnode_id is not set
+            if fields is None:
+                return None
+
+            return Log(**fields)
+
+        @staticmethod
+        def get_fields_from_record(record):
+            """
+            Helper function to get the fields of a log entry from a record created as by the python logging library
+
+            :param record: The record created by the logging module
+            :type record: :class:`logging.record`
+
+            :return: dictionary with the fields of the log entry, or None if the record is not attached to a node
+            :rtype: dict
+            """
             from datetime import datetime
 
             dbnode_id = record.__dict__.get('dbnode_id', None)
 
-            # Do not store if dbnode_id is not set
             if dbnode_id is None:
                 return None
 
@@ -71,13 +89,24 @@ class Log(entities.Entity):
                 if key in metadata:
                     metadata[key] = str(metadata[key])
 
-            return Log(
-                time=timezone.make_aware(datetime.fromtimestamp(record.created)),
-                loggername=record.name,
-                levelname=record.levelname,
-                dbnode_id=dbnode_id,
-                message=message,
-                metadata=metadata)
+            return {
+                'time': timezone.make_aware(datetime.fromtimestamp(record.created)),
+                'loggername': record.name,
+                'levelname': record.levelname,
+                'dbnode_id': dbnode_id,
+                'message': message,
+                'metadata': metadata,
+            }
+
+        def create_entries_from_fields(self, entries):
+            """
+            Create and store many log entries at once, with a single bulk insert
+
+            :param entries: list of dictionaries with the fields of each log entry, as returned by
+                :meth:`get_fields_from_record`
+            :type entries: list
+            """
+            self._backend.logs.create_many(entries)
 
         def get_logs_for(self, entity, order_by=None):
             """
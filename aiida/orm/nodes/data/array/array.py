@@ -14,6 +14,9 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import six
+
+from aiida.manage.manager import get_manager
 from ..data import Data
 
 
@@ -24,21 +27,25 @@ class ArrayData(Data):
     installed).
 
     Each array is stored within the Node folder as a different .npy file.
+    Large arrays can instead be stored in chunks along their first axis, by
+    passing a ``chunk_size`` to :py:meth:`.set_array`, where each chunk is a
+    separate .npy file, or a compressed .npz file if ``compressed=True``.
+    Chunked arrays can be extended with :py:meth:`.append_array` and partial
+    reads with :py:meth:`.get_array_slice` only read the chunks that are needed.
 
     :note: Before storing, no caching is done: if you perform a
       :py:meth:`.get_array` call, the array will be re-read from disk.
       If instead the ArrayData node has already been stored,
       the array is cached in memory after the first read, and the cached array
-      is used thereafter.
-      If too much RAM memory is used, you can clear the
+      is used thereafter. The cache is shared by all nodes and discards the least
+      recently used arrays once their total size exceeds the `orm.array_cache_size`
+      configuration option. You can also clear the arrays of a node from the
       cache with the :py:meth:`.clear_internal_cache` method.
+      To read only part of a large array, use :py:meth:`.get_array_slice` or
+      :py:meth:`.get_array` with ``mmap=True``.
     """
     array_prefix = "array|"
-    _cached_arrays = None
-
-    def initialize(self):
-        super(ArrayData, self).initialize()
-        self._cached_arrays = {}
+    array_chunks_prefix = "array_chunks|"
 
     def delete_array(self, name):
         """
@@ -46,17 +53,16 @@ class ArrayData(Data):
 
         :param name: The name of the array to delete from the node.
         """
-        fname = '{}.npy'.format(name)
-        if fname not in self.list_object_names():
+        if not self._delete_array_files(name):
             raise KeyError("Array with name '{}' not found in node pk= {}".format(name, self.pk))
 
-        # remove both file and attribute
-        self.delete_object(fname)
-        try:
-            self.delete_attribute("{}{}".format(self.array_prefix, name))
-        except (KeyError, AttributeError):
-            # Should not happen, but do not crash if for some reason the property was not set.
-            pass
+        # remove both files and attributes
+        for prefix in [self.array_prefix, self.array_chunks_prefix]:
+            try:
+                self.delete_attribute("{}{}".format(prefix, name))
+            except (KeyError, AttributeError):
+                # Should not happen, but do not crash if for some reason the property was not set.
+                pass
 
     def get_arraynames(self):
         """
@@ -73,7 +79,8 @@ class ArrayData(Data):
         Return a list of all arrays stored in the node, listing the files (and
         not relying on the properties).
         """
-        return [i[:-4] for i in self.list_object_names() if i.endswith('.npy')]
+        filenames = [i for i in self.list_object_names() if i.endswith(('.npy', '.npz'))]
+        return list({self._get_array_name_from_filename(i) for i in filenames})
 
     def _arraynames_from_properties(self):
         """
@@ -101,33 +108,100 @@ class ArrayData(Data):
         for name in self.get_arraynames():
             yield (name, self.get_array(name))
 
-    def get_array(self, name):
+    def get_array(self, name, mmap=False):
         """
         Return an array stored in the node
 
         :param name: The name of the array to return.
+        :param mmap: if True, return a read-only array that is memory-mapped to the file in the repository, such that
+            only the parts of the array that are used are read from disk. Memory-mapped arrays are not cached.
+        :return: the array, which is read-only if the node is stored, because it is shared through the array cache by
+            all instances of the node, so make a copy to modify it
+        :raises ValueError: if `mmap` is True and the array is chunked, use :py:meth:`.get_array_chunk` instead.
         """
         import numpy
 
-        def get_array_from_file(self, name):
-            """Return the array stored in a .npy file"""
-            filename = '{}.npy'.format(name)
-
-            if filename not in self.list_object_names():
-                raise KeyError('Array with name `{}` not found in ArrayData<{}>'.format(name, self.pk))
-
-            # Open a handle in binary read mode as the arrays are written as binary files as well
-            with self.open(filename, mode='rb') as handle:
-                return numpy.load(handle)
+        if mmap:
+            if self._get_chunk_info(name) is not None:
+                raise ValueError('the chunked array `{}` cannot be memory-mapped as a whole'.format(name))
+            return numpy.load(self._get_array_path(name), mmap_mode='r')
 
         # Return with proper caching if the node is stored, otherwise always re-read from disk
         if not self.is_stored:
-            return get_array_from_file(self, name)
+            return self._get_array_from_file(name)
+
+        cache = get_manager().get_array_cache()
+        array = cache.get((self.uuid, name))
+
+        if array is None:
+            array = self._get_array_from_file(name)
+            array.setflags(write=False)
+            cache.set((self.uuid, name), array)
+
+        return array
+
+    def get_array_slice(self, name, index):
+        """
+        Return part of an array stored in the node, reading only that part from disk if possible
+
+        The array file is memory-mapped, unless the array is already cached, and the returned part is copied into
+        memory, such that it does not keep a reference to the file or to the cached array. For chunked arrays, only
+        the chunks that contain the requested elements along the first axis are read.
+
+        :param name: The name of the array.
+        :param index: any index or slice that is supported by numpy arrays, e.g. `3` or `slice(0, 10)` for the first
+            ten elements along the first axis
+        """
+        import numpy
+
+        array = get_manager().get_array_cache().get((self.uuid, name)) if self.is_stored else None
+
+        if array is None and self._get_chunk_info(name) is not None:
+            part = self._get_chunked_array_slice(name, index)
+        else:
+            if array is None:
+                try:
+                    array = self.get_array(name, mmap=True)
+                except ValueError:
+                    # Arrays of python objects cannot be memory-mapped
+                    array = self.get_array(name)
+
+            part = array[index]
+
+        # Indexing a single element returns a numpy scalar, which is already a copy
+        return numpy.array(part) if isinstance(part, numpy.ndarray) else part
+
+    def get_array_chunk(self, name, index, mmap=False):
+        """
+        Return a single chunk of a chunked array stored in the node
+
+        :param name: The name of the array.
+        :param index: the index of the chunk, the chunk with index `i` contains the elements `i * chunk_size` up to
+            `(i + 1) * chunk_size` along the first axis of the array.
+        :param mmap: if True, return a read-only array that is memory-mapped to the chunk file in the repository,
+            which avoids any copy. Compressed chunks and arrays of python objects are always read in memory.
+        :raises KeyError: if the array does not exist.
+        :raises ValueError: if the array is not chunked.
+        :raises IndexError: if the chunk does not exist.
+        """
+        import numpy
+
+        chunk_info = self._get_chunk_info(name)
+
+        if chunk_info is None:
+            if name in self.get_arraynames():
+                raise ValueError('the array `{}` is not chunked'.format(name))
+            raise KeyError('Array with name `{}` not found in ArrayData<{}>'.format(name, self.pk))
 
-        if name not in self._cached_arrays:
-            self._cached_arrays[name] = get_array_from_file(self, name)
+        if not 0 <= index < self._get_num_chunks(name):
+            raise IndexError('the array `{}` has no chunk with index {}'.format(name, index))
 
-        return self._cached_arrays[name]
+        if mmap and not chunk_info['compressed'] and not numpy.dtype(chunk_info['dtype']).hasobject:
+            filename = self._get_chunk_filename(name, index, compressed=False)
+            folder = self._repository._get_base_folder()  # pylint: disable=protected-access
+            return numpy.load(folder.get_abs_path(filename), mmap_mode='r')
+
+        return self._get_array_chunk_from_file(name, index, chunk_info['compressed'])
 
     def clear_internal_cache(self):
         """
@@ -136,21 +210,185 @@ class ArrayData(Data):
         disk).
         This function is useful if you want to keep the node in memory, but you
         do not want to waste memory to cache the arrays in RAM.
+
+        .. note:: the cache is shared by all instances of the same stored node, and is bounded by the
+            `orm.array_cache_size` configuration option.
         """
-        self._cached_arrays = {}
+        if not self.is_stored:
+            return
+
+        cache = get_manager().get_array_cache()
+
+        for name in self.get_arraynames():
+            cache.pop((self.uuid, name))
+
+    def _get_array_from_file(self, name):
+        """Return the array stored in a .npy file, or the concatenation of its chunks if the array is chunked"""
+        import numpy
+
+        chunk_info = self._get_chunk_info(name)
+
+        if chunk_info is not None:
+            chunks = [
+                self._get_array_chunk_from_file(name, index, chunk_info['compressed'])
+                for index in range(self._get_num_chunks(name))
+            ]
+            if not chunks:
+                return numpy.empty(self.get_shape(name), dtype=numpy.dtype(chunk_info['dtype']))
+            return numpy.concatenate(chunks)
+
+        filename = '{}.npy'.format(name)
+
+        if filename not in self.list_object_names():
+            raise KeyError('Array with name `{}` not found in ArrayData<{}>'.format(name, self.pk))
+
+        # Open a handle in binary read mode as the arrays are written as binary files as well
+        with self.open(filename, mode='rb') as handle:
+            return numpy.load(handle)
 
-    def set_array(self, name, array):
+    def _get_array_path(self, name):
+        """Return the absolute path of the .npy file of an array, which should only be read from"""
+        filename = '{}.npy'.format(name)
+
+        if filename not in self.list_object_names():
+            raise KeyError('Array with name `{}` not found in ArrayData<{}>'.format(name, self.pk))
+
+        return self._repository._get_base_folder().get_abs_path(filename)  # pylint: disable=protected-access
+
+    def _get_chunk_info(self, name):
+        """Return the chunk size, compression and dtype of a chunked array, or None if the array is not chunked"""
+        return self.get_attribute('{}{}'.format(self.array_chunks_prefix, name), None)
+
+    def _get_num_chunks(self, name):
+        """Return the number of chunks of a chunked array"""
+        chunk_size = self._get_chunk_info(name)['chunk_size']
+        return (self.get_shape(name)[0] + chunk_size - 1) // chunk_size
+
+    @staticmethod
+    def _get_chunk_filename(name, index, compressed):
+        """Return the filename of a chunk of an array"""
+        return '{}.{:06d}.{}'.format(name, index, 'npz' if compressed else 'npy')
+
+    @staticmethod
+    def _get_array_name_from_filename(filename):
+        """Return the name of the array stored in a .npy or .npz file, which is either the whole array or a chunk"""
+        # Array names can only contain digits, letters and underscores, so the name ends at the first dot
+        return filename.split('.', 1)[0]
+
+    def _get_array_chunk_from_file(self, name, index, compressed):
+        """Return a chunk of an array stored in a .npy or a compressed .npz file"""
+        import io
+        import numpy
+
+        with self.open(self._get_chunk_filename(name, index, compressed), mode='rb') as handle:
+            if not compressed:
+                return numpy.load(handle)
+
+            # Reading the zip archive requires a seekable handle, which the repository does not guarantee
+            with numpy.load(io.BytesIO(handle.read())) as npz:
+                return npz['chunk']
+
+    def _get_chunked_array_slice(self, name, index):
+        """Return part of a chunked array, reading only the chunks that contain the requested elements"""
+        import numbers
+        import numpy
+
+        chunk_info = self._get_chunk_info(name)
+        chunk_size = chunk_info['chunk_size']
+        shape = self.get_shape(name)
+        mmap = not chunk_info['compressed']
+
+        first, rest = (index[0], index[1:]) if isinstance(index, tuple) and index else (index, ())
+
+        if first is Ellipsis or first is None or not shape:
+            # The index does not select along the first axis, so all chunks are needed
+            return self.get_array(name)[index]
+
+        if isinstance(first, numbers.Integral):
+            if not -shape[0] <= first < shape[0]:
+                raise IndexError('index {} is out of bounds for axis 0 with size {}'.format(first, shape[0]))
+            row = first % shape[0]
+            return self.get_array_chunk(name, row // chunk_size, mmap=mmap)[(row % chunk_size,) + rest]
+
+        if not isinstance(first, slice) and numpy.asarray(first).dtype == bool and numpy.ndim(first) != 1:
+            # A multi-dimensional boolean mask selects along several axes at once
+            return self.get_array(name)[index]
+
+        # Any other index along the first axis (slice, array of integers or boolean mask) selects a set of rows
+        rows = numpy.arange(shape[0])[first]
+        chunk_indices = numpy.unique(rows // chunk_size)
+
+        if chunk_indices.size:
+            block = numpy.concatenate([self.get_array_chunk(name, i, mmap=mmap) for i in chunk_indices])
+        else:
+            block = numpy.empty((0,) + shape[1:], dtype=numpy.dtype(chunk_info['dtype']))
+
+        # All chunks but the last one of the array are full, so the rows are at these positions in the block
+        positions = numpy.searchsorted(chunk_indices, rows // chunk_size) * chunk_size + rows % chunk_size
+
+        if isinstance(first, slice):
+            return block[positions][(slice(None),) + rest]
+
+        # Replace the index along the first axis by the positions of the rows, such that any advanced indices in the
+        # rest of the index are broadcast together with it, just as for the full array
+        return block[(positions,) + rest]
+
+    def _delete_array_files(self, name):
+        """Delete all the files of an array, whether chunked or not, and return whether any files were deleted"""
+        filenames = [
+            filename for filename in self.list_object_names()
+            if filename.endswith(('.npy', '.npz')) and self._get_array_name_from_filename(filename) == name
+        ]
+
+        for filename in filenames:
+            self.delete_object(filename)
+
+        return bool(filenames)
+
+    def _put_array_file(self, array, filename, compressed=False):
+        """Write an array to a .npy file, or to a compressed .npz file, in the repository"""
+        import tempfile
+        import numpy
+
+        # Write the array to a temporary file, and then add it to the repository of the node
+        with tempfile.NamedTemporaryFile() as handle:
+            if compressed:
+                numpy.savez_compressed(handle, chunk=array)
+            else:
+                numpy.save(handle, array)
+
+            # Flush and rewind the handle, otherwise the command to store it in the repo will write an empty file
+            handle.flush()
+            handle.seek(0)
+
+            # Write the numpy array to the repository, keeping the byte representation
+            self.put_object_from_filelike(handle, filename, mode='wb', encoding=None)
+
+    def _put_array_chunks(self, name, array, start, chunk_info):
+        """Write the rows of an array in chunks, where `start` is the index of the chunk of the first row"""
+        chunk_size = chunk_info['chunk_size']
+
+        for offset in range(0, array.shape[0], chunk_size):
+            filename = self._get_chunk_filename(name, start + offset // chunk_size, chunk_info['compressed'])
+            self._put_array_file(array[offset:offset + chunk_size], filename, chunk_info['compressed'])
+
+    def set_array(self, name, array, chunk_size=None, compressed=False):
         """
         Store a new numpy array inside the node. Possibly overwrite the array
         if it already existed.
 
-        Internally, it stores a name.npy file in numpy format.
+        Internally, it stores a name.npy file in numpy format. If a `chunk_size`
+        is given, the array is instead split along its first axis in chunks of
+        `chunk_size` elements, which are stored in separate files.
 
         :param name: The name of the array.
         :param array: The numpy array to store.
+        :param chunk_size: if specified, store the array in chunks of this number of elements along the first axis, such
+            that the array can be extended with :py:meth:`.append_array` and partially read chunk by chunk.
+        :param compressed: if True, compress each chunk. If no `chunk_size` is given, the array is stored as a single
+            compressed chunk. Compressed chunks cannot be memory-mapped.
         """
         import re
-        import tempfile
         import numpy
 
         if not isinstance(array, numpy.ndarray):
@@ -161,20 +399,81 @@ class ArrayData(Data):
             raise ValueError("The name assigned to the array ({}) is not valid,"
                              "it can only contain digits, letters and underscores")
 
-        # Write the array to a temporary file, and then add it to the repository of the node
-        with tempfile.NamedTemporaryFile() as handle:
-            numpy.save(handle, array)
-
-            # Flush and rewind the handle, otherwise the command to store it in the repo will write an empty file
-            handle.flush()
-            handle.seek(0)
-
-            # Write the numpy array to the repository, keeping the byte representation
-            self.put_object_from_filelike(handle, '{}.npy'.format(name), mode='wb', encoding=None)
+        if (chunk_size is not None or compressed) and not array.shape:
+            raise ValueError('zero-dimensional arrays cannot be chunked or compressed')
+
+        if chunk_size is None and compressed:
+            chunk_size = max(array.shape[0], 1)
+
+        if chunk_size is not None:
+            if not isinstance(chunk_size, six.integer_types) or chunk_size <= 0:
+                raise ValueError('the chunk size should be a positive integer, got {}'.format(chunk_size))
+
+        # Remove the files of a previous array with the same name, which might have been stored in another format
+        self._delete_array_files(name)
+
+        if chunk_size is None:
+            self._put_array_file(array, '{}.npy'.format(name))
+            try:
+                self.delete_attribute('{}{}'.format(self.array_chunks_prefix, name))
+            except (KeyError, AttributeError):
+                pass
+        else:
+            chunk_info = {'chunk_size': chunk_size, 'compressed': compressed, 'dtype': array.dtype.str}
+            self._put_array_chunks(name, array, 0, chunk_info)
+            if not array.shape[0]:
+                # Write a single empty chunk, such that the array can still be found from the files of the node
+                self._put_array_file(array, self._get_chunk_filename(name, 0, compressed), compressed)
+            self.set_attribute('{}{}'.format(self.array_chunks_prefix, name), chunk_info)
 
         # Store the array name and shape for querying purposes
         self.set_attribute('{}{}'.format(self.array_prefix, name), list(array.shape))
 
+    def append_array(self, name, array):
+        """
+        Append elements along the first axis to a chunked array. Only the new chunks are written, and the last chunk
+        of the array if it was not full. Can only be called before storing.
+
+        :param name: The name of the array, which should have been set with a `chunk_size`.
+        :param array: The numpy array to append, whose shape should match the array except along the first axis and
+            whose dtype should be safely castable to the dtype of the array.
+        :raises KeyError: if the array does not exist.
+        :raises ValueError: if the array is not chunked, or if the shapes do not match.
+        """
+        import numpy
+
+        chunk_info = self._get_chunk_info(name)
+
+        if chunk_info is None:
+            if name in self.get_arraynames():
+                raise ValueError('only arrays that are set with a `chunk_size` can be appended to')
+            raise KeyError('Array with name `{}` not found in ArrayData<{}>'.format(name, self.pk))
+
+        if not isinstance(array, numpy.ndarray):
+            raise TypeError('ArrayData can only store numpy arrays. Convert the object to an array first')
+
+        shape = self.get_shape(name)
+
+        if array.shape[1:] != shape[1:]:
+            raise ValueError('cannot append an array of shape {} to the array `{}` of shape {}'.format(
+                array.shape, name, shape))
+
+        array = array.astype(numpy.dtype(chunk_info['dtype']), casting='safe', copy=False)
+        length = shape[0] + array.shape[0]
+        chunk_size = chunk_info['chunk_size']
+        start, filled = divmod(shape[0], chunk_size)
+
+        if filled:
+            # Complete the last chunk, which is the only existing chunk that is rewritten
+            last = self._get_array_chunk_from_file(name, start, chunk_info['compressed'])
+            self._put_array_chunks(name, numpy.concatenate([last, array[:chunk_size - filled]]), start, chunk_info)
+            array = array[chunk_size - filled:]
+            start += 1
+
+        self._put_array_chunks(name, array, start, chunk_info)
+
+        self.set_attribute('{}{}'.format(self.array_prefix, name), [length] + list(shape[1:]))
+
     def _validate(self):
         """
         Check if the list of .npy files stored inside the node and the
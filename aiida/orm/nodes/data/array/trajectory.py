@@ -80,7 +80,9 @@ class TrajectoryData(ArrayData):
                                  "have shape (s,n,3), "
                                  "with s=number of steps and n=number of symbols")
 
-    def set_trajectory(self, symbols, positions, stepids=None, cells=None, times=None, velocities=None):  # pylint: disable=too-many-arguments
+    def set_trajectory(  # pylint: disable=too-many-arguments
+            self, symbols, positions, stepids=None, cells=None, times=None, velocities=None, chunk_size=None,
+            compressed=False):
         r"""
         Store the whole trajectory, after checking that types and dimensions
         are correct.
@@ -129,6 +131,11 @@ class TrajectoryData(ArrayData):
         :param velocities: if specified, must be a float array with the same
                       dimensions of the ``positions`` array.
                       The array contains the velocities in the atoms.
+        :param chunk_size: if specified, store all arrays in chunks of this
+                      number of steps, such that steps can be added later with
+                      :py:meth:`.append_steps` and single steps are read without
+                      reading the whole trajectory.
+        :param compressed: if True, compress the chunks of all arrays.
 
         .. todo :: Choose suitable units for velocities
         """
@@ -136,15 +143,16 @@ class TrajectoryData(ArrayData):
         import numpy
 
         self._internal_validate(stepids, cells, symbols, positions, times, velocities)
+        storage = {'chunk_size': chunk_size, 'compressed': compressed}
         # set symbols as attribute for easier querying
         self.set_attribute('symbols', list(symbols))
-        self.set_array('positions', positions)
+        self.set_array('positions', positions, **storage)
         if stepids is not None:  # use input stepids
-            self.set_array('steps', stepids)
+            self.set_array('steps', stepids, **storage)
         else:  # use consecutive sequence if not given
-            self.set_array('steps', numpy.arange(positions.shape[0]))
+            self.set_array('steps', numpy.arange(positions.shape[0]), **storage)
         if cells is not None:
-            self.set_array('cells', cells)
+            self.set_array('cells', cells, **storage)
         else:
             # Delete cells array, if it was present
             try:
@@ -152,7 +160,7 @@ class TrajectoryData(ArrayData):
             except KeyError:
                 pass
         if times is not None:
-            self.set_array('times', times)
+            self.set_array('times', times, **storage)
         else:
             # Delete times array, if it was present
             try:
@@ -160,7 +168,7 @@ class TrajectoryData(ArrayData):
             except KeyError:
                 pass
         if velocities is not None:
-            self.set_array('velocities', velocities)
+            self.set_array('velocities', velocities, **storage)
         else:
             # Delete velocities array, if it was present
             try:
@@ -168,6 +176,39 @@ class TrajectoryData(ArrayData):
             except KeyError:
                 pass
 
+    def append_steps(self, positions, stepids=None, cells=None, times=None, velocities=None):
+        """
+        Append steps to a trajectory that was set with a ``chunk_size``, see
+        :py:meth:`.set_trajectory`. Only the chunks of the new steps are
+        written, so the steps already in the trajectory are not rewritten.
+
+        The parameters have the same meaning as for :py:meth:`.set_trajectory`,
+        but only contain the new steps. The ``cells``, ``times`` and
+        ``velocities`` should be given if and only if the trajectory has them.
+        If no ``stepids`` are given, the sequence of step ids is continued.
+        """
+        import numpy
+
+        self._internal_validate(stepids, cells, self.symbols, positions, times, velocities)
+
+        arraynames = self.get_arraynames()
+        optional = [('cells', cells), ('times', times), ('velocities', velocities)]
+
+        for name, array in optional:
+            if (name in arraynames) != (array is not None):
+                raise ValueError("TrajectoryData.{} should be given if and only if the trajectory has "
+                                 "them".format(name))
+
+        if stepids is None:
+            stepids = numpy.arange(self.numsteps, self.numsteps + positions.shape[0])
+
+        self.append_array('positions', positions)
+        self.append_array('steps', stepids)
+
+        for name, array in optional:
+            if array is not None:
+                self.append_array(name, array)
+
     def set_structurelist(self, structurelist):
         """
         Create trajectory from the list of
@@ -340,16 +381,24 @@ class TrajectoryData(ArrayData):
             raise IndexError("You have only {} steps, but you are looking beyond"
                              " (index={})".format(self.numsteps, index))
 
-        vel = self.get_velocities()
-        if vel is not None:
-            vel = vel[index, :, :]
-        time = self.get_times()
-        if time is not None:
-            time = time[index]
-        cells = self.get_cells()
-        if cells is not None:
-            cell = cells[index, :, :]
-        return (self.get_stepids()[index], time, cell, self.symbols, self.get_positions()[index, :, :], vel)
+        # Only read the given step of each array, which avoids loading all steps of large trajectories in memory
+        vel = self._get_array_slice_or_none('velocities', index)
+        time = self._get_array_slice_or_none('times', index)
+        cell = self._get_array_slice_or_none('cells', index)
+
+        step = self.get_array_slice('steps', index)
+        pos = self.get_array_slice('positions', index)
+
+        return (step, time, cell, self.symbols, pos, vel)
+
+    def _get_array_slice_or_none(self, name, index):
+        """
+        Return the given step of an optional array, or None if the array has not been set.
+        """
+        try:
+            return self.get_array_slice(name, index)
+        except (AttributeError, KeyError):
+            return None
 
     def get_step_structure(self, index, custom_kinds=None):
         """
@@ -718,7 +767,7 @@ class TrajectoryData(ArrayData):
         try:
             if self.get_attribute('units|positions') in ('bohr', 'atomic'):
                 from aiida.common.constants import bohr_to_ang
-                positions *= bohr_to_ang
+                positions = positions * bohr_to_ang
         except KeyError:
             pass
 
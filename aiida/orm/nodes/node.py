@@ -34,7 +34,7 @@ from ..entities import Collection as EntityCollection
 from ..querybuilder import QueryBuilder
 from ..users import User
 
-__all__ = ('Node',)
+__all__ = ('Node', 'store_many')
 
 _NO_DEFAULT = tuple()
 
@@ -100,6 +100,7 @@ class Node(Entity):
 
     # These are to be initialized in the `initialization` method
     _incoming_cache = None
+    _stored_links_cache = None
     _repository = None
 
     @classmethod
@@ -151,6 +152,9 @@ class Node(Entity):
         # A cache of incoming links represented as a list of LinkTriples instances
         self._incoming_cache = list()
 
+        # An optional cache of all stored links per link direction, filled by `aiida.orm.utils.links.get_links`
+        self._stored_links_cache = dict()
+
         # Calls the initialisation from the RepositoryMixin
         self._repository = Repository(uuid=self.uuid, is_stored=self.is_stored, base_path=self._repository_base_path)
 
@@ -765,6 +769,8 @@ class Node(Entity):
 
         if self.is_stored and source.is_stored:
             self.backend_entity.add_incoming(source.backend_entity, link_type, link_label)
+            self._stored_links_cache.pop('incoming', None)
+            source._stored_links_cache.pop('outgoing', None)  # pylint: disable=protected-access
         else:
             self._add_incoming_cache(source, link_type, link_label)
 
@@ -840,12 +846,20 @@ class Node(Entity):
             one would pass directly to a QuerBuilder filter statement with the 'like' operation.
         :param link_direction: `incoming` or `outgoing` to get the incoming or outgoing links, respectively.
         """
+        from aiida.orm.utils.links import filter_link_triples
+
         if not isinstance(link_type, tuple):
             link_type = (link_type,)
 
         if link_type and not all([isinstance(t, LinkType) for t in link_type]):
             raise TypeError('link_type should be a LinkType or tuple of LinkType: got {}'.format(link_type))
 
+        link_direction = 'outgoing' if link_direction == 'outgoing' else 'incoming'
+
+        if link_direction in self._stored_links_cache:
+            return filter_link_triples(self._stored_links_cache[link_direction], node_class, link_type,
+                                       link_label_filter)
+
         node_class = node_class or Node
         node_filters = {'id': {'==': self.id}}
         edge_filters = {}
@@ -894,7 +908,17 @@ class Node(Entity):
         else:
             link_triples = []
 
-        # Get all cached link triples
+        return LinkManager(self._merge_incoming_cache(link_triples, link_type, link_label_filter))
+
+    def _merge_incoming_cache(self, link_triples, link_type=(), link_label_filter=None):
+        """Add the link triples of the incoming link cache that match the filters to the given stored link triples.
+
+        :param link_triples: list of stored incoming link triples, to which the cached link triples are appended
+        :param link_type: tuple of link types to filter the cached link triples by, if empty all are added
+        :param link_label_filter: filters the cached link triples by their label
+        :return: the list of link triples
+        :raise aiida.common.InternalError: if a link triple is both stored and cached
+        """
         for link_triple in self._incoming_cache:
 
             if link_triple in link_triples:
@@ -908,7 +932,7 @@ class Node(Entity):
                 else:
                     link_triples.append(link_triple)
 
-        return LinkManager(link_triples)
+        return link_triples
 
     def get_outgoing(self, node_class=None, link_type=(), link_label_filter=None):
         """Return a list of link triples that are (directly) outgoing of this node.
@@ -1025,6 +1049,10 @@ class Node(Entity):
             self._repository.restore()
             raise
 
+        # The sources of the links that were just stored have a new outgoing link
+        for link_triple in links:
+            link_triple.node._stored_links_cache.pop('outgoing', None)  # pylint: disable=protected-access
+
         self._incoming_cache = list()
         self._backend_entity.set_extra(_HASH_EXTRA_KEY, self.get_hash())
 
@@ -1097,7 +1125,7 @@ class Node(Entity):
                 for key, val in self.attributes_items()
                 if key not in self._hash_ignored_attributes and key not in self._updatable_attributes  # pylint: disable=unsupported-membership-test
             },
-            self._repository._get_base_folder(),  # pylint: disable=protected-access
+            self._repository.get_hashable_content(),
             self.computer.uuid if self.computer is not None else None
         ]
         return objects
@@ -1166,9 +1194,19 @@ class Node(Entity):
         if not node_hash or not self._cachable:
             return iter(())
 
-        builder = QueryBuilder()
-        builder.append(self.__class__, filters={'extras._aiida_hash': node_hash}, project='*', subclassing=False)
-        nodes_identical = (n[0] for n in builder.iterall())
+        return self._iter_same_nodes_from_hash(node_hash)
+
+    def _iter_same_nodes_from_hash(self, node_hash):
+        """Return an iterator over the stored nodes of the same node type with the given hash that are valid caches.
+
+        The nodes are looked up through the dedicated index on the node type and hash and are loaded one at a time.
+
+        :param node_hash: the hash of the nodes
+        """
+        from aiida.orm.utils import load_node
+
+        pks = self.backend.nodes.get_pks_by_hash(self.node_type, node_hash)
+        nodes_identical = (load_node(pk) for pk in pks)
 
         return (node for node in nodes_identical if node.is_valid_cache)
 
@@ -1268,3 +1306,99 @@ class Node(Entity):
                 "type": "str"
             }
         }
+
+
+def store_many(nodes, with_transaction=True):
+    """Store many data nodes at once, inserting the nodes and their incoming links in bulk.
+
+    This is equivalent to calling `store` on each node, but much faster for large numbers of nodes, since the hashes
+    are computed before inserting, such that all nodes and subsequently all links can be inserted in bulk, instead of
+    one insert for each node, for each of its links and for its hash. Nodes that are already stored are skipped and
+    the caching mechanism is not used. The nodes inserted in bulk are stored in a single transaction. Nodes whose class
+    customizes the `store` method are instead stored individually, each through its own `store` call and therefore in
+    its own transaction, before the bulk insert, so they remain stored if the bulk insert fails. Pass
+    `with_transaction=False` from within an open transaction to store all the nodes atomically.
+
+    :param nodes: an iterable of unstored `Data` nodes, whose incoming links should all come from stored nodes
+    :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+    :return: the list of nodes
+    :raise TypeError: if one of the nodes is not a `Data` node
+    :raise aiida.common.StoringNotAllowed: if one of the nodes is not storable
+    :raise aiida.common.ModificationNotAllowed: if the source node of one of the incoming links is not stored
+    """
+    # pylint: disable=protected-access
+    from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
+    from aiida.orm import Data, Group
+
+    nodes = list(nodes)
+    bulk = []
+    individual = []
+    seen = set()
+
+    for node in nodes:
+        if not isinstance(node, Data):
+            raise TypeError('only `Data` nodes can be stored in bulk, got: {}'.format(type(node)))
+
+        if not node._storable:
+            raise exceptions.StoringNotAllowed(node._unstorable_message)
+
+        if node.is_stored or id(node) in seen:
+            continue
+
+        seen.add(id(node))
+
+        if six.get_unbound_function(type(node).store) is six.get_unbound_function(Node.store):
+            bulk.append(node)
+        else:
+            individual.append(node)
+
+    for node in bulk:
+        node._validate()
+        node.verify_are_parents_stored()
+        node._backend_entity.clean_values()
+
+    for node in individual:
+        node.store(with_transaction=with_transaction)
+
+    # As for a single node, the repository folders are stored first, such that if this fails, there will not be any
+    # incomplete nodes in the database. Since the repository is then in its final location, the hashes can be computed
+    # and set as extras before inserting, which saves an update per node afterwards.
+    repository_stored = []
+
+    try:
+        for node in bulk:
+            node._repository.store()
+            repository_stored.append(node)
+            node._backend_entity.set_extra(_HASH_EXTRA_KEY, node._get_hash())
+
+        if bulk:
+            backend_nodes = [node.backend_entity for node in bulk]
+            links = [node._incoming_cache for node in bulk]
+            # The values were cleaned before computing the hashes, which are simple strings that need no cleaning
+            bulk[0].backend.nodes.store_many(backend_nodes, links, with_transaction=with_transaction, clean=False)
+    except Exception:
+        for node in repository_stored:
+            node._repository.restore()
+            try:
+                node._backend_entity.delete_extra(_HASH_EXTRA_KEY)
+            except AttributeError:
+                pass
+        raise
+
+    for node in bulk:
+        for link_triple in node._incoming_cache:
+            link_triple.node._stored_links_cache.pop('outgoing', None)
+        node._incoming_cache = list()
+
+    if current_autogroup is not None and bulk:
+        if not isinstance(current_autogroup, Autogroup):
+            raise exceptions.ValidationError('`current_autogroup` is not of type `Autogroup`')
+
+        group_label = current_autogroup.get_group_name()
+        grouped = [node for node in bulk if current_autogroup.is_to_be_grouped(node)]
+
+        if group_label is not None and grouped:
+            group = Group.objects.get_or_create(label=group_label, type_string=VERDIAUTOGROUP_TYPE)[0]
+            group.add_nodes(grouped)
+
+    return nodes
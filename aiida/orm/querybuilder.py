@@ -28,9 +28,9 @@ import copy
 import logging
 import six
 from six.moves import range, zip
-from sqlalchemy import and_, or_, not_, func as sa_func, select, join
+from sqlalchemy import and_, or_, not_, func as sa_func, select, join, inspect as sa_inspect
 from sqlalchemy.types import Integer
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, defer
 from sqlalchemy.sql.expression import cast
 from sqlalchemy.dialects.postgresql import array
 
@@ -54,6 +54,29 @@ __all__ = ('QueryBuilder',)
 _LOGGER = logging.getLogger(__name__)
 
 
+def _to_array(values):
+    """
+    Convert a sequence of values to a one-dimensional NumPy array, of which the data type is inferred if possible.
+
+    :param values: the sequence of values
+    :returns: a :class:`numpy.ndarray` with the same length as the values
+    """
+    import numpy
+
+    try:
+        array = numpy.array(values)
+    except ValueError:
+        array = None
+
+    # Sequences, such as lists from JSON attributes, would otherwise create additional dimensions
+    if array is None or array.ndim != 1:
+        array = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            array[index] = value
+
+    return array
+
+
 def get_querybuilder_classifiers_from_cls(cls, qb):
     """
     Return the correct classifiers for the QueryBuilder from an ORM class.
@@ -371,6 +394,9 @@ class QueryBuilder(object):
         # Check QueryBuilder.inject_query
         self._injected = False
 
+        # Whether the closure table of the provenance graph is enabled, which is only checked once it is needed
+        self._closure_table_enabled = None
+
         # Setting debug levels:
         self.set_debug(kwargs.pop('debug', False))
 
@@ -547,6 +573,9 @@ class QueryBuilder(object):
                edge_filters=None,
                edge_project=None,
                outerjoin=False,
+               max_depth=None,
+               link_types=None,
+               traversal_filters=None,
                **kwargs):
         """
         Any iterative procedure to build the path for a graph query
@@ -590,6 +619,17 @@ class QueryBuilder(object):
             The filters to apply on the edge. Also here, details in :meth:`.add_filter`.
         :param str edge_project:
             The project from the edges. API-details in :meth:`.add_projection`.
+        :param int max_depth:
+            Only for `with_ancestors` and `with_descendants`: the maximum number of links to traverse,
+            e.g. 1 only joins the direct neighbours. By default the graph is traversed without limit.
+        :param link_types:
+            Only for `with_ancestors` and `with_descendants`: the link type or list of link types to follow,
+            given as :class:`aiida.common.links.LinkType` or their values. The default is to follow
+            `create` and `input_calc` links.
+        :param dict traversal_filters:
+            Only for `with_ancestors` and `with_descendants`: filters that every node on the way has to pass,
+            e.g. `{'node_type': {'like': 'data.%'}}` to only walk through data nodes. These are applied while
+            traversing the graph, so the walk does not continue beyond nodes that do not pass them.
 
         A small usage example how this can be invoked::
 
@@ -787,6 +827,14 @@ class QueryBuilder(object):
                                                "direction={}\n"
                                                "{}\n".format(joining_value, exc))
 
+            traversal_options = dict(max_depth=max_depth, link_types=link_types, traversal_filters=traversal_filters)
+            if joining_keyword not in ('with_ancestors', 'with_descendants'):
+                for key, value in traversal_options.items():
+                    if value is not None:
+                        raise InputValidationError("{} can only be specified for a joining with "
+                                                   "with_ancestors or with_descendants".format(key))
+            traversal_options = self._get_traversal_options(**traversal_options)
+
         except Exception as e:
             if self._debug:
                 print("DEBUG: Exception caught in append (part joining), cleaning up")
@@ -861,10 +909,43 @@ class QueryBuilder(object):
                 joining_keyword=joining_keyword,
                 joining_value=joining_value,
                 outerjoin=outerjoin,
-                edge_tag=edge_tag))
+                edge_tag=edge_tag,
+                **traversal_options))
 
         return self
 
+    def _get_traversal_options(self, max_depth=None, link_types=None, traversal_filters=None):
+        """
+        Validate the options of a recursive traversal and return them in the form in which they are stored in the path.
+
+        :param max_depth: the maximum number of links to traverse
+        :param link_types: a link type or list of link types, given as `LinkType` or their values
+        :param traversal_filters: the filters for the traversed nodes
+        :return: a dictionary with the validated options
+        :raises InputValidationError: if any of the options is invalid
+        """
+        if max_depth is not None:
+            if not isinstance(max_depth, six.integer_types) or isinstance(max_depth, bool) or max_depth < 1:
+                raise InputValidationError("max_depth has to be a positive integer, not {}".format(max_depth))
+
+        if link_types is not None:
+            if isinstance(link_types, (LinkType, six.string_types)):
+                link_types = [link_types]
+            link_type_values = []
+            for link_type in link_types:
+                try:
+                    link_type_values.append(LinkType(link_type).value)
+                except ValueError:
+                    raise InputValidationError("{} is not a valid link type, valid link types are: {}".format(
+                        link_type, ', '.join(link_type.value for link_type in LinkType)))
+            # Sorted such that equivalent specifications result in identical queries
+            link_types = sorted(set(link_type_values))
+
+        if traversal_filters is not None:
+            traversal_filters = self._process_filters(dict(traversal_filters))
+
+        return dict(max_depth=max_depth, link_types=link_types, traversal_filters=traversal_filters)
+
     def order_by(self, order_by):
         """
         Set the entity to order by
@@ -1147,6 +1228,9 @@ class QueryBuilder(object):
                                            "will not work!\n"
                                            "I suggest you apply functions on a column, e.g. ('id')\n")
             self._query = self._query.add_entity(alias)
+            # The attributes of nodes are loaded lazily by the backend node, one key at a time, if ever needed
+            if sa_inspect(alias).mapper.class_ is self._impl.Node:
+                self._query = self._query.options(defer(alias.attributes))
         else:
             entity_to_project = self._get_projectable_entity(alias, column_name, attr_key, cast=cast)
             if func is None:
@@ -1375,114 +1459,203 @@ class QueryBuilder(object):
             entity_to_join, aliased_edge.input_id == entity_to_join.id, isouter=isouterjoin)
         return aliased_edge
 
-    def _join_descendants_recursive(self, joined_entity, entity_to_join, isouterjoin, filter_dict, expand_path=False):
+    def _join_descendants_recursive(self, joined_entity, entity_to_join, isouterjoin, filter_dict, **kwargs):
         """
         joining descendants using the recursive functionality
-        :TODO: Move the filters to be done inside the recursive query (for example on depth)
-        :TODO: Pass an option to also show the path, if this is wanted.
-        """
 
+        See :meth:`._join_recursive` for the keyword arguments that control the traversal.
+        """
         self._check_dbentities((joined_entity, self._impl.Node), (entity_to_join, self._impl.Node),
                                'with_ancestors')
+        return self._join_recursive(
+            joined_entity, entity_to_join, isouterjoin, filter_dict, descendants=True, **kwargs)
+
+    def _join_ancestors_recursive(self, joined_entity, entity_to_join, isouterjoin, filter_dict, **kwargs):
+        """
+        joining ancestors using the recursive functionality
+
+        See :meth:`._join_recursive` for the keyword arguments that control the traversal.
+        """
+        self._check_dbentities((joined_entity, self._impl.Node), (entity_to_join, self._impl.Node),
+                               'with_descendants')
+        return self._join_recursive(
+            joined_entity, entity_to_join, isouterjoin, filter_dict, descendants=False, **kwargs)
+
+    def _join_recursive(self,
+                        joined_entity,
+                        entity_to_join,
+                        isouterjoin,
+                        filter_dict,
+                        descendants,
+                        expand_path=False,
+                        expand_depth=True,
+                        max_depth=None,
+                        link_types=None,
+                        traversal_filters=None):
+        """
+        Join the ancestors or descendants of `joined_entity` through a recursive common table expression.
+
+        All conditions that bound the traversal are applied inside the recursive part of the expression, such that the
+        database never walks further than necessary: the filters of the joined entity select the starting points, only
+        links of the given types are followed, only nodes that pass the traversal filters are stepped on and the walk
+        stops after `max_depth` links.
+
+        Unless the path is requested, the rows of the walk are combined with `UNION` instead of `UNION ALL`, such that
+        a node that is reachable through multiple paths is only visited once and the walk terminates on cycles. If the
+        depth is requested as well, nodes are only deduplicated per depth, so for link types that can form cycles the
+        walk should then be bounded with `max_depth`. If the path is requested, nodes already on the path are skipped.
+
+        If the closure table of the provenance graph is enabled and the walk neither requires the path or the depth nor
+        deviates from the default link types, the closure table is joined instead, see :meth:`._join_closure`.
+
+        :param joined_entity: the aliased node to start the walk from
+        :param entity_to_join: the aliased node to join the walked nodes to
+        :param isouterjoin: whether to do an outer join
+        :param filter_dict: the filters of `joined_entity`, which are applied to the starting points of the walk
+        :param descendants: if True walk towards the descendants, otherwise towards the ancestors
+        :param expand_path: whether to build the path of each walk, which is expensive
+        :param expand_depth: whether to keep track of the depth of each walk
+        :param max_depth: the maximum number of links to traverse, or None for no limit
+        :param link_types: list of link type values to follow, by default CREATE and INPUT_CALC links
+        :param traversal_filters: filters that every node stepped on by the walk has to pass
+        :return: the columns of the walk, which serve as the edge
+        """
+        # pylint: disable=too-many-arguments,too-many-locals
+        if link_types is None:
+            link_types = (LinkType.CREATE.value, LinkType.INPUT_CALC.value)
+
+        if self._can_use_closure_table(expand_path, expand_depth, link_types, traversal_filters):
+            return self._join_closure(joined_entity, entity_to_join, isouterjoin, descendants, max_depth)
+
+        # The depth is needed to bound the walk, but each node should still be returned once if it is not requested
+        deduplicate_depth = max_depth is not None and not expand_depth and not expand_path
+        expand_depth = expand_depth or max_depth is not None
 
         link1 = aliased(self._impl.Link)
         link2 = aliased(self._impl.Link)
         node1 = aliased(self._impl.Node)
-        in_recursive_filters = self._build_filters(node1, filter_dict)
 
-        selection_walk_list = [
-            link1.input_id.label('ancestor_id'),
-            link1.output_id.label('descendant_id'),
-            cast(0, Integer).label('depth'),
+        # The walk always goes from the `source` to the `target` of a link, so the direction is set by swapping them
+        if descendants:
+            source1, target1, source2, target2 = link1.input_id, link1.output_id, link2.input_id, link2.output_id
+        else:
+            source1, target1, source2, target2 = link1.output_id, link1.input_id, link2.output_id, link2.input_id
+
+        anchor_conditions = [
+            self._build_filters(node1, filter_dict),  # I apply filters for speed here
+            link1.type.in_(link_types),
         ]
+        anchor_from = join(node1, link1, source1 == node1.id)
+
+        if traversal_filters:
+            node2 = aliased(self._impl.Node)
+            anchor_from = anchor_from.join(node2, target1 == node2.id)
+            anchor_conditions.append(self._build_filters(node2, traversal_filters))
+
+        selection_walk_list = [link1.input_id.label('ancestor_id'), link1.output_id.label('descendant_id')]
+        if expand_depth:
+            selection_walk_list.append(cast(0, Integer).label('depth'))
         if expand_path:
-            selection_walk_list.append(array((link1.input_id, link1.output_id)).label('path'))
+            selection_walk_list.append(array((source1, target1)).label('path'))
 
-        walk = select(selection_walk_list).select_from(join(node1, link1, link1.input_id == node1.id)).where(
-            and_(
-                in_recursive_filters,  # I apply filters for speed here
-                link1.type.in_((LinkType.CREATE.value, LinkType.INPUT_CALC.value))  # I follow input and create links
-            )).cte(recursive=True)
+        walk = select(selection_walk_list).select_from(anchor_from).where(and_(*anchor_conditions)).cte(recursive=True)
 
         aliased_walk = aliased(walk)
 
-        selection_union_list = [
-            aliased_walk.c.ancestor_id.label('ancestor_id'),
-            link2.output_id.label('descendant_id'), (aliased_walk.c.depth + cast(1, Integer)).label('current_depth')
-        ]
+        if descendants:
+            walk_end = aliased_walk.c.descendant_id
+            selection_union_list = [aliased_walk.c.ancestor_id.label('ancestor_id'), target2.label('descendant_id')]
+        else:
+            walk_end = aliased_walk.c.ancestor_id
+            selection_union_list = [target2.label('ancestor_id'), aliased_walk.c.descendant_id.label('descendant_id')]
+
+        step_conditions = [link2.type.in_(link_types)]
+        step_from = join(aliased_walk, link2, source2 == walk_end)
+
+        if traversal_filters:
+            node3 = aliased(self._impl.Node)
+            step_from = step_from.join(node3, target2 == node3.id)
+            step_conditions.append(self._build_filters(node3, traversal_filters))
+
+        if expand_depth:
+            selection_union_list.append((aliased_walk.c.depth + cast(1, Integer)).label('current_depth'))
+            if max_depth is not None:
+                # The depth of the anchor is zero, i.e. a walk of depth `n` has traversed `n + 1` links
+                step_conditions.append(aliased_walk.c.depth < max_depth - 1)
+
+        if expand_path:
+            selection_union_list.append((aliased_walk.c.path + array((target2,))).label('path'))
+            step_conditions.append(not_(aliased_walk.c.path.any(target2)))
+
+        step = select(selection_union_list).select_from(step_from).where(and_(*step_conditions))
+
         if expand_path:
-            selection_union_list.append((aliased_walk.c.path + array((link2.output_id,))).label('path'))
-
-        descendants_recursive = aliased(
-            aliased_walk.union_all(
-                select(selection_union_list).select_from(
-                    join(
-                        aliased_walk,
-                        link2,
-                        link2.input_id == aliased_walk.c.descendant_id,
-                    )).where(link2.type.in_((LinkType.CREATE.value, LinkType.INPUT_CALC.value)))))  # .alias()
-
-        self._query = self._query.join(descendants_recursive,
-                                       descendants_recursive.c.ancestor_id == joined_entity.id).join(
-                                           entity_to_join,
-                                           descendants_recursive.c.descendant_id == entity_to_join.id,
-                                           isouter=isouterjoin)
-        return descendants_recursive.c
-
-    def _join_ancestors_recursive(self, joined_entity, entity_to_join, isouterjoin, filter_dict, expand_path=False):
+            recursive = aliased(aliased_walk.union_all(step))
+        else:
+            recursive = aliased(aliased_walk.union(step))
+
+        if deduplicate_depth:
+            recursive = select([recursive.c.ancestor_id, recursive.c.descendant_id]).distinct().alias()
+
+        if descendants:
+            start_id, end_id = recursive.c.ancestor_id, recursive.c.descendant_id
+        else:
+            start_id, end_id = recursive.c.descendant_id, recursive.c.ancestor_id
+
+        self._query = self._query.join(recursive, start_id == joined_entity.id).join(
+            entity_to_join, end_id == entity_to_join.id, isouter=isouterjoin)
+        return recursive.c
+
+    def _can_use_closure_table(self, expand_path, expand_depth, link_types, traversal_filters):
         """
-        joining ancestors using the recursive functionality
-        :TODO: Move the filters to be done inside the recursive query (for example on depth)
-        :TODO: Pass an option to also show the path, if this is wanted.
+        Return whether a recursive join can be done through the closure table of the provenance graph.
 
+        The closure table only contains the shortest depth between two nodes for the default link types, so it can only
+        be used if neither the path nor the depth are requested and the walk is not restricted otherwise.
         """
-        self._check_dbentities((joined_entity, self._impl.Node), (entity_to_join, self._impl.Node),
-                               'with_ancestors')
+        from aiida.manage.database.closure import CLOSURE_LINK_TYPES
 
-        link1 = aliased(self._impl.Link)
-        link2 = aliased(self._impl.Link)
-        node1 = aliased(self._impl.Node)
-        in_recursive_filters = self._build_filters(node1, filter_dict)
+        if expand_path or expand_depth or traversal_filters or set(link_types) != set(CLOSURE_LINK_TYPES):
+            return False
 
-        selection_walk_list = [
-            link1.input_id.label('ancestor_id'),
-            link1.output_id.label('descendant_id'),
-            cast(0, Integer).label('depth'),
-        ]
-        if expand_path:
-            selection_walk_list.append(array((link1.output_id, link1.input_id)).label('path'))
+        return self._is_closure_table_enabled()
+
+    def _is_closure_table_enabled(self):
+        """
+        Return whether the closure table of the provenance graph is enabled, querying the database only once.
+        """
+        from aiida.manage.database.closure import is_closure_table_enabled
 
-        walk = select(selection_walk_list).select_from(join(node1, link1, link1.output_id == node1.id)).where(
-            and_(in_recursive_filters, link1.type.in_((LinkType.CREATE.value,
-                                                       LinkType.INPUT_CALC.value)))).cte(recursive=True)
+        if self._closure_table_enabled is None:
+            self._closure_table_enabled = is_closure_table_enabled(self._impl.get_session())
 
-        aliased_walk = aliased(walk)
+        return self._closure_table_enabled
 
-        selection_union_list = [
-            link2.input_id.label('ancestor_id'),
-            aliased_walk.c.descendant_id.label('descendant_id'),
-            (aliased_walk.c.depth + cast(1, Integer)).label('current_depth'),
-        ]
-        if expand_path:
-            selection_union_list.append((aliased_walk.c.path + array((link2.input_id,))).label('path'))
-
-        ancestors_recursive = aliased(
-            aliased_walk.union_all(
-                select(selection_union_list).select_from(
-                    join(
-                        aliased_walk,
-                        link2,
-                        link2.output_id == aliased_walk.c.ancestor_id,
-                    )).where(link2.type.in_((LinkType.CREATE.value, LinkType.INPUT_CALC.value)))
-                # I can't follow RETURN or CALL links
-            ))
-
-        self._query = self._query.join(ancestors_recursive,
-                                       ancestors_recursive.c.descendant_id == joined_entity.id).join(
-                                           entity_to_join,
-                                           ancestors_recursive.c.ancestor_id == entity_to_join.id,
-                                           isouter=isouterjoin)
-        return ancestors_recursive.c
+    def _join_closure(self, joined_entity, entity_to_join, isouterjoin, descendants, max_depth=None):
+        """
+        Join the ancestors or descendants of `joined_entity` through the closure table of the provenance graph.
+
+        :param joined_entity: the aliased node to start from
+        :param entity_to_join: the aliased node to join the ancestors or descendants to
+        :param isouterjoin: whether to do an outer join
+        :param descendants: if True join the descendants, otherwise the ancestors
+        :param max_depth: the maximum number of links between the nodes, or None for no limit
+        :return: the aliased closure table, which serves as the edge
+        """
+        closure = aliased(self._impl.NodeClosure)
+
+        if descendants:
+            start_id, end_id = closure.ancestor_id, closure.descendant_id
+        else:
+            start_id, end_id = closure.descendant_id, closure.ancestor_id
+
+        join_condition = start_id == joined_entity.id
+        if max_depth is not None:
+            join_condition = and_(join_condition, closure.depth < max_depth)
+
+        self._query = self._query.join(closure, join_condition).join(
+            entity_to_join, end_id == entity_to_join.id, isouter=isouterjoin)
+        return closure
 
     def _join_group_members(self, joined_entity, entity_to_join, isouterjoin):
         """
@@ -1783,6 +1956,38 @@ class QueryBuilder(object):
             entity = entity.desc()
         self._query = self._query.order_by(entity)
 
+    def _is_edge_column_used(self, edge_tag, column_name):
+        """
+        Return whether a column of an edge is used in a filter, a projection or an ordering.
+
+        :param str edge_tag: the tag of the edge
+        :param str column_name: the name of the column
+        :rtype: bool
+        """
+
+        def is_filtered(filter_spec):
+            for key, value in filter_spec.items():
+                if key in ('and', 'or', '~or', '~and', '!and', '!or'):
+                    if any(is_filtered(sub_spec) for sub_spec in value):
+                        return True
+                elif key.split('.')[0] == column_name:
+                    return True
+            return False
+
+        if is_filtered(self._filters.get(edge_tag, {})):
+            return True
+
+        for projection in self._projections.get(edge_tag, []):
+            if column_name in projection or '*' in projection:
+                return True
+
+        for order_spec in self._order_by:
+            for entitydict in order_spec.get(edge_tag, []):
+                if column_name in entitydict:
+                    return True
+
+        return False
+
     def _build(self):
         """
         build the query and return a sqlalchemy.Query instance
@@ -1819,10 +2024,19 @@ class QueryBuilder(object):
                 # I also find out whether the path is used in a filter or a project
                 # if so, I instruct the recursive function to build the path on the fly!
                 # The default is False, cause it's super expensive
-                expand_path = ((self._filters[edge_tag].get('path', None) is not None) or
-                               any(['path' in d.keys() for d in self._projections[edge_tag]]))
+                # The same goes for the depth, without which the walk can be deduplicated more aggressively
+                expand_path = self._is_edge_column_used(edge_tag, 'path')
+                expand_depth = self._is_edge_column_used(edge_tag, 'depth')
                 aliased_edge = connection_func(
-                    toconnectwith, alias, isouterjoin=isouterjoin, filter_dict=filter_dict, expand_path=expand_path)
+                    toconnectwith,
+                    alias,
+                    isouterjoin=isouterjoin,
+                    filter_dict=filter_dict,
+                    expand_path=expand_path,
+                    expand_depth=expand_depth,
+                    max_depth=verticespec.get('max_depth', None),
+                    link_types=verticespec.get('link_types', None),
+                    traversal_filters=verticespec.get('traversal_filters', None))
             else:
                 aliased_edge = connection_func(toconnectwith, alias, isouterjoin=isouterjoin)
             if aliased_edge is not None:
@@ -2001,10 +2215,79 @@ class QueryBuilder(object):
                 given_tags.append(path['edge_tag'])
         return given_tags
 
+    def _get_queryhelp_key(self):
+        """
+        Return the structure of the queryhelp and the values of its filters, see
+        :func:`aiida.orm.utils.querycache.get_queryhelp_key`.
+
+        :raises TypeError: if the queryhelp contains values that are not hashable
+        """
+        from aiida.orm.utils.querycache import get_queryhelp_key
+        return get_queryhelp_key(self._path, self._filters, self._projections, self._order_by, self._limit,
+                                 self._offset)
+
+    def _build_query_template(self, values):
+        """
+        Build the query on a copy of this instance, with the given values in place of the values of the filters.
+
+        :param values: the values to substitute, in the order returned by :meth:`._get_queryhelp_key`
+        :returns: tuple of the query, the projected properties per tag, the projected properties per column
+            and the aliases per tag
+        """
+        from aiida.orm.utils.querycache import substitute_parameters
+
+        template = copy.copy(self)
+        template._filters = substitute_parameters(self._filters, values)  # pylint: disable=protected-access
+        template.tag_to_alias_map = dict(self.tag_to_alias_map)
+        query = template._build()  # pylint: disable=protected-access
+
+        return (query, template.tag_to_projected_property_dict, template._attrkeys_as_in_sql_result,
+                template.tag_to_alias_map)
+
+    def _get_cached_query(self, mode='all'):
+        """
+        Return a query from the process-wide cache of compiled queries, which is shared by all queries with a
+        queryhelp of the same structure, such that the query does not have to be built and compiled again.
+
+        Only a query that was not built by this instance itself is taken from the cache, because a query that was
+        built may have been modified, for example with :meth:`.distinct` or :meth:`.inject_query`.
+
+        :param mode: `all`, `first` or `count`
+        :returns: an instance of :class:`aiida.orm.utils.querycache.CachedQuery` or None if the query cannot be cached
+        """
+        from aiida.orm.utils.querycache import get_query_cache
+
+        if self._hash is not None or self._injected or self._debug:
+            return None
+
+        try:
+            key, values = self._get_queryhelp_key()
+        except TypeError:
+            return None
+
+        # The query depends on whether the closure table is used for the recursive joins
+        if any(path['joining_keyword'] in ('with_ancestors', 'with_descendants') for path in self._path):
+            key = (type(self._impl), self._is_closure_table_enabled(), key)
+        else:
+            key = (type(self._impl), key)
+
+        result = get_query_cache().get_query(key, values, self._impl.get_session(), self._build_query_template, mode)
+
+        if result is None:
+            return None
+
+        query, template = result
+        self.tag_to_projected_property_dict = template.tag_to_projected_property_dict
+        self._attrkeys_as_in_sql_result = template.attrkeys_as_in_sql_result
+        for tag, alias in template.tag_to_alias_map.items():
+            self.tag_to_alias_map.setdefault(tag, alias)
+
+        return query
+
     def get_query(self):
         """
         Instantiates and manipulates a sqlalchemy.orm.Query instance if this is needed.
-        First,  I check if the query instance is still valid by hashing the queryhelp.
+        First,  I check if the query instance is still valid by comparing the structure and values of the queryhelp.
         In this way, if a user asks for the same query twice, I am not recreating an instance.
 
         :returns: an instance of sqlalchemy.orm.Query that is specific to the backend used.
@@ -2017,7 +2300,11 @@ class QueryBuilder(object):
         # The queryhelp_hash is used to determine
         # whether the query is still valid
 
-        queryhelp_hash = make_hash(self.get_json_compatible_queryhelp())
+        try:
+            structure, values = self._get_queryhelp_key()
+            queryhelp_hash = (structure, tuple(values))
+        except TypeError:
+            queryhelp_hash = make_hash(self.get_json_compatible_queryhelp())
         # if self._hash (which is None if this function has not been invoked
         # and is a string (hash) if it has) is the same as the queryhelp
         # I can use the query again:
@@ -2101,7 +2388,9 @@ class QueryBuilder(object):
         :returns:
             One row of results as a list
         """
-        query = self.get_query()
+        query = self._get_cached_query('first')
+        if query is None:
+            query = self.get_query()
         result = self._impl.first(query)
 
         if result is None:
@@ -2139,7 +2428,9 @@ class QueryBuilder(object):
 
         :returns: the number of rows as an integer
         """
-        query = self.get_query()
+        query = self._get_cached_query('count')
+        if query is None:
+            query = self.get_query()
         return self._impl.count(query)
 
     def iterall(self, batch_size=100):
@@ -2156,7 +2447,9 @@ class QueryBuilder(object):
 
         :returns: a generator of lists
         """
-        query = self.get_query()
+        query = self._get_cached_query()
+        if query is None:
+            query = self.get_query()
 
         for item in self._impl.iterall(query, batch_size, self._attrkeys_as_in_sql_result):
             # Convert to AiiDA frontend entities (if they are such)
@@ -2179,7 +2472,9 @@ class QueryBuilder(object):
 
         :returns: a generator of dictionaries
         """
-        query = self.get_query()
+        query = self._get_cached_query()
+        if query is None:
+            query = self.get_query()
 
         for item in self._impl.iterdict(query, batch_size, self.tag_to_projected_property_dict, self.tag_to_alias_map):
             for key, value in item.items():
@@ -2257,6 +2552,87 @@ class QueryBuilder(object):
         """
         return list(self.iterdict(batch_size=batch_size))
 
+    def iter_columns(self, batch_size=1000):
+        """
+        Executes the full query and returns a generator of the projected columns of each batch of rows as NumPy arrays.
+
+        The rows are fetched from a server side cursor and the values are not converted to AiiDA entities, which makes
+        this much faster than :meth:`.iterdict` for large numbers of rows, but means that only columns and attributes
+        can be projected, not entire entities with `*`. Each value is as returned by the database, so an attribute
+        that is projected without a `cast` is a JSON value and any missing value is `None`. The data type of each array
+        is inferred by NumPy and is `object` if the values cannot be represented by a single NumPy type.
+
+        Usage::
+
+            qb = QueryBuilder()
+            qb.append(Float, project=['id', 'attributes.value'], tag='float')
+
+            for columns in qb.iter_columns(batch_size=10000):
+                ids, values = columns['float']['id'], columns['float']['attributes.value']
+
+        :param int batch_size: the number of rows per batch
+        :returns:
+            a generator of dictionaries with the tag of each vertice as key and as value a dictionary
+            of the projected properties of that vertice to the NumPy array of their values in the batch
+        :raises InputValidationError: if an entire entity is projected
+        """
+        query = self._get_cached_query()
+        if query is None:
+            query = self.get_query()
+
+        if '*' in self._attrkeys_as_in_sql_result.values():
+            raise InputValidationError("Only columns and attributes can be returned as arrays, not entities ('*')")
+
+        columns = [(tag, self._get_output_property(tag, attrkey), index)
+                   for tag, projected_entities_dict in self.tag_to_projected_property_dict.items()
+                   for attrkey, index in projected_entities_dict.items()]
+
+        for rows in self._impl.iter_rows(query, batch_size):
+            values = list(zip(*rows))
+            arrays = {}
+            for tag, key, index in columns:
+                arrays.setdefault(tag, {})[key] = _to_array(values[index])
+            yield arrays
+
+    def to_arrays(self, batch_size=1000):
+        """
+        Executes the full query and returns the projected columns as NumPy arrays, see :meth:`.iter_columns`.
+
+        :param int batch_size: the number of rows to fetch from the database at a time
+        :returns:
+            a dictionary with the tag of each vertice as key and as value a dictionary
+            of the projected properties of that vertice to the NumPy array of their values
+        """
+        import numpy
+
+        batches = {}
+        for arrays in self.iter_columns(batch_size=batch_size):
+            for tag, tag_arrays in arrays.items():
+                for key, array in tag_arrays.items():
+                    batches.setdefault(tag, {}).setdefault(key, []).append(array)
+
+        if not batches:
+            # No rows, so return an empty array for each projection
+            return {
+                tag: {self._get_output_property(tag, attrkey): numpy.array([]) for attrkey in projected_entities_dict}
+                for tag, projected_entities_dict in self.tag_to_projected_property_dict.items()
+            }
+
+        return {
+            tag: {key: numpy.concatenate(arrays) for key, arrays in tag_batches.items()
+                 } for tag, tag_batches in batches.items()
+        }
+
+    def _get_output_property(self, tag, attrkey):
+        """
+        Return the name of a projected property as returned to the user, which can differ from the name of the column.
+
+        :param tag: the tag of the vertice
+        :param attrkey: the name of the projected property
+        """
+        table_name = getattr(self.tag_to_alias_map[tag], '__tablename__', None)
+        return self._impl.get_corresponding_property(table_name, attrkey, self._impl.inner_to_outer_schema)
+
     def inputs(self, **kwargs):
         """
         Join to inputs of previous vertice in path.
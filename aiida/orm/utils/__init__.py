@@ -14,7 +14,9 @@ from __future__ import absolute_import
 
 import six
 
-__all__ = ('load_code', 'load_computer', 'load_group', 'load_node')
+from .links import get_links
+
+__all__ = ('load_code', 'load_computer', 'load_group', 'load_node', 'get_links')
 
 
 def load_entity(entity_loader=None,
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""A bounded identity map of stored entities that can no longer change, such that they are loaded only once.
+
+Loading the same code or the same finished process over and over again, as for example the engine and the `verdi`
+commands do, each time costs a query and the construction of a new instance. The identity map keeps such entities in
+memory, keyed by both their pk and their UUID, and the entity loaders return the instance from the map instead. Only
+entities whose content cannot change once stored are kept: codes, computers and sealed process nodes. Their label,
+description and extras can still change, but those are refreshed from the database by the backend when accessed, as
+long as the instance is used outside of a transaction. The map is owned by the manager and is discarded together with
+the backend. Entities that are deleted through AiiDA are removed from the map explicitly and the map is cleared after
+an import. Since entities can also be deleted by other processes, an entity that is found in the map is only returned
+after a cheap query has confirmed that its row still exists.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import collections
+import threading
+
+import six
+
+from aiida.common.datastructures import LRUCache
+
+__all__ = ('IdentityMap',)
+
+IdentityMapInfo = collections.namedtuple('IdentityMapInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class IdentityMap(object):  # pylint: disable=useless-object-inheritance
+    """A map of pks and UUIDs onto entity instances, that discards the least recently used entities."""
+
+    def __init__(self, maxsize=1024):
+        """Construct a new identity map.
+
+        :param maxsize: the maximum number of entities to keep, if 0 nothing is kept
+        """
+        # The UUIDs are kept with the entities, since the attributes of a deleted entity can no longer be loaded
+        self._entities = LRUCache(maxsize)
+        self._uuids = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """Return the maximum number of entities that are kept."""
+        return self._entities.maxsize
+
+    def info(self):
+        """Return the statistics of the identity map.
+
+        :return: named tuple with the number of hits and misses, the maximum size and the current size
+        """
+        return IdentityMapInfo(self._hits, self._misses, self._entities.maxsize, len(self._entities))
+
+    def clear(self):
+        """Discard all entities and reset the statistics."""
+        with self._lock:
+            self._entities.clear()
+            self._uuids.clear()
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def is_cacheable(entity):
+        """Return whether the given entity can be kept in the identity map.
+
+        :param entity: the entity
+        :return: boolean, True if the entity is stored and its content can no longer change
+        """
+        from aiida.orm import Code, Computer, ProcessNode
+
+        if isinstance(entity, Computer):
+            return entity.is_stored
+
+        if isinstance(entity, Code):
+            return entity.is_stored
+
+        if isinstance(entity, ProcessNode):
+            return entity.is_stored and entity.is_sealed
+
+        return False
+
+    def get(self, orm_class, identifier):
+        """Return the entity of the given orm class with the given pk or full UUID, if it is in the map.
+
+        :param orm_class: the orm class of the entity, which determines to which collection the identifier refers
+        :param identifier: the pk as an integer or the full UUID as a string
+        :return: the entity or None if it is not in the map
+        """
+        if not self._entities.maxsize:
+            return None
+
+        collection = _get_collection(orm_class)
+
+        if isinstance(identifier, six.string_types):
+            identifier = self._uuids.get((collection, identifier))
+
+        uuid, entity = self._entities.get((collection, identifier), (None, None))
+
+        if entity is not None and not _exists(collection, identifier, uuid):
+            self.invalidate(collection, identifier)
+            entity = None
+
+        with self._lock:
+            if entity is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        return entity
+
+    def add(self, entity):
+        """Add the given entity to the map, if it is cacheable.
+
+        :param entity: the entity
+        :return: boolean, True if the entity was added
+        """
+        if not self._entities.maxsize or not self.is_cacheable(entity):
+            return False
+
+        collection = _get_collection(type(entity))
+        self._entities.set((collection, entity.pk), (entity.uuid, entity))
+        self._uuids.set((collection, entity.uuid), entity.pk)
+
+        return True
+
+    def invalidate(self, orm_class, pks):
+        """Remove the entities of the given orm class with the given pks from the map.
+
+        :param orm_class: the orm class of the entities
+        :param pks: an iterable of pks or a single pk
+        """
+        if isinstance(pks, six.integer_types):
+            pks = (pks,)
+
+        collection = _get_collection(orm_class)
+
+        for pk in pks:
+            uuid, _ = self._entities.pop((collection, pk), (None, None))
+            if uuid is not None:
+                self._uuids.pop((collection, uuid), None)
+
+
+def _exists(collection, pk, uuid):
+    """Return whether an entity with the given pk and UUID exists in the database.
+
+    :param collection: the base orm class of the collection of the entity
+    :param pk: the pk of the entity
+    :param uuid: the UUID of the entity
+    :return: boolean, True if the entity exists
+    """
+    from aiida.orm import QueryBuilder
+
+    builder = QueryBuilder().append(collection, filters={'id': pk, 'uuid': uuid}, project=['id'])
+    return builder.limit(1).first() is not None
+
+
+def _get_collection(orm_class):
+    """Return the base orm class of the collection of the given orm class, within which pks and UUIDs are unique.
+
+    :param orm_class: an orm entity class
+    :return: the base orm class of its collection, e.g. `Node` for all node classes
+    """
+    from aiida.orm import Node
+
+    if issubclass(orm_class, Node):
+        return Node
+
+    return orm_class
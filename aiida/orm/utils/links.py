@@ -17,7 +17,10 @@ from collections import namedtuple, OrderedDict, Mapping
 from aiida.common import exceptions
 from aiida.common.lang import type_check
 
-__all__ = ('LinkPair', 'LinkTriple', 'LinkManager', 'validate_link')
+__all__ = ('LinkPair', 'LinkTriple', 'LinkManager', 'validate_link', 'get_links')
+
+# The default maximum number of nodes whose links are fetched with a single query
+DEFAULT_BATCH_SIZE = 1000
 
 LinkPair = namedtuple('LinkPair', ['link_type', 'link_label'])
 LinkTriple = namedtuple('LinkTriple', ['node', 'link_type', 'link_label'])
@@ -157,6 +160,129 @@ def validate_link(source, target, link_type, link_label):
             target.uuid, link_type, link_label, source.uuid))
 
 
+def get_links(nodes,
+              link_direction='incoming',
+              link_type=(),
+              node_class=None,
+              link_label_filter=None,
+              cache=False,
+              batch_size=DEFAULT_BATCH_SIZE):
+    """Return the incoming or outgoing links of many nodes at once.
+
+    This is equivalent to calling `Node.get_incoming` or `Node.get_outgoing` for each node, but the links and neighbor
+    nodes of all stored nodes are fetched with a single query per batch of nodes. Neighbor nodes that are shared are
+    loaded only once.
+
+    If `cache` is True, all the links of the nodes in the given direction are fetched, regardless of the filters, and
+    stored on the node instances, such that subsequent calls of `get_incoming` or `get_outgoing` on these instances
+    are answered from memory, applying the filters there. The cache of a node is cleared when a link is added to it
+    through the same instance, but it does not see links that are added in any other way, so it should only be used
+    when the links are not expected to change, e.g. for nodes of terminated processes.
+
+    :param nodes: iterable of nodes
+    :param link_direction: `incoming` or `outgoing` to get the incoming or outgoing links, respectively
+    :param link_type: Only get links of this link type or tuple of link types, if empty tuple then returns all links.
+    :param node_class: If specified, should be a class, and it filters only neighbors of that (subclass of) type
+    :param link_label_filter: filters the links by their label, with wildcards as for the 'like' operator of the
+        QueryBuilder
+    :param cache: boolean, if True, cache all the links of the nodes in the given direction on the node instances
+    :param batch_size: the maximum number of nodes whose links are fetched with a single query
+    :return: `OrderedDict` with a `LinkManager` for each of the given nodes
+    :raises ValueError: if the link direction is invalid
+    """
+    # pylint: disable=too-many-arguments,too-many-locals,protected-access
+    from aiida.common.links import LinkType
+    from aiida.orm import Node, QueryBuilder
+
+    if link_direction not in ('incoming', 'outgoing'):
+        raise ValueError("link_direction should be 'incoming' or 'outgoing': got {}".format(link_direction))
+
+    if not isinstance(link_type, tuple):
+        link_type = (link_type,)
+
+    if link_type and not all([isinstance(t, LinkType) for t in link_type]):
+        raise TypeError('link_type should be a LinkType or tuple of LinkType: got {}'.format(link_type))
+
+    nodes = list(nodes)
+    stored_link_triples = {}
+
+    # The links of nodes that are cached already are filtered in memory and need not be fetched
+    for node in nodes:
+        if node.is_stored and link_direction not in node._stored_links_cache:
+            stored_link_triples[node.pk] = []
+
+    edge_filters = {}
+    neighbor_class = Node
+
+    # With the cache, all links are fetched and the filters are applied in memory
+    if not cache:
+        neighbor_class = node_class or Node
+
+        if link_type:
+            edge_filters['type'] = {'in': [t.value for t in link_type]}
+
+        if link_label_filter:
+            edge_filters['label'] = {'like': link_label_filter}
+
+    relationship = 'with_outgoing' if link_direction == 'incoming' else 'with_incoming'
+    neighbors = {}
+    pks = sorted(stored_link_triples)
+
+    for start in range(0, len(pks), batch_size):
+        builder = QueryBuilder()
+        builder.append(Node, filters={'id': {'in': pks[start:start + batch_size]}}, project=['id'], tag='main')
+        builder.append(
+            neighbor_class,
+            project=['*'],
+            edge_project=['type', 'label'],
+            edge_filters=edge_filters,
+            **{relationship: 'main'})
+
+        for pk, neighbor, type_value, label in builder.iterall():
+            neighbor = neighbors.setdefault(neighbor.pk, neighbor)
+            stored_link_triples[pk].append(LinkTriple(neighbor, LinkType(type_value), label))
+
+    result = OrderedDict()
+
+    for node in nodes:
+        if not node.is_stored:
+            link_triples = []
+        elif link_direction in node._stored_links_cache:
+            link_triples = filter_link_triples(node._stored_links_cache[link_direction], node_class, link_type,
+                                               link_label_filter)
+        elif cache:
+            node._stored_links_cache[link_direction] = stored_link_triples[node.pk]
+            link_triples = filter_link_triples(stored_link_triples[node.pk], node_class, link_type, link_label_filter)
+        else:
+            link_triples = list(stored_link_triples[node.pk])
+
+        if link_direction == 'incoming':
+            link_triples = node._merge_incoming_cache(link_triples, link_type, link_label_filter)
+
+        result[node] = LinkManager(link_triples)
+
+    return result
+
+
+def filter_link_triples(link_triples, node_class=None, link_type=(), link_label_filter=None):
+    """Return the link triples that match the given filters, in the same way as the `QueryBuilder` would filter them.
+
+    :param link_triples: list of `LinkTriple`
+    :param node_class: If specified, should be a class, and it filters only elements of that (subclass of) type
+    :param link_type: tuple of `LinkType`, if empty tuple then link triples of all link types are returned
+    :param link_label_filter: filters the link triples by their label, with wildcards as for the 'like' operator
+    :return: new list of `LinkTriple`
+    """
+    from aiida.common.escaping import sql_string_match
+
+    return [
+        link_triple for link_triple in link_triples
+        if (node_class is None or isinstance(link_triple.node, node_class)) and
+        (not link_type or link_triple.link_type in link_type) and
+        (not link_label_filter or sql_string_match(string=link_triple.link_label, pattern=link_label_filter))
+    ]
+
+
 class LinkManager(object):  # pylint: disable=useless-object-inheritance
     """
     Class to convert a list of LinkTriple tuples into an iterator.
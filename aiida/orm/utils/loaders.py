@@ -188,9 +188,20 @@ class OrmEntityLoader(object):
         :raises aiida.common.MultipleObjectsError: if the identifier maps onto multiple entities
         :raises aiida.common.NotExistent: if the identifier maps onto not a single entity
         """
+        from aiida.manage.manager import get_manager
+
         builder, query_parameters = cls.get_query_builder(identifier, identifier_type, sub_classes, query_with_dashes)
         builder.limit(2)
 
+        # Entities that can no longer change are only loaded once, as long as they are identified by a pk or full UUID
+        identity_map = get_manager().get_identity_map()
+        key = cls._get_identity_map_key(query_parameters['identifier'], query_parameters['identifier_type'])
+
+        if key is not None:
+            entity = identity_map.get(cls.orm_base_class, key)
+            if isinstance(entity, query_parameters['classes']):
+                return entity
+
         classes = ' or '.join([sub_class.__name__ for sub_class in query_parameters['classes']])
         identifier = query_parameters['identifier']
         identifier_type = query_parameters['identifier_type'].value
@@ -204,8 +215,35 @@ class OrmEntityLoader(object):
             error = 'no {} found with {}<{}>: {}'.format(classes, identifier_type, identifier, exception)
             raise NotExistent(error)
 
+        identity_map.add(entity)
+
         return entity
 
+    @staticmethod
+    def _get_identity_map_key(identifier, identifier_type):
+        """
+        Return the key of the identity map for the given identifier, if it uniquely identifies an entity by itself.
+
+        :param identifier: the identifier
+        :param identifier_type: the type of the identifier
+        :returns: the pk as an integer for an ID, the normalized UUID for a full UUID and None otherwise
+        """
+        from uuid import UUID
+
+        if identifier_type == IdentifierType.ID:
+            try:
+                return int(identifier)
+            except (TypeError, ValueError):
+                return None
+
+        if identifier_type == IdentifierType.UUID and len(identifier.replace('-', '')) == 32:
+            try:
+                return str(UUID(identifier))
+            except ValueError:
+                return None
+
+        return None
+
     @classmethod
     def get_query_classes(cls, sub_classes=None):
         """
@@ -11,7 +11,20 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+
 import logging
+import threading
+
+from six.moves import queue
+
+# The default number of records after which a `BufferedDBLogHandler` writes its buffer to the database
+DEFAULT_BUFFER_SIZE = 100
+
+# The default maximum time in seconds that a record is kept in the buffer of a `BufferedDBLogHandler`
+DEFAULT_FLUSH_INTERVAL = 1
+
+# The number of buffers that can be waiting to be written, before emitting a record blocks
+BACKPRESSURE_BUFFERS = 10
 
 
 class DBLogHandler(logging.Handler):
@@ -48,6 +61,137 @@ class DBLogHandler(logging.Handler):
             raise
 
 
+class BufferedDBLogHandler(DBLogHandler):
+    """A db log handler that buffers the log records and writes them to the database in bulk.
+
+    The records are converted into log entries when they are emitted, but they are written by a background thread,
+    as soon as `buffer_size` records are waiting or at the latest after `flush_interval` seconds, with a single insert
+    per backend. When the thread falls behind, such that `BACKPRESSURE_BUFFERS` full buffers are waiting, emitting a
+    record blocks until there is space again. Calling `flush` writes all waiting records in the calling thread, which is
+    done when a process terminates and when the handler is closed at exit.
+    """
+
+    def __init__(self, level=logging.NOTSET, buffer_size=DEFAULT_BUFFER_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """Construct a new handler.
+
+        :param level: the minimum level of the records that are handled
+        :param buffer_size: the number of waiting records after which they are written to the database
+        :param flush_interval: the maximum time in seconds that a record waits before it is written to the database
+        """
+        super(BufferedDBLogHandler, self).__init__(level)
+        self._buffer_size = max(buffer_size, 1)
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=self._buffer_size * BACKPRESSURE_BUFFERS)
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def emit(self, record):
+        from aiida import orm
+
+        if record.exc_info:
+            # Put an appropriate string in exc_text, see `DBLogHandler.emit`
+            self.format(record)
+
+        try:
+            backend = record.__dict__.pop('backend')
+        except KeyError:
+            # The backend should be set. We silently absorb this error
+            return
+
+        fields = orm.Log.Collection.get_fields_from_record(record)
+
+        if fields is None:
+            return
+
+        if self._closed:
+            orm.Log.objects(backend).create_entries_from_fields([fields])
+            return
+
+        self._start_thread()
+
+        # Blocks while the queue is full, until the background thread has written the waiting records
+        self._queue.put((backend, fields))
+
+        if self._queue.qsize() >= self._buffer_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all the waiting records to the database."""
+        from aiida import orm
+
+        with self._flush_lock:
+            batches = []
+
+            while True:
+                try:
+                    backend, fields = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                # Keep the order of the records, while grouping consecutive records of the same backend
+                if batches and batches[-1][0] is backend:
+                    batches[-1][1].append(fields)
+                else:
+                    batches.append((backend, [fields]))
+
+            for backend, entries in batches:
+                orm.Log.objects(backend).create_entries_from_fields(entries)
+
+    def close(self):
+        """Stop the background thread and write all the waiting records to the database."""
+        self._closed = True
+        self._wakeup.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        try:
+            self.flush()
+        finally:
+            super(BufferedDBLogHandler, self).close()
+
+    def _start_thread(self):
+        """Start the background thread that writes the records, unless it is already running."""
+        if self._thread is not None:
+            return
+
+        with self._flush_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='BufferedDBLogHandler')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        """Write the waiting records whenever the buffer is full or the flush interval has passed."""
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                # To avoid loops with the error handler, I just print, and carry on with the next records
+                import traceback
+                traceback.print_exc()
+
+
+def flush_db_log_handlers(logger=None):
+    """Write the records that are waiting in the buffered db log handlers of the given logger to the database.
+
+    :param logger: the logger, by default the AiiDA logger
+    """
+    from aiida.common.log import AIIDA_LOGGER
+
+    logger = logger or AIIDA_LOGGER
+
+    for handler in logger.handlers:
+        if isinstance(handler, BufferedDBLogHandler):
+            handler.flush()
+
+
 def get_dblogger_extra(node):
     """Return the additional information necessary to attach any log records to the given node instance.
 
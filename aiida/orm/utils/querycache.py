@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""A process-wide cache of compiled queries of the `QueryBuilder`, keyed by the structure of their queryhelp.
+
+Queries that only differ in the values of their filters share the same structure. For such queries the SQLAlchemy
+query is built and compiled only once, from a template in which each filter value is replaced by a unique sentinel
+value. The bound parameters that carry those sentinels are then simply given the actual filter values upon execution.
+This follows the approach of the `sqlalchemy.ext.baked` extension, but the cache key is derived from the queryhelp.
+
+Cached queries are executed through private internals of SQLAlchemy, so queries are only cached for the versions of
+SQLAlchemy for which these are known to work, see :func:`is_sqlalchemy_supported`. For any other version every query is
+built and executed as usual.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import collections
+import copy
+import threading
+
+import six
+
+from aiida.common.datastructures import LRUCache
+
+__all__ = ('QueryCache', 'CachedQuery', 'get_query_cache', 'get_queryhelp_key', 'substitute_parameters',
+           'is_sqlalchemy_supported')
+
+QueryCacheInfo = collections.namedtuple('QueryCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# The types of filter values that are bound as parameters, all other values are part of the structure of the query
+_PARAMETER_TYPES = six.integer_types + (float,) + six.string_types
+
+# Operators whose value determines the structure of the expression, such that it cannot be bound as a parameter
+_LITERAL_OPERATORS = ('of_type', 'contains')
+
+_SENTINEL_INTEGER = -2**40
+_SENTINEL_FLOAT = -2.0**40 - 0.5
+_SENTINEL_STRING = u'__aiida_query_parameter_{}__'
+
+# The range of versions of SQLAlchemy, inclusive, whose `Query._compile_context` and `loading.instances` behave as
+# expected by cached queries
+_SQLALCHEMY_VERSIONS = ((1, 0), (1, 3))
+
+_MISSING = object()
+
+_QUERY_CACHE = None
+
+_SQLALCHEMY_SUPPORTED = None
+
+
+def is_sqlalchemy_supported():
+    """Return whether the installed version of SQLAlchemy supports the private internals used by cached queries.
+
+    :return: boolean, if False queries should not be cached
+    """
+    global _SQLALCHEMY_SUPPORTED  # pylint: disable=global-statement
+
+    if _SQLALCHEMY_SUPPORTED is None:
+        import sqlalchemy
+        from sqlalchemy.orm import loading, Query
+
+        try:
+            version = tuple(int(part) for part in sqlalchemy.__version__.split('.')[:2])
+        except ValueError:
+            version = None
+
+        _SQLALCHEMY_SUPPORTED = (version is not None and _SQLALCHEMY_VERSIONS[0] <= version <= _SQLALCHEMY_VERSIONS[1]
+                                 and hasattr(Query, '_compile_context') and hasattr(loading, 'instances'))
+
+    return _SQLALCHEMY_SUPPORTED
+
+
+def get_query_cache():
+    """Return the process-wide query cache, creating it with the configured size if necessary.
+
+    :return: the query cache
+    :rtype: :class:`aiida.orm.utils.querycache.QueryCache`
+    """
+    global _QUERY_CACHE  # pylint: disable=global-statement
+
+    if _QUERY_CACHE is None:
+        from aiida.manage.configuration import get_config_option
+        _QUERY_CACHE = QueryCache(maxsize=get_config_option('querybuilder.cache_size'))
+
+    return _QUERY_CACHE
+
+
+def get_queryhelp_key(path, filters, projections, order_by, limit, offset):
+    """Return the structure of a queryhelp and the values of its filters that can be bound as parameters.
+
+    The structure is hashable and is the same for all queryhelps that only differ in the values of their filters. The
+    values are returned in the same order in which :func:`substitute_parameters` substitutes them.
+
+    :param path: the path of the queryhelp
+    :param filters: the filters of the queryhelp
+    :param projections: the projections of the queryhelp
+    :param order_by: the order of the queryhelp
+    :param limit: the limit of the queryhelp
+    :param offset: the offset of the queryhelp
+    :return: tuple of the structure and the list of values
+    :raises TypeError: if the queryhelp contains values that are not hashable
+    """
+    values = []
+    frozen_filters = _freeze_filters(filters, values)
+    structure = (_freeze(path), frozen_filters, _freeze(projections), _freeze(order_by), limit, offset)
+    hash(structure)
+    return structure, values
+
+
+def substitute_parameters(filters, values):
+    """Return a copy of the filters in which the values that are bound as parameters are replaced by the given values.
+
+    :param filters: the filters of a queryhelp
+    :param values: the values to substitute, in the order returned by :func:`get_queryhelp_key`
+    :return: the filters with the values substituted
+    """
+    return _substitute_filters(filters, iter(values))
+
+
+def _freeze(value):
+    """Return a hashable version of a value of a queryhelp, by recursively converting dictionaries and lists to tuples.
+
+    :param value: the value
+    """
+    if isinstance(value, dict):
+        return (dict,) + tuple((key, _freeze(value[key])) for key in sorted(value))
+    if isinstance(value, (list, tuple)):
+        return (list,) + tuple(_freeze(item) for item in value)
+    # Include the type, such that for example `1` and `True` do not result in the same structure
+    return (type(value), value)
+
+
+def _is_parameter(value, operator):
+    """Return whether the given filter value of the given operator is bound as a parameter."""
+    return (isinstance(value, _PARAMETER_TYPES) and not isinstance(value, bool) and
+            operator.lstrip('~!') not in _LITERAL_OPERATORS)
+
+
+def _freeze_filters(spec, values, operator='=='):
+    """Return the hashable structure of a filter specification, while appending its parameter values to `values`.
+
+    :param spec: the filter specification
+    :param values: list to which the values that are bound as parameters are appended
+    :param operator: the operator that applies to the specification
+    """
+    if isinstance(spec, dict):
+        if operator.lstrip('~!') in _LITERAL_OPERATORS:
+            return (operator, _freeze(spec))
+        return (dict,) + tuple((key, _freeze_filters(spec[key], values, key)) for key in sorted(spec))
+
+    if isinstance(spec, (list, tuple)):
+        if operator.lstrip('~!') in _LITERAL_OPERATORS:
+            return (operator, _freeze(spec))
+        return (list,) + tuple(_freeze_filters(item, values, operator) for item in spec)
+
+    if _is_parameter(spec, operator):
+        values.append(spec)
+        return type(spec)
+
+    return _freeze(spec)
+
+
+def _substitute_filters(spec, values, operator='=='):
+    """Return a copy of a filter specification with its parameter values replaced by the next ones of `values`.
+
+    This traverses the specification in exactly the same order as :func:`_freeze_filters`.
+
+    :param spec: the filter specification
+    :param values: iterator over the values to substitute
+    :param operator: the operator that applies to the specification
+    """
+    if operator.lstrip('~!') in _LITERAL_OPERATORS:
+        return spec
+
+    if isinstance(spec, dict):
+        return collections.OrderedDict(
+            (key, _substitute_filters(spec[key], values, key)) for key in sorted(spec))
+
+    if isinstance(spec, (list, tuple)):
+        return [_substitute_filters(item, values, operator) for item in spec]
+
+    if _is_parameter(spec, operator):
+        return next(values)
+
+    return spec
+
+
+def _get_sentinel(index, value):
+    """Return a unique sentinel value of the same type as the given value, for the parameter with the given index.
+
+    :param index: the index of the parameter
+    :param value: the actual value of the parameter
+    """
+    if isinstance(value, float):
+        return type(value)(_SENTINEL_FLOAT - index)
+    if isinstance(value, six.integer_types):
+        return type(value)(_SENTINEL_INTEGER - index)
+    return type(value)(_SENTINEL_STRING.format(index))
+
+
+class QueryTemplate(object):  # pylint: disable=useless-object-inheritance
+    """A query built with sentinel values in place of its parameters, which is compiled once per mode of execution.
+
+    The mode is `all` to fetch all rows, `first` to fetch only the first row or `count` to count the rows.
+    """
+
+    _MODES = ('all', 'first', 'count')
+
+    def __init__(self, query, sentinels, tag_to_projected_property_dict, attrkeys_as_in_sql_result, tag_to_alias_map):
+        """Construct a new template.
+
+        :param query: the query built with the sentinel values
+        :type query: :class:`sqlalchemy.orm.Query`
+        :param sentinels: the sentinel values, in the order of the parameters
+        :param tag_to_projected_property_dict: the projected properties per tag, as determined while building the query
+        :param attrkeys_as_in_sql_result: the projected properties per column of the results
+        :param tag_to_alias_map: the aliases per tag, including those of the edges, used to build the query
+        """
+        self._query = query.with_session(None)
+        self._sentinels = {sentinel: index for index, sentinel in enumerate(sentinels)}
+        self._statements = {}
+        self.tag_to_projected_property_dict = tag_to_projected_property_dict
+        self.attrkeys_as_in_sql_result = attrkeys_as_in_sql_result
+        self.tag_to_alias_map = tag_to_alias_map
+
+    def get_statement(self, mode, session):
+        """Return the compiled statement for the given mode, compiling it if necessary.
+
+        :param mode: the mode of execution
+        :param session: the session in which the query will be executed
+        :return: tuple of the query context, the compiled statement and a dictionary of the keys of the bound
+            parameters to the index of the parameter, or None if the parameters could not all be bound
+        """
+        try:
+            return self._statements[mode]
+        except KeyError:
+            statement = self._compile(mode, session)
+            self._statements[mode] = statement
+            return statement
+
+    def _compile(self, mode, session):
+        """Compile the statement for the given mode.
+
+        :param mode: the mode of execution
+        :param session: the session in which the query will be executed
+        :return: see :meth:`get_statement`
+        """
+        from sqlalchemy import func, literal_column
+
+        if mode not in self._MODES:
+            raise ValueError('invalid mode {}, valid modes are {}'.format(mode, self._MODES))
+
+        query = self._query.with_session(session)
+
+        if mode == 'first':
+            query = query.slice(0, 1)
+        elif mode == 'count':
+            query = query.from_self(func.count(literal_column('*')))
+
+        # This mirrors what `Query.__iter__` does before executing the statement of the context
+        context = query._compile_context()  # pylint: disable=protected-access
+        context.statement.use_labels = True
+        context.session = None
+        context.query = context.query.with_session(None)
+
+        compiled = context.statement.compile(dialect=session.get_bind().dialect)
+
+        keys = {}
+        for bind in compiled.binds.values():
+            try:
+                index = self._sentinels.get(bind.value, None)
+            except TypeError:
+                # The values of some parameters, such as the path into a JSON column, are not hashable
+                continue
+            if index is not None:
+                keys[bind.key] = index
+
+        # If a sentinel did not end up as a bound parameter, its value was transformed while building the query
+        if set(keys.values()) != set(self._sentinels.values()):
+            return None
+
+        return context, compiled, keys
+
+
+class CachedQuery(object):  # pylint: disable=useless-object-inheritance
+    """A cached query that is executed with the actual values of its parameters.
+
+    This implements the part of the interface of :class:`sqlalchemy.orm.Query` through which the backend query builders
+    fetch results, such that it can be passed in place of a query.
+    """
+
+    def __init__(self, template, values, session):
+        """Construct a new cached query.
+
+        :param template: the template of the query
+        :type template: :class:`aiida.orm.utils.querycache.QueryTemplate`
+        :param values: the values of the parameters
+        :param session: the session in which to execute the query
+        """
+        self._template = template
+        self._values = values
+        self._session = session
+
+    def __iter__(self):
+        return self._execute('all')
+
+    def yield_per(self, count):
+        """Return an iterator over all rows, that are fetched from a server side cursor in batches.
+
+        :param count: the number of rows to fetch at a time
+        """
+        return self._execute('all', batch_size=count)
+
+    def first(self):
+        """Return the first row or None if there are no rows."""
+        rows = list(self._execute('first'))
+        return rows[0] if rows else None
+
+    def count(self):
+        """Return the number of rows."""
+        row = list(self._execute('count'))[0]
+        return row[0] if isinstance(row, tuple) else row
+
+    def execute(self, mode='all', stream_results=False):
+        """Execute the compiled statement of the given mode and return the result with the rows as returned by the
+        database driver, without converting them to ORM entities.
+
+        :param mode: the mode of execution
+        :param stream_results: if True, fetch the rows from a server side cursor
+        :return: the result proxy
+        :rtype: :class:`sqlalchemy.engine.ResultProxy`
+        """
+        _, compiled, keys = self._template.get_statement(mode, self._session)
+
+        if self._session.autoflush:
+            self._session._autoflush()  # pylint: disable=protected-access
+
+        connection = self._session.connection()
+        if stream_results:
+            connection = connection.execution_options(stream_results=True)
+
+        parameters = {key: self._values[index] for key, index in keys.items()}
+        return connection.execute(compiled, parameters)
+
+    def _execute(self, mode, batch_size=None):
+        """Execute the compiled statement of the given mode and return an iterator over the rows.
+
+        :param mode: the mode of execution
+        :param batch_size: if not None, fetch the rows from a server side cursor in batches of this size
+        """
+        from sqlalchemy.orm import loading
+
+        context, _, _ = self._template.get_statement(mode, self._session)
+
+        context = copy.copy(context)
+        context.session = self._session
+        context.attributes = context.attributes.copy()
+
+        query = context.query.with_session(self._session)
+        if batch_size is not None:
+            query = query.yield_per(batch_size)
+        context.query = query
+
+        result = self.execute(mode, stream_results=batch_size is not None)
+
+        return loading.instances(query, result, context)
+
+
+class QueryCache(object):  # pylint: disable=useless-object-inheritance
+    """A cache of query templates keyed by the structure of the queryhelp, that discards the least recently used."""
+
+    def __init__(self, maxsize=256):
+        """Construct a new cache.
+
+        :param maxsize: the maximum number of templates to keep, if 0 nothing is cached
+        """
+        self._templates = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """Return the maximum number of templates that are kept."""
+        return self._templates.maxsize
+
+    def info(self):
+        """Return the statistics of the cache.
+
+        :return: named tuple with the number of hits and misses, the maximum size and the current size
+        """
+        return QueryCacheInfo(self._hits, self._misses, self._templates.maxsize, len(self._templates))
+
+    def clear(self):
+        """Discard all templates and reset the statistics."""
+        with self._lock:
+            self._templates.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def get_query(self, key, values, session, build_template, mode='all'):
+        """Return a cached query for the given structure and parameter values.
+
+        :param key: the structure of the queryhelp, as returned by :func:`get_queryhelp_key`
+        :param values: the values of the parameters, as returned by :func:`get_queryhelp_key`
+        :param session: the session in which to execute the query
+        :param build_template: callable that is called with a list of sentinel values in place of `values` and should
+            return the built query, the projected properties per tag, the projected properties per column and the
+            aliases per tag
+        :param mode: the mode of execution, `all`, `first` or `count`
+        :return: a tuple of the cached query and its template, or None if the query cannot be cached
+        """
+        if not self._templates.maxsize or not is_sqlalchemy_supported():
+            return None
+
+        template = self._templates.get(key, _MISSING)
+
+        with self._lock:
+            if template is _MISSING:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        if template is _MISSING:
+            template = self._build_template(values, build_template)
+            self._templates.set(key, template)
+
+        if template is None or template.get_statement(mode, session) is None:
+            return None
+
+        return CachedQuery(template, values, session), template
+
+    @staticmethod
+    def _build_template(values, build_template):
+        """Build the template for the given parameter values.
+
+        :param values: the values of the parameters
+        :param build_template: see :meth:`get_query`
+        :return: the template or None if the query could not be built with sentinel values
+        """
+        sentinels = [_get_sentinel(index, value) for index, value in enumerate(values)]
+
+        try:
+            query, projected_properties, attrkeys, tag_to_alias_map = build_template(sentinels)
+        except Exception:  # pylint: disable=broad-except
+            # The query will be built with the actual values instead, which raises again if the queryhelp is invalid
+            return None
+
+        return QueryTemplate(query, sentinels, projected_properties, attrkeys, tag_to_alias_map)
@@ -14,11 +14,20 @@ from __future__ import absolute_import
 
 import collections
 import enum
+import errno
 import io
 import os
+import shutil
 
 from aiida.common import exceptions
 from aiida.common.folders import RepositoryFolder, SandboxFolder
+from aiida.common.objectstore import ObjectTree, get_object_store
+
+# The values of the `repository.backend` option
+REPOSITORY_BACKEND_FOLDER = 'folder'
+REPOSITORY_BACKEND_OBJECTSTORE = 'objectstore'
+
+_NOT_IN_OBJECT_STORE = object()
 
 
 class FileType(enum.Enum):
@@ -30,22 +39,41 @@ class FileType(enum.Enum):
 File = collections.namedtuple('File', ['name', 'type'])
 
 
+def get_repository_backend():
+    """Return the backend in which the repository content of nodes is stored when they are stored.
+
+    :return: `folder` or `objectstore`
+    """
+    from aiida.manage.configuration import get_config_option
+    return get_config_option('repository.backend')
+
+
 class Repository(object):  # pylint: disable=useless-object-inheritance
-    """Class that represents the repository of a `Node` instance."""
+    """Class that represents the repository of a `Node` instance.
+
+    The content of a stored node either lives in a folder of its own, or, if the node was stored while the
+    `repository.backend` option was set to `objectstore`, in the object store of the profile, where the node references
+    its objects through its manifest. Such content is read directly from the object store, and is only copied into a
+    sandbox folder if a path on disk is required.
+    """
 
     # Name to be used for the Repository section
     _section_name = 'node'
 
     def __init__(self, uuid, is_stored, base_path=None):
+        self._uuid = uuid
         self._is_stored = is_stored
         self._base_path = base_path
         self._temp_folder = None
+        self._materialized_folder = None
+        self._manifest = None
         self._repo_folder = RepositoryFolder(section=self._section_name, uuid=uuid)
 
     def __del__(self):
-        """Clean the sandboxfolder if it was instantiated."""
-        if getattr(self, '_temp_folder', None) is not None:
-            self._temp_folder.erase()
+        """Clean the sandboxfolders if they were instantiated."""
+        for name in ('_temp_folder', '_materialized_folder'):
+            if getattr(self, name, None) is not None:
+                getattr(self, name).erase()
 
     def validate_mutability(self):
         """Raise if the repository is immutable.
@@ -72,6 +100,11 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
         :param key: fully qualified identifier for the object within the repository
         :return: a list of `File` named tuples representing the objects present in directory with the given key
         """
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            return self._list_manifest_objects(manifest, key)
+
         folder = self._get_base_folder()
 
         if key:
@@ -100,8 +133,27 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
 
         :param key: fully qualified identifier for the object within the repository
         :param mode: the mode under which to open the handle
+        :raises aiida.common.ModificationNotAllowed: if the object is in the object store and the mode is for writing
         """
-        return io.open(self._get_base_folder().get_abs_path(key), mode=mode)
+        manifest = self._get_manifest()
+
+        if manifest is None:
+            return io.open(self._get_base_folder().get_abs_path(key), mode=mode)
+
+        if any(character in mode for character in 'wax+'):
+            raise exceptions.ModificationNotAllowed('cannot open an object of a stored repository for writing')
+
+        object_hash = manifest.get(self._get_manifest_path(key))
+
+        if object_hash is None:
+            raise IOError(errno.ENOENT, 'no object with key `{}`'.format(key))
+
+        handle = get_object_store().open_object(object_hash)
+
+        if 'b' in mode:
+            return handle
+
+        return io.TextIOWrapper(handle, encoding='utf8')
 
     def get_object(self, key):
         """Return the object identified by key.
@@ -116,6 +168,13 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
         except ValueError:
             directory, filename = None, key
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            if self._is_manifest_directory(manifest, self._get_manifest_path(key)):
+                return File(filename, FileType.DIRECTORY)
+            return File(filename, FileType.FILE)
+
         folder = self._get_base_folder()
 
         if directory:
@@ -155,6 +214,15 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
         if not os.path.isabs(path):
             raise ValueError('the `path` must be an absolute path')
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            prefix = self._get_manifest_path(key if contents_only else os.path.join(key or '', os.path.basename(path)))
+            for relpath, object_hash in get_object_store().add_objects_from_directory(path).items():
+                self._set_manifest_entry(manifest, os.path.join(prefix, relpath), object_hash)
+            self._save_manifest(manifest)
+            return
+
         folder = self._get_base_folder()
 
         if key:
@@ -205,6 +273,17 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
 
         self.validate_object_key(key)
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            with SandboxFolder() as sandbox:
+                filepath = sandbox.create_file_from_filelike(handle, 'object', mode=mode, encoding=encoding)
+                with io.open(filepath, 'rb') as binary:
+                    object_hash = get_object_store().add_object_from_filelike(binary)
+            self._set_manifest_entry(manifest, self._get_manifest_path(key), object_hash)
+            self._save_manifest(manifest)
+            return
+
         folder = self._get_base_folder()
 
         if os.sep in key:
@@ -228,6 +307,19 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
 
         self.validate_object_key(key)
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            path = self._get_manifest_path(key)
+            for entry in [entry for entry in manifest if entry == path or entry.startswith(path + os.sep)]:
+                manifest.pop(entry)
+            # Deleting the last object of a directory leaves the directory itself
+            directory = os.path.dirname(path)
+            if directory and not self._is_manifest_directory(manifest, directory):
+                manifest[directory] = None
+            self._save_manifest(manifest)
+            return
+
         self._get_base_folder().remove_path(key)
 
     def erase(self, force=False):
@@ -242,30 +334,81 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
         if not force:
             self.validate_mutability()
 
+        if self._get_manifest() is not None:
+            get_object_store().delete_manifest(self._uuid)
+            self._manifest = _NOT_IN_OBJECT_STORE
+            self._erase_materialized_folder()
+
         self._repo_folder.erase()
 
     def store(self):
-        """Store the contents of the sandbox folder into the repository folder."""
+        """Store the contents of the sandbox folder into the repository folder or the object store."""
         if self._is_stored:
             raise exceptions.ModificationNotAllowed('repository is already stored')
 
-        self._repo_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
+        if get_repository_backend() == REPOSITORY_BACKEND_OBJECTSTORE:
+            object_store = get_object_store()
+            self._manifest = object_store.add_objects_from_directory(self._get_temp_folder().abspath)
+            object_store.set_manifest(self._uuid, self._manifest)
+            # The sandbox folder already contains the content, should a path on disk ever be needed
+            self._materialized_folder, self._temp_folder = self._temp_folder, None
+        else:
+            self._repo_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
+
         self._is_stored = True
 
     def restore(self):
-        """Move the contents from the repository folder back into the sandbox folder."""
+        """Move the contents from the repository folder or the object store back into the sandbox folder."""
         if not self._is_stored:
             raise exceptions.ModificationNotAllowed('repository is not yet stored')
 
-        self._temp_folder.replace_with_folder(self._repo_folder.abspath, move=True, overwrite=True)
+        if self._get_manifest() is not None:
+            get_object_store().delete_manifest(self._uuid)
+            self._temp_folder, self._materialized_folder = self._get_materialized_folder(), None
+            self._manifest = None
+        else:
+            self._temp_folder.replace_with_folder(self._repo_folder.abspath, move=True, overwrite=True)
+
         self._is_stored = False
 
+    def get_hashable_content(self):
+        """Return the object that represents the content of the repository in the hash of the node.
+
+        Content in the object store is represented by the hashes of its objects, such that it does not have to be read.
+        The same representation is used for unstored content, if it will be stored in the object store.
+
+        :return: an `ObjectTree` or a `Folder`
+        """
+        manifest = self._get_manifest()
+
+        if manifest is None and not self._is_stored and get_repository_backend() == REPOSITORY_BACKEND_OBJECTSTORE:
+            return ObjectTree.from_folder(self._get_base_folder())
+
+        if manifest is None:
+            return self._get_base_folder()
+
+        prefix = self._get_manifest_path()
+
+        if not prefix:
+            return ObjectTree(manifest)
+
+        return ObjectTree({
+            path[len(prefix) + 1:]: object_hash
+            for path, object_hash in manifest.items()
+            if path.startswith(prefix + os.sep)
+        })
+
     def _get_base_folder(self):
         """Return the base sub folder in the repository.
 
+        .. note:: if the content is in the object store, it is first copied into a sandbox folder, which should only be
+            read from, since changes to it are not stored.
+
         :return: a Folder object.
         """
-        if self._is_stored:
+        if self._is_stored and self._get_manifest() is not None:
+            folder = self._get_materialized_folder()
+        elif self._is_stored:
             folder = self._repo_folder
         else:
             folder = self._get_temp_folder()
@@ -285,3 +428,146 @@ class Repository(object):  # pylint: disable=useless-object-inheritance
             self._temp_folder = SandboxFolder()
 
         return self._temp_folder
+
+    def _get_manifest(self):
+        """Return the manifest of the content in the object store.
+
+        :return: dictionary of paths onto object hashes, or None if the repository is not stored in the object store
+        """
+        if not self._is_stored:
+            return None
+
+        if self._manifest is None:
+            manifest = get_object_store().get_manifest(self._uuid)
+            self._manifest = _NOT_IN_OBJECT_STORE if manifest is None else manifest
+
+        if self._manifest is _NOT_IN_OBJECT_STORE:
+            return None
+
+        return self._manifest
+
+    def _save_manifest(self, manifest):
+        """Store the modified manifest and discard the copy of the previous content on disk.
+
+        :param manifest: dictionary of paths onto object hashes
+        """
+        get_object_store().set_manifest(self._uuid, manifest)
+        self._manifest = manifest
+        self._erase_materialized_folder()
+
+    def _get_manifest_path(self, key=None):
+        """Return the path in the manifest of the given key, which is relative to the base path.
+
+        :param key: fully qualified identifier for the object within the repository
+        :return: the normalized path, which is empty for the base path itself
+        """
+        parts = [part for part in (self._base_path, key) if part]
+
+        if not parts:
+            return ''
+
+        path = os.path.normpath(os.path.join(*parts))
+
+        return '' if path == os.curdir else path
+
+    @staticmethod
+    def _set_manifest_entry(manifest, path, object_hash):
+        """Set the object of the given path in the manifest, and remove the markers of empty parent directories.
+
+        :param manifest: dictionary of paths onto object hashes
+        :param path: the path of the object
+        :param object_hash: the hash of the object, or None for an empty directory
+        """
+        path = os.path.normpath(path)
+        directory = os.path.dirname(path)
+
+        while directory:
+            if manifest.get(directory, False) is None:
+                manifest.pop(directory)
+            directory = os.path.dirname(directory)
+
+        if object_hash is None and any(entry.startswith(path + os.sep) for entry in manifest):
+            return
+
+        manifest[path] = object_hash
+
+    @staticmethod
+    def _is_manifest_directory(manifest, path):
+        """Return whether the given path is a directory in the manifest.
+
+        :param manifest: dictionary of paths onto object hashes
+        :param path: the path
+        :return: boolean, True if the path is the base path, an empty directory or contains objects
+        """
+        if not path or manifest.get(path, False) is None:
+            return True
+
+        return any(entry.startswith(path + os.sep) for entry in manifest)
+
+    def _list_manifest_objects(self, manifest, key=None):
+        """Return a list of the objects in the manifest in the directory with the given key.
+
+        :param manifest: dictionary of paths onto object hashes
+        :param key: fully qualified identifier for the directory within the repository
+        :return: a list of `File` named tuples
+        :raises IOError: if the directory does not exist
+        """
+        prefix = self._get_manifest_path(key)
+        objects = {}
+
+        for path, object_hash in manifest.items():
+            if prefix:
+                if not path.startswith(prefix + os.sep):
+                    continue
+                path = path[len(prefix) + 1:]
+
+            name, separator, _ = path.partition(os.sep)
+
+            if separator or object_hash is None:
+                objects[name] = File(name, FileType.DIRECTORY)
+            else:
+                objects[name] = File(name, FileType.FILE)
+
+        if key and not objects and not self._is_manifest_directory(manifest, prefix):
+            raise IOError(errno.ENOENT, 'no directory with key `{}`'.format(key))
+
+        return sorted(objects.values(), key=lambda x: x.name)
+
+    def _get_materialized_folder(self):
+        """Return a sandbox folder with a copy of the content in the object store, creating it if necessary.
+
+        :return: a SandboxFolder object
+        """
+        if self._materialized_folder is None:
+            object_store = get_object_store()
+            folder = SandboxFolder()
+
+            for path, object_hash in self._get_manifest().items():
+                abspath = os.path.join(folder.abspath, path)
+
+                if object_hash is None:
+                    _makedirs(abspath)
+                    continue
+
+                _makedirs(os.path.dirname(abspath))
+                with object_store.open_object(object_hash) as source, io.open(abspath, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+
+            self._materialized_folder = folder
+
+        return self._materialized_folder
+
+    def _erase_materialized_folder(self):
+        """Erase the copy of the content in the object store on disk, if it exists."""
+        if self._materialized_folder is not None:
+            self._materialized_folder.erase()
+            self._materialized_folder = None
+
+
+def _makedirs(path):
+    """Create a directory and its parents, if it does not yet exist."""
+    try:
+        os.makedirs(path)
+    except OSError as exception:
+        if exception.errno != errno.EEXIST:
+            raise
@@ -19,6 +19,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 
 from functools import partial
+import six
 import yaml
 
 from plumpy import Bundle
@@ -34,6 +35,9 @@ _ATTRIBUTE_DICT_TAG = '!aiida_attributedict'
 _PLUMPY_ATTRIBUTES_FROZENDICT_TAG = '!plumpy:attributes_frozendict'
 _PLUMPY_BUNDLE = '!plumpy:bundle'
 
+_JSON_TYPE_KEY = '__aiida_type__'
+_JSON_VALUE_KEY = 'value'
+
 
 def represent_node(dumper, node):
     """Represent a node in yaml.
@@ -222,3 +226,132 @@ def deserialize(serialized):
     :return: the deserialized data structure
     """
     return yaml.load(serialized, Loader=AiiDALoader)
+
+
+def _encode_json_compatible(data):
+    """Recursively convert a data structure into one that only contains JSON compatible types.
+
+    Types that cannot be represented natively in JSON, such as tuples, AiiDA entities and the mappings of AiiDA and
+    plumpy, are converted into a dictionary that records the type and the encoded value.
+
+    :param data: the data structure to convert
+    :return: the JSON compatible data structure
+    :raises TypeError: if the data structure contains a type that is not supported
+    """
+    # pylint: disable=too-many-return-statements
+    if data is None or isinstance(data, (bool, float) + six.integer_types + six.string_types):
+        return data
+
+    if isinstance(data, orm.Node):
+        if not data.is_stored:
+            raise ValueError('node {}<{}> cannot be represented because it is not stored'.format(type(data), data.uuid))
+        return {_JSON_TYPE_KEY: 'node', _JSON_VALUE_KEY: data.uuid}
+
+    if isinstance(data, orm.Group):
+        if not data.is_stored:
+            raise ValueError('group {} cannot be represented because it is not stored'.format(data))
+        return {_JSON_TYPE_KEY: 'group', _JSON_VALUE_KEY: data.uuid}
+
+    if isinstance(data, orm.Computer):
+        if not data.is_stored:
+            raise ValueError('computer {} cannot be represented because it is not stored'.format(data))
+        return {_JSON_TYPE_KEY: 'computer', _JSON_VALUE_KEY: data.uuid}
+
+    if isinstance(data, list):
+        return [_encode_json_compatible(value) for value in data]
+
+    if isinstance(data, tuple):
+        return {_JSON_TYPE_KEY: 'tuple', _JSON_VALUE_KEY: [_encode_json_compatible(value) for value in data]}
+
+    for mapping_type, tag in _JSON_MAPPING_TYPES:
+        if type(data) is mapping_type:  # pylint: disable=unidiomatic-typecheck
+            encoded = {}
+            for key, value in data.items():
+                if not isinstance(key, six.string_types) or key == _JSON_TYPE_KEY:
+                    raise TypeError('mapping key {} cannot be represented in JSON'.format(key))
+                encoded[key] = _encode_json_compatible(value)
+
+            if tag is None:
+                return encoded
+
+            return {_JSON_TYPE_KEY: tag, _JSON_VALUE_KEY: encoded}
+
+    raise TypeError('object of type {} cannot be represented in JSON'.format(type(data)))
+
+
+def _decode_json_compatible(data):
+    """Recursively convert a JSON compatible data structure, as returned by `_encode_json_compatible`, back.
+
+    :param data: the JSON compatible data structure
+    :return: the decoded data structure
+    """
+    if isinstance(data, list):
+        return [_decode_json_compatible(value) for value in data]
+
+    if not isinstance(data, dict):
+        return data
+
+    tag = data.get(_JSON_TYPE_KEY, None)
+
+    if tag is None:
+        return {key: _decode_json_compatible(value) for key, value in data.items()}
+
+    value = data[_JSON_VALUE_KEY]
+
+    if tag == 'node':
+        return orm.load_node(uuid=value)
+
+    if tag == 'group':
+        return orm.load_group(uuid=value)
+
+    if tag == 'computer':
+        return orm.Computer.get(uuid=value)
+
+    if tag == 'tuple':
+        return tuple(_decode_json_compatible(element) for element in value)
+
+    decoded = {key: _decode_json_compatible(element) for key, element in value.items()}
+
+    if tag == 'bundle':
+        bundle = Bundle.__new__(Bundle)
+        bundle.update(decoded)
+        return bundle
+
+    for mapping_type, mapping_tag in _JSON_MAPPING_TYPES:
+        if tag == mapping_tag:
+            return mapping_type(decoded)
+
+    raise ValueError('unknown type tag {} in JSON serialized data'.format(tag))
+
+
+_JSON_MAPPING_TYPES = (
+    (dict, None),
+    (Bundle, 'bundle'),
+    (AttributeDict, 'attributedict'),
+    (AttributesFrozendict, 'attributes_frozendict'),
+)
+
+
+def serialize_json(data):
+    """Serialize the given data structure into a JSON string.
+
+    This is a more compact and much faster alternative to `serialize`, that supports the same AiiDA and plumpy types,
+    but only standard data containers whose mapping keys are strings. For any other type a `TypeError` is raised, in
+    which case the data structure should be serialized with `serialize` instead.
+
+    :param data: the general data to serialize
+    :return: JSON string representation of the serialized data structure
+    :raises TypeError: if the data structure contains a type that cannot be serialized to JSON
+    """
+    from aiida.common import json
+    return json.dumps(_encode_json_compatible(data), separators=(',', ':'))
+
+
+def deserialize_json(serialized):
+    """Deserialize a JSON string that represents a data structure serialized with `serialize_json`.
+
+    :param serialized: a JSON serialized string representation
+    :return: the deserialized data structure
+    """
+    from aiida.common import json
+    return _decode_json_compatible(json.loads(serialized))
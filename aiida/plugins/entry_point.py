@@ -15,14 +15,6 @@ import enum
 import six
 import traceback
 
-try:
-    from reentry.default_manager import PluginManager
-    # I don't use the default manager as it has scan_for_not_found=True
-    # by default, which re-runs scan if no entrypoints are found
-    ENTRYPOINT_MANAGER = PluginManager(scan_for_not_found=False)
-except ImportError:
-    import pkg_resources as ENTRYPOINT_MANAGER
-
 from aiida.common.exceptions import MissingEntryPointError, MultipleEntryPointError, LoadingEntryPointError
 
 __all__ = ('load_entry_point', 'load_entry_point_from_string')
@@ -31,6 +23,40 @@ __all__ = ('load_entry_point', 'load_entry_point_from_string')
 ENTRY_POINT_GROUP_PREFIX = 'aiida.'
 ENTRY_POINT_STRING_SEPARATOR = ':'
 
+# The entry point manager and the entry points of each group, which are only loaded once and when they are first needed
+_ENTRY_POINT_MANAGER = None
+_ENTRY_POINT_CACHE = {}
+
+
+def get_entry_point_manager():
+    """
+    Return the entry point manager, which is created the first time it is needed
+
+    The manager of `reentry` reads the entry points from its cache, which is written when the plugins are installed,
+    and is used if available. Otherwise `pkg_resources` is used, which scans all installed distributions when imported.
+    """
+    global _ENTRY_POINT_MANAGER  # pylint: disable=global-statement
+
+    if _ENTRY_POINT_MANAGER is None:
+        try:
+            from reentry.default_manager import PluginManager
+            # I don't use the default manager as it has scan_for_not_found=True
+            # by default, which re-runs scan if no entrypoints are found
+            _ENTRY_POINT_MANAGER = PluginManager(scan_for_not_found=False)
+        except ImportError:
+            import pkg_resources
+            _ENTRY_POINT_MANAGER = pkg_resources
+
+    return _ENTRY_POINT_MANAGER
+
+
+def clear_entry_point_cache():
+    """
+    Clear the cached entry points, such that they are read again from the entry point manager, for example after new
+    plugins have been registered in the current interpreter
+    """
+    _ENTRY_POINT_CACHE.clear()
+
 
 class EntryPointFormat(enum.Enum):
     """
@@ -217,7 +243,13 @@ def get_entry_points(group):
     :param group: the entry point group
     :return: a list of entry points
     """
-    return [ep for ep in ENTRYPOINT_MANAGER.iter_entry_points(group=group)]
+    try:
+        entry_points = _ENTRY_POINT_CACHE[group]
+    except KeyError:
+        entry_points = list(get_entry_point_manager().iter_entry_points(group=group))
+        _ENTRY_POINT_CACHE[group] = entry_points
+
+    return list(entry_points)
 
 
 def get_entry_point(group, name):
@@ -249,8 +281,8 @@ def get_entry_point_from_class(class_module, class_name):
     :param class_name: name of the class
     :return: a tuple of the corresponding group and entry point or None if not found
     """
-    for group in ENTRYPOINT_MANAGER.get_entry_map().keys():
-        for entry_point in ENTRYPOINT_MANAGER.iter_entry_points(group):
+    for group in get_entry_point_manager().get_entry_map().keys():
+        for entry_point in get_entry_points(group):
 
             if entry_point.module_name != class_module:
                 continue
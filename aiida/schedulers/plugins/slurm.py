@@ -222,6 +222,46 @@ class SlurmScheduler(aiida.schedulers.Scheduler):
         self.logger.debug("squeue command: {}".format(comm))
         return comm
 
+    def get_detailed_jobinfos(self, jobids):
+        """
+        Return the detailed job info for a list of jobs with a single `sacct` call.
+
+        The output of the command is split per job, where each job gets the header line and the lines of all its job
+        steps, such that the result for each job is identical to that of `get_detailed_jobinfo`.
+
+        :param jobids: list of job ids
+        :return: dictionary mapping each job id on the string with the output of the detailed_jobinfo command
+        """
+        if not jobids:
+            return {}
+
+        command = self._get_detailed_jobinfo_command(jobid=','.join([str(jobid) for jobid in jobids]))
+        with self.transport:
+            retval, stdout, stderr = self.transport.exec_command_wait(command)
+
+        lines = stdout.splitlines()
+
+        if retval != 0 or not lines or 'JobID' not in lines[0].split('|'):
+            return {jobid: self._format_detailed_jobinfo(command, retval, stdout, stderr) for jobid in jobids}
+
+        header = lines[0]
+        index_jobid = header.split('|').index('JobID')
+        job_lines = {str(jobid): [header] for jobid in jobids}
+
+        for line in lines[1:]:
+            fields = line.split('|')
+            if len(fields) <= index_jobid:
+                continue
+            # Job steps are reported with the job id followed by a dot and the step name, e.g. `1234.batch`
+            jobid = fields[index_jobid].split('.')[0]
+            if jobid in job_lines:
+                job_lines[jobid].append(line)
+
+        return {
+            jobid: self._format_detailed_jobinfo(command, retval, '\n'.join(job_lines[str(jobid)]) + '\n', stderr)
+            for jobid in jobids
+        }
+
     def _get_detailed_jobinfo_command(self, jobid):
         """
         Return the command to run to get the detailed information on a job,
@@ -230,6 +270,8 @@ class SlurmScheduler(aiida.schedulers.Scheduler):
         The output text is just retrieved, and returned for logging purposes.
         --parsable split the fields with a pipe (|), adding a pipe also at
         the end.
+
+        :param jobid: the job id, or a comma separated list of job ids
         """
         return "sacct --format=AllocCPUS,Account,AssocID,AveCPU,AvePages," \
                "AveRSS,AveVMSize,Cluster,Comment,CPUTime,CPUTimeRAW,DerivedExitCode," \
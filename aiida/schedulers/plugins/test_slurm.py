@@ -97,6 +97,66 @@ class TestParserSqueue(unittest.TestCase):
         #                self.assertTrue( j.num_mpiprocs==num_mpiprocs )
 
 
+class TestDetailedJobinfos(unittest.TestCase):
+    """
+    Tests for the batched retrieval of the detailed job info through `get_detailed_jobinfos`
+    """
+
+    class MockTransport(object):  # pylint: disable=useless-object-inheritance
+        """Mock transport that returns a fixed `sacct` output and records the executed commands."""
+
+        stdout = """JobID|JobName|State|
+1234|aiida-1|COMPLETED|
+1234.batch|batch|COMPLETED|
+1235|aiida-2|FAILED|
+1235.batch|batch|FAILED|
+"""
+
+        def __init__(self):
+            self.commands = []
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            pass
+
+        def exec_command_wait(self, command):
+            self.commands.append(command)
+            return 0, self.stdout, ''
+
+    def test_get_detailed_jobinfos(self):
+        """
+        Test that the detailed job info of multiple jobs is retrieved with a single command and split per job
+        """
+        transport = self.MockTransport()
+        scheduler = SlurmScheduler()
+        scheduler.set_transport(transport)
+
+        detailed_jobinfos = scheduler.get_detailed_jobinfos(['1234', '1235', '1236'])
+
+        self.assertEqual(len(transport.commands), 1)
+        self.assertIn('--jobs=1234,1235,1236', transport.commands[0])
+        self.assertEqual(set(detailed_jobinfos.keys()), set(['1234', '1235', '1236']))
+
+        self.assertIn('1234.batch|batch|COMPLETED|', detailed_jobinfos['1234'])
+        self.assertNotIn('1235', detailed_jobinfos['1234'].split('stdout:')[1])
+        self.assertIn('1235.batch|batch|FAILED|', detailed_jobinfos['1235'])
+        self.assertIn('JobID|JobName|State|', detailed_jobinfos['1236'])
+        self.assertNotIn('COMPLETED', detailed_jobinfos['1236'])
+
+    def test_get_detailed_jobinfos_empty(self):
+        """
+        Test that no command is executed if no job ids are passed
+        """
+        transport = self.MockTransport()
+        scheduler = SlurmScheduler()
+        scheduler.set_transport(transport)
+
+        self.assertEqual(scheduler.get_detailed_jobinfos([]), {})
+        self.assertEqual(transport.commands, [])
+
+
 class TestTimes(unittest.TestCase):
 
     def test_time_conversion(self):
@@ -306,6 +306,26 @@ class Scheduler(object):
         with self.transport:
             retval, stdout, stderr = self.transport.exec_command_wait(command)
 
+        return self._format_detailed_jobinfo(command, retval, stdout, stderr)
+
+    def get_detailed_jobinfos(self, jobids):
+        """
+        Return the detailed job info for a list of jobs.
+
+        By default this calls `get_detailed_jobinfo` for each job separately. Plugins whose scheduler can return the
+        information for multiple jobs in a single command should override this method to do so.
+
+        :param jobids: list of job ids
+        :return: dictionary mapping each job id on the string with the output of the detailed_jobinfo command
+        :raises: :class:`aiida.common.exceptions.FeatureNotAvailable`
+        """
+        return {jobid: self.get_detailed_jobinfo(jobid) for jobid in jobids}
+
+    @staticmethod
+    def _format_detailed_jobinfo(command, retval, stdout, stderr):
+        """
+        Return the string with the output of a detailed_jobinfo command as returned by `get_detailed_jobinfo`.
+        """
         return u"""Detailed jobinfo obtained with command '{}'
 Return Code: {}
 -------------------------------------------------------------
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Breadth first traversal of the provenance graph, following links according to a set of rules.
+
+The traversal only deals with sets of node pks and queries the link table directly, such that the neighbours of all the
+nodes of a frontier are found with a few queries, regardless of the number of nodes or links, and no node is loaded.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import collections
+import time
+
+import six
+
+from aiida.common.links import LinkType
+from aiida.common.utils import iter_sorted_batches
+
+__all__ = ('traverse', 'LinkRule', 'TraversalResult', 'IterationStats', 'TraversedLink', 'FORWARD', 'BACKWARD')
+
+# Follow links from their input to their output node, or from their output to their input node, respectively
+FORWARD = 'forward'
+BACKWARD = 'backward'
+
+# The default maximum number of pks in the `IN` clause of a single query
+DEFAULT_BATCH_SIZE = 1000
+
+LinkRule = collections.namedtuple('LinkRule', ['link_types', 'direction'])
+LinkRule.__doc__ = """Rule to follow the links of the given link types in the given direction, FORWARD or BACKWARD."""
+
+TraversedLink = collections.namedtuple('TraversedLink', ['input_id', 'output_id', 'link_type', 'link_label'])
+
+IterationStats = collections.namedtuple(
+    'IterationStats', ['iteration', 'frontier', 'discovered', 'visited', 'links', 'queries', 'seconds'])
+IterationStats.__doc__ = """Statistics of a single iteration of a traversal.
+
+The `frontier` is the number of nodes whose links were followed, `discovered` the number of nodes that were visited for
+the first time, `visited` the total number of nodes visited so far, `links` the number of new links that were found,
+`queries` the number of queries that were needed and `seconds` the time it took."""
+
+TraversalResult = collections.namedtuple('TraversalResult', ['pks', 'frontier', 'links', 'stats'])
+TraversalResult.__doc__ = """Result of a traversal.
+
+The `pks` are all the visited nodes, including the starting nodes, and the `frontier` the subset of nodes whose links
+have not been followed, because the maximum number of iterations was reached. The `links` are a list of the traversed
+links, ordered by the iteration in which they were found, or None if they were not requested, and `stats` a list with
+the statistics of each iteration."""
+
+
+def traverse(pks, rules, max_iterations=None, batch_size=DEFAULT_BATCH_SIZE, return_links=False, stats_callback=None):
+    """Find all the nodes that can be reached from the given nodes by following links according to the given rules.
+
+    The graph is traversed breadth first: in each iteration the links of all the nodes that were discovered in the
+    previous iteration are followed at once, with one query per direction for each batch of at most `batch_size` nodes.
+
+    :param pks: iterable of the pks of the nodes to start from
+    :param rules: iterable of :py:class:`LinkRule`, where the link types can be given as `LinkType` or its values
+    :param max_iterations: optional maximum number of iterations, i.e. the maximum distance of a visited node from the
+        starting nodes
+    :param batch_size: the maximum number of pks in the `IN` clause of a single query
+    :param return_links: if True, also return the traversed links, including those to nodes that had been visited
+    :param stats_callback: optional callable that is called with the :py:class:`IterationStats` of each iteration
+    :return: :py:class:`TraversalResult`
+    :raises ValueError: if a rule or `max_iterations` is invalid
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    from aiida.manage.manager import get_manager
+
+    if max_iterations is not None and (not isinstance(max_iterations, six.integer_types) or max_iterations < 0):
+        raise ValueError('max_iterations should be a non-negative integer, got {}'.format(max_iterations))
+
+    link_types = _get_link_types_per_direction(rules)
+
+    builder = get_manager().get_backend().query()
+    session = builder.get_session()
+    link_table = builder.Link
+
+    visited = set(pks)
+    frontier = set(visited)
+    traversed = set() if return_links else None
+    links = [] if return_links else None
+    stats = []
+    iteration = 0
+
+    while frontier and (max_iterations is None or iteration < max_iterations):
+        iteration += 1
+        start = time.time()
+        discovered = set()
+        queries = 0
+        number_of_links = len(links) if return_links else 0
+
+        for direction, types in link_types.items():
+            if direction == FORWARD:
+                source, target = link_table.input_id, link_table.output_id
+            else:
+                source, target = link_table.output_id, link_table.input_id
+
+            if return_links:
+                columns = (target, link_table.input_id, link_table.output_id, link_table.type, link_table.label)
+            else:
+                columns = (target,)
+
+            for batch in iter_sorted_batches(frontier, batch_size):
+                query = session.query(*columns).filter(source.in_(batch), link_table.type.in_(types))
+                queries += 1
+
+                if not return_links:
+                    discovered.update(pk for pk, in query.distinct())
+                    continue
+
+                for row in query:
+                    discovered.add(row[0])
+                    link = TraversedLink(*row[1:])
+                    if link not in traversed:
+                        traversed.add(link)
+                        links.append(link)
+
+        expanded = len(frontier)
+        frontier = discovered - visited
+        visited.update(frontier)
+
+        iteration_stats = IterationStats(
+            iteration=iteration,
+            frontier=expanded,
+            discovered=len(frontier),
+            visited=len(visited),
+            links=(len(links) - number_of_links) if return_links else None,
+            queries=queries,
+            seconds=time.time() - start)
+        stats.append(iteration_stats)
+
+        if stats_callback is not None:
+            stats_callback(iteration_stats)
+
+    return TraversalResult(pks=visited, frontier=frontier, links=links, stats=stats)
+
+
+def _get_link_types_per_direction(rules):
+    """Validate the rules and return the sorted values of the link types to follow for each direction.
+
+    :param rules: iterable of :py:class:`LinkRule`
+    :return: dictionary of direction to a list of link type values
+    :raises ValueError: if a rule is invalid
+    """
+    link_types = {}
+
+    for rule in rules:
+        link_types_rule, direction = rule
+
+        if direction not in (FORWARD, BACKWARD):
+            raise ValueError('invalid direction {}, should be `{}` or `{}`'.format(direction, FORWARD, BACKWARD))
+
+        if isinstance(link_types_rule, (LinkType, six.string_types)):
+            link_types_rule = [link_types_rule]
+
+        for link_type in link_types_rule:
+            link_types.setdefault(direction, set()).add(LinkType(link_type).value)
+
+    return {direction: sorted(types) for direction, types in link_types.items()}
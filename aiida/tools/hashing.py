@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tools to recompute the hashes of many nodes in the database, optionally using multiple processes."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import multiprocessing
+
+__all__ = ('rehash_nodes',)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def rehash_nodes(node_classes=None, pks=None, processes=1, chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None):
+    """Recompute and store the hash of many nodes.
+
+    The pks of the nodes to rehash are streamed from the database in chunks, such that not all nodes have to be loaded
+    in memory. The nodes of each chunk are loaded with a single query, hashed and their hashes are written back with a
+    single bulk update. If more than one process is requested, the chunks are hashed by a pool of worker processes,
+    while this process writes back the hashes.
+
+    .. note:: worker processes are forked and reconnect to the database, so this should not be called while inside
+        an open transaction.
+
+    :param node_classes: tuple of node classes whose instances and the instances of their sub classes to rehash,
+        by default `Data` and `ProcessNode`
+    :param pks: optional list of node pks to restrict the rehashing to
+    :param processes: the number of worker processes to hash the nodes with, if 1 the nodes are hashed in this process
+    :param chunk_size: the number of nodes that are loaded, hashed and updated at a time
+    :param progress_callback: optional callable that is called with the number of nodes rehashed after each chunk
+    :return: the total number of nodes rehashed
+    """
+    from aiida.manage.configuration import get_profile
+
+    if node_classes is None:
+        from aiida.orm import Data, ProcessNode
+        node_classes = (Data, ProcessNode)
+
+    chunks = _iter_pk_chunks(node_classes, pks, chunk_size)
+
+    if processes > 1:
+        _close_database_connections()
+        pool = multiprocessing.Pool(processes, initializer=_initialize_worker, initargs=(get_profile().name,))
+        try:
+            return _store_hashes(pool.imap_unordered(_hash_nodes, chunks), progress_callback)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    return _store_hashes((_hash_nodes(chunk) for chunk in chunks), progress_callback)
+
+
+def _store_hashes(results, progress_callback=None):
+    """Store the hashes of each chunk of results with a single bulk update.
+
+    :param results: iterable of lists of tuples of a node pk and its hash
+    :param progress_callback: optional callable that is called with the number of nodes rehashed after each chunk
+    :return: the total number of nodes rehashed
+    """
+    from aiida.common.hashing import _HASH_EXTRA_KEY
+    from aiida.manage.manager import get_manager
+
+    backend = get_manager().get_backend()
+    total = 0
+
+    for result in results:
+        backend.nodes.bulk_set_extra(_HASH_EXTRA_KEY, dict(result))
+        total += len(result)
+
+        if progress_callback is not None:
+            progress_callback(len(result))
+
+    return total
+
+
+def _iter_pk_chunks(node_classes, pks, chunk_size):
+    """Yield the pks of the nodes to rehash in lists of at most `chunk_size` pks.
+
+    Without explicit pks, the pks are queried with keyset pagination, such that each chunk requires only a cheap query
+    that does not depend on a cursor being kept open.
+
+    :param node_classes: tuple of node classes whose instances to include
+    :param pks: optional list of pks to restrict to
+    :param chunk_size: the maximum number of pks per chunk
+    """
+    from aiida.orm import QueryBuilder
+
+    if pks is not None:
+        pks = sorted(set(pks))
+        for start in range(0, len(pks), chunk_size):
+            yield pks[start:start + chunk_size]
+        return
+
+    last_pk = -1
+
+    while True:
+        builder = QueryBuilder()
+        builder.append(node_classes, filters={'id': {'>': last_pk}}, project='id', tag='node')
+        builder.order_by({'node': {'id': 'asc'}})
+        builder.limit(chunk_size)
+        chunk = [pk for pk, in builder.all()]
+
+        if not chunk:
+            return
+
+        yield chunk
+        last_pk = chunk[-1]
+
+
+def _hash_nodes(pks):
+    """Load the nodes with the given pks with a single query and compute their hashes.
+
+    :param pks: list of node pks
+    :return: list of tuples of a node pk and its hash
+    """
+    from aiida.orm import Node, QueryBuilder
+
+    builder = QueryBuilder()
+    builder.append(Node, filters={'id': {'in': pks}}, project='*')
+
+    return [(node.pk, node.get_hash()) for node, in builder.all()]
+
+
+def _close_database_connections():
+    """Close the open database connections of this process, such that they are not shared by forked processes.
+
+    Connections are reopened automatically once they are needed again.
+    """
+    from aiida.backends import BACKEND_DJANGO, BACKEND_SQLA
+    from aiida.manage.configuration import get_profile
+
+    backend = get_profile().database_backend
+
+    if backend == BACKEND_DJANGO:
+        from django.db import connections
+        connections.close_all()
+    elif backend == BACKEND_SQLA:
+        # Only the idle pooled connections are closed, the connection of the current session is not shared, because
+        # the forked processes recreate their session upon forking
+        from aiida.backends import sqlalchemy as sa
+        sa.ENGINE.dispose()
+
+
+def _initialize_worker(profile_name):
+    """Make sure that the profile is loaded in a worker process, which is necessary if it was not forked.
+
+    :param profile_name: the name of the profile to load
+    """
+    from aiida.manage.configuration import get_profile, load_profile
+    from aiida.manage.manager import get_manager
+
+    if get_profile() is None:
+        load_profile(profile_name)
+
+    get_manager().get_backend()
@@ -13,17 +13,23 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import functools
+import io
 import os
 import tarfile
 import time
+from multiprocessing.pool import ThreadPool
+
+import six
 
 from aiida import get_version
 from aiida.common import json
-from aiida.common.folders import RepositoryFolder, SandboxFolder
+from aiida.common.folders import SandboxFolder
 from aiida.common.links import LinkType
-from aiida.common.utils import export_shard_uuid
+from aiida.common.utils import export_shard_uuid, iter_sorted_batches
 from aiida.orm import QueryBuilder, Node, Data, Group, Log, Comment, Computer, ProcessNode
 from aiida.orm.utils.repository import Repository
+from aiida.tools.graph import traverse, LinkRule, FORWARD, BACKWARD
 
 from aiida.tools.importexport.dbexport.utils import check_licences, fill_in_query, serialize_dict
 from aiida.tools.importexport.config import (NODE_ENTITY_NAME, GROUP_ENTITY_NAME, COMPUTER_ENTITY_NAME, LOG_ENTITY_NAME,
@@ -32,9 +38,13 @@ from aiida.tools.importexport.config import (get_all_fields_info, file_fields_to
                                              model_fields_to_file_fields)
 
 from .zip import *  # pylint: disable=wildcard-import
+from .zip import ZipFolder
 
 __all__ = ('export_tree', 'export') + zip.__all__  # pylint: disable=no-member
 
+# The default number of nodes that are visited, queried or written at a time
+DEFAULT_BATCH_SIZE = 1000
+
 
 def export_tree(what,
                 folder,
@@ -46,7 +56,10 @@ def export_tree(what,
                 return_reversed=False,
                 call_reversed=False,
                 include_comments=True,
-                include_logs=True):
+                include_logs=True,
+                streaming=False,
+                batch_size=DEFAULT_BATCH_SIZE,
+                threads=1):
     """
     Export the entries passed in the 'what' list to a file tree.
     :todo: limit the export to finished or failed calculations.
@@ -73,6 +86,11 @@ def export_tree(what,
     Default: True, *include* comments in export (as well as relevant users).
     :param include_logs: Bool: In-/exclude export of logs for given node(s).
     Default: True, *include* logs in export.
+    :param streaming: Bool: write the database entries incrementally while they are queried in batches, instead of
+    first collecting all of them in memory. The resulting archive is identical and can be imported as usual.
+    :param batch_size: the number of nodes that are visited, queried or written at a time.
+    :param threads: the number of threads used to copy the repository folders of the nodes, which is only used if
+    the folder is not a zip folder.
     :param silent: suppress debug prints
     :raises LicensingException: if any node is licensed under forbidden
     license
@@ -82,9 +100,6 @@ def export_tree(what,
 
     all_fields_info, unique_identifiers = get_all_fields_info()
 
-    # The set that contains the nodes ids of the nodes that should be exported
-    to_be_exported = set()
-
     given_data_entry_ids = set()
     given_calculation_entry_ids = set()
     given_group_entry_ids = set()
@@ -122,187 +137,54 @@ def export_tree(what,
             elif issubclass(entry.__class__, ProcessNode):
                 given_calculation_entry_ids.add(entry.pk)
 
-    # We will iteratively explore the AiiDA graph to find further nodes that
-    # should also be exported.
-
-    # We repeat until there are no further nodes to be visited
-    while given_calculation_entry_ids or given_data_entry_ids:
-
-        # If is is a calculation node
-        if given_calculation_entry_ids:
-            curr_node_id = given_calculation_entry_ids.pop()
-            # If it is already visited continue to the next node
-            if curr_node_id in to_be_exported:
-                continue
-            # Otherwise say that it is a node to be exported
-            else:
-                to_be_exported.add(curr_node_id)
-
-            # INPUT(Data, ProcessNode) - Reversed
-            builder = QueryBuilder()
-            builder.append(Data, tag='predecessor', project=['id'])
-            builder.append(
-                ProcessNode,
-                with_incoming='predecessor',
-                filters={'id': {
-                    '==': curr_node_id
-                }},
-                edge_filters={'type': {
-                    'in': [LinkType.INPUT_CALC.value, LinkType.INPUT_WORK.value]
-                }})
-            res = {_[0] for _ in builder.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-
-            # INPUT(Data, ProcessNode) - Forward
-            if input_forward:
-                builder = QueryBuilder()
-                builder.append(Data, tag='predecessor', project=['id'], filters={'id': {'==': curr_node_id}})
-                builder.append(
-                    ProcessNode,
-                    with_incoming='predecessor',
-                    edge_filters={'type': {
-                        'in': [LinkType.INPUT_CALC.value, LinkType.INPUT_WORK.value]
-                    }})
-                res = {_[0] for _ in builder.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-            # CREATE/RETURN(ProcessNode, Data) - Forward
-            builder = QueryBuilder()
-            builder.append(ProcessNode, tag='predecessor', filters={'id': {'==': curr_node_id}})
-            builder.append(
-                Data,
-                with_incoming='predecessor',
-                project=['id'],
-                edge_filters={'type': {
-                    'in': [LinkType.CREATE.value, LinkType.RETURN.value]
-                }})
-            res = {_[0] for _ in builder.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-
-            # CREATE(ProcessNode, Data) - Reversed
-            if create_reversed:
-                builder = QueryBuilder()
-                builder.append(ProcessNode, tag='predecessor')
-                builder.append(
-                    Data,
-                    with_incoming='predecessor',
-                    project=['id'],
-                    filters={'id': {
-                        '==': curr_node_id
-                    }},
-                    edge_filters={'type': {
-                        'in': [LinkType.CREATE.value]
-                    }})
-                res = {_[0] for _ in builder.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-            # RETURN(ProcessNode, Data) - Reversed
-            if return_reversed:
-                builder = QueryBuilder()
-                builder.append(ProcessNode, tag='predecessor')
-                builder.append(
-                    Data,
-                    with_incoming='predecessor',
-                    project=['id'],
-                    filters={'id': {
-                        '==': curr_node_id
-                    }},
-                    edge_filters={'type': {
-                        'in': [LinkType.RETURN.value]
-                    }})
-                res = {_[0] for _ in builder.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-            # CALL(ProcessNode, ProcessNode) - Forward
-            builder = QueryBuilder()
-            builder.append(ProcessNode, tag='predecessor', filters={'id': {'==': curr_node_id}})
-            builder.append(
-                ProcessNode,
-                with_incoming='predecessor',
-                project=['id'],
-                edge_filters={'type': {
-                    'in': [LinkType.CALL_CALC.value, LinkType.CALL_WORK.value]
-                }})
-            res = {_[0] for _ in builder.all()}
-            given_calculation_entry_ids.update(res - to_be_exported)
-
-            # CALL(ProcessNode, ProcessNode) - Reversed
-            if call_reversed:
-                builder = QueryBuilder()
-                builder.append(ProcessNode, tag='predecessor')
-                builder.append(
-                    ProcessNode,
-                    with_incoming='predecessor',
-                    project=['id'],
-                    filters={'id': {
-                        '==': curr_node_id
-                    }},
-                    edge_filters={'type': {
-                        'in': [LinkType.CALL_CALC.value, LinkType.CALL_WORK.value]
-                    }})
-                res = {_[0] for _ in builder.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
+    # We will iteratively explore the AiiDA graph to find further nodes that should also be exported, following the
+    # links of all nodes visited in the last iteration at once, in batches of at most `batch_size` nodes per query.
+    # INPUT(Data, ProcessNode) - Reversed
+    # CREATE/RETURN(ProcessNode, Data) - Forward
+    # CALL(ProcessNode, ProcessNode) - Forward
+    rules = [
+        LinkRule([LinkType.INPUT_CALC, LinkType.INPUT_WORK], BACKWARD),
+        LinkRule([LinkType.CREATE, LinkType.RETURN], FORWARD),
+        LinkRule([LinkType.CALL_CALC, LinkType.CALL_WORK], FORWARD),
+    ]
+
+    # INPUT(Data, ProcessNode) - Forward
+    if input_forward:
+        rules.append(LinkRule([LinkType.INPUT_CALC, LinkType.INPUT_WORK], FORWARD))
+
+    # CREATE(ProcessNode, Data) - Reversed
+    if create_reversed:
+        rules.append(LinkRule([LinkType.CREATE], BACKWARD))
+
+    # RETURN(ProcessNode, Data) - Reversed
+    if return_reversed:
+        rules.append(LinkRule([LinkType.RETURN], BACKWARD))
+
+    # CALL(ProcessNode, ProcessNode) - Reversed
+    if call_reversed:
+        rules.append(LinkRule([LinkType.CALL_CALC, LinkType.CALL_WORK], BACKWARD))
 
-        # If it is a Data node
-        else:
-            curr_node_id = given_data_entry_ids.pop()
-            # If it is already visited continue to the next node
-            if curr_node_id in to_be_exported:
-                continue
-            # Otherwise say that it is a node to be exported
-            else:
-                to_be_exported.add(curr_node_id)
-
-            # Case 2:
-            # CREATE(ProcessNode, Data) - Reversed
-            if create_reversed:
-                builder = QueryBuilder()
-                builder.append(ProcessNode, tag='predecessor', project=['id'])
-                builder.append(
-                    Data,
-                    with_incoming='predecessor',
-                    filters={'id': {
-                        '==': curr_node_id
-                    }},
-                    edge_filters={'type': {
-                        'in': [LinkType.CREATE.value]
-                    }})
-                res = {_[0] for _ in builder.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
-
-            # Case 3:
-            # RETURN(ProcessNode, Data) - Reversed
-            if return_reversed:
-                builder = QueryBuilder()
-                builder.append(ProcessNode, tag='predecessor', project=['id'])
-                builder.append(
-                    Data,
-                    with_incoming='predecessor',
-                    filters={'id': {
-                        '==': curr_node_id
-                    }},
-                    edge_filters={'type': {
-                        'in': [LinkType.RETURN.value]
-                    }})
-                res = {_[0] for _ in builder.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
+    # The set that contains the nodes ids of the nodes that should be exported
+    to_be_exported = traverse(given_calculation_entry_ids | given_data_entry_ids, rules, batch_size=batch_size).pks
 
     ## Universal "entities" attributed to all types of nodes
     # Logs
     if include_logs and to_be_exported:
         # Get related log(s) - universal for all nodes
-        builder = QueryBuilder()
-        builder.append(Log, filters={'dbnode_id': {'in': to_be_exported}}, project=['id'])
-        res = {_[0] for _ in builder.all()}
-        given_log_entry_ids.update(res)
+        for node_ids in iter_sorted_batches(to_be_exported, batch_size):
+            builder = QueryBuilder()
+            builder.append(Log, filters={'dbnode_id': {'in': node_ids}}, project=['id'])
+            res = {_[0] for _ in builder.all()}
+            given_log_entry_ids.update(res)
 
     # Comments
     if include_comments and to_be_exported:
         # Get related log(s) - universal for all nodes
-        builder = QueryBuilder()
-        builder.append(Comment, filters={'dbnode_id': {'in': to_be_exported}}, project=['id'])
-        res = {_[0] for _ in builder.all()}
-        given_comment_entry_ids.update(res)
+        for node_ids in iter_sorted_batches(to_be_exported, batch_size):
+            builder = QueryBuilder()
+            builder.append(Comment, filters={'dbnode_id': {'in': node_ids}}, project=['id'])
+            res = {_[0] for _ in builder.all()}
+            given_comment_entry_ids.update(res)
 
     # Here we get all the columns that we plan to project per entity that we
     # would like to extract
@@ -319,6 +201,7 @@ def export_tree(what,
         given_entities.append(COMMENT_ENTITY_NAME)
 
     entries_to_add = dict()
+    entity_ids = dict()
     for given_entity in given_entities:
         project_cols = ["id"]
         # The following gets a list of fields that we need,
@@ -344,6 +227,8 @@ def export_tree(what,
         elif given_entity == COMMENT_ENTITY_NAME:
             entry_ids_to_add = given_comment_entry_ids
 
+        entity_ids[given_entity] = entry_ids_to_add
+
         builder = QueryBuilder()
         builder.append(
             entity_names_to_entities[given_entity],
@@ -358,12 +243,19 @@ def export_tree(what,
     # TODO (Spyros) To see better! Especially for functional licenses
     # Check the licenses of exported data.
     if allowed_licenses is not None or forbidden_licenses is not None:
-        builder = QueryBuilder()
-        builder.append(Node, project=["id", "attributes.source.license"], filters={"id": {"in": to_be_exported}})
-        # Skip those nodes where the license is not set (this is the standard behavior with Django)
-        node_licenses = list((a, b) for [a, b] in builder.all() if b is not None)
+        node_licenses = list()
+        for node_ids in iter_sorted_batches(to_be_exported, batch_size):
+            builder = QueryBuilder()
+            builder.append(Node, project=["id", "attributes.source.license"], filters={"id": {"in": node_ids}})
+            # Skip those nodes where the license is not set (this is the standard behavior with Django)
+            node_licenses.extend((a, b) for [a, b] in builder.all() if b is not None)
         check_licences(node_licenses, allowed_licenses, forbidden_licenses)
 
+    if streaming:
+        _export_tree_streaming(folder, entity_ids, all_fields_info, unique_identifiers, input_forward, return_reversed,
+                               call_reversed, batch_size, threads, silent)
+        return
+
     ############################################################
     ##### Start automatic recursive export data generation #####
     ############################################################
@@ -702,20 +594,7 @@ def export_tree(what,
 
     # If there are no nodes, there are no files to store
     if all_nodes_pk:
-        # Large speed increase by not getting the node itself and looping in memory
-        # in python, but just getting the uuid
-        uuid_query = QueryBuilder()
-        uuid_query.append(Node, filters={"id": {"in": all_nodes_pk}}, project=["uuid"])
-        for res in uuid_query.all():
-            uuid = str(res[0])
-            sharded_uuid = export_shard_uuid(uuid)
-
-            # Important to set create=False, otherwise creates
-            # twice a subfolder. Maybe this is a bug of insert_path??
-            thisnodefolder = nodesubfolder.get_subfolder(sharded_uuid, create=False, reset_limit=True)
-            # In this way, I copy the content of the folder, and not the folder itself
-            src = RepositoryFolder(section=Repository._section_name, uuid=uuid).abspath
-            thisnodefolder.insert_path(src=src, dest_name='.')
+        _copy_node_repositories(nodesubfolder, all_nodes_pk, batch_size, threads)
 
 
 def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=False, **kwargs):
@@ -772,3 +651,377 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=Fal
 
     if not silent:
         print("DONE.")
+
+
+def _dumps(value):
+    """Serialize a value to JSON, always returning text such that it can be written to a file opened in text mode."""
+    return six.text_type(json.dumps(value))
+
+
+def _copy_node_repository(nodesubfolder, uuid):
+    """Copy the repository folder of the node with the given uuid to its sharded subfolder in the export folder.
+
+    :param nodesubfolder: the `nodes` subfolder of the export folder
+    :param uuid: the uuid of the node
+    """
+    sharded_uuid = export_shard_uuid(uuid)
+
+    # Important to set create=False, otherwise creates twice a subfolder. Maybe this is a bug of insert_path?
+    thisnodefolder = nodesubfolder.get_subfolder(sharded_uuid, create=False, reset_limit=True)
+
+    # The repository is kept referenced while copying, since content in the object store is copied to a sandbox folder
+    # that is removed together with the repository
+    repository = Repository(uuid, is_stored=True)
+
+    # In this way, I copy the content of the folder, and not the folder itself
+    src = repository._get_base_folder().abspath  # pylint: disable=protected-access
+    thisnodefolder.insert_path(src=src, dest_name='.')
+
+
+def _copy_node_repositories(nodesubfolder, node_ids, batch_size=DEFAULT_BATCH_SIZE, threads=1):
+    """Copy the repository folders of the nodes with the given ids to the export folder.
+
+    The uuids of the nodes are queried in batches. If more than one thread is requested, the folders of each batch are
+    copied concurrently, which mostly helps when the repository is on a network file system. A zip folder cannot be
+    written to concurrently, so its folders are always copied one at a time.
+
+    :param nodesubfolder: the `nodes` subfolder of the export folder
+    :param node_ids: iterable of node ids
+    :param batch_size: the number of uuids to query at a time
+    :param threads: the number of threads with which to copy the folders
+    """
+    pool = None
+    if threads > 1 and not isinstance(nodesubfolder, ZipFolder):
+        pool = ThreadPool(threads)
+
+    try:
+        for chunk in iter_sorted_batches(node_ids, batch_size):
+            builder = QueryBuilder()
+            builder.append(Node, filters={'id': {'in': chunk}}, project=['uuid'])
+            uuids = [six.text_type(uuid) for uuid, in builder.iterall(batch_size=batch_size)]
+
+            if pool is None:
+                for uuid in uuids:
+                    _copy_node_repository(nodesubfolder, uuid)
+            else:
+                pool.map(functools.partial(_copy_node_repository, nodesubfolder), uuids)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def _get_entity_query(entity_name, entry_ids, all_fields_info, entity_separator):
+    """Return a query that projects the fields to export of the entries of the given entity and the ids.
+
+    :param entity_name: the name of the entity
+    :param entry_ids: list of ids of the entries
+    :param all_fields_info: the fields info of all entities, as returned by `get_all_fields_info`
+    :param entity_separator: the separator used to build the tags of the entities that are joined
+    :return: the query
+    """
+    project_cols = ['id']
+    for prop in all_fields_info[entity_name].keys():
+        project_cols.append(file_fields_to_model_fields[entity_name].get(prop, prop))
+
+    builder = QueryBuilder()
+    builder.append(
+        entity_names_to_entities[entity_name],
+        filters={'id': {
+            'in': entry_ids
+        }},
+        project=project_cols,
+        tag=entity_name,
+        outerjoin=True)
+
+    for value in all_fields_info[entity_name].values():
+        if 'requires' in value:
+            fill_in_query(builder, entity_name, value['requires'], [entity_name], entity_separator)
+
+    return builder
+
+
+def _write_export_data_entries(sandbox, entity_ids, all_fields_info, batch_size):
+    """Write the serialized entries of all entities to a file per entity in the sandbox, one entry per line.
+
+    Each line is a `"id": {...}` member of the JSON object of the entity in the `export_data` of `data.json`. Entries of
+    other entities that are joined in, such as users and computers, are written to the file of their own entity.
+
+    :param sandbox: the sandbox folder in which to write the files, named after the entities
+    :param entity_ids: dictionary of entity names to the ids of the entries to export
+    :param all_fields_info: the fields info of all entities, as returned by `get_all_fields_info`
+    :param batch_size: the number of entries to query at a time
+    :return: dictionary of entity names to the set of ids of the entries that were written
+    """
+    entity_separator = '_'
+    written_ids = {}
+    handles = {}
+
+    try:
+        for entity_name, entry_ids in entity_ids.items():
+            for chunk in iter_sorted_batches(entry_ids, batch_size):
+                builder = _get_entity_query(entity_name, chunk, all_fields_info, entity_separator)
+                for temp_d in builder.iterdict(batch_size=batch_size):
+                    for key, values in temp_d.items():
+                        current_entity = key.split(entity_separator)[-1]
+                        entry_id = values['id']
+                        current_ids = written_ids.setdefault(current_entity, set())
+
+                        # Skip empty results of an outer join and the entries that were already written
+                        if entry_id is None or entry_id in current_ids:
+                            continue
+
+                        current_ids.add(entry_id)
+
+                        if current_entity not in handles:
+                            handles[current_entity] = io.open(
+                                sandbox.get_abs_path(current_entity), 'w', encoding='utf8')
+
+                        entry = serialize_dict(
+                            values, remove_fields=['id'], rename_fields=model_fields_to_file_fields[current_entity])
+                        handles[current_entity].write(u'{}: {}\n'.format(
+                            _dumps(six.text_type(entry_id)), _dumps(entry)))
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    return {entity_name: ids for entity_name, ids in written_ids.items() if ids}
+
+
+def _iter_node_column(node_ids, column, batch_size):
+    """Yield tuples of the pk, as a string, and the value of the given column of the nodes with the given ids.
+
+    :param node_ids: iterable of node ids
+    :param column: the name of the column, e.g. `attributes` or `extras`
+    :param batch_size: the number of nodes to query at a time
+    """
+    for chunk in iter_sorted_batches(node_ids, batch_size):
+        builder = QueryBuilder()
+        builder.append(Node, filters={'id': {'in': chunk}}, project=['id', column])
+        for pk, value in builder.iterall(batch_size=batch_size):
+            yield str(pk), value
+
+
+def _iter_links(node_ids, input_forward, return_reversed, call_reversed, batch_size):
+    """Yield the links to export of the nodes with the given ids, as dictionaries of the uuids, label and type.
+
+    These are the same links as those exported by `export_tree`, but every link is yielded exactly once without having
+    to keep all of them in memory: a link that is found both from its source and its target is only yielded from its
+    source.
+
+    :param node_ids: set of ids of the nodes to export
+    :param input_forward: whether INPUT links of the exported data nodes are exported
+    :param return_reversed: whether RETURN links to the exported data nodes are exported
+    :param call_reversed: whether CALL links to the exported process nodes are exported
+    :param batch_size: the number of nodes whose links are queried at a time
+    """
+    # Tuples of the source and target entity, link types, whether the links from the exported nodes and whether the
+    # links to the exported nodes are exported. Reversed CREATE links are not needed, because every CREATE link of an
+    # exported process node is already exported.
+    link_specs = (
+        (Data, ProcessNode, [LinkType.INPUT_CALC.value, LinkType.INPUT_WORK.value], input_forward, True),
+        (ProcessNode, Data, [LinkType.CREATE.value], True, False),
+        (ProcessNode, Data, [LinkType.RETURN.value], True, return_reversed),
+        (ProcessNode, ProcessNode, [LinkType.CALL_CALC.value, LinkType.CALL_WORK.value], True, call_reversed),
+    )
+
+    for chunk in iter_sorted_batches(node_ids, batch_size):
+        for source, target, link_types, forward, backward in link_specs:
+
+            if forward:
+                builder = QueryBuilder()
+                builder.append(source, project=['id', 'uuid'], tag='input', filters={'id': {'in': chunk}})
+                builder.append(
+                    target,
+                    project=['uuid'],
+                    tag='output',
+                    edge_filters={'type': {
+                        'in': link_types
+                    }},
+                    edge_project=['label', 'type'],
+                    with_incoming='input')
+                for _, input_uuid, output_uuid, link_label, link_type in builder.iterall(batch_size=batch_size):
+                    yield {
+                        'input': str(input_uuid),
+                        'output': str(output_uuid),
+                        'label': str(link_label),
+                        'type': str(link_type)
+                    }
+
+            if backward:
+                builder = QueryBuilder()
+                builder.append(source, project=['id', 'uuid'], tag='input')
+                builder.append(
+                    target,
+                    project=['uuid'],
+                    tag='output',
+                    filters={'id': {
+                        'in': chunk
+                    }},
+                    edge_filters={'type': {
+                        'in': link_types
+                    }},
+                    edge_project=['label', 'type'],
+                    with_incoming='input')
+                for input_id, input_uuid, output_uuid, link_label, link_type in builder.iterall(batch_size=batch_size):
+                    # This link was already yielded from its source
+                    if forward and input_id in node_ids:
+                        continue
+                    yield {
+                        'input': str(input_uuid),
+                        'output': str(output_uuid),
+                        'label': str(link_label),
+                        'type': str(link_type)
+                    }
+
+
+def _write_members(handle, items):
+    """Write the members of a JSON object to an open file, without the enclosing braces.
+
+    :param handle: the file handle opened in text mode
+    :param items: iterable of tuples of a key and a JSON serializable value
+    """
+    for index, (key, value) in enumerate(items):
+        if index:
+            handle.write(u', ')
+        handle.write(u'{}: {}'.format(_dumps(key), _dumps(value)))
+
+
+def _write_elements(handle, values):
+    """Write the elements of a JSON array to an open file, without the enclosing brackets.
+
+    :param handle: the file handle opened in text mode
+    :param values: iterable of JSON serializable values
+    """
+    for index, value in enumerate(values):
+        if index:
+            handle.write(u', ')
+        handle.write(_dumps(value))
+
+
+def _write_groups_uuid(handle, group_ids, batch_size):
+    """Write the members of the `groups_uuid` JSON object, mapping the uuid of each group on the uuids of its nodes.
+
+    Groups without nodes are omitted, as in `export_tree`.
+
+    :param handle: the file handle opened in text mode
+    :param group_ids: iterable of the ids of the exported groups
+    :param batch_size: the number of nodes to query at a time
+    """
+    first_group = True
+
+    for group_id in sorted(group_ids):
+        builder = QueryBuilder()
+        builder.append(
+            entity_names_to_entities[GROUP_ENTITY_NAME], filters={'id': {
+                '==': group_id
+            }}, project=['uuid'], tag='group')
+        builder.append(entity_names_to_entities[NODE_ENTITY_NAME], project=['uuid'], with_group='group')
+
+        first_node = True
+        for group_uuid, node_uuid in builder.iterall(batch_size=batch_size):
+            if first_node:
+                handle.write(u'{}{}: ['.format(u'' if first_group else u', ', _dumps(str(group_uuid))))
+                first_group = False
+            else:
+                handle.write(u', ')
+            handle.write(_dumps(str(node_uuid)))
+            first_node = False
+
+        if not first_node:
+            handle.write(u']')
+
+
+def _export_tree_streaming(folder, entity_ids, all_fields_info, unique_identifiers, input_forward, return_reversed,
+                           call_reversed, batch_size, threads, silent):
+    """Write the entries with the given ids to the export folder, while querying them in batches.
+
+    The serialized entries are first written to temporary files per entity and `data.json` is then assembled from those
+    files and from the attributes, extras, links and group elements, which are queried and written in batches as well.
+    This means that the memory usage does not grow with the number of exported entries and that the resulting archive
+    has exactly the same format as one written by `export_tree` without streaming.
+
+    :param folder: the folder to export to
+    :param entity_ids: dictionary of entity names to the ids of the entries to export
+    :param all_fields_info: the fields info of all entities, as returned by `get_all_fields_info`
+    :param unique_identifiers: the unique identifiers of all entities, as returned by `get_all_fields_info`
+    :param input_forward: whether INPUT links of the exported data nodes are exported
+    :param return_reversed: whether RETURN links to the exported data nodes are exported
+    :param call_reversed: whether CALL links to the exported process nodes are exported
+    :param batch_size: the number of entries to query and write at a time
+    :param threads: the number of threads used to copy the repository folders of the nodes
+    :param silent: suppress debug prints
+    """
+    if not silent:
+        print("STORING DATABASE ENTRIES...")
+
+    sandbox = SandboxFolder()
+
+    try:
+        written_ids = _write_export_data_entries(sandbox, entity_ids, all_fields_info, batch_size)
+        node_ids = written_ids.get(NODE_ENTITY_NAME, set())
+
+        if not written_ids:
+            if not silent:
+                print("No nodes to store, exiting...")
+            return
+
+        if not silent:
+            print("Exporting a total of {} db entries, of which {} nodes.".format(
+                sum(len(ids) for ids in written_ids.values()), len(node_ids)))
+
+        data_filepath = sandbox.get_abs_path('data.json')
+
+        with io.open(data_filepath, 'w', encoding='utf8') as handle:
+            if not silent:
+                print("STORING NODE ATTRIBUTES...")
+            handle.write(u'{"node_attributes": {')
+            _write_members(handle, _iter_node_column(node_ids, 'attributes', batch_size))
+
+            if not silent:
+                print("STORING NODE EXTRAS...")
+            handle.write(u'}, "node_extras": {')
+            _write_members(handle, _iter_node_column(node_ids, 'extras', batch_size))
+
+            if not silent:
+                print("STORING DATA...")
+            handle.write(u'}, "export_data": {')
+            for index, entity_name in enumerate(sorted(written_ids)):
+                handle.write(u'{}{}: {{'.format(u', ' if index else u'', _dumps(entity_name)))
+                with io.open(sandbox.get_abs_path(entity_name), 'r', encoding='utf8') as entries:
+                    for line_number, line in enumerate(entries):
+                        if line_number:
+                            handle.write(u', ')
+                        handle.write(line.rstrip(u'\n'))
+                handle.write(u'}')
+
+            if not silent:
+                print("STORING NODE LINKS...")
+            handle.write(u'}, "links_uuid": [')
+            _write_elements(handle, _iter_links(node_ids, input_forward, return_reversed, call_reversed, batch_size))
+
+            if not silent:
+                print("STORING GROUP ELEMENTS...")
+            handle.write(u'], "groups_uuid": {')
+            _write_groups_uuid(handle, written_ids.get(GROUP_ENTITY_NAME, ()), batch_size)
+            handle.write(u'}}')
+
+        folder.insert_path(data_filepath, dest_name='data.json')
+    finally:
+        sandbox.erase()
+
+    metadata = {
+        'aiida_version': get_version(),
+        'export_version': EXPORT_VERSION,
+        'all_fields_info': all_fields_info,
+        'unique_identifiers': unique_identifiers,
+    }
+
+    with folder.open('metadata.json', "w") as fhandle:
+        fhandle.write(json.dumps(metadata))
+
+    if not silent:
+        print("STORING FILES...")
+
+    nodesubfolder = folder.get_subfolder('nodes', create=True, reset_limit=True)
+    _copy_node_repositories(nodesubfolder, node_ids, batch_size, threads)
@@ -43,15 +43,20 @@ def import_data(in_path, group=None, silent=False, **kwargs):
     :param comment_mode_new: Similar to param extras_mode_new, but for Comments.
     """
     from aiida.manage import configuration
+    from aiida.manage.manager import get_manager
     from aiida.backends import BACKEND_DJANGO, BACKEND_SQLA
 
-    if configuration.PROFILE.database_backend == BACKEND_SQLA:
-        from aiida.tools.importexport.dbimport.backends.sqla import import_data_sqla
-        return import_data_sqla(in_path, group=group, silent=silent, **kwargs)
+    try:
+        if configuration.PROFILE.database_backend == BACKEND_SQLA:
+            from aiida.tools.importexport.dbimport.backends.sqla import import_data_sqla
+            return import_data_sqla(in_path, group=group, silent=silent, **kwargs)
 
-    if configuration.PROFILE.database_backend == BACKEND_DJANGO:
-        from aiida.tools.importexport.dbimport.backends.django import import_data_dj
-        return import_data_dj(in_path, group=group, silent=silent, **kwargs)
+        if configuration.PROFILE.database_backend == BACKEND_DJANGO:
+            from aiida.tools.importexport.dbimport.backends.django import import_data_dj
+            return import_data_dj(in_path, group=group, silent=silent, **kwargs)
+    finally:
+        # Imported entities can have the UUIDs of entities that were deleted, which may still be in the identity map
+        get_manager().get_identity_map().clear()
 
     # else
     raise Exception("Unknown backend: {}".format(configuration.PROFILE.database_backend))
@@ -13,7 +13,6 @@ from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
 
-from distutils.version import StrictVersion
 import io
 import os
 import tarfile
@@ -28,11 +27,13 @@ from aiida.common.folders import SandboxFolder, RepositoryFolder
 from aiida.common.utils import grouper, export_shard_uuid, get_object_from_string
 from aiida.orm.utils.repository import Repository
 from aiida.orm import QueryBuilder, Node, Group
-from aiida.tools.importexport.config import DUPL_SUFFIX, IMPORTGROUP_TYPE, EXPORT_VERSION
+from aiida.tools.importexport.config import DUPL_SUFFIX, IMPORTGROUP_TYPE
 from aiida.tools.importexport.config import (NODE_ENTITY_NAME, GROUP_ENTITY_NAME, COMPUTER_ENTITY_NAME,
                                              USER_ENTITY_NAME, LOG_ENTITY_NAME, COMMENT_ENTITY_NAME)
 from aiida.tools.importexport.config import entity_names_to_signatures
-from aiida.tools.importexport.dbimport.backends.utils import deserialize_field, merge_comment, merge_extras
+from aiida.tools.importexport.dbimport.backends.streaming import DEFAULT_BATCH_SIZE
+from aiida.tools.importexport.dbimport.backends.utils import (deserialize_field, merge_comment, merge_extras,
+                                                              clean_extras, check_export_version)
 
 __all__ = ('import_data_dj',)
 
@@ -43,7 +44,9 @@ def import_data_dj(in_path,
                    extras_mode_existing='kcl',
                    extras_mode_new='import',
                    comment_mode='newest',
-                   silent=False):
+                   silent=False,
+                   streaming=False,
+                   batch_size=DEFAULT_BATCH_SIZE):
     """
     Import exported AiiDA environment to the AiiDA database.
     If the 'in_path' is a folder, calls extract_tree; otherwise, tries to
@@ -70,13 +73,25 @@ def import_data_dj(in_path,
     :param comment_mode: Comment import modes (when same UUIDs are found):
     'newest': Will keep the Comment with the most recent modification time (mtime)
     'overwrite': Will overwrite existing Comments with the ones from the import file
+    :param streaming: if True, read the archive in chunks without extracting it or loading `data.json` in memory, see
+        :class:`~aiida.tools.importexport.dbimport.backends.streaming.StreamingImport`
+    :param batch_size: the number of entries that are imported at a time when streaming
     """
+    if streaming:
+        from aiida.tools.importexport.dbimport.backends.django.streaming import DjangoStreamingImport
+        importer = DjangoStreamingImport(
+            group=group,
+            ignore_unknown_nodes=ignore_unknown_nodes,
+            extras_mode_existing=extras_mode_existing,
+            extras_mode_new=extras_mode_new,
+            comment_mode=comment_mode,
+            silent=silent,
+            batch_size=batch_size)
+        return importer.import_archive(in_path)
+
     from django.db import transaction  # pylint: disable=import-error,no-name-in-module
     from aiida.backends.djsite.db import models
 
-    # This is the export version expected by this function
-    expected_export_version = StrictVersion(EXPORT_VERSION)
-
     # The name of the subfolder in which the node files are stored
     nodes_export_subfolder = 'nodes'
 
@@ -126,16 +141,7 @@ def import_data_dj(in_path,
         ######################
         # PRELIMINARY CHECKS #
         ######################
-        export_version = StrictVersion(str(metadata['export_version']))
-        if export_version != expected_export_version:
-            msg = "Export file version is {}, can import only version {}"\
-                    .format(metadata['export_version'], expected_export_version)
-            if export_version < expected_export_version:
-                msg += "\nUse 'verdi export migrate' to update this export file."
-            else:
-                msg += "\nUpdate your AiiDA version in order to import this file."
-
-            raise exceptions.IncompatibleArchiveVersionError(msg)
+        check_export_version(metadata['export_version'])
 
         ##########################################################################
         # CREATE UUID REVERSE TABLES AND CHECK IF I HAVE ALL NODES FOR THE LINKS #
@@ -390,13 +396,7 @@ def import_data_dj(in_path,
                             except KeyError:
                                 raise ValueError("Unable to find extras info "
                                                  "for DbNode with UUID = {}".format(unique_id))
-                            # TODO: remove when aiida extras will be moved somewhere else
-                            # from here
-                            extras = {key: value for key, value in extras.items() if not key.startswith('_aiida_')}
-                            if object_.node_type.endswith('code.Code.'):
-                                extras = {key: value for key, value in extras.items() if not key == 'hidden'}
-                            # till here
-                            object_.extras = extras
+                            object_.extras = clean_extras(extras, object_.node_type)
                         elif extras_mode_new == 'none':
                             if not silent:
                                 print("SKIPPING NEW NODE EXTRAS...")
@@ -424,12 +424,7 @@ def import_data_dj(in_path,
 
                         # Here I have to deserialize the extras
                         old_extras = db_node.extras
-                        # TODO: remove when aiida extras will be moved somewhere else
-                        # from here
-                        extras = {key: value for key, value in extras.items() if not key.startswith('_aiida_')}
-                        if models.DbNode.objects.filter(uuid=unique_id)[0].node_type.endswith('code.Code.'):
-                            extras = {key: value for key, value in extras.items() if not key == 'hidden'}
-                        # till here
+                        extras = clean_extras(extras, models.DbNode.objects.filter(uuid=unique_id)[0].node_type)
                         db_node.extras = merge_extras(old_extras, extras, extras_mode_existing)
                         db_node.save()
 
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+""" Django-specific streaming import of AiiDA entities """
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+
+import contextlib
+
+from aiida.common import exceptions
+from aiida.common.utils import get_object_from_string
+from aiida.tools.importexport.config import IMPORTGROUP_TYPE, entity_names_to_signatures
+from aiida.tools.importexport.dbimport.backends.streaming import StreamingImport
+
+__all__ = ('DjangoStreamingImport',)
+
+
+class DjangoStreamingImport(StreamingImport):
+    """Streaming import for the Django backend.
+
+    All lookups go through the Django ORM, because the query builder uses a separate connection that does not see the
+    entries that are created in the transaction of the import.
+    """
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        from django.db import transaction  # pylint: disable=import-error,no-name-in-module
+
+        with transaction.atomic():
+            yield
+
+    def _get_pks(self, entity_name, field, values):
+        model = get_object_from_string(entity_names_to_signatures[entity_name])
+
+        if not values:
+            return {}
+
+        results = model.objects.filter(**{'{}__in'.format(field): values}).values_list(field, 'pk')
+
+        # note: convert uuids from type UUID to strings
+        return {str(value): pk for value, pk in results}
+
+    def _create_entries(self, entity_name, entries):
+        from aiida.backends.djsite.db import models
+
+        model = get_object_from_string(entity_names_to_signatures[entity_name])
+        objects_to_create = [model(**import_data) for import_data in entries]
+
+        # If there is an mtime in the field, disable the automatic update to keep the mtime that we have set here
+        if 'mtime' in [field.name for field in model._meta.local_fields]:  # pylint: disable=protected-access
+            with models.suppress_auto_now([(model, ['mtime'])]):
+                model.objects.bulk_create(objects_to_create)
+        else:
+            model.objects.bulk_create(objects_to_create)
+
+    def _get_node_extras(self, pks):
+        from aiida.backends.djsite.db import models
+
+        return list(models.DbNode.objects.filter(pk__in=pks).values_list('pk', 'node_type', 'extras'))
+
+    def _set_node_extras(self, extras):
+        from aiida.backends.djsite.db import models
+
+        for pk, value in extras.items():
+            models.DbNode.objects.filter(pk=pk).update(extras=value)
+
+    def _get_incoming_links(self, pks):
+        from aiida.backends.djsite.db import models
+
+        return list(models.DbLink.objects.filter(output__in=pks).values_list('input', 'output', 'label'))
+
+    def _create_links(self, links):
+        from aiida.backends.djsite.db import models
+
+        models.DbLink.objects.bulk_create([
+            models.DbLink(input_id=in_id, output_id=out_id, label=label, type=link_type)
+            for in_id, out_id, label, link_type in links
+        ])
+
+    def _add_nodes_to_group(self, group_pk, node_pks):
+        from aiida.backends.djsite.db import models
+
+        # The many-to-many manager skips the nodes that are already in the group
+        models.DbGroup.objects.get(pk=group_pk).dbnodes.add(*node_pks)
+
+    def _create_import_group(self, label):
+        from django.db import transaction  # pylint: disable=import-error,no-name-in-module
+        from aiida.orm import Group
+
+        try:
+            # Use a savepoint, such that a failure does not break the transaction of the import
+            with transaction.atomic():
+                return Group(label=label, type_string=IMPORTGROUP_TYPE).store().pk
+        except (exceptions.UniquenessError, exceptions.IntegrityError):
+            return None
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=protected-access
+""" SQLAlchemy-specific streaming import of AiiDA entities """
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+
+import contextlib
+
+import six
+
+from aiida.common import json
+from aiida.common.utils import get_object_from_string
+from aiida.tools.importexport.config import IMPORTGROUP_TYPE, COMPUTER_ENTITY_NAME, LOG_ENTITY_NAME
+from aiida.tools.importexport.config import entity_names_to_sqla_schema, file_fields_to_model_fields
+from aiida.tools.importexport.dbimport.backends.streaming import StreamingImport
+from aiida.tools.importexport.dbimport.backends.sqla.utils import validate_uuid
+
+__all__ = ('SqlaStreamingImport',)
+
+
+class SqlaStreamingImport(StreamingImport):
+    """Streaming import for the SQLAlchemy backend, which does all database operations in the scoped session."""
+
+    def __init__(self, *args, **kwargs):
+        import aiida.backends.sqlalchemy
+
+        super(SqlaStreamingImport, self).__init__(*args, **kwargs)
+        self._session = aiida.backends.sqlalchemy.get_scoped_session()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        try:
+            yield
+            self._print("COMMITTING EVERYTHING...")
+            self._session.commit()
+        except:
+            print("Rolling back")
+            self._session.rollback()
+            raise
+
+    def _get_pks(self, entity_name, field, values):
+        model = get_object_from_string(entity_names_to_sqla_schema[entity_name])
+
+        if field == 'uuid':
+            values = [value for value in values if validate_uuid(value)]
+
+        if not values:
+            return {}
+
+        column = getattr(model, field)
+        results = self._session.query(column, model.id).filter(column.in_(values)).all()
+
+        # str() to convert UUID() to string
+        return {str(value): pk for value, pk in results}
+
+    def _create_entries(self, entity_name, entries):
+        db_entity = get_object_from_string(entity_names_to_sqla_schema[entity_name])
+        objects_to_create = []
+
+        for import_data in entries:
+            # The Django export method stores the metadata of computers as a serialized JSON string
+            if entity_name == COMPUTER_ENTITY_NAME and isinstance(import_data['metadata'],
+                                                                  (six.string_types, six.binary_type)):
+                import_data['metadata'] = json.loads(import_data['metadata'])
+
+            for file_fkey, model_fkey in file_fields_to_model_fields.get(entity_name, {}).items():
+                # The `DbLog` class expects the `metadata` keyword in its constructor, see the regular import
+                if entity_name == LOG_ENTITY_NAME and file_fkey == 'metadata':
+                    continue
+                if model_fkey in import_data or file_fkey not in import_data:
+                    continue
+                import_data[model_fkey] = import_data.pop(file_fkey)
+
+            objects_to_create.append(db_entity(**import_data))
+
+        self._session.bulk_save_objects(objects_to_create)
+
+    def _get_node_extras(self, pks):
+        from aiida.backends.sqlalchemy.models.node import DbNode
+
+        if not pks:
+            return []
+
+        return self._session.query(DbNode.id, DbNode.node_type, DbNode.extras).filter(DbNode.id.in_(pks)).all()
+
+    def _set_node_extras(self, extras):
+        from aiida.backends.sqlalchemy.models.node import DbNode
+
+        self._session.bulk_update_mappings(DbNode, [{'id': pk, 'extras': value} for pk, value in extras.items()])
+
+    def _get_incoming_links(self, pks):
+        from aiida.backends.sqlalchemy.models.node import DbLink
+
+        if not pks:
+            return []
+
+        return self._session.query(DbLink.input_id, DbLink.output_id, DbLink.label).filter(
+            DbLink.output_id.in_(pks)).all()
+
+    def _create_links(self, links):
+        from aiida.backends.sqlalchemy.models.node import DbLink
+
+        self._session.bulk_insert_mappings(DbLink, [{
+            'input_id': in_id,
+            'output_id': out_id,
+            'label': label,
+            'type': link_type
+        } for in_id, out_id, label, link_type in links])
+
+    def _add_nodes_to_group(self, group_pk, node_pks):
+        # Insert directly in the many-to-many table, like `SqlaGroup.add_nodes` with `skip_orm=True` but without
+        # committing, such that everything is done in the transaction of the import
+        from sqlalchemy.dialects.postgresql import insert  # pylint: disable=import-error, no-name-in-module
+        from aiida.backends.sqlalchemy.models.base import Base
+
+        table = Base.metadata.tables['db_dbgroup_dbnodes']
+        ins = insert(table).values([{'dbnode_id': node_pk, 'dbgroup_id': group_pk} for node_pk in node_pks])
+        self._session.execute(ins.on_conflict_do_nothing(index_elements=['dbnode_id', 'dbgroup_id']))
+
+    def _create_import_group(self, label):
+        from aiida.backends.sqlalchemy.models.group import DbGroup
+        from aiida.orm import Group
+
+        if self._session.query(DbGroup).filter(DbGroup.label == label).count():
+            return None
+
+        dbgroup = Group(label=label, type_string=IMPORTGROUP_TYPE).backend_entity._dbmodel
+        self._session.add(dbgroup)
+        self._session.flush()
+
+        return dbgroup.id
@@ -0,0 +1,1228 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=protected-access,too-many-arguments,too-many-locals,too-many-branches,too-many-statements
+"""Streaming import of archives, that neither loads `data.json` into memory nor extracts the archive to disk.
+
+The `data.json` of the archive is parsed incrementally and its content is staged in a temporary SQLite database. The
+entries are then imported in chunks, for which the existing entries are looked up and the new entries are inserted in
+bulk. The repository folders of the new nodes are written straight from the files in the archive. The backend specific
+database operations are implemented by the subclasses of :class:`StreamingImport` in the backend modules.
+"""
+from __future__ import division
+from __future__ import absolute_import
+from __future__ import print_function
+
+import codecs
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tarfile
+import zipfile
+
+import six
+import simplejson
+
+from aiida.common import exceptions, json, timezone
+from aiida.common.archive import CorruptArchive
+from aiida.common.folders import RepositoryFolder, SandboxFolder
+from aiida.common.links import LinkType
+from aiida.orm.utils.repository import Repository
+from aiida.tools.importexport.config import DUPL_SUFFIX, IMPORTGROUP_TYPE
+from aiida.tools.importexport.config import (NODE_ENTITY_NAME, GROUP_ENTITY_NAME, COMPUTER_ENTITY_NAME,
+                                             USER_ENTITY_NAME, LOG_ENTITY_NAME, COMMENT_ENTITY_NAME)
+from aiida.tools.importexport.dbimport.backends.utils import (deserialize_field, merge_comment, merge_extras,
+                                                              clean_extras, check_export_version)
+
+__all__ = ('StreamingImport', 'ArchiveReader', 'JsonStreamReader', 'DEFAULT_BATCH_SIZE')
+
+# The number of entries that are imported at a time
+DEFAULT_BATCH_SIZE = 1000
+
+# The number of characters that are read from `data.json` at a time
+CHUNK_SIZE = 2**16
+
+# The number of values that are passed to a single SQLite query, which is limited to 999 parameters by default
+_SQLITE_CHUNK_SIZE = 500
+
+# The order in which the entities are imported, as defined by the relationships between them
+ENTITY_ORDER = (USER_ENTITY_NAME, COMPUTER_ENTITY_NAME, NODE_ENTITY_NAME, GROUP_ENTITY_NAME, LOG_ENTITY_NAME,
+                COMMENT_ENTITY_NAME)
+
+
+class JsonStreamReader(object):  # pylint: disable=useless-object-inheritance
+    """Incremental reader of a JSON document in a text stream.
+
+    The members of objects and the elements of arrays can be iterated over without decoding the object or array as a
+    whole, such that only the value that is being decoded has to fit in memory.
+    """
+
+    _WHITESPACE = u' \t\n\r'
+
+    def __init__(self, handle, chunk_size=CHUNK_SIZE):
+        """Construct a new reader.
+
+        :param handle: a text stream with the JSON document
+        :param chunk_size: the number of characters that are read from the stream at a time
+        """
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = simplejson.JSONDecoder()
+        self._buffer = u''
+        self._position = 0
+        self._eof = False
+
+    def read_value(self):
+        """Decode and return the next value.
+
+        :return: the decoded value
+        :raises ValueError: if the stream does not contain a valid value at this position
+        """
+        self._peek()
+        size = self._chunk_size
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if self._eof:
+                    raise
+            else:
+                # A value that ends with the buffer, such as a number, may continue in the part not yet read
+                if end < len(self._buffer) or self._eof:
+                    self._position = end
+                    return value
+
+            self._fill(size)
+            size *= 2
+
+    def iter_object(self):
+        """Iterate over the members of the next object, yielding their keys.
+
+        The value of each member has to be consumed, with any of the read or iterate methods, before the next key is
+        requested.
+
+        :raises ValueError: if the stream does not contain an object at this position
+        """
+        self._expect(u'{')
+
+        if self._peek() == u'}':
+            self._position += 1
+            return
+
+        while True:
+            key = self.read_value()
+            if not isinstance(key, six.string_types):
+                raise ValueError('expected an object key but found `{}`'.format(key))
+            self._expect(u':')
+            yield key
+            if self._expect(u',}') == u'}':
+                return
+
+    def iter_object_items(self):
+        """Iterate over the members of the next object, yielding their keys and decoded values.
+
+        :raises ValueError: if the stream does not contain an object at this position
+        """
+        for key in self.iter_object():
+            yield key, self.read_value()
+
+    def iter_array(self):
+        """Iterate over the elements of the next array, yielding their decoded values.
+
+        :raises ValueError: if the stream does not contain an array at this position
+        """
+        self._expect(u'[')
+
+        if self._peek() == u']':
+            self._position += 1
+            return
+
+        while True:
+            yield self.read_value()
+            if self._expect(u',]') == u']':
+                return
+
+    def _fill(self, size=None):
+        """Read more characters from the stream into the buffer, discarding the characters that were consumed.
+
+        :param size: the number of characters to read, by default the chunk size
+        :return: boolean, False if the end of the stream was reached
+        """
+        data = self._handle.read(size or self._chunk_size)
+        self._buffer = self._buffer[self._position:] + data
+        self._position = 0
+
+        if not data:
+            self._eof = True
+
+        return bool(data)
+
+    def _peek(self):
+        """Return the next character that is not whitespace, without consuming it.
+
+        :raises ValueError: if the end of the stream is reached
+        """
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in self._WHITESPACE:
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._fill():
+                raise ValueError('unexpected end of the JSON document')
+
+    def _expect(self, characters):
+        """Consume and return the next character that is not whitespace, which has to be one of the given characters.
+
+        :param characters: the characters that are expected
+        :raises ValueError: if the next character is not one of the expected characters
+        """
+        character = self._peek()
+
+        if character not in characters:
+            raise ValueError('expected one of `{}` in the JSON document but found `{}`'.format(characters, character))
+
+        self._position += 1
+
+        return character
+
+
+class ArchiveReader(object):  # pylint: disable=useless-object-inheritance
+    """Reader of the files in an export archive, which is a folder, a zip file or a (compressed) tar file.
+
+    Files are read directly from the archive without extracting it. A compressed tar file can only be read sequentially,
+    which means that each file that is opened and the iteration over the node repository files each require a pass over
+    the archive.
+    """
+
+    FORMAT_FOLDER = 'folder'
+    FORMAT_ZIP = 'zip'
+    FORMAT_TAR = 'tar'
+
+    def __init__(self, in_path, nodes_export_subfolder='nodes'):
+        """Construct a new reader.
+
+        :param in_path: the path of the archive
+        :param nodes_export_subfolder: the name of the folder in the archive with the node repositories
+        :raises ValueError: if the format of the archive is not recognized
+        """
+        if os.path.isdir(in_path):
+            self._format = self.FORMAT_FOLDER
+        elif tarfile.is_tarfile(in_path):
+            self._format = self.FORMAT_TAR
+        elif zipfile.is_zipfile(in_path):
+            self._format = self.FORMAT_ZIP
+        else:
+            raise ValueError("Unable to detect the input file format, it is neither a (possibly compressed) tar file, "
+                             "nor a zip file.")
+
+        self._in_path = in_path
+        self._nodes_export_subfolder = nodes_export_subfolder
+
+    @property
+    def format(self):
+        """Return the format of the archive."""
+        return self._format
+
+    @contextlib.contextmanager
+    def open(self, name):
+        """Open the file with the given name at the top level of the archive.
+
+        :param name: the name of the file
+        :return: a binary file handle
+        :raises CorruptArchive: if the archive does not contain the file
+        """
+        if self._format == self.FORMAT_FOLDER:
+            try:
+                handle = io.open(os.path.join(self._in_path, name), 'rb')
+            except IOError:
+                raise CorruptArchive('required file `{}` is not included'.format(name))
+            with handle:
+                yield handle
+
+        elif self._format == self.FORMAT_ZIP:
+            with zipfile.ZipFile(self._in_path, 'r', allowZip64=True) as archive:
+                try:
+                    handle = archive.open(name)
+                except KeyError:
+                    raise CorruptArchive('required file `{}` is not included'.format(name))
+                with contextlib.closing(handle):
+                    yield handle
+
+        else:
+            with tarfile.open(self._in_path, 'r|*', format=tarfile.PAX_FORMAT) as archive:
+                for member in _iter_tar_members(archive):
+                    if _normalize_member_name(member.name) == name and member.isfile():
+                        yield archive.extractfile(member)
+                        return
+                raise CorruptArchive('required file `{}` is not included'.format(name))
+
+    def iter_node_files(self):
+        """Iterate over the files and directories in the node repositories of the archive.
+
+        :return: generator of tuples of the node uuid, the relative path in the repository and a binary file handle, or
+            None for a directory, whose content has to be read before the next tuple is requested
+        """
+        if self._format == self.FORMAT_FOLDER:
+            basepath = os.path.join(self._in_path, self._nodes_export_subfolder)
+            for dirpath, dirnames, filenames in os.walk(basepath):
+                node_path = self._parse_node_path(os.path.relpath(dirpath, basepath).replace(os.sep, '/'))
+                if node_path is None:
+                    continue
+                uuid, relpath = node_path
+                yield uuid, relpath, None
+                for filename in filenames:
+                    with io.open(os.path.join(dirpath, filename), 'rb') as handle:
+                        yield uuid, _join_path(relpath, filename), handle
+                dirnames.sort()
+
+        elif self._format == self.FORMAT_ZIP:
+            with zipfile.ZipFile(self._in_path, 'r', allowZip64=True) as archive:
+                for info in archive.infolist():
+                    node_path = self._parse_node_path(info.filename)
+                    if node_path is None:
+                        continue
+                    uuid, relpath = node_path
+                    if info.filename.endswith('/'):
+                        yield uuid, relpath, None
+                    else:
+                        with contextlib.closing(archive.open(info)) as handle:
+                            yield uuid, relpath, handle
+
+        else:
+            with tarfile.open(self._in_path, 'r|*', format=tarfile.PAX_FORMAT) as archive:
+                for member in _iter_tar_members(archive):
+                    node_path = self._parse_node_path(member.name)
+                    if node_path is None:
+                        continue
+                    if member.isdev() or member.issym() or member.islnk():
+                        # safety: in export, I set dereference=True therefore there should be no links or devices
+                        print('WARNING, link or device found inside the import file: {}'.format(member.name),
+                              file=sys.stderr)
+                        continue
+                    uuid, relpath = node_path
+                    if member.isdir():
+                        yield uuid, relpath, None
+                    else:
+                        yield uuid, relpath, archive.extractfile(member)
+
+    def _parse_node_path(self, name):
+        """Return the node uuid and the relative path in its repository of a path in the archive.
+
+        :param name: the path in the archive, with forward slashes as separators
+        :return: tuple of the uuid and the relative path, or None if the path is not in a node repository
+        """
+        parts = [part for part in _normalize_member_name(name).split('/') if part]
+
+        if parts and parts[0] == self._nodes_export_subfolder:
+            parts = parts[1:]
+        elif self._format != self.FORMAT_FOLDER:
+            return None
+
+        if len(parts) < 3 or any(part in (os.curdir, os.pardir) for part in parts):
+            return None
+
+        return ''.join(parts[:3]), '/'.join(parts[3:])
+
+
+class ImportStaging(object):  # pylint: disable=useless-object-inheritance
+    """A temporary SQLite database in which the content of `data.json` is staged, such that it can be read in chunks.
+
+    The database also keeps the primary keys in the database of the imported entries, once they have been imported or
+    found, and those of the nodes that are only referenced by the links and groups of the archive.
+    """
+
+    _SQL_CREATE_TABLES = (
+        'CREATE TABLE entries (entity TEXT NOT NULL, import_pk INTEGER NOT NULL, unique_id TEXT, data TEXT NOT NULL, '
+        'pk INTEGER, new INTEGER, found INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (entity, import_pk))',
+        'CREATE INDEX entries_unique_id ON entries (entity, unique_id)',
+        'CREATE TABLE node_columns (name TEXT NOT NULL, import_pk INTEGER NOT NULL, data TEXT NOT NULL, '
+        'PRIMARY KEY (name, import_pk))',
+        'CREATE TABLE links (input TEXT NOT NULL, output TEXT NOT NULL, label TEXT NOT NULL, type TEXT NOT NULL)',
+        'CREATE TABLE group_nodes (group_uuid TEXT NOT NULL, node_uuid TEXT NOT NULL)',
+        'CREATE TABLE node_pks (uuid TEXT PRIMARY KEY, pk INTEGER NOT NULL)',
+    )
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Create the temporary database in a sandbox folder.
+
+        :param batch_size: the number of rows that are inserted and read at a time
+        """
+        self._batch_size = batch_size
+        self._folder = SandboxFolder()
+        self._connection = sqlite3.connect(self._folder.get_abs_path('staging.sqlite'))
+
+        # The database is temporary, so it does not have to survive a crash
+        self._connection.execute('PRAGMA synchronous = OFF')
+        self._connection.execute('PRAGMA journal_mode = OFF')
+
+        for statement in self._SQL_CREATE_TABLES:
+            self._connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close and remove the database."""
+        self._connection.close()
+        self._folder.erase()
+
+    def stage_data(self, handle, unique_identifiers):
+        """Parse the `data.json` in the given text stream and stage its content.
+
+        :param handle: a text stream with the content of `data.json`
+        :param unique_identifiers: dictionary of entity names onto the names of their unique identifier field
+        """
+        reader = JsonStreamReader(handle)
+
+        for key in reader.iter_object():
+            if key in ('node_attributes', 'node_extras'):
+                name = key[len('node_'):]
+                self._insert_many('INSERT INTO node_columns (name, import_pk, data) VALUES (?, ?, ?)',
+                                  ((name, int(import_pk), json.dumps(value))
+                                   for import_pk, value in reader.iter_object_items()))
+
+            elif key == 'export_data':
+                for entity_name in reader.iter_object():
+                    unique_identifier = unique_identifiers.get(entity_name, None)
+                    self._insert_many(
+                        'INSERT INTO entries (entity, import_pk, unique_id, data) VALUES (?, ?, ?, ?)',
+                        ((entity_name, int(import_pk), _get_unique_id(entry, unique_identifier), json.dumps(entry))
+                         for import_pk, entry in reader.iter_object_items()))
+
+            elif key == 'links_uuid':
+                self._insert_many('INSERT INTO links (input, output, label, type) VALUES (?, ?, ?, ?)',
+                                  ((link['input'], link['output'], link['label'], link['type'])
+                                   for link in reader.iter_array()))
+
+            elif key == 'groups_uuid':
+                for group_uuid in reader.iter_object():
+                    self._insert_many('INSERT INTO group_nodes (group_uuid, node_uuid) VALUES (?, ?)',
+                                      ((group_uuid, node_uuid) for node_uuid in reader.iter_array()))
+
+            else:
+                reader.read_value()
+
+        self._connection.commit()
+
+    def count_entries(self, entity_name):
+        """Return the number of staged entries of the given entity."""
+        return self._connection.execute('SELECT COUNT(*) FROM entries WHERE entity = ?', (entity_name,)).fetchone()[0]
+
+    def iter_entries(self, entity_name):
+        """Iterate over the staged entries of the given entity in chunks.
+
+        :param entity_name: the name of the entity
+        :return: generator of lists of tuples of the import pk and the decoded entry
+        """
+        last_import_pk = None
+
+        while True:
+            rows = self._connection.execute(
+                'SELECT import_pk, data FROM entries WHERE entity = ? AND (? IS NULL OR import_pk > ?) '
+                'ORDER BY import_pk LIMIT ?',
+                (entity_name, last_import_pk, last_import_pk, self._batch_size)).fetchall()
+
+            if not rows:
+                return
+
+            last_import_pk = rows[-1][0]
+
+            yield [(import_pk, json.loads(data)) for import_pk, data in rows]
+
+    def get_entries(self, entity_name, import_pks):
+        """Return the unique ids and the primary keys in the database of the entries with the given import pks.
+
+        :param entity_name: the name of the entity
+        :param import_pks: iterable of import pks
+        :return: dictionary of import pks onto tuples of the unique id and the primary key, which is None if the entry
+            has not yet been imported
+        """
+        return dict(
+            (import_pk, (unique_id, pk))
+            for import_pk, unique_id, pk in self._select_in(
+                'SELECT import_pk, unique_id, pk FROM entries WHERE entity = ? AND import_pk IN ({})', import_pks,
+                (entity_name,)))
+
+    def get_node_columns(self, name, import_pks):
+        """Return the staged attributes or extras of the nodes with the given import pks.
+
+        :param name: `attributes` or `extras`
+        :param import_pks: iterable of import pks
+        :return: dictionary of import pks onto the decoded values
+        """
+        return dict((import_pk, json.loads(data)) for import_pk, data in self._select_in(
+            'SELECT import_pk, data FROM node_columns WHERE name = ? AND import_pk IN ({})', import_pks, (name,)))
+
+    def set_pks(self, entity_name, pks, new):
+        """Set the primary keys in the database of imported entries.
+
+        :param entity_name: the name of the entity
+        :param pks: list of tuples of the import pk, the unique id and the primary key in the database
+        :param new: boolean, whether the entries were newly created
+        """
+        self._connection.executemany('UPDATE entries SET pk = ?, new = ? WHERE entity = ? AND import_pk = ?',
+                                     ((pk, int(new), entity_name, import_pk) for import_pk, _, pk in pks))
+
+        if entity_name == NODE_ENTITY_NAME:
+            self.set_node_pks((unique_id, pk) for _, unique_id, pk in pks)
+
+    def set_node_pks(self, node_pks):
+        """Set the primary keys in the database of nodes, by their uuid.
+
+        :param node_pks: iterable of tuples of the uuid and the primary key
+        """
+        self._connection.executemany('INSERT OR REPLACE INTO node_pks (uuid, pk) VALUES (?, ?)', node_pks)
+
+    def iter_imported_pks(self, entity_name):
+        """Iterate over the primary keys in the database of the imported entries of the given entity, in chunks.
+
+        :return: generator of lists of primary keys
+        """
+        cursor = self._connection.execute(
+            'SELECT pk FROM entries WHERE entity = ? AND pk IS NOT NULL ORDER BY import_pk', (entity_name,))
+
+        while True:
+            rows = cursor.fetchmany(self._batch_size)
+            if not rows:
+                return
+            yield [pk for pk, in rows]
+
+    def iter_referenced_node_uuids(self):
+        """Iterate over the uuids of the nodes that are referenced by links or groups but are not in the archive.
+
+        :return: generator of lists of uuids
+        """
+        cursor = self._connection.execute(
+            'SELECT uuid FROM (SELECT input AS uuid FROM links UNION SELECT output FROM links '
+            'UNION SELECT node_uuid FROM group_nodes) '
+            'WHERE uuid NOT IN (SELECT unique_id FROM entries WHERE entity = ? AND unique_id IS NOT NULL)',
+            (NODE_ENTITY_NAME,))
+
+        while True:
+            rows = cursor.fetchall() if self._batch_size is None else cursor.fetchmany(self._batch_size)
+            if not rows:
+                return
+            yield [uuid for uuid, in rows]
+
+    def get_node_status(self, uuid):
+        """Return whether the node with the given uuid was newly created by the import and whether its repository was
+        already found in the archive.
+
+        :param uuid: the uuid of the node
+        :return: tuple of two booleans
+        """
+        row = self._connection.execute('SELECT new, found FROM entries WHERE entity = ? AND unique_id = ?',
+                                       (NODE_ENTITY_NAME, uuid)).fetchone()
+        return (False, False) if row is None else (bool(row[0]), bool(row[1]))
+
+    def set_node_found(self, uuid):
+        """Record that the repository of the node with the given uuid was found in the archive.
+
+        :param uuid: the uuid of the node
+        """
+        self._connection.execute('UPDATE entries SET found = 1 WHERE entity = ? AND unique_id = ?',
+                                 (NODE_ENTITY_NAME, uuid))
+
+    def get_new_node_not_found(self):
+        """Return the uuid of a newly created node whose repository was not found in the archive, if any.
+
+        :return: the uuid or None
+        """
+        row = self._connection.execute('SELECT unique_id FROM entries WHERE entity = ? AND new = 1 AND found = 0',
+                                       (NODE_ENTITY_NAME,)).fetchone()
+        return None if row is None else row[0]
+
+    def iter_links(self):
+        """Iterate over the staged links in chunks, with the primary keys in the database of their nodes.
+
+        :return: generator of lists of tuples of the input uuid, output uuid, label, type, input pk and output pk, where
+            the primary keys are None for unknown nodes
+        """
+        last_rowid = 0
+
+        while True:
+            rows = self._connection.execute(
+                'SELECT links.rowid, links.input, links.output, links.label, links.type, inputs.pk, outputs.pk '
+                'FROM links LEFT JOIN node_pks AS inputs ON inputs.uuid = links.input '
+                'LEFT JOIN node_pks AS outputs ON outputs.uuid = links.output '
+                'WHERE links.rowid > ? ORDER BY links.rowid LIMIT ?', (last_rowid, self._batch_size)).fetchall()
+
+            if not rows:
+                return
+
+            last_rowid = rows[-1][0]
+
+            yield [row[1:] for row in rows]
+
+    def iter_group_nodes(self):
+        """Iterate over the staged group elements in chunks, with the primary keys in the database of their nodes.
+
+        :return: generator of lists of tuples of the group uuid, the node uuid and the node pk, which is None for an
+            unknown node
+        """
+        last_rowid = 0
+
+        while True:
+            rows = self._connection.execute(
+                'SELECT group_nodes.rowid, group_nodes.group_uuid, group_nodes.node_uuid, node_pks.pk '
+                'FROM group_nodes LEFT JOIN node_pks ON node_pks.uuid = group_nodes.node_uuid '
+                'WHERE group_nodes.rowid > ? ORDER BY group_nodes.rowid LIMIT ?',
+                (last_rowid, self._batch_size)).fetchall()
+
+            if not rows:
+                return
+
+            last_rowid = rows[-1][0]
+
+            yield [row[1:] for row in rows]
+
+    def commit(self):
+        """Commit the changes to the staging database."""
+        self._connection.commit()
+
+    def _insert_many(self, statement, rows):
+        """Execute the given insert statement for all rows, a batch at a time.
+
+        :param statement: the SQL statement
+        :param rows: iterable of tuples of parameters
+        """
+        batch = []
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self._batch_size:
+                self._connection.executemany(statement, batch)
+                batch = []
+
+        if batch:
+            self._connection.executemany(statement, batch)
+
+    def _select_in(self, statement, values, parameters=()):
+        """Execute a select statement with a list of values for an `IN` clause, a limited number of values at a time.
+
+        :param statement: the SQL statement, with a `{}` placeholder for the parameters of the `IN` clause
+        :param values: iterable of values
+        :param parameters: tuple of the parameters that precede those of the `IN` clause
+        :return: list of the resulting rows
+        """
+        values = list(values)
+        rows = []
+
+        for start in range(0, len(values), _SQLITE_CHUNK_SIZE):
+            chunk = values[start:start + _SQLITE_CHUNK_SIZE]
+            query = statement.format(', '.join('?' * len(chunk)))
+            rows.extend(self._connection.execute(query, tuple(parameters) + tuple(chunk)).fetchall())
+
+        return rows
+
+
+class StreamingImport(object):  # pylint: disable=useless-object-inheritance
+    """Import an archive in chunks, with bounded memory and without extracting it.
+
+    Subclasses implement the database operations of a specific backend.
+    """
+
+    def __init__(self,
+                 group=None,
+                 ignore_unknown_nodes=False,
+                 extras_mode_existing='kcl',
+                 extras_mode_new='import',
+                 comment_mode='newest',
+                 silent=False,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        """Construct a new import.
+
+        :param group: Group wherein all imported Nodes will be placed.
+        :param ignore_unknown_nodes: boolean, if True, links and group elements with nodes that are neither in the
+            archive nor in the database are skipped
+        :param extras_mode_existing: 3 letter code that will identify what to do with the extras import, see
+            :func:`~aiida.tools.importexport.dbimport.backends.utils.merge_extras`
+        :param extras_mode_new: 'import' to import extras of new nodes or 'none' to ignore them
+        :param comment_mode: 'newest' or 'overwrite', see
+            :func:`~aiida.tools.importexport.dbimport.backends.utils.merge_comment`
+        :param silent: suppress prints
+        :param batch_size: the number of entries that are imported at a time
+        """
+        if extras_mode_new not in ('import', 'none'):
+            raise ValueError("Unknown extras_mode_new value: {}, should be either 'import' or "
+                             "'none'".format(extras_mode_new))
+
+        self._group = group
+        self._ignore_unknown_nodes = ignore_unknown_nodes
+        self._extras_mode_existing = extras_mode_existing
+        self._extras_mode_new = extras_mode_new
+        self._comment_mode = comment_mode
+        self._silent = silent
+        self._batch_size = batch_size
+        self._imported_computer_names = set()
+
+    def import_archive(self, in_path, nodes_export_subfolder='nodes'):
+        """Import the archive at the given path.
+
+        :param in_path: the path to a file or folder that can be imported in AiiDA
+        :param nodes_export_subfolder: the name of the folder in the archive with the node repositories
+        :return: dictionary with the new and existing entries of each entity, as returned by the regular import
+        """
+        from aiida.orm import Group
+
+        if self._group is not None:
+            if not isinstance(self._group, Group):
+                raise TypeError("group must be a Group entity")
+            elif not self._group.is_stored:
+                self._group.store()
+
+        archive = ArchiveReader(in_path, nodes_export_subfolder)
+
+        self._print("READING METADATA...")
+        with archive.open('metadata.json') as handle:
+            metadata = json.load(codecs.getreader('utf8')(handle))
+
+        self._validate_metadata(metadata)
+
+        with ImportStaging(self._batch_size) as staging:
+            self._print("READING DATA...")
+            with archive.open('data.json') as handle:
+                staging.stage_data(codecs.getreader('utf8')(handle), metadata['unique_identifiers'])
+
+            self._check_unknown_nodes(staging)
+
+            ret_dict = {}
+
+            with self._transaction():
+                for entity_name in ENTITY_ORDER:
+                    self._import_entity(staging, metadata, entity_name, ret_dict)
+
+                    if entity_name == NODE_ENTITY_NAME:
+                        self._import_node_repositories(staging, archive)
+
+                staging.commit()
+
+                self._import_links(staging, ret_dict)
+                self._import_group_nodes(staging)
+                self._import_group(staging)
+
+        self._print("DONE.")
+
+        return ret_dict
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Return a context manager in which all database operations are done in a single transaction."""
+        raise NotImplementedError
+
+    def _get_pks(self, entity_name, field, values):
+        """Return the primary keys of the entries of the given entity whose field has one of the given values.
+
+        :param entity_name: the name of the entity
+        :param field: the name of the field, such as the unique identifier
+        :param values: list of values
+        :return: dictionary of the values, as strings, onto the primary keys
+        """
+        raise NotImplementedError
+
+    def _create_entries(self, entity_name, entries):
+        """Create new entries of the given entity in bulk.
+
+        :param entity_name: the name of the entity
+        :param entries: list of dictionaries of the deserialized fields of the entries
+        """
+        raise NotImplementedError
+
+    def _get_node_extras(self, pks):
+        """Return the node types and extras of the nodes with the given primary keys.
+
+        :param pks: list of primary keys
+        :return: list of tuples of the primary key, the node type and the extras
+        """
+        raise NotImplementedError
+
+    def _set_node_extras(self, extras):
+        """Set the extras of existing nodes.
+
+        :param extras: dictionary of primary keys onto the new extras
+        """
+        raise NotImplementedError
+
+    def _get_incoming_links(self, pks):
+        """Return the links whose outputs are the nodes with the given primary keys.
+
+        :param pks: list of primary keys
+        :return: list of tuples of the input pk, output pk and label
+        """
+        raise NotImplementedError
+
+    def _create_links(self, links):
+        """Create links in bulk.
+
+        :param links: list of tuples of the input pk, output pk, label and link type value
+        """
+        raise NotImplementedError
+
+    def _add_nodes_to_group(self, group_pk, node_pks):
+        """Add nodes to a group, skipping those that are already in it.
+
+        :param group_pk: the primary key of the group
+        :param node_pks: list of primary keys of the nodes
+        """
+        raise NotImplementedError
+
+    def _create_import_group(self, label):
+        """Create the group into which the imported nodes are put, unless a group with the label already exists.
+
+        :param label: the label of the group
+        :return: the primary key of the new group, or None if a group with the label already exists
+        """
+        raise NotImplementedError
+
+    def _print(self, message):
+        """Print the message unless the import is silent."""
+        if not self._silent:
+            print(message)
+
+    @staticmethod
+    def _validate_metadata(metadata):
+        """Check that the archive has the supported version and that its entities can be imported in order.
+
+        :param metadata: the content of `metadata.json`
+        :raises IncompatibleArchiveVersionError: if the version of the archive is not supported
+        """
+        check_export_version(metadata['export_version'])
+
+        for import_field_name in metadata['all_fields_info']:
+            if import_field_name not in ENTITY_ORDER and import_field_name not in ['Attribute', 'Link']:
+                raise NotImplementedError("Apparently, you are importing a file with a model '{}', but this does not "
+                                          "appear in all_known_models!".format(import_field_name))
+
+        for idx, entity_name in enumerate(ENTITY_ORDER):
+            for field in metadata['all_fields_info'].get(entity_name, {}).values():
+                dependency = field.get('requires', None)
+                if dependency is not None and dependency not in ENTITY_ORDER[:idx]:
+                    raise ValueError("Entity {} requires {} but would be loaded first; stopping...".format(
+                        entity_name, dependency))
+
+    def _check_unknown_nodes(self, staging):
+        """Look up the nodes that are referenced by the links and groups of the archive but are not in the archive.
+
+        :param staging: the staging database
+        :raises ValueError: if some of these nodes are not in the database either, unless unknown nodes are ignored
+        """
+        unknown_nodes = []
+
+        for uuids in staging.iter_referenced_node_uuids():
+            node_pks = self._get_pks(NODE_ENTITY_NAME, 'uuid', uuids)
+            staging.set_node_pks(node_pks.items())
+            unknown_nodes.extend(uuid for uuid in uuids if uuid not in node_pks)
+
+        staging.commit()
+
+        if unknown_nodes and not self._ignore_unknown_nodes:
+            raise ValueError("The import file refers to {} nodes with unknown UUID, therefore it cannot be imported. "
+                             "Either first import the unknown nodes, or export also the parents when exporting. The "
+                             "unknown UUIDs are:\n".format(len(unknown_nodes)) + "\n".join(
+                                 '* {}'.format(uuid) for uuid in unknown_nodes))
+
+    def _import_entity(self, staging, metadata, entity_name, ret_dict):
+        """Import the staged entries of the given entity in chunks.
+
+        :param staging: the staging database
+        :param metadata: the content of `metadata.json`
+        :param entity_name: the name of the entity
+        :param ret_dict: the dictionary with the new and existing entries, that is updated
+        """
+        fields_info = metadata['all_fields_info'].get(entity_name, {})
+        unique_identifier = metadata['unique_identifiers'].get(entity_name, None)
+        count_new = 0
+        count_existing = 0
+
+        if not staging.count_entries(entity_name):
+            return
+
+        for chunk in staging.iter_entries(entity_name):
+            mappings = self._get_foreign_mappings(staging, chunk, fields_info)
+
+            if unique_identifier is None:
+                existing_pks = {}
+            else:
+                existing_pks = self._get_pks(entity_name, unique_identifier,
+                                             [entry[unique_identifier] for _, entry in chunk])
+
+            new_entries = []
+            existing = []
+
+            for import_pk, entry in chunk:
+                unique_id = None if unique_identifier is None else entry[unique_identifier]
+
+                if unique_id not in existing_pks:
+                    new_entries.append((import_pk, entry))
+                    continue
+
+                existing.append((import_pk, unique_id, existing_pks[unique_id]))
+                ret_dict.setdefault(entity_name, {'new': [], 'existing': []})['existing'].append(
+                    (str(import_pk), existing_pks[unique_id]))
+
+                if entity_name == COMMENT_ENTITY_NAME:
+                    new_entry_uuid = merge_comment(self._deserialize(entry, fields_info, mappings), self._comment_mode)
+                    if new_entry_uuid is not None:
+                        entry[unique_identifier] = new_entry_uuid
+                        new_entries.append((import_pk, entry))
+
+            if existing:
+                staging.set_pks(entity_name, existing, new=False)
+                count_existing += len(existing)
+
+                if entity_name == NODE_ENTITY_NAME:
+                    self._update_node_extras(staging, existing)
+
+            if new_entries:
+                created = self._create_new_entries(staging, entity_name, unique_identifier, fields_info, mappings,
+                                                   new_entries)
+                staging.set_pks(entity_name, created, new=True)
+                count_new += len(created)
+
+                for import_pk, _, pk in created:
+                    ret_dict.setdefault(entity_name, {'new': [], 'existing': []})['new'].append((str(import_pk), pk))
+
+        staging.commit()
+
+        self._print("IMPORTED {}: {} new, {} existing".format(entity_name, count_new, count_existing))
+
+    def _create_new_entries(self, staging, entity_name, unique_identifier, fields_info, mappings, entries):
+        """Create the given new entries of an entity.
+
+        :param staging: the staging database
+        :param entity_name: the name of the entity
+        :param unique_identifier: the name of the unique identifier field of the entity
+        :param fields_info: the fields info of the entity
+        :param mappings: tuple of the import unique ids mappings and the foreign ids reverse mappings
+        :param entries: list of tuples of the import pk and the entry
+        :return: list of tuples of the import pk, the unique id and the primary key of the created entries
+        """
+        entries_data = []
+
+        if entity_name == NODE_ENTITY_NAME:
+            import_pks = [import_pk for import_pk, _ in entries]
+            attributes = staging.get_node_columns('attributes', import_pks)
+            extras = staging.get_node_columns('extras', import_pks) if self._extras_mode_new == 'import' else {}
+
+        for import_pk, entry in entries:
+            import_data = self._deserialize(entry, fields_info, mappings)
+
+            if entity_name == GROUP_ENTITY_NAME:
+                # Check if there is already a group with the same name, and if so, recreate the name
+                orig_label = import_data['label']
+                dupl_counter = 0
+                while self._get_pks(entity_name, 'label', [import_data['label']]):
+                    import_data['label'] = orig_label + DUPL_SUFFIX.format(dupl_counter)
+                    dupl_counter += 1
+                    if dupl_counter == 100:
+                        raise exceptions.UniquenessError("A group of that label ( {} ) already exists and I could not "
+                                                         "create a new one".format(orig_label))
+
+            elif entity_name == COMPUTER_ENTITY_NAME:
+                # Check if there is already a computer with the same name in the database
+                orig_name = import_data['name']
+                dupl_counter = 0
+                while (self._get_pks(entity_name, 'name', [import_data['name']]) or
+                       import_data['name'] in self._imported_computer_names):
+                    import_data['name'] = orig_name + DUPL_SUFFIX.format(dupl_counter)
+                    dupl_counter += 1
+                    if dupl_counter == 100:
+                        raise exceptions.UniquenessError("A computer of that name ( {} ) already exists and I could "
+                                                         "not create a new one".format(orig_name))
+
+                self._imported_computer_names.add(import_data['name'])
+
+            elif entity_name == NODE_ENTITY_NAME:
+                try:
+                    import_data['attributes'] = attributes[import_pk]
+                except KeyError:
+                    raise ValueError("Unable to find attribute info for DbNode with UUID = {}".format(
+                        import_data['uuid']))
+
+                if self._extras_mode_new == 'import':
+                    try:
+                        import_data['extras'] = clean_extras(extras[import_pk], import_data['node_type'])
+                    except KeyError:
+                        raise ValueError("Unable to find extras info for DbNode with UUID = {}".format(
+                            import_data['uuid']))
+
+            entries_data.append(import_data)
+
+        self._create_entries(entity_name, entries_data)
+
+        import_pks = dict((entry[unique_identifier], import_pk) for import_pk, entry in entries)
+        created = self._get_pks(entity_name, unique_identifier, list(import_pks))
+
+        return [(import_pks[unique_id], unique_id, pk) for unique_id, pk in created.items()]
+
+    def _update_node_extras(self, staging, existing):
+        """Merge the extras in the archive into those of the given existing nodes.
+
+        :param staging: the staging database
+        :param existing: list of tuples of the import pk, the uuid and the primary key of the existing nodes
+        """
+        import_pks = dict((pk, import_pk) for import_pk, _, pk in existing)
+        extras = staging.get_node_columns('extras', import_pks.values())
+        new_extras = {}
+
+        for pk, node_type, old_extras in self._get_node_extras(list(import_pks)):
+            try:
+                incoming_extras = extras[import_pks[pk]]
+            except KeyError:
+                raise ValueError("Unable to find extras info for DbNode with pk = {}".format(pk))
+
+            incoming_extras = clean_extras(incoming_extras, node_type)
+            new_extras[pk] = merge_extras(old_extras, incoming_extras, self._extras_mode_existing)
+
+        self._set_node_extras(new_extras)
+
+    def _import_node_repositories(self, staging, archive):
+        """Write the repository folders of the newly created nodes from the files in the archive.
+
+        :param staging: the staging database
+        :param archive: the archive reader
+        :raises ValueError: if the archive does not contain the repository folder of a new node
+        """
+        self._print("STORING NEW NODE FILES...")
+
+        current_uuid = None
+        folder = None
+
+        for uuid, relpath, handle in archive.iter_node_files():
+
+            if uuid != current_uuid:
+                current_uuid = uuid
+                folder = None
+
+                new, found = staging.get_node_status(uuid)
+
+                if new:
+                    folder = RepositoryFolder(section=Repository._section_name, uuid=uuid)
+
+                    # The files of a node are not necessarily contiguous in the archive, so the folder is only replaced,
+                    # possibly destroying existing previous folders, when the node is encountered for the first time
+                    if not found:
+                        folder.erase(create_empty_folder=True)
+                        staging.set_node_found(uuid)
+
+            if folder is None:
+                continue
+
+            if handle is None:
+                folder.get_subfolder(relpath, create=True, reset_limit=True)
+            else:
+                dirname, filename = os.path.split(relpath)
+                subfolder = folder.get_subfolder(dirname, create=True, reset_limit=True) if dirname else folder
+                subfolder.create_file_from_filelike(handle, filename, mode='wb')
+
+        uuid = staging.get_new_node_not_found()
+
+        if uuid is not None:
+            raise ValueError("Unable to find the repository folder for node with UUID={} in the exported "
+                             "file".format(uuid))
+
+    def _import_links(self, staging, ret_dict):
+        """Create the links in the archive that do not yet exist, in chunks.
+
+        :param staging: the staging database
+        :param ret_dict: the dictionary with the new and existing entries, that is updated
+        """
+        self._print("STORING NODE LINKS...")
+
+        count = 0
+
+        for chunk in staging.iter_links():
+            links_to_store = []
+            output_pks = set(out_id for _, _, _, _, _, out_id in chunk if out_id is not None)
+
+            existing_links_labels = {}
+            existing_input_links = {}
+            for in_id, out_id, label in self._get_incoming_links(list(output_pks)):
+                existing_links_labels[in_id, out_id] = label
+                existing_input_links[out_id, label] = in_id
+
+            for input_uuid, output_uuid, label, link_type, in_id, out_id in chunk:
+                if in_id is None or out_id is None:
+                    if self._ignore_unknown_nodes:
+                        continue
+                    raise ValueError("Trying to create a link with one or both unknown nodes, stopping (in_uuid={}, "
+                                     "out_uuid={}, label={})".format(input_uuid, output_uuid, label))
+
+                if (in_id, out_id) in existing_links_labels:
+                    existing_label = existing_links_labels[in_id, out_id]
+                    if existing_label != label:
+                        raise ValueError("Trying to rename an existing link name, stopping (in={}, out={}, "
+                                         "old_label={}, new_label={})".format(in_id, out_id, existing_label, label))
+                    # Do nothing, the link is already in place and has the correct name
+                    continue
+
+                if (out_id, label) in existing_input_links:
+                    # Only the RETURN links of workflows can have more than one link with the same label entering a
+                    # node, in any other case this is an error
+                    if link_type != LinkType.RETURN.value:
+                        raise ValueError("There exists already an input link to node with UUID {} with label {} but "
+                                         "it does not come from the expected input with UUID {} but from a node with "
+                                         "pk {}.".format(output_uuid, label, input_uuid,
+                                                         existing_input_links[out_id, label]))
+                    continue
+
+                # New link, which is also recorded as existing for the following links in this chunk
+                links_to_store.append((in_id, out_id, label, LinkType(link_type).value))
+                existing_links_labels[in_id, out_id] = label
+                existing_input_links[out_id, label] = in_id
+                ret_dict.setdefault('Link', {'new': []})['new'].append((in_id, out_id))
+
+            if links_to_store:
+                self._create_links(links_to_store)
+                count += len(links_to_store)
+
+        self._print("   ({} new links...)".format(count))
+
+    def _import_group_nodes(self, staging):
+        """Add the nodes of the groups in the archive to these groups, in chunks.
+
+        :param staging: the staging database
+        """
+        self._print("STORING GROUP ELEMENTS...")
+
+        group_pks = {}
+
+        for chunk in staging.iter_group_nodes():
+            node_pks = {}
+
+            for group_uuid, node_uuid, node_pk in chunk:
+                if node_pk is None:
+                    if self._ignore_unknown_nodes:
+                        continue
+                    raise ValueError("Trying to add an unknown node with UUID {} to the group with UUID {}".format(
+                        node_uuid, group_uuid))
+
+                if group_uuid not in group_pks:
+                    group_pks.update(self._get_pks(GROUP_ENTITY_NAME, 'uuid', [group_uuid]))
+
+                node_pks.setdefault(group_pks[group_uuid], []).append(node_pk)
+
+            for group_pk, pks in node_pks.items():
+                self._add_nodes_to_group(group_pk, pks)
+
+    def _import_group(self, staging):
+        """Add all imported nodes to the given group or to a new import group.
+
+        :param staging: the staging database
+        """
+        # So that we do not create empty groups
+        if not staging.count_entries(NODE_ENTITY_NAME):
+            self._print("NO NODES TO IMPORT, SO NO GROUP CREATED, IF IT DID NOT ALREADY EXIST")
+            return
+
+        if self._group is None:
+            # Get an unique name for the import group, based on the current (local) time
+            basename = timezone.localtime(timezone.now()).strftime("%Y%m%d-%H%M%S")
+            counter = 0
+            group_pk = None
+            while group_pk is None:
+                group_label = basename if counter == 0 else "{}_{}".format(basename, counter)
+                group_pk = self._create_import_group(group_label)
+                counter += 1
+        else:
+            group_pk = self._group.pk
+            group_label = self._group.label
+
+        for pks in staging.iter_imported_pks(NODE_ENTITY_NAME):
+            self._add_nodes_to_group(group_pk, pks)
+
+        self._print("IMPORTED NODES ARE GROUPED IN THE IMPORT GROUP LABELED '{}'".format(group_label))
+
+    @staticmethod
+    def _get_foreign_mappings(staging, chunk, fields_info):
+        """Return the mappings needed to deserialize the foreign keys of the given entries.
+
+        These are the same mappings that are used by the regular import, but restricted to the foreign entries that
+        are referenced by the given entries.
+
+        :param staging: the staging database
+        :param chunk: list of tuples of the import pk and the entry
+        :param fields_info: the fields info of the entity
+        :return: tuple of the import unique ids mappings and the foreign ids reverse mappings
+        """
+        import_unique_ids_mappings = {}
+        foreign_ids_reverse_mappings = {}
+
+        for field, field_info in fields_info.items():
+            requires = field_info.get('requires', None)
+            if requires is None:
+                continue
+
+            import_pks = set(entry[field] for _, entry in chunk if entry.get(field, None) is not None)
+            foreign_entries = staging.get_entries(requires, import_pks)
+
+            import_unique_ids = import_unique_ids_mappings.setdefault(requires, {})
+            foreign_ids = foreign_ids_reverse_mappings.setdefault(requires, {})
+
+            for import_pk, (unique_id, pk) in foreign_entries.items():
+                import_unique_ids[import_pk] = unique_id
+                foreign_ids[unique_id] = pk
+
+        return import_unique_ids_mappings, foreign_ids_reverse_mappings
+
+    @staticmethod
+    def _deserialize(entry, fields_info, mappings):
+        """Deserialize the fields of an entry.
+
+        :param entry: the entry as in the archive
+        :param fields_info: the fields info of the entity
+        :param mappings: tuple of the import unique ids mappings and the foreign ids reverse mappings
+        :return: dictionary of the deserialized fields
+        """
+        import_unique_ids_mappings, foreign_ids_reverse_mappings = mappings
+        return dict(
+            deserialize_field(
+                key,
+                value,
+                fields_info=fields_info,
+                import_unique_ids_mappings=import_unique_ids_mappings,
+                foreign_ids_reverse_mappings=foreign_ids_reverse_mappings) for key, value in entry.items())
+
+
+def _get_unique_id(entry, unique_identifier):
+    """Return the unique id of an entry as a string, or None if the entity has no unique identifier."""
+    if unique_identifier is None:
+        return None
+    return six.text_type(entry[unique_identifier])
+
+
+def _iter_tar_members(archive):
+    """Iterate over the members of a tar file opened in stream mode, without keeping all of them in memory.
+
+    :param archive: the `TarFile`
+    """
+    for member in archive:
+        yield member
+        # The tar file keeps a list of the members that were read, which is only needed for random access
+        archive.members = []
+
+
+def _normalize_member_name(name):
+    """Return the name of a member of an archive relative to the root of the archive."""
+    while name.startswith('./'):
+        name = name[2:]
+    return name.lstrip('/')
+
+
+def _join_path(*parts):
+    """Join the non-empty parts of a path with forward slashes."""
+    return '/'.join(part for part in parts if part)
@@ -13,6 +13,8 @@ from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
 
+from distutils.version import StrictVersion
+
 from six.moves import zip
 
 import click
@@ -20,6 +22,25 @@ import click
 from aiida.orm import QueryBuilder, Comment
 from aiida.common import exceptions
 from aiida.common.utils import get_new_uuid
+from aiida.tools.importexport.config import EXPORT_VERSION
+
+
+def check_export_version(export_version):
+    """Check that an archive with the given export version can be imported.
+
+    :param export_version: the `export_version` in the metadata of the archive
+    :raises aiida.common.exceptions.IncompatibleArchiveVersionError: if the version is not the one that can be imported
+    """
+    expected_export_version = StrictVersion(EXPORT_VERSION)
+
+    if StrictVersion(str(export_version)) != expected_export_version:
+        msg = "Export file version is {}, can import only version {}".format(export_version, expected_export_version)
+        if StrictVersion(str(export_version)) < expected_export_version:
+            msg += "\nUse 'verdi export migrate' to update this export file."
+        else:
+            msg += "\nUpdate your AiiDA version in order to import this file."
+
+        raise exceptions.IncompatibleArchiveVersionError(msg)
 
 
 def merge_comment(incoming_comment, comment_mode):
@@ -171,6 +192,21 @@ def merge_extras(old_extras, new_extras, mode):
     return final_extras
 
 
+def clean_extras(extras, node_type):
+    """Remove the extras that are internal to AiiDA from the extras of an imported node.
+
+    These are the extras whose key starts with `_aiida_` and, for codes, the `hidden` extra.
+
+    :param extras: a dictionary containing the extras of the node in the archive
+    :param node_type: the node type of the node
+    :return: a dictionary containing the extras to import
+    """
+    extras = {key: value for key, value in extras.items() if not key.startswith('_aiida_')}
+    if node_type.endswith('code.Code.'):
+        extras = {key: value for key, value in extras.items() if not key == 'hidden'}
+    return extras
+
+
 def deserialize_attributes(attributes_data, conversion_data):
     """Deserialize attributes"""
     import datetime
@@ -14,13 +14,17 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import collections
 import os
 import six
 from graphviz import Digraph
-from aiida.orm import load_node, Data, ProcessNode
+from aiida.orm import load_node, Data, Node, ProcessNode
 from aiida.orm.querybuilder import QueryBuilder
 from aiida.common import LinkType
+from aiida.common.utils import iter_sorted_batches
 from aiida.orm.utils.links import LinkPair
+from aiida.tools.graph import traverse, LinkRule, FORWARD, BACKWARD
+from aiida.tools.graph.traversal import DEFAULT_BATCH_SIZE
 
 __all__ = ('Graph', 'default_link_styles', 'default_node_styles', 'pstate_node_styles', 'default_node_sublabels')
 
@@ -572,38 +576,8 @@ class Graph(object):
 
         """
         # pylint: disable=too-many-arguments
-        origin_node = self._load_node(origin)
-
-        self.add_node(origin_node, style_override=dict(origin_style))
-
-        leaf_nodes = [origin_node]
-        traversed_pks = [origin_node.pk]
-        cur_depth = 0
-        while leaf_nodes:
-            cur_depth += 1
-            # checking of maximum descendant depth is set and applies.
-            if depth is not None and cur_depth > depth:
-                break
-            if print_func:
-                print_func("- Depth: {}".format(cur_depth))
-            new_nodes = []
-            for node in leaf_nodes:
-                outgoing_nodes = self.add_outgoing(
-                    node, link_types=link_types, annotate_links=annotate_links, return_pks=False)
-                if outgoing_nodes and print_func:
-                    print_func("  {} -> {}".format(node.pk, [on.pk for on in outgoing_nodes]))
-                new_nodes.extend(outgoing_nodes)
-
-                if include_process_inputs and isinstance(node, ProcessNode):
-                    self.add_incoming(node, link_types=link_types, annotate_links=annotate_links)
-
-            # ensure the same path isn't traversed multiple times
-            leaf_nodes = []
-            for new_node in new_nodes:
-                if new_node.pk in traversed_pks:
-                    continue
-                leaf_nodes.append(new_node)
-                traversed_pks.append(new_node.pk)
+        self._recurse(origin, FORWARD, depth, link_types, annotate_links, origin_style, include_process_inputs,
+                      print_func)
 
     def recurse_ancestors(self,
                           origin,
@@ -632,38 +606,79 @@ class Graph(object):
 
         """
         # pylint: disable=too-many-arguments
+        self._recurse(origin, BACKWARD, depth, link_types, annotate_links, origin_style, include_process_outputs,
+                      print_func)
+
+    def _recurse(self, origin, direction, depth, link_types, annotate_links, origin_style, include_process_links,
+                 print_func):
+        """add nodes and edges from an origin recursively, following the links in the given direction
+
+        The graph is traversed with a single query per depth, after which all nodes are loaded with a single query.
+
+        :param origin: node or node pk/uuid
+        :param direction: `aiida.tools.graph.FORWARD` to follow outgoing or `BACKWARD` to follow incoming links
+        :param depth: if not None, stop after travelling a certain depth into the graph
+        :param link_types: filter by subset of link types
+        :param annotate_links: label edges with the link 'label', 'type' or 'both'
+        :param origin_style: node style map for origin node
+        :param include_process_links: include the links in the opposite direction for all processes whose links were
+            followed
+        :param print_func: a function to stream information to, i.e. print_func(str)
+
+        """
+        # pylint: disable=too-many-arguments,too-many-locals
+        if annotate_links not in [None, False, "label", "type", "both"]:
+            raise AssertionError('annotate_links must be one of False, "label", "type" or "both"')
+
         origin_node = self._load_node(origin)
+        rules = [LinkRule(self._convert_link_types(link_types) or tuple(LinkType), direction)]
+
+        result = traverse([origin_node.pk], rules, max_iterations=depth, return_links=True)
+        links = result.links
+
+        if print_func:
+            start = 0
+            for stats in result.stats:
+                print_func("- Depth: {}".format(stats.iteration))
+                neighbours = collections.OrderedDict()
+                for link in links[start:start + stats.links]:
+                    if direction == FORWARD:
+                        neighbours.setdefault(link.input_id, []).append(link.output_id)
+                    else:
+                        neighbours.setdefault(link.output_id, []).append(link.input_id)
+                for source, targets in neighbours.items():
+                    print_func("  {} -> {}".format(source, targets))
+                start += stats.links
+
+        if include_process_links:
+            opposite = BACKWARD if direction == FORWARD else FORWARD
+            expanded = result.pks - result.frontier
+            process_pks = set()
+            for batch in iter_sorted_batches(expanded, DEFAULT_BATCH_SIZE):
+                builder = QueryBuilder().append(ProcessNode, filters={'id': {'in': batch}}, project='id')
+                process_pks.update(pk for pk, in builder.iterall())
+            links = links + traverse(process_pks, [LinkRule(rules[0].link_types, opposite)], max_iterations=1,
+                                     return_links=True).links
+
+        pks = set(result.pks)
+        for link in links:
+            pks.update((link.input_id, link.output_id))
+        pks.discard(origin_node.pk)
+
+        nodes = {origin_node.pk: origin_node}
+        for batch in iter_sorted_batches(pks, DEFAULT_BATCH_SIZE):
+            builder = QueryBuilder().append(Node, filters={'id': {'in': batch}}, project='*')
+            nodes.update((node.pk, node) for node, in builder.iterall())
 
         self.add_node(origin_node, style_override=dict(origin_style))
 
-        last_nodes = [origin_node]
-        traversed_pks = [origin_node.pk]
-        cur_depth = 0
-        while last_nodes:
-            cur_depth += 1
-            # checking of maximum descendant depth is set and applies.
-            if depth is not None and cur_depth > depth:
-                break
-            if print_func:
-                print_func("- Depth: {}".format(cur_depth))
-            new_nodes = []
-            for node in last_nodes:
-                incoming_nodes = self.add_incoming(
-                    node, link_types=link_types, annotate_links=annotate_links, return_pks=False)
-                if incoming_nodes and print_func:
-                    print_func("  {} -> {}".format(node.pk, [n.pk for n in incoming_nodes]))
-                new_nodes.extend(incoming_nodes)
-
-                if include_process_outputs and isinstance(node, ProcessNode):
-                    self.add_outgoing(node, link_types=link_types, annotate_links=annotate_links)
-
-            # ensure the same path isn't traversed multiple times
-            last_nodes = []
-            for new_node in new_nodes:
-                if new_node.pk in traversed_pks:
-                    continue
-                last_nodes.append(new_node)
-                traversed_pks.append(new_node.pk)
+        for link in links:
+            self.add_node(nodes[link.input_id])
+            self.add_node(nodes[link.output_id])
+            link_pair = LinkPair(LinkType(link.link_type), link.link_label)
+            style = self._link_styles(
+                link_pair, add_label=annotate_links in ["label", "both"], add_type=annotate_links in ["type", "both"])
+            self.add_edge(nodes[link.input_id], nodes[link.output_id], link_pair, style=style)
 
     def add_origin_to_targets(self,
                               origin,
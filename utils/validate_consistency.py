@@ -127,6 +127,9 @@ def validate_verdi_documentation():
     command = verdi.get_command(ctx, 'data')
     command.set_exclude_external_plugins(True)
 
+    # The sub commands of `verdi` are loaded lazily, so they have to be retrieved through `get_command`
+    commands = [(name, verdi.get_command(ctx, name)) for name in verdi.list_commands(ctx)]
+
     # Replacing the block with the overview of `verdi`
     filepath_verdi_overview = os.path.join(ROOT_DIR, 'docs', 'source', 'working_with_aiida', 'index.rst')
     overview_block_start_marker = '.. _verdi_overview:'
@@ -134,7 +137,7 @@ def validate_verdi_documentation():
 
     # Generate the new block with the command index
     block = []
-    for name, command in sorted(verdi.commands.items()):
+    for name, command in commands:
         short_help = command.help.split('\n')[0]
         block.append(u'* :ref:`{name:}<verdi_{name:}>`:  {help:}\n'.format(name=name, help=short_help))
 
@@ -154,7 +157,7 @@ def validate_verdi_documentation():
     message = u'Below is a list with all available subcommands.'
     block = [u'{}\n{}\n{}\n\n'.format(header, '=' * len(header), message)]
 
-    for name, command in sorted(verdi.commands.items()):
+    for name, command in commands:
         ctx = click.Context(command)
 
         header_label = u'.. _verdi_{name:}:'.format(name=name)